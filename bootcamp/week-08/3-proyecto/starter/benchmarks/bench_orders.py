@@ -0,0 +1,133 @@
+"""
+Benchmark de creación de pedidos.
+
+Compara, con pedidos de LINES líneas sobre SQLite en disco:
+
+- antes: un get_by_id por línea, stock descontado en Python y
+  commit + refresh del pedido (el flujo original de OrderService.create)
+- create: productos con una query IN y stock con un UPDATE con guarda
+- create_batch: BATCH pedidos por llamada con un solo commit
+
+Uso (desde la carpeta starter):
+    python -m benchmarks.bench_orders
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import Category, Order, OrderItem, OrderStatus, Product, User
+from repositories import OrderRepository, ProductRepository, UnitOfWork, UserRepository
+from schemas.order import OrderCreate
+from services.order import OrderService
+
+
+PRODUCTS = 500
+LINES = 50
+ORDERS = 200
+BATCH = 20
+
+
+def create_order_before(service: OrderService, data: OrderCreate) -> None:
+    """Flujo original: una query por línea y commit + refresh."""
+    service.user_repo.get_by_id(data.user_id)
+    items = []
+    products = []
+    for item_data in data.items:
+        product = service.product_repo.get_by_id(item_data.product_id)
+        items.append(OrderItem(
+            product_id=product.id,
+            product_name=product.name,
+            quantity=item_data.quantity,
+            unit_price=product.price,
+            subtotal=product.price * item_data.quantity
+        ))
+        products.append((product, item_data.quantity))
+    order = Order(
+        user_id=data.user_id,
+        status=OrderStatus.PENDING,
+        shipping_address=data.shipping_address,
+        items=items
+    )
+    for product, quantity in products:
+        product.stock -= quantity
+    db = service.order_repo.db
+    db.add(order)
+    db.commit()
+    db.refresh(order)
+    # El mapper recorre los items (lazy load tras el refresh)
+    len(order.items)
+
+
+def build(path: Path):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    with Session() as db:
+        db.add(User(email="bench@example.com", name="Bench", password_hash="x"))
+        db.add(Category(name="Bench"))
+        db.flush()
+        db.add_all(
+            Product(name=f"P{i}", sku=f"BEN-{i:04d}", price=9.99, stock=10**9, category_id=1)
+            for i in range(PRODUCTS)
+        )
+        db.commit()
+    return engine, Session
+
+
+def order_data(n: int) -> OrderCreate:
+    return OrderCreate(
+        user_id=1,
+        shipping_address="Calle del Benchmark 1",
+        items=[
+            {"product_id": (n * LINES + line) % PRODUCTS + 1, "quantity": 1}
+            for line in range(LINES)
+        ]
+    )
+
+
+def run(mode: str) -> tuple[float, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, Session = build(Path(tmp) / "bench.db")
+        queries = 0
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def count(*args):
+            nonlocal queries
+            queries += 1
+
+        orders = [order_data(n) for n in range(ORDERS)]
+        start = time.perf_counter()
+        with Session() as db:
+            service = OrderService(
+                OrderRepository(db), UserRepository(db), ProductRepository(db), UnitOfWork(db)
+            )
+            if mode == "antes":
+                for data in orders:
+                    create_order_before(service, data)
+            elif mode == "create":
+                for data in orders:
+                    service.create(data)
+            else:
+                for i in range(0, ORDERS, BATCH):
+                    service.create_batch(orders[i:i + BATCH])
+        elapsed = time.perf_counter() - start
+        engine.dispose()
+    return ORDERS / elapsed, queries / ORDERS
+
+
+def main() -> None:
+    print(f"{ORDERS} pedidos de {LINES} líneas (batch de {BATCH})")
+    print(f"{'modo':>14} | {'pedidos/s':>10} | {'queries/pedido':>14}")
+    print("-" * 45)
+    for mode in ("antes", "create", "create_batch"):
+        rate, queries = run(mode)
+        print(f"{mode:>14} | {rate:>10.0f} | {queries:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
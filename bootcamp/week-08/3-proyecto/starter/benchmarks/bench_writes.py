@@ -0,0 +1,105 @@
+"""
+Latencia de los endpoints de escritura.
+
+Ejecuta REQUESTS veces cada endpoint de escritura contra SQLite en
+disco (cada commit es un fsync) y muestra la latencia media, p95 y las
+queries por request.
+
+Uso (desde la carpeta starter):
+    python -m benchmarks.bench_writes
+"""
+
+import os
+import statistics
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+# La app crea el engine al importarse: configurar antes
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(_tmp.name) / 'bench.db'}"
+os.environ["DEBUG"] = "false"
+warnings.filterwarnings("ignore")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from database import engine  # noqa: E402
+from main import app  # noqa: E402
+
+REQUESTS = 200
+LINES = 5
+
+queries = 0
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def count_queries(*args):
+    global queries
+    queries += 1
+
+
+def measure(client: TestClient, name: str, calls) -> None:
+    global queries
+    latencies = []
+    queries = 0
+    for method, url, body, expected in calls:
+        start = time.perf_counter()
+        response = client.request(method, url, json=body)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == expected, response.text
+    latencies.sort()
+    print(
+        f"{name:>28} | {statistics.mean(latencies):>8.2f} | "
+        f"{latencies[int(len(latencies) * 0.95)]:>8.2f} | {queries / len(latencies):>8.1f}"
+    )
+
+
+def main() -> None:
+    client = TestClient(app)
+    n = REQUESTS
+    print(f"{n} requests por endpoint")
+    print(f"{'endpoint':>28} | {'media ms':>8} | {'p95 ms':>8} | {'queries':>8}")
+    print("-" * 62)
+
+    measure(client, "POST /users/", [
+        ("POST", "/users/", {"email": f"u{i}@example.com", "name": "U", "password": "secret123"}, 201)
+        for i in range(n)
+    ])
+    measure(client, "POST /categories/", [
+        ("POST", "/categories/", {"name": f"Cat {i}"}, 201) for i in range(n)
+    ])
+    measure(client, "PATCH /categories/{id}", [
+        ("PATCH", f"/categories/{i + 1}", {"description": "nueva"}, 200) for i in range(n)
+    ])
+    measure(client, "POST /products/", [
+        ("POST", "/products/", {
+            "name": f"P{i}", "sku": f"BEN-{i:04d}", "price": 9.99, "stock": 10**6, "category_id": 1
+        }, 201)
+        for i in range(n)
+    ])
+    measure(client, "PATCH /products/{id}", [
+        ("PATCH", f"/products/{i + 1}", {"price": 10.5}, 200) for i in range(n)
+    ])
+    order = {
+        "user_id": 1,
+        "shipping_address": "Calle del Benchmark 1",
+        "items": [{"product_id": line + 1, "quantity": 1} for line in range(LINES)]
+    }
+    measure(client, f"POST /orders/ ({LINES} líneas)", [
+        ("POST", "/orders/", order, 201) for _ in range(n)
+    ])
+    measure(client, "PATCH /orders/{id}/status", [
+        ("PATCH", f"/orders/{i + 1}/status", {"status": "confirmed"}, 200) for i in range(n)
+    ])
+    measure(client, "PATCH /orders/{id}/cancel", [
+        ("PATCH", f"/orders/{i + 1}/cancel", None, 200) for i in range(n)
+    ])
+    measure(client, "DELETE /categories/{id}", [
+        ("DELETE", f"/categories/{i + 2}", None, 204) for i in range(n - 1)
+    ])
+
+
+if __name__ == "__main__":
+    main()
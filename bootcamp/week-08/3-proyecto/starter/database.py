@@ -15,7 +15,14 @@ engine = create_engine(
     echo=settings.debug
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: tras el commit de la UnitOfWork las entidades
+# conservan sus valores y se mapean a DTOs sin volver a leerlas
+SessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=engine
+)
 
 Base = declarative_base()
 
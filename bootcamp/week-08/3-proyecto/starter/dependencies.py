@@ -10,12 +10,22 @@ from repositories.user import UserRepository
 from repositories.category import CategoryRepository
 from repositories.product import ProductRepository
 from repositories.order import OrderRepository
+from repositories.unit_of_work import UnitOfWork
 from services.user import UserService
 from services.category import CategoryService
 from services.product import ProductService
 from services.order import OrderService
 
 
+# ============================================
+# UNIT OF WORK
+# ============================================
+
+def get_unit_of_work(db: Session = Depends(get_db)) -> UnitOfWork:
+    # Misma sesión que los repositories (FastAPI cachea get_db por request)
+    return UnitOfWork(db)
+
+
 # ============================================
 # USER
 # ============================================
@@ -25,9 +35,10 @@ def get_user_repository(db: Session = Depends(get_db)) -> UserRepository:
 
 
 def get_user_service(
-    repo: UserRepository = Depends(get_user_repository)
+    repo: UserRepository = Depends(get_user_repository),
+    uow: UnitOfWork = Depends(get_unit_of_work)
 ) -> UserService:
-    return UserService(repo)
+    return UserService(repo, uow)
 
 
 # ============================================
@@ -39,9 +50,10 @@ def get_category_repository(db: Session = Depends(get_db)) -> CategoryRepository
 
 
 def get_category_service(
-    repo: CategoryRepository = Depends(get_category_repository)
+    repo: CategoryRepository = Depends(get_category_repository),
+    uow: UnitOfWork = Depends(get_unit_of_work)
 ) -> CategoryService:
-    return CategoryService(repo)
+    return CategoryService(repo, uow)
 
 
 # ============================================
@@ -54,9 +66,10 @@ def get_product_repository(db: Session = Depends(get_db)) -> ProductRepository:
 
 def get_product_service(
     product_repo: ProductRepository = Depends(get_product_repository),
-    category_repo: CategoryRepository = Depends(get_category_repository)
+    category_repo: CategoryRepository = Depends(get_category_repository),
+    uow: UnitOfWork = Depends(get_unit_of_work)
 ) -> ProductService:
-    return ProductService(product_repo, category_repo)
+    return ProductService(product_repo, category_repo, uow)
 
 
 # ============================================
@@ -70,6 +83,7 @@ def get_order_repository(db: Session = Depends(get_db)) -> OrderRepository:
 def get_order_service(
     order_repo: OrderRepository = Depends(get_order_repository),
     user_repo: UserRepository = Depends(get_user_repository),
-    product_repo: ProductRepository = Depends(get_product_repository)
+    product_repo: ProductRepository = Depends(get_product_repository),
+    uow: UnitOfWork = Depends(get_unit_of_work)
 ) -> OrderService:
-    return OrderService(order_repo, user_repo, product_repo)
+    return OrderService(order_repo, user_repo, product_repo, uow)
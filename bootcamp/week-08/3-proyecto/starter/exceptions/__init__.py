@@ -2,5 +2,5 @@
 from .base import AppException, NotFoundError, ConflictError, ValidationError
 from .user import UserNotFoundError, UserAlreadyExistsError
 from .category import CategoryNotFoundError, CategoryHasProductsError
-from .product import ProductNotFoundError, ProductAlreadyExistsError, InsufficientStockError
+from .product import ProductNotFoundError, ProductAlreadyExistsError, InsufficientStockError, StockConflictError
 from .order import OrderNotFoundError, OrderCannotBeCancelledError
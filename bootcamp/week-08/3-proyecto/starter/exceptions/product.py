@@ -25,6 +25,16 @@ class ProductAlreadyExistsError(ConflictError):
         )
 
 
+class StockConflictError(ConflictError):
+    """El stock cambió concurrentemente mientras se reservaba."""
+    
+    def __init__(self):
+        super().__init__(
+            message="Stock changed while the order was being placed, please retry",
+            code="STOCK_CONFLICT"
+        )
+
+
 class InsufficientStockError(ValidationError):
     """Stock insuficiente."""
     
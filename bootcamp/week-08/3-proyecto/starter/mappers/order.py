@@ -9,6 +9,13 @@ from schemas.order import OrderResponse, OrderItemResponse
 class OrderMapper:
     """Mapper para conversiones de Order."""
     
+    # Columnas del CSV: una fila por item con los datos del pedido
+    CSV_FIELDS = [
+        "order_id", "user_id", "status", "created_at", "shipping_address",
+        "subtotal", "tax", "shipping_cost", "total",
+        "item_id", "product_id", "product_name", "quantity", "unit_price", "item_subtotal"
+    ]
+    
     @staticmethod
     def to_item_response(entity: OrderItem) -> OrderItemResponse:
         """Convierte OrderItem → OrderItemResponse."""
@@ -34,6 +41,33 @@ class OrderMapper:
             created_at=entity.created_at
         )
     
+    @staticmethod
+    def to_csv_rows(entity: Order) -> list[dict]:
+        """Aplana un pedido a una fila por item (columnas CSV_FIELDS)."""
+        order = {
+            "order_id": entity.id,
+            "user_id": entity.user_id,
+            "status": entity.status,
+            "created_at": entity.created_at.isoformat(),
+            "shipping_address": entity.shipping_address,
+            "subtotal": entity.subtotal,
+            "tax": entity.tax,
+            "shipping_cost": entity.shipping_cost,
+            "total": entity.total
+        }
+        return [
+            {
+                **order,
+                "item_id": item.id,
+                "product_id": item.product_id,
+                "product_name": item.product_name,
+                "quantity": item.quantity,
+                "unit_price": item.unit_price,
+                "item_subtotal": item.subtotal
+            }
+            for item in entity.items
+        ]
+    
     @staticmethod
     def to_response_list(entities: list[Order]) -> list[OrderResponse]:
         """Convierte lista de entities."""
@@ -5,7 +5,7 @@
 from datetime import datetime
 from enum import Enum
 from sqlalchemy import String, DateTime, Text, Float, Integer, ForeignKey
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship, orm_insert_sentinel
 
 from database import Base
 
@@ -47,6 +47,10 @@ class Order(Base):
     # TODO: Agregar campo created_at (DateTime)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     
+    # Centinela de insertmanyvalues: SQLite no garantiza el orden de
+    # RETURNING, así que sin ella SQLAlchemy inserta fila a fila
+    _sentinel: Mapped[int | None] = orm_insert_sentinel()
+    
     # Relaciones
     user: Mapped["User"] = relationship(back_populates="orders")
     items: Mapped[list["OrderItem"]] = relationship(
@@ -82,6 +86,9 @@ class OrderItem(Base):
     unit_price: Mapped[float] = mapped_column(Float)
     subtotal: Mapped[float] = mapped_column(Float)
     
+    # Ver Order._sentinel: todos los items de un flush en un solo INSERT
+    _sentinel: Mapped[int | None] = orm_insert_sentinel()
+    
     # Relación
     order: Mapped["Order"] = relationship(back_populates="items")
     
@@ -4,3 +4,4 @@ from .user import UserRepository
 from .category import CategoryRepository
 from .product import ProductRepository
 from .order import OrderRepository
+from .unit_of_work import UnitOfWork
@@ -2,15 +2,20 @@
 # BASE REPOSITORY
 # ============================================
 
-from typing import TypeVar, Generic, Type
-from sqlalchemy import select
+from typing import TypeVar, Generic, Type, Iterable, Iterator
+from sqlalchemy import select, Select
 from sqlalchemy.orm import Session
 
 T = TypeVar("T")
 
 
 class BaseRepository(Generic[T]):
-    """Repository base con operaciones CRUD genéricas."""
+    """
+    Repository base con operaciones CRUD genéricas.
+    
+    Las escrituras no hacen commit: se confirman al terminar la
+    UnitOfWork del service.
+    """
     
     def __init__(self, db: Session, model: Type[T]):
         self.db = db
@@ -19,21 +24,54 @@ class BaseRepository(Generic[T]):
     def get_by_id(self, entity_id: int) -> T | None:
         return self.db.get(self.model, entity_id)
     
+    def get_many(self, entity_ids: Iterable[int]) -> dict[int, T]:
+        """Obtiene varias entidades por ID con una sola query IN."""
+        ids = set(entity_ids)
+        if not ids:
+            return {}
+        stmt = select(self.model).where(self.model.id.in_(ids))
+        return {entity.id: entity for entity in self.db.execute(stmt).scalars()}
+    
     def get_all(self, skip: int = 0, limit: int = 100) -> list[T]:
         stmt = select(self.model).offset(skip).limit(limit)
         return list(self.db.execute(stmt).scalars().all())
     
+    def stream(self, stmt: Select | None = None, batch_size: int = 500) -> Iterator[T]:
+        """
+        Itera entidades leyendo de la DB por lotes (yield_per).
+        
+        La sesión solo guarda referencias débiles a entidades sin
+        cambios: las ya procesadas se liberan y la memoria no crece con
+        el número de filas.
+        """
+        if stmt is None:
+            stmt = select(self.model).order_by(self.model.id)
+        result = self.db.execute(stmt.execution_options(yield_per=batch_size))
+        yield from result.scalars()
+    
     def add(self, entity: T) -> T:
         self.db.add(entity)
-        self.db.commit()
-        self.db.refresh(entity)
         return entity
     
+    def add_all(self, entities: list[T]) -> list[T]:
+        """Agrega varias entidades; se insertan en el mismo flush."""
+        self.db.add_all(entities)
+        return entities
+    
     def update(self, entity: T) -> T:
-        self.db.commit()
-        self.db.refresh(entity)
+        # La sesión ya rastrea los cambios de la entidad
         return entity
     
     def delete(self, entity: T) -> None:
         self.db.delete(entity)
-        self.db.commit()
+    
+    def refresh(self, entity: T) -> T:
+        """
+        Relee la entidad de la DB.
+        
+        Solo hace falta si hay valores generados por el servidor
+        (server_default, triggers); los default de Python ya están en
+        la entidad tras el flush.
+        """
+        self.db.refresh(entity)
+        return entity
@@ -2,8 +2,10 @@
 # ORDER REPOSITORY
 # ============================================
 
+from typing import Iterator
+
 from sqlalchemy import select
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from .base import BaseRepository
 from models.order import Order
@@ -40,3 +42,19 @@ class OrderRepository(BaseRepository[Order]):
             .where(Order.user_id == user_id)
         )
         return list(self.db.execute(stmt).unique().scalars().all())
+    
+    def stream_with_items(
+        self,
+        user_id: int | None = None,
+        batch_size: int = 500
+    ) -> Iterator[Order]:
+        """
+        Itera pedidos con sus items por lotes.
+        
+        joinedload no es compatible con yield_per; selectinload carga
+        los items de cada lote con una query IN.
+        """
+        stmt = select(Order).options(selectinload(Order.items)).order_by(Order.id)
+        if user_id is not None:
+            stmt = stmt.where(Order.user_id == user_id)
+        return self.stream(stmt, batch_size)
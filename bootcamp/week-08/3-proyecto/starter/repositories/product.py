@@ -2,7 +2,7 @@
 # PRODUCT REPOSITORY
 # ============================================
 
-from sqlalchemy import select
+from sqlalchemy import select, update, case
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
@@ -36,13 +36,74 @@ class ProductRepository(BaseRepository[Product]):
         stmt = select(Product).where(Product.is_active == True)
         return list(self.db.execute(stmt).scalars().all())
     
+    def decrement_stock(self, quantities: dict[int, int]) -> bool:
+        """
+        Descuenta stock de varios productos con un único UPDATE.
+        
+        La condición ``stock >= cantidad`` la evalúa la DB al actualizar
+        cada fila, así dos pedidos concurrentes no pueden vender la misma
+        unidad. Si algún producto no tiene stock suficiente se devuelve
+        lo ya descontado y no cambia nada: la transacción sigue abierta y
+        la UnitOfWork decide (el service relee y reintenta).
+        
+        No usa un SAVEPOINT: con pysqlite un SAVEPOINT abre la transacción
+        si no había una, y su RELEASE haría commit antes que la UnitOfWork.
+        
+        Returns:
+            True si se descontó el stock de todos los productos
+        """
+        if not quantities:
+            return True
+        quantity = case(quantities, value=Product.id)
+        stmt = (
+            update(Product)
+            .where(Product.id.in_(list(quantities)), Product.stock >= quantity)
+            .values(stock=Product.stock - quantity)
+            .returning(Product.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated = self.db.scalars(stmt).all()
+        if len(updated) != len(quantities):
+            # Las filas actualizadas siguen bloqueadas por esta transacción
+            self.increment_stock({product_id: quantities[product_id] for product_id in updated})
+            # También las que no pasaron el guard: el reintento debe ver
+            # el stock actual y no el que quedó en la sesión
+            self._expire_stock(quantities)
+            return False
+        self._expire_stock(quantities)
+        return True
+    
+    def increment_stock(self, quantities: dict[int, int]) -> None:
+        """Devuelve stock a varios productos con un único UPDATE."""
+        if not quantities:
+            return
+        quantity = case(quantities, value=Product.id)
+        stmt = (
+            update(Product)
+            .where(Product.id.in_(list(quantities)))
+            .values(stock=Product.stock + quantity)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.execute(stmt)
+        self._expire_stock(quantities)
+    
+    def _expire_stock(self, product_ids) -> None:
+        """Los Product ya cargados en la sesión tienen el stock anterior."""
+        ids = set(product_ids)
+        for entity in list(self.db.identity_map.values()):
+            if isinstance(entity, Product) and entity.id in ids:
+                self.db.expire(entity, ["stock"])
+    
     def add(self, product: Product) -> Product:
-        """Agrega producto con manejo de SKU duplicado."""
+        """
+        Agrega producto con manejo de SKU duplicado.
+        
+        Hace flush para detectar el SKU duplicado aquí; el rollback lo
+        hace la UnitOfWork al propagarse la excepción.
+        """
+        self.db.add(product)
         try:
-            self.db.add(product)
-            self.db.commit()
-            self.db.refresh(product)
-            return product
+            self.db.flush()
         except IntegrityError:
-            self.db.rollback()
             raise ProductAlreadyExistsError(product.sku)
+        return product
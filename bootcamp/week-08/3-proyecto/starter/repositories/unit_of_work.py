@@ -0,0 +1,49 @@
+# ============================================
+# UNIT OF WORK
+# ============================================
+
+from sqlalchemy.orm import Session
+
+
+class UnitOfWork:
+    """
+    Transacción de una operación de servicio.
+    
+    Los repositories solo registran cambios en la sesión; la UnitOfWork
+    hace un único flush + commit al salir del bloque, o rollback si se
+    lanzó una excepción. Un bloque anidado (un service que llama a
+    otro) se une a la transacción del bloque externo.
+    
+    Uso en un service:
+        with self.uow:
+            product.stock -= 1
+            self.order_repo.add(order)
+        # commit hecho: order.id ya está asignado
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+        self._depth = 0
+    
+    def __enter__(self) -> "UnitOfWork":
+        self._depth += 1
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self._depth -= 1
+        if self._depth == 0:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        return False
+    
+    def flush(self) -> None:
+        """Envía los cambios pendientes (p. ej. para obtener IDs)."""
+        self.db.flush()
+    
+    def commit(self) -> None:
+        self.db.commit()
+    
+    def rollback(self) -> None:
+        self.db.rollback()
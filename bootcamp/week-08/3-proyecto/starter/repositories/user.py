@@ -30,13 +30,12 @@ class UserRepository(BaseRepository[User]):
         """
         Agrega usuario con manejo de duplicados.
         
-        TODO: Capturar IntegrityError y lanzar UserAlreadyExistsError
+        Hace flush para detectar el email duplicado aquí; el rollback lo
+        hace la UnitOfWork al propagarse la excepción.
         """
+        self.db.add(user)
         try:
-            self.db.add(user)
-            self.db.commit()
-            self.db.refresh(user)
-            return user
+            self.db.flush()
         except IntegrityError:
-            self.db.rollback()
             raise UserAlreadyExistsError(user.email)
+        return user
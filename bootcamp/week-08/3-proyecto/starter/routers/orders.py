@@ -2,15 +2,37 @@
 # ORDERS ROUTER
 # ============================================
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 
-from schemas.order import OrderCreate, OrderResponse, OrderStatusUpdate
+from schemas.order import OrderCreate, OrderBatchCreate, OrderResponse, OrderStatusUpdate
 from services.order import OrderService
+from mappers.order import OrderMapper
 from dependencies import get_order_service
+from streaming import ExportFormat, export_response
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
 
+@router.get("/export")
+def export_orders(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    user_id: int | None = None,
+    service: OrderService = Depends(get_order_service)
+):
+    """
+    Exporta pedidos (opcionalmente de un usuario) en NDJSON o CSV.
+    
+    NDJSON: un pedido por línea con sus items.
+    CSV: una fila por item con los datos del pedido.
+    """
+    return export_response(
+        service.iter_export(user_id, flat=export_format == ExportFormat.CSV),
+        export_format,
+        filename="orders",
+        fieldnames=OrderMapper.CSV_FIELDS
+    )
+
+
 @router.get("/{order_id}", response_model=OrderResponse)
 def get_order(
     order_id: int,
@@ -48,6 +70,23 @@ def create_order(
     return service.create(data)
 
 
+@router.post(
+    "/batch",
+    response_model=list[OrderResponse],
+    status_code=status.HTTP_201_CREATED
+)
+def create_orders_batch(
+    data: OrderBatchCreate,
+    service: OrderService = Depends(get_order_service)
+):
+    """
+    Crea varios pedidos en una transacción.
+    
+    Si un pedido falla (usuario, producto o stock) no se crea ninguno.
+    """
+    return service.create_batch(data.orders)
+
+
 @router.patch("/{order_id}/status", response_model=OrderResponse)
 def update_order_status(
     order_id: int,
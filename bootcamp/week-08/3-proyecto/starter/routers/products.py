@@ -2,11 +2,12 @@
 # PRODUCTS ROUTER
 # ============================================
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 
 from schemas.product import ProductCreate, ProductUpdate, ProductResponse
 from services.product import ProductService
 from dependencies import get_product_service
+from streaming import ExportFormat, export_response
 
 router = APIRouter(prefix="/products", tags=["products"])
 
@@ -17,6 +18,24 @@ def list_products(service: ProductService = Depends(get_product_service)):
     return service.get_all()
 
 
+@router.get("/export")
+def export_products(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    service: ProductService = Depends(get_product_service)
+):
+    """
+    Exporta todos los productos en NDJSON o CSV.
+    
+    Se envía en streaming: la memoria no depende del número de productos.
+    """
+    return export_response(
+        service.iter_export(),
+        export_format,
+        filename="products",
+        fieldnames=list(ProductResponse.model_fields)
+    )
+
+
 @router.get("/{product_id}", response_model=ProductResponse)
 def get_product(
     product_id: int,
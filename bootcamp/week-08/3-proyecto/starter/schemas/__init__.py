@@ -2,4 +2,4 @@
 from .user import UserCreate, UserResponse
 from .category import CategoryCreate, CategoryUpdate, CategoryResponse
 from .product import ProductCreate, ProductUpdate, ProductResponse
-from .order import OrderCreate, OrderResponse, OrderItemCreate, OrderItemResponse
+from .order import OrderCreate, OrderBatchCreate, OrderResponse, OrderItemCreate, OrderItemResponse
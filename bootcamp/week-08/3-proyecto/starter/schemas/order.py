@@ -28,6 +28,11 @@ class OrderCreate(BaseModel):
     shipping_address: str = Field(..., min_length=10)
 
 
+class OrderBatchCreate(BaseModel):
+    """DTO para crear varios pedidos en una sola request."""
+    orders: list[OrderCreate] = Field(..., min_length=1, max_length=100)
+
+
 class OrderItemResponse(BaseModel):
     """DTO de respuesta para item de pedido."""
     model_config = ConfigDict(from_attributes=True)
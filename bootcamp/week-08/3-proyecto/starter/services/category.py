@@ -5,14 +5,16 @@
 from models.category import Category
 from schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
 from repositories.category import CategoryRepository
+from repositories.unit_of_work import UnitOfWork
 from exceptions.category import CategoryNotFoundError, CategoryHasProductsError
 
 
 class CategoryService:
     """Service para lógica de negocio de Category."""
     
-    def __init__(self, repo: CategoryRepository):
+    def __init__(self, repo: CategoryRepository, uow: UnitOfWork):
         self.repo = repo
+        self.uow = uow
     
     def get_all(self) -> list[CategoryResponse]:
         """Lista todas las categorías."""
@@ -36,7 +38,8 @@ class CategoryService:
             name=data.name,
             description=data.description
         )
-        saved = self.repo.add(entity)
+        with self.uow:
+            saved = self.repo.add(entity)
         return CategoryResponse.model_validate(saved)
     
     def update(self, category_id: int, data: CategoryUpdate) -> CategoryResponse:
@@ -45,15 +48,16 @@ class CategoryService:
         
         TODO: Aplicar solo campos enviados (exclude_unset)
         """
-        entity = self.repo.get_by_id(category_id)
-        if not entity:
-            raise CategoryNotFoundError(category_id)
-        
-        update_data = data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(entity, field, value)
-        
-        saved = self.repo.update(entity)
+        with self.uow:
+            entity = self.repo.get_by_id(category_id)
+            if not entity:
+                raise CategoryNotFoundError(category_id)
+            
+            update_data = data.model_dump(exclude_unset=True)
+            for field, value in update_data.items():
+                setattr(entity, field, value)
+            
+            saved = self.repo.update(entity)
         return CategoryResponse.model_validate(saved)
     
     def delete(self, category_id: int) -> None:
@@ -62,13 +66,14 @@ class CategoryService:
         
         TODO: Validar que no tenga productos antes de eliminar
         """
-        entity = self.repo.get_by_id(category_id)
-        if not entity:
-            raise CategoryNotFoundError(category_id)
-        
-        # Validar que no tenga productos
-        product_count = self.repo.count_products(category_id)
-        if product_count > 0:
-            raise CategoryHasProductsError(category_id, product_count)
-        
-        self.repo.delete(entity)
+        with self.uow:
+            entity = self.repo.get_by_id(category_id)
+            if not entity:
+                raise CategoryNotFoundError(category_id)
+            
+            # Validar que no tenga productos
+            product_count = self.repo.count_products(category_id)
+            if product_count > 0:
+                raise CategoryHasProductsError(category_id, product_count)
+            
+            self.repo.delete(entity)
@@ -3,20 +3,30 @@
 # ============================================
 
 from datetime import datetime
+from typing import Iterator
 
 from config import get_settings
 from models.order import Order, OrderItem, OrderStatus
+from models.product import Product
 from schemas.order import OrderCreate, OrderResponse
 from repositories.order import OrderRepository
 from repositories.user import UserRepository
 from repositories.product import ProductRepository
+from repositories.unit_of_work import UnitOfWork
 from mappers.order import OrderMapper
 from exceptions.user import UserNotFoundError
-from exceptions.product import ProductNotFoundError, InsufficientStockError
+from exceptions.product import (
+    ProductNotFoundError,
+    InsufficientStockError,
+    StockConflictError
+)
 from exceptions.order import OrderNotFoundError, OrderCannotBeCancelledError
 
 settings = get_settings()
 
+# Reintentos si el stock cambia entre la lectura y el UPDATE
+STOCK_RESERVE_ATTEMPTS = 3
+
 
 class OrderService:
     """
@@ -29,11 +39,13 @@ class OrderService:
         self,
         order_repo: OrderRepository,
         user_repo: UserRepository,
-        product_repo: ProductRepository
+        product_repo: ProductRepository,
+        uow: UnitOfWork
     ):
         self.order_repo = order_repo
         self.user_repo = user_repo
         self.product_repo = product_repo
+        self.uow = uow
     
     def get_by_id(self, order_id: int) -> OrderResponse:
         """Obtiene pedido por ID."""
@@ -55,40 +67,81 @@ class OrderService:
         entities = self.order_repo.get_by_user(user_id)
         return OrderMapper.to_response_list(entities)
     
-    def create(self, data: OrderCreate) -> OrderResponse:
+    def iter_export(self, user_id: int | None = None, flat: bool = False) -> Iterator[dict]:
         """
-        Crea pedido completo.
+        Pedidos para exportación, uno a uno desde la DB.
         
-        TODO: Implementar flujo completo:
-        1. Validar usuario
-        2. Validar productos y stock
-        3. Crear OrderItems
-        4. Calcular totales
-        5. Reducir stock
-        6. Guardar todo
+        Args:
+            user_id: Solo pedidos de este usuario
+            flat: Una fila por item (CSV) en lugar de pedidos anidados
         """
-        # 1. Validar usuario
-        user = self.user_repo.get_by_id(data.user_id)
-        if not user:
-            raise UserNotFoundError(data.user_id)
+        # Se valida antes de devolver el generador: una vez empezado el
+        # streaming ya no se puede responder 404
+        if user_id is not None and not self.user_repo.get_by_id(user_id):
+            raise UserNotFoundError(user_id)
+        return self._export_rows(user_id, flat)
+    
+    def _export_rows(self, user_id: int | None, flat: bool) -> Iterator[dict]:
+        for entity in self.order_repo.stream_with_items(user_id):
+            if flat:
+                yield from OrderMapper.to_csv_rows(entity)
+            else:
+                yield OrderMapper.to_response(entity).model_dump(mode="json")
+    
+    def create(self, data: OrderCreate) -> OrderResponse:
+        """Crea pedido completo (ver create_batch)."""
+        return self.create_batch([data])[0]
+    
+    def create_batch(self, orders_data: list[OrderCreate]) -> list[OrderResponse]:
+        """
+        Crea varios pedidos en una transacción: se crean todos o ninguno.
         
-        # 2 y 3. Validar productos, stock y crear items
+        El número de queries no depende de pedidos ni de líneas:
+        1. Usuarios: una query IN
+        2. Productos de todos los pedidos: una query IN
+        3. Stock: un UPDATE con guarda (stock >= cantidad) para todos
+        4. Un INSERT multi-fila de pedidos y otro de items (insertmanyvalues
+           con columna centinela, ver models.order; en páginas de 1000
+           filas) y un solo commit (UnitOfWork)
+        """
+        with self.uow:
+            # 1. Validar usuarios
+            users = self.user_repo.get_many(data.user_id for data in orders_data)
+            for data in orders_data:
+                if data.user_id not in users:
+                    raise UserNotFoundError(data.user_id)
+            
+            # 2. Validar productos y crear pedidos con sus items
+            products = self.product_repo.get_many(
+                item.product_id for data in orders_data for item in data.items
+            )
+            orders: list[Order] = []
+            # Cantidad total por producto (un producto puede repetirse)
+            requested: dict[int, int] = {}
+            for data in orders_data:
+                orders.append(self._build_order(data, products))
+                for item_data in data.items:
+                    requested[item_data.product_id] = (
+                        requested.get(item_data.product_id, 0) + item_data.quantity
+                    )
+            
+            # 3. Reducir stock
+            self._reserve_stock(requested, products)
+            
+            # 4. Guardar
+            self.order_repo.add_all(orders)
+        return OrderMapper.to_response_list(orders)
+    
+    def _build_order(self, data: OrderCreate, products: dict[int, Product]) -> Order:
+        """Crea el Order con sus items y totales."""
         order_items: list[OrderItem] = []
-        products_to_update: list[tuple] = []
         subtotal = 0.0
         
         for item_data in data.items:
-            product = self.product_repo.get_by_id(item_data.product_id)
+            product = products.get(item_data.product_id)
             if not product:
                 raise ProductNotFoundError(item_data.product_id)
             
-            if product.stock < item_data.quantity:
-                raise InsufficientStockError(
-                    product_id=product.id,
-                    requested=item_data.quantity,
-                    available=product.stock
-                )
-            
             item = OrderItem(
                 product_id=product.id,
                 product_name=product.name,
@@ -98,9 +151,7 @@ class OrderService:
             )
             order_items.append(item)
             subtotal += item.subtotal
-            products_to_update.append((product, item_data.quantity))
         
-        # 4. Calcular totales
         tax = round(subtotal * settings.tax_rate, 2)
         shipping = (
             0.0 if subtotal >= settings.free_shipping_threshold
@@ -108,8 +159,7 @@ class OrderService:
         )
         total = round(subtotal + tax + shipping, 2)
         
-        # 5. Crear Order
-        order = Order(
+        return Order(
             user_id=data.user_id,
             status=OrderStatus.PENDING,
             subtotal=subtotal,
@@ -120,14 +170,32 @@ class OrderService:
             created_at=datetime.utcnow(),
             items=order_items
         )
+    
+    def _reserve_stock(self, requested: dict[int, int], products: dict[int, Product]) -> None:
+        """
+        Descuenta el stock pedido o lanza InsufficientStockError.
         
-        # 6. Reducir stock
-        for product, quantity in products_to_update:
-            product.stock -= quantity
-        
-        # 7. Guardar
-        saved = self.order_repo.add(order)
-        return OrderMapper.to_response(saved)
+        La comprobación previa da un error claro sin tocar la DB; el
+        UPDATE con guarda es el que evita vender de más si otro pedido
+        se lleva el stock entre la lectura y la escritura.
+        """
+        for _ in range(STOCK_RESERVE_ATTEMPTS):
+            for product_id, quantity in requested.items():
+                product = products.get(product_id)
+                if not product:
+                    raise ProductNotFoundError(product_id)
+                available = product.stock
+                if available < quantity:
+                    raise InsufficientStockError(
+                        product_id=product_id,
+                        requested=quantity,
+                        available=available
+                    )
+            if self.product_repo.decrement_stock(requested):
+                return
+            # El stock cambió: releer y volver a comprobar
+            products = self.product_repo.get_many(requested)
+        raise StockConflictError()
     
     def update_status(self, order_id: int, new_status: str) -> OrderResponse:
         """
@@ -135,12 +203,13 @@ class OrderService:
         
         TODO: Validar transiciones de estado válidas
         """
-        order = self.order_repo.get_by_id_with_items(order_id)
-        if not order:
-            raise OrderNotFoundError(order_id)
-        
-        order.status = new_status
-        saved = self.order_repo.update(order)
+        with self.uow:
+            order = self.order_repo.get_by_id_with_items(order_id)
+            if not order:
+                raise OrderNotFoundError(order_id)
+            
+            order.status = new_status
+            saved = self.order_repo.update(order)
         return OrderMapper.to_response(saved)
     
     def cancel(self, order_id: int) -> OrderResponse:
@@ -150,20 +219,21 @@ class OrderService:
         TODO: Solo permitir cancelar pedidos PENDING o CONFIRMED
         TODO: Restaurar stock de productos
         """
-        order = self.order_repo.get_by_id_with_items(order_id)
-        if not order:
-            raise OrderNotFoundError(order_id)
-        
-        # Solo se pueden cancelar pedidos pending o confirmed
-        if order.status not in [OrderStatus.PENDING, OrderStatus.CONFIRMED]:
-            raise OrderCannotBeCancelledError(order_id, order.status)
-        
-        # Restaurar stock
-        for item in order.items:
-            product = self.product_repo.get_by_id(item.product_id)
-            if product:
-                product.stock += item.quantity
-        
-        order.status = OrderStatus.CANCELLED
-        saved = self.order_repo.update(order)
+        with self.uow:
+            order = self.order_repo.get_by_id_with_items(order_id)
+            if not order:
+                raise OrderNotFoundError(order_id)
+            
+            # Solo se pueden cancelar pedidos pending o confirmed
+            if order.status not in [OrderStatus.PENDING, OrderStatus.CONFIRMED]:
+                raise OrderCannotBeCancelledError(order_id, order.status)
+            
+            # Restaurar stock (un solo UPDATE para todos los productos)
+            restored: dict[int, int] = {}
+            for item in order.items:
+                restored[item.product_id] = restored.get(item.product_id, 0) + item.quantity
+            self.product_repo.increment_stock(restored)
+            
+            order.status = OrderStatus.CANCELLED
+            saved = self.order_repo.update(order)
         return OrderMapper.to_response(saved)
@@ -2,10 +2,13 @@
 # PRODUCT SERVICE
 # ============================================
 
+from typing import Iterator
+
 from models.product import Product
 from schemas.product import ProductCreate, ProductUpdate, ProductResponse
 from repositories.product import ProductRepository
 from repositories.category import CategoryRepository
+from repositories.unit_of_work import UnitOfWork
 from mappers.product import ProductMapper
 from exceptions.product import ProductNotFoundError
 from exceptions.category import CategoryNotFoundError
@@ -17,16 +20,23 @@ class ProductService:
     def __init__(
         self,
         product_repo: ProductRepository,
-        category_repo: CategoryRepository
+        category_repo: CategoryRepository,
+        uow: UnitOfWork
     ):
         self.product_repo = product_repo
         self.category_repo = category_repo
+        self.uow = uow
     
     def get_all(self) -> list[ProductResponse]:
         """Lista todos los productos."""
         entities = self.product_repo.get_all()
         return ProductMapper.to_response_list(entities)
     
+    def iter_export(self) -> Iterator[dict]:
+        """Productos para exportación, uno a uno desde la DB."""
+        for entity in self.product_repo.stream():
+            yield ProductMapper.to_response(entity).model_dump(mode="json")
+    
     def get_by_id(self, product_id: int) -> ProductResponse:
         """
         Obtiene producto por ID.
@@ -57,13 +67,14 @@ class ProductService:
         
         TODO: Validar que categoría exista
         """
-        # Validar categoría
-        category = self.category_repo.get_by_id(data.category_id)
-        if not category:
-            raise CategoryNotFoundError(data.category_id)
-        
-        entity = ProductMapper.to_entity(data)
-        saved = self.product_repo.add(entity)
+        with self.uow:
+            # Validar categoría
+            category = self.category_repo.get_by_id(data.category_id)
+            if not category:
+                raise CategoryNotFoundError(data.category_id)
+            
+            entity = ProductMapper.to_entity(data)
+            saved = self.product_repo.add(entity)
         return ProductMapper.to_response(saved)
     
     def update(self, product_id: int, data: ProductUpdate) -> ProductResponse:
@@ -72,24 +83,26 @@ class ProductService:
         
         TODO: Si cambia category_id, validar que exista
         """
-        entity = self.product_repo.get_by_id(product_id)
-        if not entity:
-            raise ProductNotFoundError(product_id)
-        
-        # Si cambia categoría, validar
-        if data.category_id is not None:
-            category = self.category_repo.get_by_id(data.category_id)
-            if not category:
-                raise CategoryNotFoundError(data.category_id)
-        
-        updated = ProductMapper.update_entity(entity, data)
-        saved = self.product_repo.update(updated)
+        with self.uow:
+            entity = self.product_repo.get_by_id(product_id)
+            if not entity:
+                raise ProductNotFoundError(product_id)
+            
+            # Si cambia categoría, validar
+            if data.category_id is not None:
+                category = self.category_repo.get_by_id(data.category_id)
+                if not category:
+                    raise CategoryNotFoundError(data.category_id)
+            
+            updated = ProductMapper.update_entity(entity, data)
+            saved = self.product_repo.update(updated)
         return ProductMapper.to_response(saved)
     
     def delete(self, product_id: int) -> None:
         """Elimina producto."""
-        entity = self.product_repo.get_by_id(product_id)
-        if not entity:
-            raise ProductNotFoundError(product_id)
-        
-        self.product_repo.delete(entity)
+        with self.uow:
+            entity = self.product_repo.get_by_id(product_id)
+            if not entity:
+                raise ProductNotFoundError(product_id)
+            
+            self.product_repo.delete(entity)
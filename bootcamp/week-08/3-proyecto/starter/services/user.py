@@ -5,6 +5,7 @@
 from models.user import User
 from schemas.user import UserCreate, UserResponse
 from repositories.user import UserRepository
+from repositories.unit_of_work import UnitOfWork
 from mappers.user import UserMapper
 from exceptions.user import UserNotFoundError
 
@@ -12,8 +13,9 @@ from exceptions.user import UserNotFoundError
 class UserService:
     """Service para lógica de negocio de User."""
     
-    def __init__(self, repo: UserRepository):
+    def __init__(self, repo: UserRepository, uow: UnitOfWork):
         self.repo = repo
+        self.uow = uow
     
     def get_all(self) -> list[UserResponse]:
         """Lista todos los usuarios."""
@@ -42,5 +44,6 @@ class UserService:
         password_hash = f"hashed_{data.password}"
         
         entity = UserMapper.to_entity(data, password_hash)
-        saved = self.repo.add(entity)
+        with self.uow:
+            saved = self.repo.add(entity)
         return UserMapper.to_response(saved)
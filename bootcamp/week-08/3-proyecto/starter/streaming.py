@@ -0,0 +1,102 @@
+# ============================================
+# STREAMING EXPORT (NDJSON / CSV)
+# ============================================
+#
+# Exporta listados grandes sin cargarlos enteros en memoria:
+# el repository lee con yield_per (cursor en el servidor, lotes de
+# filas) y aquí se agrupan las filas en chunks de bytes que
+# StreamingResponse envía según se generan.
+#
+# La sesión de DB sigue abierta mientras se envía el body: FastAPI
+# cierra las dependencias con yield después de la respuesta.
+
+import csv
+import io
+import json
+from enum import Enum
+from typing import Any, Iterable, Iterator
+
+from fastapi.responses import StreamingResponse
+
+# Filas por chunk: menos llamadas a send sin acumular demasiado
+ROWS_PER_CHUNK = 500
+
+
+class ExportFormat(str, Enum):
+    """Formatos de exportación."""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def iter_ndjson(
+    rows: Iterable[dict[str, Any]],
+    rows_per_chunk: int = ROWS_PER_CHUNK
+) -> Iterator[bytes]:
+    """Un objeto JSON por línea, en chunks de ``rows_per_chunk`` filas."""
+    lines: list[str] = []
+    for row in rows:
+        lines.append(json.dumps(row, default=str, ensure_ascii=False))
+        if len(lines) >= rows_per_chunk:
+            yield ("\n".join(lines) + "\n").encode()
+            lines.clear()
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def iter_csv(
+    rows: Iterable[dict[str, Any]],
+    fieldnames: list[str],
+    rows_per_chunk: int = ROWS_PER_CHUNK
+) -> Iterator[bytes]:
+    """CSV con cabecera, en chunks de ``rows_per_chunk`` filas."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    # Incluye la cabecera si no hubo filas
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def export_response(
+    rows: Iterable[dict[str, Any]],
+    export_format: ExportFormat,
+    filename: str,
+    fieldnames: list[str]
+) -> StreamingResponse:
+    """
+    StreamingResponse con las filas en el formato pedido.
+
+    Args:
+        rows: Iterador de dicts (se consume mientras se envía)
+        export_format: NDJSON o CSV
+        filename: Nombre sin extensión para Content-Disposition
+        fieldnames: Columnas del CSV (en NDJSON se ignoran)
+    """
+    if export_format == ExportFormat.CSV:
+        body = iter_csv(rows, fieldnames)
+    else:
+        body = iter_ndjson(rows)
+
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'
+        }
+    )
@@ -0,0 +1,188 @@
+"""
+Benchmark del envío por lotes de NotificationService.
+
+Compara, con senders y repositorio fake que simulan latencia de red:
+
+- antes: send_notification por cada notificación (save, send y save
+  en secuencia, una detrás de otra)
+- send_batch: agrupado por canal, send_batch por chunks con
+  concurrencia acotada por canal y dos escrituras por lote
+
+El sender se prueba de dos formas:
+
+- api batch: el proveedor acepta un lote por petición (una latencia
+  por llamada más un coste pequeño por notificación)
+- por item: send_batch llama a send para cada notificación (sin API
+  batch, solo se gana con la concurrencia entre chunks)
+
+Uso (desde la carpeta starter):
+    python -m benchmarks.bench_dispatch
+    python -m benchmarks.bench_dispatch --count 10000 --chunk-size 200
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from src.application.services.batch_dispatcher import DispatchConfig
+from src.application.services.notification_service import NotificationService
+from src.domain.entities.notification import Notification, NotificationChannel, NotificationStatus
+
+
+# ============================================
+# FAKES CON LATENCIA
+# ============================================
+
+class LatencySender:
+    """Sender fake: duerme lo que tardaría el proveedor."""
+
+    def __init__(
+        self,
+        channel: NotificationChannel,
+        latency: float,
+        per_item: float,
+        batch_api: bool,
+        failure_rate: float = 0.0,
+    ):
+        self._channel = channel
+        self._latency = latency
+        self._per_item = per_item
+        self._batch_api = batch_api
+        self._failure_rate = failure_rate
+
+    @property
+    def channel(self) -> NotificationChannel:
+        return self._channel
+
+    async def send(self, notification: Notification) -> bool:
+        await asyncio.sleep(self._latency)
+        return random.random() >= self._failure_rate
+
+    async def send_batch(self, notifications: list[Notification]) -> dict[str, bool]:
+        if not self._batch_api:
+            return {n.id: await self.send(n) for n in notifications}
+        await asyncio.sleep(self._latency + self._per_item * len(notifications))
+        return {n.id: random.random() >= self._failure_rate for n in notifications}
+
+
+class LatencyRepository:
+    """Repositorio en memoria con una latencia por escritura."""
+
+    def __init__(self, latency: float):
+        self._latency = latency
+        self._notifications: dict[str, Notification] = {}
+        self.writes = 0
+
+    async def save(self, notification: Notification) -> Notification:
+        self.writes += 1
+        await asyncio.sleep(self._latency)
+        self._notifications[notification.id] = notification
+        return notification
+
+    async def save_many(self, notifications: list[Notification]) -> list[Notification]:
+        self.writes += 1
+        await asyncio.sleep(self._latency)
+        self._notifications.update((n.id, n) for n in notifications)
+        return notifications
+
+    async def get_by_status(self, status: NotificationStatus) -> list[Notification]:
+        return [n for n in self._notifications.values() if n.status == status]
+
+
+# ============================================
+# ESCENARIOS
+# ============================================
+
+CHANNELS = [NotificationChannel.EMAIL, NotificationChannel.SMS, NotificationChannel.PUSH]
+
+
+def make_data(count: int) -> list[dict]:
+    return [
+        {
+            "recipient": f"user{i}",
+            "channel": CHANNELS[i % len(CHANNELS)].value,
+            "message": f"Mensaje {i}",
+        }
+        for i in range(count)
+    ]
+
+
+def make_service(
+    args: argparse.Namespace,
+    batch_api: bool,
+) -> tuple[NotificationService, LatencyRepository]:
+    senders = {
+        channel: LatencySender(
+            channel,
+            latency=args.send_latency_ms / 1000,
+            per_item=args.per_item_ms / 1000,
+            batch_api=batch_api,
+            failure_rate=args.failure_rate,
+        )
+        for channel in CHANNELS
+    }
+    repository = LatencyRepository(args.db_latency_ms / 1000)
+    config = DispatchConfig(chunk_size=args.chunk_size, max_concurrency=args.concurrency)
+    return NotificationService(senders, repository, config), repository
+
+
+async def run_before(service: NotificationService, data: list[dict]) -> list[Notification]:
+    """Flujo original de send_batch: send_notification una a una."""
+    return [
+        await service.send_notification(
+            recipient=item["recipient"],
+            channel=NotificationChannel(item["channel"]),
+            message=item["message"],
+        )
+        for item in data
+    ]
+
+
+async def measure(name: str, args: argparse.Namespace, batch_api: bool, before: bool) -> None:
+    service, repository = make_service(args, batch_api)
+    data = make_data(args.baseline_count if before else args.count)
+
+    start = time.perf_counter()
+    if before:
+        result = await run_before(service, data)
+    else:
+        result = await service.send_batch(data)
+    elapsed = time.perf_counter() - start
+
+    sent = sum(1 for n in result if n.status == NotificationStatus.SENT)
+    print(
+        f"{name:>22} | {len(data):>7} | {elapsed:>8.2f} | {len(data) / elapsed:>9.0f} | "
+        f"{repository.writes:>10} | {sent:>7}"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    random.seed(0)
+    print(
+        f"latencia envío {args.send_latency_ms} ms (+{args.per_item_ms} ms/item en api batch), "
+        f"escritura {args.db_latency_ms} ms, chunk {args.chunk_size}, "
+        f"concurrencia {args.concurrency}/canal, {len(CHANNELS)} canales"
+    )
+    print(
+        f"{'escenario':>22} | {'notifs':>7} | {'segundos':>8} | {'notifs/s':>9} | "
+        f"{'escrituras':>10} | {'enviadas':>7}"
+    )
+    print("-" * 79)
+    await measure("antes (por item)", args, batch_api=False, before=True)
+    await measure("send_batch (por item)", args, batch_api=False, before=False)
+    await measure("send_batch (api batch)", args, batch_api=True, before=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de NotificationService.send_batch")
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--baseline-count", type=int, default=500,
+                        help="El flujo secuencial es lento: se mide con menos notificaciones")
+    parser.add_argument("--send-latency-ms", type=float, default=5)
+    parser.add_argument("--per-item-ms", type=float, default=0.05)
+    parser.add_argument("--db-latency-ms", type=float, default=1)
+    parser.add_argument("--chunk-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--failure-rate", type=float, default=0.01)
+    asyncio.run(main(parser.parse_args()))
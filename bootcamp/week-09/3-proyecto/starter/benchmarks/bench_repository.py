@@ -0,0 +1,141 @@
+"""
+Benchmark de InMemoryNotificationRepository con índices.
+
+Compara con un repositorio que solo tiene el diccionario por ID
+(el de src/tests/fakes): cada consulta por estado, canal o
+destinatario recorre todas las notificaciones y paginar por fecha
+obliga a ordenar el listado completo.
+
+Datos: COUNT notificaciones, 4 canales, COUNT/10 destinatarios y
+un 1% en FAILED.
+
+Uso (desde la carpeta starter):
+    python -m benchmarks.bench_repository
+    python -m benchmarks.bench_repository --count 100000
+"""
+
+import argparse
+import asyncio
+import gc
+import time
+from datetime import datetime, timedelta
+
+from src.domain.entities.notification import (
+    Notification,
+    NotificationChannel,
+    NotificationStatus,
+)
+from src.domain.ports.notification_repository import encode_cursor
+from src.infrastructure.persistence.in_memory_repository import InMemoryNotificationRepository
+from src.tests.fakes.fake_repository import FakeNotificationRepository
+
+
+CHANNELS = list(NotificationChannel)
+PAGE = 50
+
+
+def make_notifications(count: int) -> list[Notification]:
+    start = datetime(2026, 1, 1)
+    notifications = []
+    for i in range(count):
+        notification = Notification(
+            recipient=f"user{i % (count // 10)}@example.com",
+            channel=CHANNELS[i % len(CHANNELS)],
+            message="Hola",
+            id=f"{i:08d}",
+            created_at=start + timedelta(milliseconds=i),
+        )
+        if i % 100 == 0:
+            notification.mark_as_failed("timeout")
+        notifications.append(notification)
+    return notifications
+
+
+async def timed(func, repeat: int = 1) -> tuple[float, object]:
+    """Media en ms de ``repeat`` ejecuciones y el último resultado."""
+    gc.collect()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = await func()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+async def offset_page(repository: FakeNotificationRepository, offset: int) -> list[Notification]:
+    """Paginación sin índice: ordenar todo y cortar por offset."""
+    ordered = sorted(await repository.get_all(), key=lambda n: (n.created_at, n.id))
+    return ordered[offset:offset + PAGE]
+
+
+async def main(args: argparse.Namespace) -> None:
+    print(f"Creando {args.count:,} notificaciones...")
+    notifications = make_notifications(args.count)
+    scan = FakeNotificationRepository()
+    indexed = InMemoryNotificationRepository()
+
+    rows = []
+
+    ms_scan, _ = await timed(lambda: scan.save_many(notifications))
+    ms_indexed, _ = await timed(lambda: indexed.save_many(notifications))
+    rows.append(("save_many (todas)", ms_scan, ms_indexed))
+
+    for name, scan_call, indexed_call in [
+        (
+            "get_by_status(FAILED) 1%",
+            lambda: scan.get_by_status(NotificationStatus.FAILED),
+            lambda: indexed.get_by_status(NotificationStatus.FAILED),
+        ),
+        (
+            "get_by_channel(SMS) 25%",
+            lambda: scan.get_by_channel(NotificationChannel.SMS),
+            lambda: indexed.get_by_channel(NotificationChannel.SMS),
+        ),
+        (
+            "get_by_recipient",
+            lambda: scan.get_by_recipient("user42@example.com"),
+            lambda: indexed.get_by_recipient("user42@example.com"),
+        ),
+    ]:
+        ms_scan, expected = await timed(scan_call, args.repeat)
+        ms_indexed, result = await timed(indexed_call, args.repeat)
+        assert {n.id for n in result} == {n.id for n in expected}
+        rows.append((name, ms_scan, ms_indexed))
+
+    # Cambio de estado de 10.000 notificaciones (un lote de retry_failed)
+    batch = notifications[1:10_001]
+    for notification in batch:
+        notification.mark_as_sent()
+    ms_scan, _ = await timed(lambda: scan.save_many(batch))
+    ms_indexed, _ = await timed(lambda: indexed.save_many(batch))
+    rows.append(("save_many 10k (cambio estado)", ms_scan, ms_indexed))
+
+    # Paginación: primera página y la 1001
+    ms_scan, expected = await timed(lambda: offset_page(scan, 0))
+    ms_indexed, page = await timed(lambda: indexed.list_page(limit=PAGE))
+    assert [n.id for n in page.items] == [n.id for n in expected]
+    rows.append(("página 1", ms_scan, ms_indexed))
+
+    deep = 1000 * PAGE
+    if args.count > deep:
+        cursor = encode_cursor(notifications[deep - 1])
+        ms_scan, expected = await timed(lambda: offset_page(scan, deep))
+        ms_indexed, page = await timed(lambda: indexed.list_page(limit=PAGE, cursor=cursor))
+        assert [n.id for n in page.items] == [n.id for n in expected]
+        rows.append(("página 1001 (cursor)", ms_scan, ms_indexed))
+
+    failed = NotificationStatus.FAILED
+    ms_scan, expected = await timed(lambda: scan.list_page(limit=PAGE, status=failed))
+    ms_indexed, page = await timed(lambda: indexed.list_page(limit=PAGE, status=failed))
+    assert [n.id for n in page.items] == [n.id for n in expected.items]
+    rows.append(("página FAILED", ms_scan, ms_indexed))
+
+    print(f"{'operación':>30} | {'sin índices ms':>14} | {'con índices ms':>14} | {'x':>8}")
+    print("-" * 75)
+    for name, before, after in rows:
+        print(f"{name:>30} | {before:>14.3f} | {after:>14.3f} | {before / after:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark del repositorio en memoria")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
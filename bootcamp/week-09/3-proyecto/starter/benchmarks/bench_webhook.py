@@ -0,0 +1,106 @@
+"""
+Benchmark de WebhookNotificationSender contra un servidor local.
+
+Envía COUNT webhooks repartidos entre URLS receptores (todos en
+StubWebhookServer, 127.0.0.1) con la misma concurrencia por host:
+
+- antes: un AsyncClient por webhook (una conexión TCP por envío);
+  es tan lento que se mide con BASELINE_COUNT webhooks
+- pool: cliente compartido con keep-alive
+- pool + lotes: además, las URLs aceptan lotes y send_batch agrupa
+
+En una red real cada conexión nueva añade un RTT (y dos más con TLS),
+así que la diferencia es mayor que en localhost.
+
+Uso (desde la carpeta starter):
+    python -m benchmarks.bench_webhook
+    python -m benchmarks.bench_webhook --count 5000 --latency-ms 2
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from src.domain.entities.notification import Notification, NotificationChannel
+from src.infrastructure.adapters.webhook_adapter import WebhookNotificationSender, build_payload
+from src.tests.fakes.stub_webhook_server import StubWebhookServer
+
+
+async def send_naive(notifications: list[Notification], per_host: int) -> dict[str, bool]:
+    """Un cliente (y una conexión) nuevo por webhook."""
+    limit = asyncio.Semaphore(per_host)
+
+    async def one(notification: Notification) -> tuple[str, bool]:
+        async with limit:
+            async with httpx.AsyncClient() as client:
+                response = await client.post(
+                    notification.recipient, json=build_payload(notification)
+                )
+        return notification.id, response.is_success
+
+    return dict(await asyncio.gather(*(one(n) for n in notifications)))
+
+
+async def measure(name: str, server: StubWebhookServer, notifications, send) -> None:
+    server.reset()
+    start = time.perf_counter()
+    results = await send(notifications)
+    elapsed = time.perf_counter() - start
+    assert len(results) == len(notifications) and all(results.values())
+    print(
+        f"{name:>13} | {elapsed:>8.2f} | {server.connections:>9} | "
+        f"{server.connections / elapsed:>7.0f} | {server.requests:>9} | "
+        f"{len(notifications) / elapsed:>9.0f}"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    async with StubWebhookServer(latency=args.latency_ms / 1000) as server:
+        urls = [f"{server.url}/hooks/{i}" for i in range(args.urls)]
+        notifications = [
+            Notification(
+                recipient=urls[i % len(urls)],
+                channel=NotificationChannel.WEBHOOK,
+                message=f"Evento {i}",
+            )
+            for i in range(args.count)
+        ]
+
+        print(
+            f"{args.count} webhooks a {args.urls} URLs, latencia del receptor "
+            f"{args.latency_ms} ms, {args.per_host} peticiones/host, lotes de {args.batch_size}"
+        )
+        print(
+            f"{'escenario':>13} | {'segundos':>8} | {'conexiones':>9} | {'conn/s':>7} | "
+            f"{'peticiones':>9} | {'notifs/s':>9}"
+        )
+        print("-" * 70)
+
+        await measure(
+            "antes", server, notifications[:args.baseline_count],
+            lambda ns: send_naive(ns, args.per_host),
+        )
+
+        async with WebhookNotificationSender(max_connections_per_host=args.per_host) as pooled:
+            await measure("pool", server, notifications, pooled.send_batch)
+
+        async with WebhookNotificationSender(
+            max_connections_per_host=args.per_host,
+            batch_urls=urls,
+            batch_size=args.batch_size,
+        ) as batched:
+            await measure("pool + lotes", server, notifications, batched.send_batch)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark del sender de webhooks")
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--baseline-count", type=int, default=200,
+                        help="Webhooks del escenario sin pool (crear un cliente es caro)")
+    parser.add_argument("--urls", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=1)
+    parser.add_argument("--per-host", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=100)
+    asyncio.run(main(parser.parse_args()))
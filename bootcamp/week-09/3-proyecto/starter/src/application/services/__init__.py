@@ -1,3 +1,12 @@
 from src.application.services.notification_service import NotificationService
+from src.application.services.batch_dispatcher import BatchDispatcher, DispatchConfig
+from src.application.services.retry_policy import RetryPolicy
+from src.application.services.retry_worker import RetryWorker
 
-__all__ = ["NotificationService"]
+__all__ = [
+    "NotificationService",
+    "BatchDispatcher",
+    "DispatchConfig",
+    "RetryPolicy",
+    "RetryWorker",
+]
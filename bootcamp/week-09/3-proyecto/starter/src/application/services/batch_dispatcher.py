@@ -0,0 +1,134 @@
+"""
+BatchDispatcher - Envío concurrente de notificaciones por canal.
+
+Agrupa las notificaciones por canal, las parte en chunks y llama al
+``send_batch`` de cada sender. Cada canal tiene su propio semáforo:
+un proveedor lento no ocupa los huecos de los demás y nunca hay más
+de ``max_concurrency`` llamadas abiertas contra el mismo proveedor.
+"""
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from src.domain.entities.notification import Notification, NotificationChannel
+from src.domain.ports.notification_sender import NotificationSender
+
+
+REJECTED_MESSAGE = "El proveedor rechazó la notificación"
+
+
+@dataclass(frozen=True)
+class DispatchConfig:
+    """
+    Límites del envío por lotes.
+
+    Attributes:
+        chunk_size: Notificaciones por llamada a send_batch
+        max_concurrency: Llamadas simultáneas por canal
+        channel_concurrency: Límite propio de algunos canales
+            (ej: el proveedor de SMS admite menos conexiones)
+    """
+    chunk_size: int = 100
+    max_concurrency: int = 10
+    channel_concurrency: dict[NotificationChannel, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.chunk_size < 1:
+            raise ValueError("chunk_size debe ser >= 1")
+        limits = [self.max_concurrency, *self.channel_concurrency.values()]
+        if min(limits) < 1:
+            raise ValueError("La concurrencia por canal debe ser >= 1")
+
+    def concurrency_for(self, channel: NotificationChannel) -> int:
+        """Llamadas simultáneas permitidas para un canal."""
+        return self.channel_concurrency.get(channel, self.max_concurrency)
+
+
+def group_by_channel(
+    notifications: list[Notification],
+) -> dict[NotificationChannel, list[Notification]]:
+    """Agrupa las notificaciones por canal conservando el orden."""
+    groups: dict[NotificationChannel, list[Notification]] = defaultdict(list)
+    for notification in notifications:
+        groups[notification.channel].append(notification)
+    return dict(groups)
+
+
+class BatchDispatcher:
+    """
+    Envía lotes de notificaciones con concurrencia acotada por canal.
+
+    No persiste nada: marca cada notificación como SENT o FAILED y el
+    servicio guarda los cambios con una sola escritura.
+    """
+
+    def __init__(
+        self,
+        senders: dict[NotificationChannel, NotificationSender],
+        config: DispatchConfig | None = None,
+    ):
+        """
+        Inicializa el dispatcher.
+
+        Args:
+            senders: Diccionario de senders por canal
+            config: Tamaño de chunk y límites de concurrencia
+        """
+        self._senders = senders
+        self._config = config or DispatchConfig()
+        self._semaphores = {
+            channel: asyncio.Semaphore(self._config.concurrency_for(channel))
+            for channel in senders
+        }
+
+    @property
+    def config(self) -> DispatchConfig:
+        """Configuración en uso."""
+        return self._config
+
+    async def dispatch(self, notifications: list[Notification]) -> None:
+        """
+        Envía las notificaciones y actualiza su estado.
+
+        Los chunks de todos los canales se lanzan a la vez; los
+        semáforos deciden cuántos llegan al proveedor. Un canal sin
+        sender marca sus notificaciones como FAILED.
+
+        Args:
+            notifications: Notificaciones a enviar (se modifican)
+        """
+        size = self._config.chunk_size
+        tasks = []
+        for channel, group in group_by_channel(notifications).items():
+            sender = self._senders.get(channel)
+            if sender is None:
+                for notification in group:
+                    notification.mark_as_failed(f"Canal no soportado: {channel.value}")
+                continue
+            for start in range(0, len(group), size):
+                tasks.append(self._send_chunk(channel, sender, group[start:start + size]))
+
+        await asyncio.gather(*tasks)
+
+    async def _send_chunk(
+        self,
+        channel: NotificationChannel,
+        sender: NotificationSender,
+        chunk: list[Notification],
+    ) -> None:
+        """Una llamada a send_batch dentro del semáforo del canal."""
+        async with self._semaphores[channel]:
+            try:
+                results = await sender.send_batch(chunk)
+            except Exception as exc:
+                # Un fallo del proveedor no cancela los demás chunks
+                error = str(exc) or type(exc).__name__
+                for notification in chunk:
+                    notification.mark_as_failed(error)
+                return
+
+        for notification in chunk:
+            if results.get(notification.id):
+                notification.mark_as_sent()
+            else:
+                notification.mark_as_failed(REJECTED_MESSAGE)
@@ -3,13 +3,22 @@ NotificationService - Servicio de aplicación.
 
 Coordina el envío de notificaciones usando los ports definidos.
 """
+import time
+
 from src.domain.entities.notification import (
     Notification,
     NotificationChannel,
     NotificationStatus,
 )
 from src.domain.ports.notification_sender import NotificationSender
-from src.domain.ports.notification_repository import NotificationRepository
+from src.domain.ports.notification_repository import NotificationPage, NotificationRepository
+from src.domain.ports.retry_queue import RetryEntry, RetryQueue
+from src.application.services.batch_dispatcher import (
+    REJECTED_MESSAGE,
+    BatchDispatcher,
+    DispatchConfig,
+)
+from src.application.services.retry_policy import RetryPolicy
 
 
 class NotificationService:
@@ -21,13 +30,23 @@ class NotificationService:
     - Coordina el flujo de envío de notificaciones
     - Es fácil de testear con fakes/mocks
     
-    TODO: Implementa los métodos marcados con TODO
+    Los envíos múltiples (send_batch, retry_failed) pasan por un
+    BatchDispatcher: se agrupan por canal, se envían con send_batch
+    en paralelo (acotado por canal) y el estado se guarda con una
+    escritura por lote.
+    
+    Con una RetryQueue, cada fallo se programa con backoff
+    exponencial (RetryPolicy) y un RetryWorker lo reintenta cuando
+    vence; al agotar los intentos pasa a DEAD_LETTER.
     """
     
     def __init__(
         self,
         senders: dict[NotificationChannel, NotificationSender],
         repository: NotificationRepository,
+        dispatch_config: DispatchConfig | None = None,
+        retry_queue: RetryQueue | None = None,
+        retry_policy: RetryPolicy | None = None,
     ):
         """
         Inicializa el servicio con sus dependencias.
@@ -35,9 +54,25 @@ class NotificationService:
         Args:
             senders: Diccionario de senders por canal
             repository: Repositorio para persistencia
+            dispatch_config: Límites del envío por lotes (opcional)
+            retry_queue: Cola de reintentos (opcional)
+            retry_policy: Backoff y máximo de intentos (opcional)
         """
         self._senders = senders
         self._repository = repository
+        self._dispatcher = BatchDispatcher(senders, dispatch_config)
+        self._retry_queue = retry_queue
+        self._retry_policy = retry_policy or RetryPolicy()
+    
+    @property
+    def senders(self) -> dict[NotificationChannel, NotificationSender]:
+        """Senders configurados por canal."""
+        return self._senders
+    
+    @property
+    def retry_queue(self) -> RetryQueue | None:
+        """Cola de reintentos configurada."""
+        return self._retry_queue
     
     async def send_notification(
         self,
@@ -62,18 +97,24 @@ class NotificationService:
             
         Raises:
             ValueError: Si el canal no está soportado
-            
-        TODO: Implementa este método:
-        1. Crear la entidad Notification
-        2. Guardar en el repositorio con estado PENDING
-        3. Obtener el sender correspondiente al canal
-        4. Enviar la notificación
-        5. Actualizar el estado según resultado (SENT o FAILED)
-        6. Guardar el estado actualizado
-        7. Retornar la notificación
-        """
-        # TODO: Implementar
-        pass
+        """
+        notification = self._create(recipient, channel, message, subject, metadata)
+        await self._repository.save(notification)
+        
+        sender = self._senders[notification.channel]
+        try:
+            sent = await sender.send(notification)
+        except Exception as exc:
+            notification.mark_as_failed(str(exc) or type(exc).__name__)
+        else:
+            if sent:
+                notification.mark_as_sent()
+            else:
+                notification.mark_as_failed(REJECTED_MESSAGE)
+        
+        if not notification.was_sent:
+            await self._schedule_retries([notification], {}, time.time())
+        return await self._repository.save(notification)
     
     async def send_batch(
         self,
@@ -82,16 +123,37 @@ class NotificationService:
         """
         Envía múltiples notificaciones.
         
+        Se validan todos los canales antes de guardar nada. Después:
+        una escritura con todas en PENDING, envío por canal con
+        BatchDispatcher y otra escritura con los estados finales.
+        
         Args:
             notifications_data: Lista de dicts con datos de cada notificación
             
         Returns:
-            Lista de notificaciones con sus estados
+            Lista de notificaciones con sus estados, en el orden recibido
             
-        TODO: Implementa este método usando send_notification para cada una.
+        Raises:
+            ValueError: Si algún canal no está soportado
         """
-        # TODO: Implementar
-        pass
+        notifications = [
+            self._create(
+                recipient=data["recipient"],
+                channel=data["channel"],
+                message=data["message"],
+                subject=data.get("subject"),
+                metadata=data.get("metadata"),
+            )
+            for data in notifications_data
+        ]
+        if not notifications:
+            return []
+        
+        await self._repository.save_many(notifications)
+        await self._dispatcher.dispatch(notifications)
+        failed = [n for n in notifications if not n.was_sent]
+        await self._schedule_retries(failed, {}, time.time())
+        return await self._repository.save_many(notifications)
     
     async def get_notification(self, notification_id: str) -> Notification | None:
         """
@@ -102,11 +164,8 @@ class NotificationService:
             
         Returns:
             La notificación o None si no existe
-            
-        TODO: Implementar usando el repositorio.
         """
-        # TODO: Implementar
-        pass
+        return await self._repository.get_by_id(notification_id)
     
     async def get_all_notifications(self) -> list[Notification]:
         """
@@ -114,11 +173,8 @@ class NotificationService:
         
         Returns:
             Lista de todas las notificaciones
-            
-        TODO: Implementar usando el repositorio.
         """
-        # TODO: Implementar
-        pass
+        return await self._repository.get_all()
     
     async def get_by_status(
         self,
@@ -132,26 +188,113 @@ class NotificationService:
             
         Returns:
             Lista de notificaciones con ese estado
+        """
+        return await self._repository.get_by_status(status)
+    
+    async def get_page(
+        self,
+        limit: int = 50,
+        cursor: str | None = None,
+        status: NotificationStatus | None = None,
+        channel: NotificationChannel | None = None,
+        recipient: str | None = None,
+        descending: bool = True,
+    ) -> NotificationPage:
+        """
+        Obtiene una página de notificaciones ordenada por fecha.
+        
+        Para listados grandes: a diferencia de get_all, no devuelve
+        todo el repositorio en cada llamada.
+        
+        Args:
+            limit: Tamaño de la página
+            cursor: ``next_cursor`` de la página anterior
+            status: Filtrar por estado
+            channel: Filtrar por canal
+            recipient: Filtrar por destinatario
+            descending: Las más recientes primero (por defecto)
+            
+        Returns:
+            Página con las notificaciones y el cursor siguiente
             
-        TODO: Implementar usando el repositorio.
+        Raises:
+            ValueError: Si el cursor no es válido
         """
-        # TODO: Implementar
-        pass
+        return await self._repository.list_page(
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            channel=channel,
+            recipient=recipient,
+            descending=descending,
+        )
     
     async def retry_failed(self) -> list[Notification]:
         """
         Reintenta enviar notificaciones fallidas.
         
+        Con cola de reintentos solo reintenta las vencidas (ver
+        retry_due); sin cola, reenvía todas las FAILED de una vez.
+        
         Returns:
             Lista de notificaciones reintentadas
+        """
+        if self._retry_queue is not None:
+            return await self.retry_due()
+        
+        failed = await self._repository.get_by_status(NotificationStatus.FAILED)
+        if not failed:
+            return []
+        
+        await self._dispatcher.dispatch(failed)
+        return await self._repository.save_many(failed)
+    
+    async def retry_due(
+        self,
+        limit: int = 100,
+        now: float | None = None,
+    ) -> list[Notification]:
+        """
+        Reintenta las notificaciones cuyo próximo intento ha vencido.
+        
+        Toma hasta ``limit`` entradas de la cola (las más antiguas),
+        las envía por lotes y, según el resultado, las quita de la
+        cola, las reprograma con backoff o las pasa a dead letter.
+        
+        Args:
+            limit: Máximo de reintentos en esta pasada
+            now: Timestamp UNIX actual (por defecto time.time())
             
-        TODO: Implementar:
-        1. Obtener notificaciones con estado FAILED
-        2. Reintentar envío de cada una
-        3. Retornar la lista actualizada
+        Returns:
+            Lista de notificaciones reintentadas
         """
-        # TODO: Implementar
-        pass
+        if self._retry_queue is None:
+            return []
+        now = time.time() if now is None else now
+        
+        entries = await self._retry_queue.claim_due(now, limit, self._retry_policy.lease)
+        if not entries:
+            return []
+        
+        notifications: list[Notification] = []
+        done: list[str] = []
+        for entry in entries:
+            notification = await self._repository.get_by_id(entry.notification_id)
+            if notification is None:
+                # Borrada mientras esperaba
+                done.append(entry.notification_id)
+            else:
+                notifications.append(notification)
+        
+        await self._dispatcher.dispatch(notifications)
+        
+        done.extend(n.id for n in notifications if n.was_sent)
+        await self._retry_queue.remove(done)
+        attempts = {entry.notification_id: entry.attempts for entry in entries}
+        failed = [n for n in notifications if not n.was_sent]
+        await self._schedule_retries(failed, attempts, now)
+        
+        return await self._repository.save_many(notifications)
     
     async def delete_notification(self, notification_id: str) -> bool:
         """
@@ -162,11 +305,75 @@ class NotificationService:
             
         Returns:
             True si se eliminó, False si no existía
-            
-        TODO: Implementar usando el repositorio.
         """
-        # TODO: Implementar
-        pass
+        if self._retry_queue is not None:
+            await self._retry_queue.remove([notification_id])
+        return await self._repository.delete(notification_id)
+    
+    async def _schedule_retries(
+        self,
+        failed: list[Notification],
+        attempts: dict[str, int],
+        now: float,
+    ) -> None:
+        """
+        Programa el siguiente intento de cada notificación fallida.
+        
+        Las que agotan ``max_attempts`` se marcan DEAD_LETTER (el
+        llamador guarda el estado).
+        
+        Args:
+            failed: Notificaciones que acaban de fallar
+            attempts: Fallos previos por ID (0 si no está)
+            now: Timestamp UNIX del intento
+        """
+        if self._retry_queue is None or not failed:
+            return
+        
+        retries: list[RetryEntry] = []
+        dead: list[RetryEntry] = []
+        for notification in failed:
+            count = attempts.get(notification.id, 0) + 1
+            entry = RetryEntry(
+                notification_id=notification.id,
+                attempts=count,
+                due_at=None,
+                last_error=notification.error_message,
+            )
+            if self._retry_policy.is_exhausted(count):
+                notification.mark_as_dead_letter(notification.error_message or REJECTED_MESSAGE)
+                dead.append(entry)
+            else:
+                entry.due_at = now + self._retry_policy.delay(count)
+                retries.append(entry)
+        
+        await self._retry_queue.schedule(retries)
+        await self._retry_queue.dead_letter(dead)
+    
+    def _create(
+        self,
+        recipient: str,
+        channel: NotificationChannel | str,
+        message: str,
+        subject: str | None,
+        metadata: dict | None,
+    ) -> Notification:
+        """
+        Crea la entidad validando el canal.
+        
+        Raises:
+            ValueError: Si el canal no existe o no tiene sender
+        """
+        channel = NotificationChannel(channel)
+        if not self.has_channel(channel):
+            raise ValueError(f"Canal no soportado: {channel.value}")
+        return Notification(
+            recipient=recipient,
+            channel=channel,
+            message=message,
+            subject=subject,
+            metadata=metadata or {},
+        )
     
     def get_available_channels(self) -> list[NotificationChannel]:
         """
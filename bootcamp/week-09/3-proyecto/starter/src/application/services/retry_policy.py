@@ -0,0 +1,46 @@
+"""
+RetryPolicy - Backoff exponencial con jitter para reintentos.
+"""
+import random
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Cuándo reintentar una notificación fallida.
+
+    El retraso del intento n es un valor aleatorio entre 0 y
+    ``min(max_delay, base_delay * factor ** (n - 1))`` ("full jitter"):
+    los fallos de un mismo lote no se reintentan todos a la vez contra
+    un proveedor que ya está saturado.
+
+    Attributes:
+        max_attempts: Intentos fallidos antes de pasar a dead letter
+        base_delay: Retraso máximo tras el primer fallo (segundos)
+        factor: Multiplicador del retraso máximo en cada intento
+        max_delay: Tope del retraso (segundos)
+        lease: Tiempo que un reintento tomado por el worker queda
+            reservado antes de volver a estar vencido (segundos)
+    """
+    max_attempts: int = 5
+    base_delay: float = 1.0
+    factor: float = 2.0
+    max_delay: float = 300.0
+    lease: float = 60.0
+    rng: random.Random = field(default_factory=random.Random, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts debe ser >= 1")
+        if self.base_delay < 0 or self.max_delay < 0 or self.factor < 1:
+            raise ValueError("Retrasos >= 0 y factor >= 1")
+
+    def is_exhausted(self, attempts: int) -> bool:
+        """True si tras ``attempts`` fallos no se debe reintentar más."""
+        return attempts >= self.max_attempts
+
+    def delay(self, attempts: int) -> float:
+        """Segundos hasta el siguiente intento tras ``attempts`` fallos."""
+        cap = min(self.max_delay, self.base_delay * self.factor ** (attempts - 1))
+        return self.rng.uniform(0, cap)
@@ -0,0 +1,106 @@
+"""
+RetryWorker - Procesa la cola de reintentos en segundo plano.
+
+El worker duerme hasta el próximo vencimiento de la cola (o hasta
+que se programe un reintento nuevo) en lugar de consultarla cada
+pocos segundos. Cuando despierta vacía los reintentos vencidos por
+lotes y vuelve a dormir.
+
+Uso con FastAPI:
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        worker = RetryWorker(get_notification_service())
+        worker.start()
+        yield
+        await worker.stop()
+"""
+import asyncio
+import logging
+import time
+
+from src.application.services.notification_service import NotificationService
+
+
+logger = logging.getLogger(__name__)
+
+
+class RetryWorker:
+    """Bucle que llama a ``NotificationService.retry_due`` cuando toca."""
+
+    def __init__(
+        self,
+        service: NotificationService,
+        batch_size: int = 100,
+        max_idle: float = 60.0,
+    ):
+        """
+        Inicializa el worker.
+
+        Args:
+            service: Servicio con una RetryQueue configurada
+            batch_size: Reintentos por pasada
+            max_idle: Espera máxima sin despertar (segundos); cubre
+                reintentos programados por otros procesos
+
+        Raises:
+            ValueError: Si el servicio no tiene cola de reintentos
+        """
+        if service.retry_queue is None:
+            raise ValueError("El servicio no tiene cola de reintentos")
+        self._service = service
+        self._queue = service.retry_queue
+        self._batch_size = batch_size
+        self._max_idle = max_idle
+        self._task: asyncio.Task[None] | None = None
+
+    async def run_once(self) -> int:
+        """
+        Procesa todos los reintentos vencidos ahora.
+
+        Returns:
+            Número de notificaciones reintentadas
+        """
+        total = 0
+        while True:
+            retried = await self._service.retry_due(self._batch_size)
+            total += len(retried)
+            if len(retried) < self._batch_size:
+                return total
+
+    async def sleep_until_due(self) -> None:
+        """Duerme hasta el próximo vencimiento, un schedule() o ``max_idle``."""
+        next_due = await self._queue.next_due_at()
+        if next_due is None:
+            timeout = self._max_idle
+        else:
+            timeout = min(max(next_due - time.time(), 0.0), self._max_idle)
+        if timeout > 0:
+            await self._queue.wait(timeout)
+
+    async def run(self) -> None:
+        """Bucle principal (hasta que se cancele)."""
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                # Un fallo del repositorio o de la cola no para el worker
+                logger.exception("Error procesando reintentos")
+                await asyncio.sleep(1.0)
+            await self.sleep_until_due()
+
+    def start(self) -> None:
+        """Lanza el bucle como tarea de fondo."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Cancela el bucle y espera a que termine."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
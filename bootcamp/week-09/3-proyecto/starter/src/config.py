@@ -28,6 +28,12 @@ class Settings(BaseSettings):
     smtp_username: str = Field(default="")
     smtp_password: str = Field(default="")
     smtp_from: str = Field(default="noreply@example.com")
+    smtp_use_tls: bool = Field(default=False)
+    smtp_starttls: bool = Field(default=True)
+    smtp_timeout: float = Field(default=10.0)
+    smtp_pool_size: int = Field(default=5)
+    smtp_max_messages_per_connection: int = Field(default=100)
+    smtp_idle_timeout: float = Field(default=30.0)
     
     # Twilio SMS
     twilio_sid: str = Field(default="")
@@ -36,6 +42,15 @@ class Settings(BaseSettings):
     
     # Webhook
     webhook_timeout: int = Field(default=30)
+    webhook_max_connections: int = Field(default=100)
+    webhook_max_connections_per_host: int = Field(default=10)
+    webhook_keepalive_expiry: float = Field(default=30.0)
+    webhook_http2: bool = Field(default=False)
+    webhook_batch_urls: list[str] = Field(default_factory=list)
+    webhook_batch_size: int = Field(default=100)
+    
+    # Cola de reintentos
+    retry_db_path: str = Field(default="retries.db")
     
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8"}
 
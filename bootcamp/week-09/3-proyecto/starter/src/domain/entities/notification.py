@@ -13,6 +13,7 @@ class NotificationStatus(str, Enum):
     SENT = "sent"
     FAILED = "failed"
     DELIVERED = "delivered"
+    DEAD_LETTER = "dead_letter"
 
 
 class NotificationChannel(str, Enum):
@@ -62,6 +63,11 @@ class Notification:
         self.status = NotificationStatus.FAILED
         self.error_message = error
     
+    def mark_as_dead_letter(self, error: str) -> None:
+        """Marca la notificación como descartada (reintentos agotados)."""
+        self.status = NotificationStatus.DEAD_LETTER
+        self.error_message = error
+    
     def mark_as_delivered(self) -> None:
         """Marca la notificación como entregada."""
         self.status = NotificationStatus.DELIVERED
@@ -1,9 +1,13 @@
 from src.domain.ports.notification_sender import NotificationSender
-from src.domain.ports.notification_repository import NotificationRepository
+from src.domain.ports.notification_repository import NotificationPage, NotificationRepository
 from src.domain.ports.template_renderer import TemplateRenderer
+from src.domain.ports.retry_queue import RetryEntry, RetryQueue
 
 __all__ = [
     "NotificationSender",
     "NotificationRepository",
+    "NotificationPage",
     "TemplateRenderer",
+    "RetryEntry",
+    "RetryQueue",
 ]
@@ -3,9 +3,46 @@ Port: NotificationRepository
 
 Define el contrato para persistir notificaciones.
 """
+from dataclasses import dataclass
+from datetime import datetime
 from typing import Protocol
 
-from src.domain.entities.notification import Notification, NotificationStatus
+from src.domain.entities.notification import (
+    Notification,
+    NotificationChannel,
+    NotificationStatus,
+)
+
+
+@dataclass
+class NotificationPage:
+    """
+    Página de un listado ordenado por fecha de creación.
+    
+    Attributes:
+        items: Notificaciones de la página
+        next_cursor: Cursor para pedir la siguiente página (None si es la última)
+    """
+    items: list[Notification]
+    next_cursor: str | None
+
+
+def encode_cursor(notification: Notification) -> str:
+    """Cursor opaco con la clave de orden (created_at, id) de una notificación."""
+    return f"{notification.created_at.isoformat()}|{notification.id}"
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """
+    Recupera la clave de orden de un cursor.
+    
+    Raises:
+        ValueError: Si el cursor no tiene el formato esperado
+    """
+    created_at, sep, notification_id = cursor.partition("|")
+    if not sep or not notification_id:
+        raise ValueError(f"Cursor no válido: {cursor!r}")
+    return datetime.fromisoformat(created_at), notification_id
 
 
 class NotificationRepository(Protocol):
@@ -17,6 +54,9 @@ class NotificationRepository(Protocol):
     - async def save(notification: Notification) -> Notification
       Guarda una notificación (crea o actualiza).
     
+    - async def save_many(notifications: list[Notification]) -> list[Notification]
+      Guarda varias notificaciones en una sola escritura.
+    
     - async def get_by_id(notification_id: str) -> Notification | None
       Obtiene una notificación por su ID.
     
@@ -26,6 +66,15 @@ class NotificationRepository(Protocol):
     - async def get_by_status(status: NotificationStatus) -> list[Notification]
       Obtiene notificaciones por estado.
     
+    - async def get_by_channel(channel: NotificationChannel) -> list[Notification]
+      Obtiene notificaciones por canal.
+    
+    - async def get_by_recipient(recipient: str) -> list[Notification]
+      Obtiene notificaciones de un destinatario.
+    
+    - async def list_page(...) -> NotificationPage
+      Página ordenada por created_at, con filtros opcionales y cursor.
+    
     - async def delete(notification_id: str) -> bool
       Elimina una notificación. Retorna True si existía.
     
@@ -37,6 +86,15 @@ class NotificationRepository(Protocol):
         """Guarda o actualiza una notificación."""
         ...
     
+    async def save_many(self, notifications: list[Notification]) -> list[Notification]:
+        """
+        Guarda o actualiza varias notificaciones de una vez.
+        
+        En una DB real es un INSERT/UPDATE por lote (una transacción),
+        no una escritura por notificación.
+        """
+        ...
+    
     async def get_by_id(self, notification_id: str) -> Notification | None:
         """Obtiene una notificación por ID."""
         ...
@@ -49,6 +107,43 @@ class NotificationRepository(Protocol):
         """Obtiene notificaciones filtradas por estado."""
         ...
     
+    async def get_by_channel(self, channel: NotificationChannel) -> list[Notification]:
+        """Obtiene notificaciones filtradas por canal."""
+        ...
+    
+    async def get_by_recipient(self, recipient: str) -> list[Notification]:
+        """Obtiene notificaciones de un destinatario."""
+        ...
+    
+    async def list_page(
+        self,
+        limit: int = 50,
+        cursor: str | None = None,
+        status: NotificationStatus | None = None,
+        channel: NotificationChannel | None = None,
+        recipient: str | None = None,
+        descending: bool = False,
+    ) -> NotificationPage:
+        """
+        Obtiene una página ordenada por fecha de creación.
+        
+        Paginación por cursor (keyset): el cursor identifica el último
+        elemento devuelto, así que pedir la página 1000 cuesta lo mismo
+        que la primera y las inserciones no desplazan los resultados.
+        
+        Args:
+            limit: Tamaño de la página
+            cursor: ``next_cursor`` de la página anterior
+            status: Filtrar por estado
+            channel: Filtrar por canal
+            recipient: Filtrar por destinatario
+            descending: Las más recientes primero
+            
+        Raises:
+            ValueError: Si el cursor no es válido
+        """
+        ...
+    
     async def delete(self, notification_id: str) -> bool:
         """Elimina una notificación."""
         ...
@@ -0,0 +1,72 @@
+"""
+Port: RetryQueue
+
+Define el contrato de la cola de reintentos: notificaciones fallidas
+ordenadas por el momento de su próximo intento.
+"""
+from dataclasses import dataclass
+from typing import Protocol
+
+
+@dataclass
+class RetryEntry:
+    """
+    Reintento programado de una notificación.
+
+    Attributes:
+        notification_id: ID de la notificación
+        attempts: Intentos fallidos hasta ahora
+        due_at: Próximo intento (timestamp UNIX); None si está en dead letter
+        last_error: Último error del proveedor
+    """
+    notification_id: str
+    attempts: int
+    due_at: float | None
+    last_error: str | None = None
+
+
+class RetryQueue(Protocol):
+    """
+    Puerto para la cola de reintentos.
+
+    Los tiempos son timestamps UNIX (``time.time()``): deben seguir
+    siendo válidos si el proceso se reinicia.
+    """
+
+    async def schedule(self, entries: list[RetryEntry]) -> None:
+        """Programa (o reprograma) reintentos."""
+        ...
+
+    async def claim_due(self, now: float, limit: int, lease: float) -> list[RetryEntry]:
+        """
+        Toma los reintentos vencidos, los más antiguos primero.
+
+        Los reintentos tomados se aplazan ``lease`` segundos: si el
+        proceso muere antes de resolverlos vuelven a estar vencidos.
+        """
+        ...
+
+    async def remove(self, notification_ids: list[str]) -> None:
+        """Quita reintentos (enviados o notificaciones borradas)."""
+        ...
+
+    async def dead_letter(self, entries: list[RetryEntry]) -> None:
+        """Mueve reintentos agotados a dead letter."""
+        ...
+
+    async def dead_letters(self) -> list[RetryEntry]:
+        """Obtiene los reintentos en dead letter."""
+        ...
+
+    async def next_due_at(self) -> float | None:
+        """Momento del próximo reintento, o None si no hay ninguno."""
+        ...
+
+    async def wait(self, timeout: float | None) -> None:
+        """
+        Espera hasta que se programe un reintento o pase ``timeout``.
+
+        Permite al worker dormir hasta el próximo vencimiento sin
+        consultar la cola periódicamente.
+        """
+        ...
@@ -2,20 +2,62 @@
 Adapter: EmailNotificationSender
 
 Implementación de NotificationSender para envío de emails.
+
+Envía por SMTP a través de un ``SMTPPool``: las sesiones (conexión,
+STARTTLS y AUTH) se reutilizan entre envíos en lugar de repetir el
+handshake por cada email. El pool se cierra con ``aclose()`` en el
+shutdown de la aplicación (ver ``close_senders`` en dependencies).
 """
+import re
+from email.header import Header
+from email.mime.text import MIMEText
+
 from src.domain.entities.notification import Notification, NotificationChannel
 from src.domain.ports.notification_sender import NotificationSender
+from src.infrastructure.adapters.smtp_pool import SMTPPool
 from src.config import settings
 
 
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+DEFAULT_SUBJECT = "Notificación"
+
+
+def is_email(value: str) -> bool:
+    """True si ``value`` parece una dirección de email."""
+    return EMAIL_PATTERN.match(value) is not None
+
+
+def build_message(notification: Notification, from_email: str) -> MIMEText:
+    """
+    Email de una notificación.
+    
+    Usa la API clásica (MIMEText, política compat32): construir un
+    EmailMessage con la política por defecto parsea cada cabecera y
+    cuesta unas cinco veces más CPU por email.
+    """
+    subject = notification.subject or DEFAULT_SUBJECT
+    # us-ascii (texto tal cual) si se puede; si no, utf-8 en base64
+    message = MIMEText(notification.message)
+    message["From"] = from_email
+    message["To"] = notification.recipient
+    if not subject.isascii():
+        subject = Header(subject, "utf-8", header_name="Subject").encode()
+    message["Subject"] = subject
+    message["X-Notification-Id"] = notification.id
+    return message
+
+
 class EmailNotificationSender:
     """
     Adapter que envía notificaciones por email.
     
     Implementa el Protocol NotificationSender.
-    En producción usaría SMTP o un servicio como SendGrid/SES.
     
-    TODO: Implementa los métodos para cumplir con el Protocol.
+    - Pool de ``pool_size`` sesiones SMTP autenticadas
+    - PIPELINING si el servidor lo anuncia
+    - Cada sesión se recicla tras ``max_messages_per_connection``
+      emails o ``idle_timeout`` segundos sin uso
     """
     
     def __init__(
@@ -25,6 +67,12 @@ class EmailNotificationSender:
         username: str | None = None,
         password: str | None = None,
         from_email: str | None = None,
+        use_tls: bool | None = None,
+        starttls: bool | None = None,
+        timeout: float | None = None,
+        pool_size: int | None = None,
+        max_messages_per_connection: int | None = None,
+        idle_timeout: float | None = None,
     ):
         """
         Inicializa el adapter con configuración SMTP.
@@ -35,50 +83,103 @@ class EmailNotificationSender:
             username: Usuario SMTP
             password: Contraseña SMTP
             from_email: Email remitente
+            use_tls: TLS implícito (puerto 465)
+            starttls: Pasar a TLS si el servidor anuncia STARTTLS
+            timeout: Segundos máximos por conexión o respuesta
+            pool_size: Sesiones SMTP simultáneas
+            max_messages_per_connection: Emails por sesión antes de reciclarla
+            idle_timeout: Segundos sin uso tras los que se cierra una sesión
         """
         self._host = host or settings.smtp_host
         self._port = port or settings.smtp_port
         self._username = username or settings.smtp_username
         self._password = password or settings.smtp_password
         self._from_email = from_email or settings.smtp_from
+        self._use_tls = settings.smtp_use_tls if use_tls is None else use_tls
+        self._starttls = settings.smtp_starttls if starttls is None else starttls
+        self._timeout = timeout or settings.smtp_timeout
+        self._pool_size = pool_size or settings.smtp_pool_size
+        self._max_messages = (
+            max_messages_per_connection or settings.smtp_max_messages_per_connection
+        )
+        self._idle_timeout = idle_timeout or settings.smtp_idle_timeout
+        self._pool: SMTPPool | None = None
     
     @property
     def channel(self) -> NotificationChannel:
         """Este adapter maneja el canal EMAIL."""
         return NotificationChannel.EMAIL
     
+    # ============================================
+    # Ciclo de vida del pool
+    # ============================================
+    
+    @property
+    def pool(self) -> SMTPPool:
+        """Pool SMTP compartido (se crea en el primer uso)."""
+        if self._pool is None:
+            self._pool = SMTPPool(
+                self._host,
+                self._port,
+                size=self._pool_size,
+                max_messages=self._max_messages,
+                idle_timeout=self._idle_timeout,
+                username=self._username,
+                password=self._password,
+                use_tls=self._use_tls,
+                starttls=self._starttls,
+                timeout=self._timeout,
+            )
+        return self._pool
+    
+    async def aclose(self) -> None:
+        """Cierra las sesiones SMTP abiertas."""
+        if self._pool is not None:
+            await self._pool.aclose()
+            self._pool = None
+    
+    async def __aenter__(self) -> "EmailNotificationSender":
+        return self
+    
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+    
+    # ============================================
+    # Envío
+    # ============================================
+    
     async def send(self, notification: Notification) -> bool:
         """
         Envía un email.
         
         Args:
             notification: Notificación con datos del email
-            
-        Returns:
-            True si se envió, False si falló
-            
-        TODO: Implementar:
-        1. Validar que recipient sea un email válido
-        2. En desarrollo: simular envío (print + return True)
-        3. En producción: usar smtplib o servicio externo
-        4. Manejar excepciones y retornar False si falla
         
-        Nota: Para este proyecto, simula el envío con un print.
+        Returns:
+            True si el servidor aceptó el email, False si falló
         """
-        # TODO: Implementar
-        pass
+        results = await self.send_batch([notification])
+        return results[notification.id]
     
     async def send_batch(self, notifications: list[Notification]) -> dict[str, bool]:
         """
         Envía múltiples emails.
         
+        Los emails se reparten entre las sesiones del pool y cada
+        sesión los envía seguidos (en pipeline si el servidor lo admite).
+        
         Args:
             notifications: Lista de notificaciones
-            
+        
         Returns:
             Dict {notification_id: success}
-            
-        TODO: Implementar iterando sobre notifications y usando send().
         """
-        # TODO: Implementar
-        pass
+        results = {n.id: False for n in notifications}
+        valid = [n for n in notifications if is_email(n.recipient)]
+        if not valid:
+            return results
+        
+        messages = [build_message(n, self._from_email) for n in valid]
+        sent = await self.pool.send_many(messages)
+        results.update(zip((n.id for n in valid), sent))
+        return results
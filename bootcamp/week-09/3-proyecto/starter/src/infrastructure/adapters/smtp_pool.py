@@ -0,0 +1,444 @@
+"""
+Transporte SMTP asíncrono con pool de conexiones.
+
+Abrir una sesión SMTP cuesta varias idas y vueltas: saludo 220, EHLO,
+STARTTLS (handshake TLS y un segundo EHLO) y AUTH. Con la sesión ya
+abierta, un email son MAIL/RCPT/DATA y el cuerpo. El pool mantiene
+sesiones autenticadas y las reutiliza entre envíos.
+
+Si el servidor anuncia PIPELINING (RFC 2920), MAIL, RCPT y DATA de
+cada mensaje van en un solo write junto con el cuerpo del mensaje
+anterior: una ida y vuelta por email en lugar de cuatro.
+
+Cada conexión se recicla (QUIT) tras ``max_messages`` mensajes o
+cuando lleva ``idle_timeout`` segundos sin usarse.
+"""
+import asyncio
+import base64
+import logging
+import re
+import ssl
+import time
+from collections import deque
+from collections.abc import Sequence
+from email.message import Message
+from typing import Any
+from email.utils import getaddresses, parseaddr
+
+
+logger = logging.getLogger(__name__)
+
+CRLF = b"\r\n"
+
+# Errores de transporte: la conexión ya no sirve
+TRANSPORT_ERRORS = (OSError, asyncio.IncompleteReadError, TimeoutError)
+
+
+class SMTPError(Exception):
+    """Respuesta inesperada del servidor SMTP."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(f"{code} {message}")
+        self.code = code
+        self.message = message
+
+
+class SMTPDisconnected(Exception):
+    """
+    La conexión se cortó a mitad de ``send_many``.
+
+    Attributes:
+        results: Resultado de los mensajes terminados antes del corte
+        safe_to_retry: True si no llegó a enviarse ningún cuerpo, así
+            que reintentar el resto no puede duplicar emails
+    """
+
+    def __init__(self, results: list[bool], safe_to_retry: bool):
+        super().__init__("Conexión SMTP cerrada durante el envío")
+        self.results = results
+        self.safe_to_retry = safe_to_retry
+
+
+def encode_message(message: Message) -> tuple[str, list[str], bytes]:
+    """
+    Sobre y cuerpo de un email listos para DATA.
+
+    Returns:
+        (remitente, destinatarios, cuerpo con dot-stuffing y ".")
+    """
+    sender = parseaddr(message["From"] or "")[1]
+    recipients = [
+        address
+        for _, address in getaddresses(message.get_all("To", []) + message.get_all("Cc", []))
+        if address
+    ]
+    data = message.as_bytes(policy=message.policy.clone(linesep="\r\n"))
+    data = re.sub(rb"(?m)^\.", b"..", data)
+    if not data.endswith(CRLF):
+        data += CRLF
+    return sender, recipients, data + b"." + CRLF
+
+
+class SMTPConnection:
+    """
+    Una sesión SMTP sobre asyncio streams.
+
+    Se abre con ``connect()`` (saludo, EHLO, STARTTLS y AUTH) y envía
+    mensajes con ``send_many()``.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        username: str = "",
+        password: str = "",
+        use_tls: bool = False,
+        starttls: bool = True,
+        ssl_context: ssl.SSLContext | None = None,
+        timeout: float = 10.0,
+        local_hostname: str = "localhost",
+    ):
+        """
+        Args:
+            host: Servidor SMTP
+            port: Puerto SMTP
+            username: Usuario para AUTH (vacío: sin AUTH)
+            password: Contraseña para AUTH
+            use_tls: TLS implícito desde el inicio (puerto 465)
+            starttls: Pasar a TLS si el servidor anuncia STARTTLS
+            ssl_context: Contexto TLS (por defecto el del sistema)
+            timeout: Segundos máximos por conexión o respuesta
+            local_hostname: Nombre que se envía en EHLO
+        """
+        self._host = host
+        self._port = port
+        self._username = username
+        self._password = password
+        self._use_tls = use_tls
+        self._starttls = starttls
+        self._ssl_context = ssl_context
+        self._timeout = timeout
+        self._local_hostname = local_hostname
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self.extensions: dict[str, str] = {}
+        self.messages_sent = 0
+        self.last_used = time.monotonic()
+
+    @property
+    def is_open(self) -> bool:
+        """False si se cerró o el servidor ya cortó la conexión (EOF)."""
+        return (
+            self._reader is not None
+            and self._writer is not None
+            and not self._writer.is_closing()
+            and not self._reader.at_eof()
+        )
+
+    @property
+    def pipelining(self) -> bool:
+        return "pipelining" in self.extensions
+
+    # ============================================
+    # Apertura y cierre
+    # ============================================
+
+    async def connect(self) -> None:
+        """
+        Abre la sesión: saludo, EHLO, STARTTLS y AUTH si procede.
+
+        Raises:
+            SMTPError: Si el servidor rechaza algún paso
+            OSError: Si no se puede conectar
+        """
+        async with asyncio.timeout(self._timeout):
+            self._reader, self._writer = await asyncio.open_connection(
+                self._host,
+                self._port,
+                ssl=self._tls_context() if self._use_tls else None,
+            )
+        try:
+            await self._expect(220)
+            await self._ehlo()
+            if not self._use_tls and self._starttls and "starttls" in self.extensions:
+                await self._command(b"STARTTLS", 220)
+                await self._writer.start_tls(self._tls_context())
+                await self._ehlo()
+            if self._username:
+                await self._login()
+        except BaseException:
+            self.close()
+            raise
+        self.last_used = time.monotonic()
+
+    async def quit(self) -> None:
+        """Cierra la sesión con QUIT (sin esperar si el servidor no responde)."""
+        if self.is_open:
+            try:
+                await self._command(b"QUIT", 221)
+            except (SMTPError, *TRANSPORT_ERRORS):
+                pass
+        self.close()
+
+    def close(self) -> None:
+        """Cierra el socket sin QUIT."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _require_open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Streams de la sesión; error de transporte si ya se cerró."""
+        if self._reader is None or self._writer is None:
+            raise ConnectionResetError("La sesión SMTP está cerrada")
+        return self._reader, self._writer
+
+    def _tls_context(self) -> ssl.SSLContext:
+        return self._ssl_context or ssl.create_default_context()
+
+    async def _ehlo(self) -> None:
+        lines = await self._command(f"EHLO {self._local_hostname}".encode(), 250)
+        self.extensions = {}
+        for line in lines[1:]:
+            keyword, _, params = line.partition(" ")
+            self.extensions[keyword.lower()] = params
+
+    async def _login(self) -> None:
+        mechanisms = self.extensions.get("auth", "").upper().split()
+        user = self._username.encode()
+        password = self._password.encode()
+        if "PLAIN" in mechanisms:
+            token = base64.b64encode(b"\0" + user + b"\0" + password)
+            await self._command(b"AUTH PLAIN " + token, 235)
+        elif "LOGIN" in mechanisms:
+            await self._command(b"AUTH LOGIN", 334)
+            await self._command(base64.b64encode(user), 334)
+            await self._command(base64.b64encode(password), 235)
+        else:
+            raise SMTPError(504, "El servidor no ofrece AUTH PLAIN ni LOGIN")
+
+    # ============================================
+    # Envío
+    # ============================================
+
+    async def send_many(self, messages: Sequence[Message]) -> list[bool]:
+        """
+        Envía varios mensajes por esta sesión.
+
+        Un mensaje rechazado (4xx/5xx) da False y la sesión sigue con
+        el siguiente tras un RSET.
+
+        Returns:
+            Lista de éxito por mensaje, en el mismo orden
+
+        Raises:
+            SMTPDisconnected: Si la conexión se corta
+        """
+        results: list[bool] = []
+        # Cuerpo del mensaje anterior (o RSET): va delante del siguiente sobre
+        tail: list[bytes] = []
+        tail_is_body = False
+        body_sent = False
+        try:
+            for message in messages:
+                sender, recipients, data = encode_message(message)
+                envelope = [f"MAIL FROM:<{sender}>".encode() + CRLF]
+                envelope += [f"RCPT TO:<{rcpt}>".encode() + CRLF for rcpt in recipients]
+                envelope.append(b"DATA" + CRLF)
+
+                body_sent = body_sent or tail_is_body
+                codes = await self._exchange(tail + envelope)
+                if tail_is_body:
+                    results.append(codes[0] == 250)
+                self.messages_sent += 1
+
+                if codes[-1] == 354:
+                    tail, tail_is_body = [data], True
+                else:
+                    results.append(False)
+                    tail, tail_is_body = [b"RSET" + CRLF], False
+
+            if tail:
+                body_sent = body_sent or tail_is_body
+                codes = await self._exchange(tail)
+                if tail_is_body:
+                    results.append(codes[0] == 250)
+        except TRANSPORT_ERRORS as exc:
+            self.close()
+            raise SMTPDisconnected(results, safe_to_retry=not body_sent) from exc
+        finally:
+            self.last_used = time.monotonic()
+        return results
+
+    async def _exchange(self, commands: list[bytes]) -> list[int]:
+        """
+        Escribe los comandos y lee una respuesta por comando.
+
+        Con PIPELINING todos van en un write; sin él, uno a uno
+        esperando cada respuesta.
+        """
+        _, writer = self._require_open()
+        if self.pipelining:
+            writer.write(b"".join(commands))
+            await writer.drain()
+            return [(await self._read_reply())[0] for _ in commands]
+        codes = []
+        for command in commands:
+            writer.write(command)
+            await writer.drain()
+            codes.append((await self._read_reply())[0])
+        return codes
+
+    async def _command(self, line: bytes, expected: int) -> list[str]:
+        _, writer = self._require_open()
+        writer.write(line + CRLF)
+        await writer.drain()
+        return await self._expect(expected)
+
+    async def _expect(self, expected: int) -> list[str]:
+        code, lines = await self._read_reply()
+        if code != expected:
+            raise SMTPError(code, " ".join(lines))
+        return lines
+
+    async def _read_reply(self) -> tuple[int, list[str]]:
+        """Lee una respuesta (posiblemente multilínea: ``250-...``)."""
+        reader, _ = self._require_open()
+        lines = []
+        async with asyncio.timeout(self._timeout):
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    raise asyncio.IncompleteReadError(raw, None)
+                line = raw.decode("utf-8", "replace").rstrip("\r\n")
+                lines.append(line[4:])
+                if line[3:4] != "-":
+                    break
+        code = int(line[:3])
+        if code == 421:
+            # El servidor va a cerrar la conexión (p. ej. por inactividad)
+            raise ConnectionAbortedError(" ".join(lines))
+        return code, lines
+
+
+class SMTPPool:
+    """
+    Pool de sesiones SMTP autenticadas.
+
+    - Como mucho ``size`` conexiones abiertas a la vez
+    - Una conexión vuelve al pool tras cada lote y se reutiliza
+      (la más reciente primero)
+    - QUIT tras ``max_messages`` mensajes o ``idle_timeout`` sin uso
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        size: int = 5,
+        max_messages: int = 100,
+        idle_timeout: float = 30.0,
+        **connection_options: Any,
+    ):
+        """
+        Args:
+            host: Servidor SMTP
+            port: Puerto SMTP
+            size: Conexiones simultáneas máximas
+            max_messages: Mensajes por conexión antes de reciclarla
+            idle_timeout: Segundos sin uso tras los que se cierra
+            **connection_options: Opciones de SMTPConnection
+                (username, password, use_tls, starttls, ...)
+        """
+        self._host = host
+        self._port = port
+        self._size = size
+        self._max_messages = max_messages
+        self._idle_timeout = idle_timeout
+        self._connection_options = connection_options
+        self._idle: list[SMTPConnection] = []
+        self._slots = asyncio.Semaphore(size)
+        self.connections_opened = 0
+
+    async def send_many(self, messages: Sequence[Message]) -> list[bool]:
+        """
+        Envía los mensajes repartidos entre las conexiones del pool.
+
+        Returns:
+            Lista de éxito por mensaje, en el mismo orden
+        """
+        results = [False] * len(messages)
+        pending = deque(enumerate(messages))
+        workers = min(self._size, len(messages))
+        chunk = -(-len(messages) // workers) if workers else 0
+        await asyncio.gather(*(self._drain(pending, results, chunk) for _ in range(workers)))
+        return results
+
+    async def aclose(self) -> None:
+        """Cierra (QUIT) las conexiones libres."""
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*(connection.quit() for connection in idle))
+
+    async def _drain(
+        self, pending: deque[tuple[int, Message]], results: list[bool], chunk: int
+    ) -> None:
+        """Toma lotes de hasta ``chunk`` mensajes de ``pending`` hasta vaciarlo."""
+        while pending:
+            async with self._slots:
+                if not pending:
+                    return
+                try:
+                    connection = await self._acquire()
+                except (SMTPError, *TRANSPORT_ERRORS) as exc:
+                    logger.warning("No se pudo abrir sesión SMTP con %s: %r", self._host, exc)
+                    pending.clear()
+                    return
+
+                if not pending:
+                    # Otro worker se llevó lo que quedaba mientras conectábamos
+                    await self._release(connection)
+                    return
+
+                reused = connection.messages_sent > 0
+                quota = min(chunk, self._max_messages - connection.messages_sent)
+                batch = [pending.popleft() for _ in range(min(quota, len(pending)))]
+                try:
+                    sent = await connection.send_many([message for _, message in batch])
+                except SMTPDisconnected as exc:
+                    sent = exc.results
+                    rest = batch[len(sent):]
+                    if reused and exc.safe_to_retry:
+                        # El servidor cerró una conexión libre: reintentar en otra
+                        pending.extendleft(reversed(rest))
+                    else:
+                        logger.warning("Sesión SMTP cortada, %d emails sin confirmar", len(rest))
+                finally:
+                    await self._release(connection)
+
+                for (index, _), ok in zip(batch, sent):
+                    results[index] = ok
+
+    async def _acquire(self) -> SMTPConnection:
+        now = time.monotonic()
+        # Las más antiguas están al principio de la lista
+        while self._idle and now - self._idle[0].last_used >= self._idle_timeout:
+            await self._idle.pop(0).quit()
+        while self._idle:
+            connection = self._idle.pop()
+            if connection.is_open:
+                return connection
+
+        connection = SMTPConnection(self._host, self._port, **self._connection_options)
+        await connection.connect()
+        self.connections_opened += 1
+        return connection
+
+    async def _release(self, connection: SMTPConnection) -> None:
+        if not connection.is_open:
+            return
+        if connection.messages_sent >= self._max_messages:
+            await connection.quit()
+        else:
+            self._idle.append(connection)
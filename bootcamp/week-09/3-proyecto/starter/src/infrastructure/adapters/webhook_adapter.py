@@ -2,11 +2,52 @@
 Adapter: WebhookNotificationSender
 
 Implementación de NotificationSender para webhooks HTTP.
+
+Usa un único ``httpx.AsyncClient`` para todos los envíos: el pool
+reutiliza las conexiones (keep-alive) en lugar de abrir una conexión
+TCP (y TLS) por webhook. El cliente se cierra con ``aclose()`` en el
+shutdown de la aplicación (ver ``close_senders`` en dependencies).
 """
+import asyncio
+import logging
+from collections.abc import Iterable
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
 from src.domain.entities.notification import Notification, NotificationChannel
 from src.domain.ports.notification_sender import NotificationSender
 from src.config import settings
 
+try:
+    import h2  # type: ignore[import-not-found]  # noqa: F401  (httpx[http2])
+except ImportError:  # h2 es opcional: solo para HTTP/2
+    h2 = None
+
+
+logger = logging.getLogger(__name__)
+
+BATCH_HEADER = "X-Webhook-Batch"
+
+
+def is_webhook_url(value: str) -> bool:
+    """True si ``value`` es una URL http(s) con host."""
+    parts = urlsplit(value)
+    return parts.scheme in ("http", "https") and bool(parts.netloc)
+
+
+def build_payload(notification: Notification) -> dict[str, Any]:
+    """Cuerpo JSON de una notificación."""
+    return {
+        "id": notification.id,
+        "channel": notification.channel.value,
+        "subject": notification.subject,
+        "message": notification.message,
+        "metadata": notification.metadata,
+        "created_at": notification.created_at.isoformat(),
+    }
+
 
 class WebhookNotificationSender:
     """
@@ -15,56 +56,167 @@ class WebhookNotificationSender:
     Implementa el Protocol NotificationSender.
     Hace POST a una URL con el payload de la notificación.
     
-    TODO: Implementa los métodos para cumplir con el Protocol.
+    - Un cliente compartido con pool de conexiones y keep-alive
+    - Como mucho ``max_connections_per_host`` peticiones a la vez
+      contra el mismo host (httpx solo limita el total)
+    - HTTP/2 opcional (requiere ``httpx[http2]``)
+    - Las URLs de ``batch_urls`` aceptan un lote: send_batch agrupa
+      sus notificaciones en un POST ``{"notifications": [...]}``
     """
     
-    def __init__(self, timeout: int | None = None):
+    def __init__(
+        self,
+        timeout: int | None = None,
+        max_connections: int | None = None,
+        max_connections_per_host: int | None = None,
+        keepalive_expiry: float | None = None,
+        http2: bool | None = None,
+        batch_urls: Iterable[str] | None = None,
+        batch_size: int | None = None,
+    ):
         """
         Inicializa el adapter con configuración.
         
         Args:
             timeout: Timeout en segundos para las peticiones HTTP
+            max_connections: Conexiones abiertas en total
+            max_connections_per_host: Peticiones simultáneas por host
+            keepalive_expiry: Segundos que una conexión libre sigue abierta
+            http2: Negociar HTTP/2 (ALPN, solo https)
+            batch_urls: URLs que aceptan notificaciones por lotes
+            batch_size: Máximo de notificaciones por POST en lote
+        
+        Raises:
+            RuntimeError: Si se pide HTTP/2 sin el paquete h2
         """
         self._timeout = timeout or settings.webhook_timeout
+        self._max_connections = max_connections or settings.webhook_max_connections
+        self._max_per_host = max_connections_per_host or settings.webhook_max_connections_per_host
+        self._keepalive_expiry = keepalive_expiry or settings.webhook_keepalive_expiry
+        self._http2 = settings.webhook_http2 if http2 is None else http2
+        self._batch_urls = set(settings.webhook_batch_urls if batch_urls is None else batch_urls)
+        self._batch_size = batch_size or settings.webhook_batch_size
+        
+        if self._http2 and h2 is None:
+            raise RuntimeError("HTTP/2 requiere el paquete 'h2' (pip install 'httpx[http2]')")
+        
+        self._client: httpx.AsyncClient | None = None
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
     
     @property
     def channel(self) -> NotificationChannel:
         """Este adapter maneja el canal WEBHOOK."""
         return NotificationChannel.WEBHOOK
     
+    # ============================================
+    # Ciclo de vida del cliente
+    # ============================================
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Cliente HTTP compartido (se crea en el primer uso)."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                http2=self._http2,
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections,
+                    keepalive_expiry=self._keepalive_expiry,
+                ),
+            )
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Cierra las conexiones del pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def __aenter__(self) -> "WebhookNotificationSender":
+        return self
+    
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+    
+    # ============================================
+    # Envío
+    # ============================================
+    
     async def send(self, notification: Notification) -> bool:
         """
         Envía una notificación via webhook.
         
         Args:
             notification: Notificación con URL como recipient
-            
+        
         Returns:
             True si el webhook respondió 2xx, False si falló
-            
-        TODO: Implementar:
-        1. Validar que recipient sea una URL válida
-        2. Construir payload JSON con datos de la notificación
-        3. En desarrollo: simular envío
-        4. En producción: usar httpx para hacer POST
-        5. Retornar True si respuesta es 2xx
-        
-        Nota: Para este proyecto, simula el envío con un print.
         """
-        # TODO: Implementar
-        pass
+        if not is_webhook_url(notification.recipient):
+            return False
+        return await self._post(
+            notification.recipient,
+            build_payload(notification),
+            {"X-Notification-Id": notification.id},
+        )
     
     async def send_batch(self, notifications: list[Notification]) -> dict[str, bool]:
         """
         Envía múltiples webhooks.
         
+        Agrupa por URL: las URLs de ``batch_urls`` reciben un POST por
+        cada ``batch_size`` notificaciones; el resto, uno por
+        notificación. Todos los POST van en paralelo, limitados por host.
+        
         Args:
             notifications: Lista de notificaciones
-            
+        
         Returns:
             Dict {notification_id: success}
-            
-        TODO: Implementar iterando y usando send().
         """
-        # TODO: Implementar
-        pass
+        results: dict[str, bool] = {}
+        by_url: dict[str, list[Notification]] = {}
+        for notification in notifications:
+            if is_webhook_url(notification.recipient):
+                by_url.setdefault(notification.recipient, []).append(notification)
+            else:
+                results[notification.id] = False
+        
+        tasks = []
+        for url, group in by_url.items():
+            if url in self._batch_urls:
+                for start in range(0, len(group), self._batch_size):
+                    tasks.append(self._send_chunk(url, group[start:start + self._batch_size]))
+            else:
+                tasks.extend(self._send_one(notification) for notification in group)
+        
+        for outcome in await asyncio.gather(*tasks):
+            results.update(outcome)
+        return results
+    
+    async def _send_one(self, notification: Notification) -> dict[str, bool]:
+        return {notification.id: await self.send(notification)}
+    
+    async def _send_chunk(self, url: str, chunk: list[Notification]) -> dict[str, bool]:
+        """Un POST con varias notificaciones: el resultado vale para todas."""
+        ok = await self._post(
+            url,
+            {"notifications": [build_payload(n) for n in chunk]},
+            {BATCH_HEADER: str(len(chunk))},
+        )
+        return {notification.id: ok for notification in chunk}
+    
+    async def _post(self, url: str, payload: dict[str, Any], headers: dict[str, str]) -> bool:
+        host = urlsplit(url).netloc
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(self._max_per_host)
+        
+        async with limit:
+            try:
+                response = await self.client.post(url, json=payload, headers=headers)
+            except httpx.HTTPError as exc:
+                logger.warning("Webhook %s falló: %r", url, exc)
+                return False
+        return response.is_success
@@ -1,3 +1,4 @@
 from src.infrastructure.persistence.in_memory_repository import InMemoryNotificationRepository
+from src.infrastructure.persistence.sqlite_retry_queue import SQLiteRetryQueue
 
-__all__ = ["InMemoryNotificationRepository"]
+__all__ = ["InMemoryNotificationRepository", "SQLiteRetryQueue"]
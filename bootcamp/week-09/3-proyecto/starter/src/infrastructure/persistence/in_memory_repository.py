@@ -2,9 +2,37 @@
 Adapter: InMemoryNotificationRepository
 
 Implementación de NotificationRepository que almacena en memoria.
+
+Además del diccionario por ID mantiene índices secundarios:
+
+- por estado, canal y destinatario: ``clave -> {id: notificación}``
+  (alta y baja en O(1); una consulta copia los valores del bucket)
+- por fecha: lista ordenada de ``(created_at, id)`` para paginar
+  con cursor usando bisect
+
+Así get_by_status, get_by_channel y get_by_recipient no recorren
+todas las notificaciones.
 """
-from src.domain.entities.notification import Notification, NotificationStatus
-from src.domain.ports.notification_repository import NotificationRepository
+import math
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import AsyncIterator, Iterable
+from datetime import datetime
+from typing import Any, TypeVar
+
+from src.domain.entities.notification import (
+    Notification,
+    NotificationChannel,
+    NotificationStatus,
+)
+from src.domain.ports.notification_repository import (
+    NotificationPage,
+    NotificationRepository,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+K = TypeVar("K")
 
 
 class InMemoryNotificationRepository:
@@ -17,12 +45,123 @@ class InMemoryNotificationRepository:
     En producción se reemplazaría por SQLAlchemyNotificationRepository
     o similar sin cambiar el resto de la aplicación.
     
-    TODO: Implementa todos los métodos del Protocol.
+    Los índices reflejan el último save(): las entidades se guardan
+    por referencia, así que ``mark_as_sent()`` cambia el objeto pero
+    la notificación no cambia de índice hasta que se guarda (igual que
+    en una base de datos). Para saber de qué índice sacarla se guarda
+    una copia de sus claves, no se lee del objeto ya modificado.
     """
     
-    def __init__(self):
+    def __init__(self) -> None:
         """Inicializa el almacenamiento en memoria."""
         self._notifications: dict[str, Notification] = {}
+        # id -> (status, channel, recipient, created_at) del último save
+        self._keys: dict[
+            str, tuple[NotificationStatus, NotificationChannel, str, datetime]
+        ] = {}
+        self._by_status: dict[NotificationStatus, dict[str, Notification]] = {}
+        self._by_channel: dict[NotificationChannel, dict[str, Notification]] = {}
+        self._by_recipient: dict[str, dict[str, Notification]] = {}
+        self._timeline: list[tuple[datetime, str]] = []
+    
+    # ============================================
+    # Índices
+    # ============================================
+    
+    @staticmethod
+    def _put(
+        index: dict[K, dict[str, Notification]], key: K, notification: Notification
+    ) -> None:
+        bucket = index.get(key)
+        if bucket is None:
+            bucket = index[key] = {}
+        # Reasignar un ID existente no cambia su posición en el bucket
+        bucket[notification.id] = notification
+    
+    @staticmethod
+    def _discard(
+        index: dict[K, dict[str, Notification]], key: K, notification_id: str
+    ) -> None:
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(notification_id, None)
+            if not bucket:
+                # Sin claves vacías (destinatarios que ya no existen)
+                del index[key]
+    
+    def _timeline_remove(self, created_at: datetime, notification_id: str) -> None:
+        position = bisect_left(self._timeline, (created_at, notification_id))
+        del self._timeline[position]
+    
+    def _timeline_add(self, keys: list[tuple[datetime, str]]) -> None:
+        if not keys:
+            return
+        timeline = self._timeline
+        keys.sort()
+        if not timeline or keys[0] > timeline[-1]:
+            # Lo habitual: notificaciones nuevas, más recientes que todas
+            timeline.extend(keys)
+        elif len(keys) > 64:
+            # Timsort aprovecha los dos tramos ya ordenados
+            timeline.extend(keys)
+            timeline.sort()
+        else:
+            for key in keys:
+                insort(timeline, key)
+    
+    def _index(self, notification: Notification) -> tuple[datetime, str] | None:
+        """
+        Añade o mueve la notificación en los índices que hayan cambiado.
+        
+        Returns:
+            La clave que falta añadir a la lista por fecha, o None
+        """
+        notification_id = notification.id
+        status, channel = notification.status, notification.channel
+        recipient, created_at = notification.recipient, notification.created_at
+        new = (status, channel, recipient, created_at)
+        old = self._keys.get(notification_id)
+        
+        if old is None:
+            self._put(self._by_status, status, notification)
+            self._put(self._by_channel, channel, notification)
+            self._put(self._by_recipient, recipient, notification)
+            self._keys[notification_id] = new
+            return (created_at, notification_id)
+        
+        # Lo que cambie sale del bucket de su valor anterior; el resto
+        # se reasigna por si se guarda otro objeto con el mismo ID
+        old_status, old_channel, old_recipient, old_created_at = old
+        if old_status != status:
+            self._discard(self._by_status, old_status, notification_id)
+        self._put(self._by_status, status, notification)
+        if old_channel != channel:
+            self._discard(self._by_channel, old_channel, notification_id)
+        self._put(self._by_channel, channel, notification)
+        if old_recipient != recipient:
+            self._discard(self._by_recipient, old_recipient, notification_id)
+        self._put(self._by_recipient, recipient, notification)
+        self._keys[notification_id] = new
+        
+        if old_created_at != created_at:
+            self._timeline_remove(old_created_at, notification_id)
+            return (created_at, notification_id)
+        return None
+    
+    def _unindex(self, notification_id: str) -> None:
+        status, channel, recipient, created_at = self._keys.pop(notification_id)
+        self._discard(self._by_status, status, notification_id)
+        self._discard(self._by_channel, channel, notification_id)
+        self._discard(self._by_recipient, recipient, notification_id)
+        self._timeline_remove(created_at, notification_id)
+    
+    def _resolve(self, ids: Iterable[str]) -> list[Notification]:
+        notifications = self._notifications
+        return [notifications[notification_id] for notification_id in ids]
+    
+    # ============================================
+    # Escritura
+    # ============================================
     
     async def save(self, notification: Notification) -> Notification:
         """
@@ -30,14 +169,66 @@ class InMemoryNotificationRepository:
         
         Args:
             notification: Notificación a guardar
-            
+        
         Returns:
             La misma notificación (ya guardada)
-            
-        TODO: Implementar guardando en self._notifications usando notification.id como key.
         """
-        # TODO: Implementar
-        pass
+        self._notifications[notification.id] = notification
+        key = self._index(notification)
+        if key is not None:
+            insort(self._timeline, key)
+        return notification
+    
+    async def save_many(self, notifications: list[Notification]) -> list[Notification]:
+        """
+        Guarda o actualiza varias notificaciones.
+        
+        Args:
+            notifications: Notificaciones a guardar
+        
+        Returns:
+            Las mismas notificaciones
+        """
+        new_keys = []
+        for notification in notifications:
+            self._notifications[notification.id] = notification
+            key = self._index(notification)
+            if key is not None:
+                new_keys.append(key)
+        self._timeline_add(new_keys)
+        return notifications
+    
+    async def delete(self, notification_id: str) -> bool:
+        """
+        Elimina una notificación.
+        
+        Args:
+            notification_id: ID a eliminar
+        
+        Returns:
+            True si existía y se eliminó, False si no existía
+        """
+        if self._notifications.pop(notification_id, None) is None:
+            return False
+        self._unindex(notification_id)
+        return True
+    
+    async def clear(self) -> None:
+        """
+        Elimina todas las notificaciones.
+        
+        Útil para testing.
+        """
+        self._notifications.clear()
+        self._keys.clear()
+        self._by_status.clear()
+        self._by_channel.clear()
+        self._by_recipient.clear()
+        self._timeline.clear()
+    
+    # ============================================
+    # Lectura
+    # ============================================
     
     async def get_by_id(self, notification_id: str) -> Notification | None:
         """
@@ -45,56 +236,56 @@ class InMemoryNotificationRepository:
         
         Args:
             notification_id: ID a buscar
-            
+        
         Returns:
             La notificación o None si no existe
-            
-        TODO: Implementar buscando en self._notifications.
         """
-        # TODO: Implementar
-        pass
+        return self._notifications.get(notification_id)
     
     async def get_all(self) -> list[Notification]:
         """
         Obtiene todas las notificaciones.
         
         Returns:
-            Lista de todas las notificaciones
-            
-        TODO: Implementar retornando todos los valores.
+            Lista de todas las notificaciones (orden de inserción)
         """
-        # TODO: Implementar
-        pass
+        return list(self._notifications.values())
     
     async def get_by_status(self, status: NotificationStatus) -> list[Notification]:
         """
-        Obtiene notificaciones por estado.
+        Obtiene notificaciones por estado (índice, sin recorrer todas).
         
         Args:
             status: Estado a filtrar
-            
+        
         Returns:
             Lista de notificaciones con ese estado
-            
-        TODO: Implementar filtrando por notification.status.
         """
-        # TODO: Implementar
-        pass
+        return list(self._by_status.get(status, {}).values())
     
-    async def delete(self, notification_id: str) -> bool:
+    async def get_by_channel(self, channel: NotificationChannel) -> list[Notification]:
         """
-        Elimina una notificación.
+        Obtiene notificaciones por canal (índice, sin recorrer todas).
         
         Args:
-            notification_id: ID a eliminar
-            
+            channel: Canal a filtrar
+        
         Returns:
-            True si existía y se eliminó, False si no existía
-            
-        TODO: Implementar usando pop() del diccionario.
+            Lista de notificaciones de ese canal
+        """
+        return list(self._by_channel.get(channel, {}).values())
+    
+    async def get_by_recipient(self, recipient: str) -> list[Notification]:
         """
-        # TODO: Implementar
-        pass
+        Obtiene notificaciones de un destinatario (índice, sin recorrer todas).
+        
+        Args:
+            recipient: Destinatario exacto
+        
+        Returns:
+            Lista de notificaciones de ese destinatario
+        """
+        return list(self._by_recipient.get(recipient, {}).values())
     
     async def count(self) -> int:
         """
@@ -102,16 +293,157 @@ class InMemoryNotificationRepository:
         
         Returns:
             Número de notificaciones almacenadas
-            
-        TODO: Implementar retornando len() del diccionario.
         """
-        # TODO: Implementar
-        pass
+        return len(self._notifications)
     
-    async def clear(self) -> None:
+    async def count_by_status(self) -> dict[NotificationStatus, int]:
         """
-        Elimina todas las notificaciones.
+        Cuenta las notificaciones de cada estado sin recorrerlas.
         
-        Útil para testing.
+        Returns:
+            Diccionario {estado: cantidad} (solo estados con alguna)
         """
-        self._notifications.clear()
+        return {status: len(ids) for status, ids in self._by_status.items()}
+    
+    # ============================================
+    # Paginación por fecha
+    # ============================================
+    
+    async def list_page(
+        self,
+        limit: int = 50,
+        cursor: str | None = None,
+        status: NotificationStatus | None = None,
+        channel: NotificationChannel | None = None,
+        recipient: str | None = None,
+        descending: bool = False,
+    ) -> NotificationPage:
+        """
+        Obtiene una página ordenada por fecha de creación.
+        
+        Sin filtros es un slice de la lista ordenada. Con filtros se
+        elige el índice más pequeño y, según su tamaño, se ordenan sus
+        IDs o se recorre la lista por fechas saltando los que no
+        cumplen los filtros (lo que cueste menos).
+        
+        Args:
+            limit: Tamaño de la página (>= 1)
+            cursor: ``next_cursor`` de la página anterior
+            status: Filtrar por estado
+            channel: Filtrar por canal
+            recipient: Filtrar por destinatario
+            descending: Las más recientes primero
+        
+        Returns:
+            Página con las notificaciones y el cursor siguiente
+        
+        Raises:
+            ValueError: Si limit < 1 o el cursor no es válido
+        """
+        if limit < 1:
+            raise ValueError("limit debe ser >= 1")
+        after = decode_cursor(cursor) if cursor else None
+        
+        buckets = []
+        if status is not None:
+            buckets.append(self._by_status.get(status, {}))
+        if channel is not None:
+            buckets.append(self._by_channel.get(channel, {}))
+        if recipient is not None:
+            buckets.append(self._by_recipient.get(recipient, {}))
+        
+        if not buckets:
+            ids = self._slice(self._timeline, after, limit + 1, descending)
+        else:
+            ids = self._filtered(buckets, after, limit + 1, descending)
+        
+        # Se pide un elemento de más para saber si hay página siguiente
+        items = self._resolve(ids[:limit])
+        next_cursor = encode_cursor(items[-1]) if len(ids) > limit else None
+        return NotificationPage(items=items, next_cursor=next_cursor)
+    
+    async def iter_pages(
+        self,
+        page_size: int = 500,
+        **filters: Any,
+    ) -> AsyncIterator[list[Notification]]:
+        """
+        Recorre las notificaciones por fecha, una página cada vez.
+        
+        Cada página es una llamada a list_page con el cursor de la
+        anterior: no hace falta cargar el listado completo.
+        
+        Args:
+            page_size: Notificaciones por página
+            **filters: status, channel, recipient o descending
+        
+        Yields:
+            Listas de como mucho ``page_size`` notificaciones
+        """
+        cursor = None
+        while True:
+            page = await self.list_page(limit=page_size, cursor=cursor, **filters)
+            if page.items:
+                yield page.items
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+    
+    @staticmethod
+    def _slice(
+        ordered: list[tuple[datetime, str]],
+        after: tuple[datetime, str] | None,
+        count: int,
+        descending: bool,
+    ) -> list[str]:
+        """IDs de los ``count`` elementos siguientes a ``after`` en una lista ordenada."""
+        if descending:
+            end = bisect_left(ordered, after) if after else len(ordered)
+            return [key[1] for key in reversed(ordered[max(end - count, 0):end])]
+        start = bisect_right(ordered, after) if after else 0
+        return [key[1] for key in ordered[start:start + count]]
+    
+    def _filtered(
+        self,
+        buckets: list[dict[str, Notification]],
+        after: tuple[datetime, str] | None,
+        count: int,
+        descending: bool,
+    ) -> list[str]:
+        """IDs que están en todos los ``buckets``, en orden de fecha."""
+        smallest = min(buckets, key=len)
+        if not smallest:
+            return []
+        
+        # Ordenar el índice cuesta k·log k; recorrer la lista completa
+        # hasta reunir ``count`` coincidencias, unas count·n/k visitas
+        k = len(smallest)
+        if k * math.log2(k + 1) <= count * len(self._timeline) / k:
+            keys = self._keys
+            ordered = sorted(
+                (keys[notification_id][3], notification_id)
+                for notification_id in smallest
+                if all(notification_id in bucket for bucket in buckets)
+            )
+            return self._slice(ordered, after, count, descending)
+        
+        timeline = self._timeline
+        if descending:
+            end = bisect_left(timeline, after) if after else len(timeline)
+            scan = (timeline[position] for position in range(end - 1, -1, -1))
+        else:
+            start = bisect_right(timeline, after) if after else 0
+            # Por índice, como en el orden descendente: islice recorrería
+            # las ``start`` primeras entradas antes de llegar al cursor
+            scan = (timeline[position] for position in range(start, len(timeline)))
+        
+        # Se comprueba primero el índice más pequeño (descarta más)
+        first = smallest
+        others = [bucket for bucket in buckets if bucket is not smallest]
+        ids: list[str] = []
+        for _, notification_id in scan:
+            if notification_id in first and all(notification_id in b for b in others):
+                ids.append(notification_id)
+                if len(ids) == count:
+                    break
+        return ids
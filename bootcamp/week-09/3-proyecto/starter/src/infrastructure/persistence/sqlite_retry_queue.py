@@ -0,0 +1,201 @@
+"""
+Adapter: SQLiteRetryQueue
+
+Implementación de RetryQueue sobre SQLite (módulo sqlite3 estándar).
+
+La cola sobrevive a reinicios y está ordenada por ``due_at`` con un
+índice parcial: tomar los reintentos vencidos lee solo las primeras
+entradas del índice, no toda la tabla.
+"""
+import asyncio
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, ParamSpec, TypeVar
+
+from src.config import settings
+from src.domain.ports.retry_queue import RetryEntry
+
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS retry_queue (
+    notification_id TEXT PRIMARY KEY,
+    attempts INTEGER NOT NULL,
+    due_at REAL,
+    last_error TEXT,
+    dead_at REAL
+);
+CREATE INDEX IF NOT EXISTS ix_retry_queue_due
+    ON retry_queue (due_at) WHERE dead_at IS NULL;
+"""
+
+
+class SQLiteRetryQueue:
+    """
+    Adapter de la cola de reintentos en SQLite.
+
+    Implementa el Protocol RetryQueue. Las queries se ejecutan en un
+    hilo (``asyncio.to_thread``) para no bloquear el event loop; un
+    lock serializa el acceso a la conexión.
+
+    ``wait`` solo despierta con reintentos programados en este
+    proceso; si varios procesos comparten el fichero, el worker
+    debe acotar el tiempo de espera.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        """
+        Abre (o crea) la base de datos de la cola.
+
+        Args:
+            path: Fichero SQLite (":memory:" para tests)
+        """
+        self._path = str(path or settings.retry_db_path)
+        # Autocommit: las transacciones se abren con BEGIN explícito
+        self._conn = sqlite3.connect(
+            self._path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._changed = asyncio.Event()
+
+    async def _run(self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        def locked() -> T:
+            with self._lock:
+                return func(*args, **kwargs)
+        return await asyncio.to_thread(locked)
+
+    def _transaction(self, sql: str, params: list[tuple[Any, ...]]) -> None:
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(sql, params)
+
+    async def schedule(self, entries: list[RetryEntry]) -> None:
+        """Programa reintentos (upsert por notification_id)."""
+        if not entries:
+            return
+        await self._run(
+            self._transaction,
+            """
+            INSERT INTO retry_queue (notification_id, attempts, due_at, last_error, dead_at)
+            VALUES (?, ?, ?, ?, NULL)
+            ON CONFLICT (notification_id) DO UPDATE SET
+                attempts = excluded.attempts,
+                due_at = excluded.due_at,
+                last_error = excluded.last_error,
+                dead_at = NULL
+            """,
+            [(e.notification_id, e.attempts, e.due_at, e.last_error) for e in entries],
+        )
+        self._changed.set()
+
+    async def claim_due(self, now: float, limit: int, lease: float) -> list[RetryEntry]:
+        """Toma hasta ``limit`` reintentos vencidos y los aplaza ``lease`` segundos."""
+
+        def claim() -> list[tuple[str, int, str | None]]:
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                return self._conn.execute(
+                    """
+                    UPDATE retry_queue SET due_at = ?
+                    WHERE notification_id IN (
+                        SELECT notification_id FROM retry_queue
+                        WHERE dead_at IS NULL AND due_at <= ?
+                        ORDER BY due_at
+                        LIMIT ?
+                    )
+                    RETURNING notification_id, attempts, last_error
+                    """,
+                    (now + lease, now, limit),
+                ).fetchall()
+
+        return [
+            RetryEntry(notification_id=nid, attempts=attempts, due_at=now + lease, last_error=error)
+            for nid, attempts, error in await self._run(claim)
+        ]
+
+    async def remove(self, notification_ids: list[str]) -> None:
+        """Elimina reintentos."""
+        if not notification_ids:
+            return
+        await self._run(
+            self._transaction,
+            "DELETE FROM retry_queue WHERE notification_id = ?",
+            [(notification_id,) for notification_id in notification_ids],
+        )
+
+    async def dead_letter(self, entries: list[RetryEntry]) -> None:
+        """Mueve reintentos agotados a dead letter (dejan de estar en el índice)."""
+        if not entries:
+            return
+        now = time.time()
+        await self._run(
+            self._transaction,
+            """
+            INSERT INTO retry_queue (notification_id, attempts, due_at, last_error, dead_at)
+            VALUES (?, ?, NULL, ?, ?)
+            ON CONFLICT (notification_id) DO UPDATE SET
+                attempts = excluded.attempts,
+                due_at = NULL,
+                last_error = excluded.last_error,
+                dead_at = excluded.dead_at
+            """,
+            [(e.notification_id, e.attempts, e.last_error, now) for e in entries],
+        )
+
+    async def dead_letters(self) -> list[RetryEntry]:
+        """Obtiene los reintentos en dead letter, los más recientes primero."""
+
+        def fetch() -> list[tuple[str, int, str | None]]:
+            return self._conn.execute(
+                "SELECT notification_id, attempts, last_error FROM retry_queue "
+                "WHERE dead_at IS NOT NULL ORDER BY dead_at DESC"
+            ).fetchall()
+
+        return [
+            RetryEntry(notification_id=nid, attempts=attempts, due_at=None, last_error=error)
+            for nid, attempts, error in await self._run(fetch)
+        ]
+
+    async def next_due_at(self) -> float | None:
+        """Menor due_at pendiente (lectura del primer elemento del índice)."""
+
+        def fetch() -> float | None:
+            due_at: float | None = self._conn.execute(
+                "SELECT min(due_at) FROM retry_queue WHERE dead_at IS NULL"
+            ).fetchone()[0]
+            return due_at
+
+        return await self._run(fetch)
+
+    async def count(self) -> int:
+        """Cuenta los reintentos pendientes (sin dead letter)."""
+
+        def fetch() -> int:
+            pending: int = self._conn.execute(
+                "SELECT count(*) FROM retry_queue WHERE dead_at IS NULL"
+            ).fetchone()[0]
+            return pending
+
+        return await self._run(fetch)
+
+    async def wait(self, timeout: float | None) -> None:
+        """Espera a un schedule() o a que pase ``timeout``."""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._changed.clear()
+
+    def close(self) -> None:
+        """Cierra la conexión."""
+        with self._lock:
+            self._conn.close()
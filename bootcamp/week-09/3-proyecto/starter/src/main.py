@@ -1,16 +1,43 @@
 """
 Main - Punto de entrada de la aplicación.
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from src.config import settings
+from src.application.services import RetryWorker
+from src.presentation.dependencies import (
+    close_retry_queue,
+    close_senders,
+    get_notification_service,
+)
 from src.presentation.routers import notifications_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Arranca el worker de reintentos; al parar lo detiene y cierra los
+    pools de conexiones de los senders y la cola de reintentos.
+    """
+    service = get_notification_service()
+    retry_worker = RetryWorker(service) if service.retry_queue is not None else None
+    if retry_worker is not None:
+        retry_worker.start()
+    yield
+    if retry_worker is not None:
+        await retry_worker.stop()
+    await close_senders()
+    close_retry_queue()
+
+
 app = FastAPI(
     title="Notification Service",
     description="API de notificaciones multi-canal con Ports & Adapters",
     version="1.0.0",
     debug=settings.debug,
+    lifespan=lifespan,
 )
 
 # Routers
@@ -20,6 +20,7 @@ from src.infrastructure.adapters.sms_adapter import SMSNotificationSender
 from src.infrastructure.adapters.push_adapter import PushNotificationSender
 from src.infrastructure.adapters.webhook_adapter import WebhookNotificationSender
 from src.infrastructure.persistence.in_memory_repository import InMemoryNotificationRepository
+from src.infrastructure.persistence.sqlite_retry_queue import SQLiteRetryQueue
 
 
 # ============================================
@@ -33,15 +34,39 @@ _repository: NotificationRepository | None = None
 def get_repository() -> NotificationRepository:
     """
     Obtiene el repositorio (singleton).
-    
-    TODO: Implementar:
-    1. Usar variable global _repository
-    2. Si es None, crear InMemoryNotificationRepository
-    3. Retornar la instancia
     """
     global _repository
-    # TODO: Implementar
-    pass
+    if _repository is None:
+        _repository = InMemoryNotificationRepository()
+    return _repository
+
+
+# Cola de reintentos persistente (única para toda la aplicación)
+_retry_queue: SQLiteRetryQueue | None = None
+
+
+def get_retry_queue() -> SQLiteRetryQueue:
+    """
+    Obtiene la cola de reintentos (singleton).
+    
+    El RetryWorker que la procesa se arranca en el lifespan.
+    """
+    global _retry_queue
+    if _retry_queue is None:
+        _retry_queue = SQLiteRetryQueue(settings.retry_db_path)
+    return _retry_queue
+
+
+def close_retry_queue() -> None:
+    """
+    Cierra la conexión de la cola de reintentos.
+    
+    Se llama en el shutdown de la aplicación (lifespan).
+    """
+    global _retry_queue
+    if _retry_queue is not None:
+        _retry_queue.close()
+        _retry_queue = None
 
 
 # ============================================
@@ -54,17 +79,30 @@ def create_senders() -> dict[NotificationChannel, NotificationSender]:
     
     Según la configuración, puede crear diferentes tipos de senders.
     
-    TODO: Implementar:
-    1. Crear un diccionario vacío
-    2. Crear instancia de cada sender (Email, SMS, Push, Webhook)
-    3. Mapear cada sender a su canal correspondiente
-    4. Retornar el diccionario
-    
     Returns:
         Dict[NotificationChannel, NotificationSender]
     """
-    # TODO: Implementar
-    pass
+    senders: list[NotificationSender] = [
+        EmailNotificationSender(),
+        SMSNotificationSender(),
+        PushNotificationSender(),
+        WebhookNotificationSender(),
+    ]
+    return {sender.channel: sender for sender in senders}
+
+
+async def close_senders() -> None:
+    """
+    Cierra los recursos de los senders (pools de conexiones).
+    
+    Se llama en el shutdown de la aplicación (lifespan).
+    """
+    if _service is None:
+        return
+    for sender in _service.senders.values():
+        aclose = getattr(sender, "aclose", None)
+        if aclose is not None:
+            await aclose()
 
 
 # ============================================
@@ -80,13 +118,6 @@ def get_notification_service() -> NotificationService:
     
     Esta es la dependencia principal que se inyecta en los endpoints.
     
-    TODO: Implementar:
-    1. Usar variable global _service
-    2. Si es None, crear NotificationService con:
-       - senders = create_senders()
-       - repository = get_repository()
-    3. Retornar la instancia
-    
     Uso en endpoints:
         @router.post("/")
         async def send(
@@ -95,8 +126,13 @@ def get_notification_service() -> NotificationService:
             ...
     """
     global _service
-    # TODO: Implementar
-    pass
+    if _service is None:
+        _service = NotificationService(
+            senders=create_senders(),
+            repository=get_repository(),
+            retry_queue=get_retry_queue(),
+        )
+    return _service
 
 
 # ============================================
@@ -110,6 +146,7 @@ def reset_dependencies() -> None:
     Permite crear nuevas instancias en cada test.
     """
     global _repository, _service
+    close_retry_queue()
     _repository = None
     _service = None
 
@@ -3,5 +3,6 @@ Fakes para testing del proyecto.
 """
 from src.tests.fakes.fake_sender import FakeNotificationSender
 from src.tests.fakes.fake_repository import FakeNotificationRepository
+from src.tests.fakes.fake_retry_queue import FakeRetryQueue
 
-__all__ = ["FakeNotificationSender", "FakeNotificationRepository"]
+__all__ = ["FakeNotificationSender", "FakeNotificationRepository", "FakeRetryQueue"]
@@ -1,7 +1,16 @@
 """
 FakeNotificationRepository - Fake para testing.
 """
-from src.domain.entities.notification import Notification, NotificationStatus
+from src.domain.entities.notification import (
+    Notification,
+    NotificationChannel,
+    NotificationStatus,
+)
+from src.domain.ports.notification_repository import (
+    NotificationPage,
+    decode_cursor,
+    encode_cursor,
+)
 
 
 class FakeNotificationRepository:
@@ -13,12 +22,20 @@ class FakeNotificationRepository:
     
     def __init__(self):
         self._notifications: dict[str, Notification] = {}
+        self._save_many_calls = 0
     
     async def save(self, notification: Notification) -> Notification:
         """Guarda en memoria."""
         self._notifications[notification.id] = notification
         return notification
     
+    async def save_many(self, notifications: list[Notification]) -> list[Notification]:
+        """Guarda varias en memoria."""
+        self._save_many_calls += 1
+        for notification in notifications:
+            self._notifications[notification.id] = notification
+        return notifications
+    
     async def get_by_id(self, notification_id: str) -> Notification | None:
         """Obtiene por ID."""
         return self._notifications.get(notification_id)
@@ -34,6 +51,44 @@ class FakeNotificationRepository:
             if n.status == status
         ]
     
+    async def get_by_channel(self, channel: NotificationChannel) -> list[Notification]:
+        """Filtra por canal."""
+        return [n for n in self._notifications.values() if n.channel == channel]
+    
+    async def get_by_recipient(self, recipient: str) -> list[Notification]:
+        """Filtra por destinatario."""
+        return [n for n in self._notifications.values() if n.recipient == recipient]
+    
+    async def list_page(
+        self,
+        limit: int = 50,
+        cursor: str | None = None,
+        status: NotificationStatus | None = None,
+        channel: NotificationChannel | None = None,
+        recipient: str | None = None,
+        descending: bool = False,
+    ) -> NotificationPage:
+        """Filtra, ordena por (created_at, id) y corta después del cursor."""
+        items = sorted(
+            (
+                n for n in self._notifications.values()
+                if (status is None or n.status == status)
+                and (channel is None or n.channel == channel)
+                and (recipient is None or n.recipient == recipient)
+            ),
+            key=lambda n: (n.created_at, n.id),
+            reverse=descending,
+        )
+        if cursor:
+            after = decode_cursor(cursor)
+            items = [
+                n for n in items
+                if ((n.created_at, n.id) < after if descending else (n.created_at, n.id) > after)
+            ]
+        page = items[:limit]
+        next_cursor = encode_cursor(page[-1]) if len(items) > limit else None
+        return NotificationPage(items=page, next_cursor=next_cursor)
+    
     async def delete(self, notification_id: str) -> bool:
         """Elimina si existe."""
         if notification_id in self._notifications:
@@ -48,3 +103,9 @@ class FakeNotificationRepository:
     async def clear(self) -> None:
         """Limpia todo."""
         self._notifications.clear()
+    
+    # Métodos de verificación para tests
+    
+    def save_many_count(self) -> int:
+        """Retorna número de llamadas a save_many()."""
+        return self._save_many_calls
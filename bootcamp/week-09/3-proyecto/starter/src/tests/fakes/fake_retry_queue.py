@@ -0,0 +1,72 @@
+"""
+FakeRetryQueue - Fake para testing.
+"""
+import asyncio
+
+from src.domain.ports.retry_queue import RetryEntry
+
+
+class FakeRetryQueue:
+    """
+    Fake de la cola de reintentos.
+    
+    Implementación en memoria que cumple con RetryQueue.
+    """
+    
+    def __init__(self):
+        self._entries: dict[str, RetryEntry] = {}
+        self._dead: dict[str, RetryEntry] = {}
+        self._changed = asyncio.Event()
+    
+    async def schedule(self, entries: list[RetryEntry]) -> None:
+        """Programa en memoria."""
+        for entry in entries:
+            self._dead.pop(entry.notification_id, None)
+            self._entries[entry.notification_id] = entry
+        if entries:
+            self._changed.set()
+    
+    async def claim_due(self, now: float, limit: int, lease: float) -> list[RetryEntry]:
+        """Toma las vencidas por orden de due_at."""
+        due = sorted(
+            (e for e in self._entries.values() if e.due_at <= now),
+            key=lambda e: e.due_at,
+        )[:limit]
+        for entry in due:
+            entry.due_at = now + lease
+        return [RetryEntry(e.notification_id, e.attempts, e.due_at, e.last_error) for e in due]
+    
+    async def remove(self, notification_ids: list[str]) -> None:
+        """Elimina si existen."""
+        for notification_id in notification_ids:
+            self._entries.pop(notification_id, None)
+            self._dead.pop(notification_id, None)
+    
+    async def dead_letter(self, entries: list[RetryEntry]) -> None:
+        """Mueve a dead letter."""
+        for entry in entries:
+            self._entries.pop(entry.notification_id, None)
+            self._dead[entry.notification_id] = entry
+    
+    async def dead_letters(self) -> list[RetryEntry]:
+        """Retorna las de dead letter."""
+        return list(self._dead.values())
+    
+    async def next_due_at(self) -> float | None:
+        """Menor due_at pendiente."""
+        return min((e.due_at for e in self._entries.values()), default=None)
+    
+    async def wait(self, timeout: float | None) -> None:
+        """Espera a un schedule() o al timeout."""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._changed.clear()
+    
+    # Métodos de verificación para tests
+    
+    def get(self, notification_id: str) -> RetryEntry | None:
+        """Retorna la entrada pendiente o None."""
+        return self._entries.get(notification_id)
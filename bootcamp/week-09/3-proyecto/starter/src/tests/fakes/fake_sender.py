@@ -31,6 +31,7 @@ class FakeNotificationSender:
         self._channel = channel
         self._should_fail = should_fail
         self._calls: list[SendCall] = []
+        self._batch_sizes: list[int] = []
     
     @property
     def channel(self) -> NotificationChannel:
@@ -43,6 +44,7 @@ class FakeNotificationSender:
     
     async def send_batch(self, notifications: list[Notification]) -> dict[str, bool]:
         """Envía cada notificación y retorna resultados."""
+        self._batch_sizes.append(len(notifications))
         results = {}
         for notification in notifications:
             results[notification.id] = await self.send(notification)
@@ -66,9 +68,14 @@ class FakeNotificationSender:
         """Retorna la última llamada o None."""
         return self._calls[-1] if self._calls else None
     
+    def batch_sizes(self) -> list[int]:
+        """Retorna el tamaño de cada llamada a send_batch()."""
+        return self._batch_sizes.copy()
+    
     def reset(self) -> None:
         """Limpia el historial de llamadas."""
         self._calls.clear()
+        self._batch_sizes.clear()
     
     def set_should_fail(self, should_fail: bool) -> None:
         """Configura si debe fallar."""
@@ -0,0 +1,137 @@
+"""
+StubSMTPServer - Servidor SMTP local para testing (aiosmtpd).
+
+Corre en el mismo event loop que el test, en 127.0.0.1 y un puerto
+libre. Cuenta conexiones, logins y emails recibidos, y puede
+anunciar PIPELINING, rechazar destinatarios, cortar conexiones
+inactivas o simular latencia de red.
+"""
+import asyncio
+from email import message_from_bytes
+from email.message import Message
+
+from aiosmtpd.smtp import SMTP, AuthResult, LoginPassword
+
+
+class _Handler:
+    """Hooks de aiosmtpd que delegan en el stub."""
+
+    def __init__(self, stub: "StubSMTPServer"):
+        self._stub = stub
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        session.host_name = hostname
+        if self._stub.pipelining:
+            responses.insert(-1, "250-PIPELINING")
+        return responses
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self._stub.rejected:
+            return "550 Destinatario rechazado"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self._stub.messages.append(message_from_bytes(envelope.content))
+        return "250 OK"
+
+
+class _StubSMTP(SMTP):
+    """SMTP de aiosmtpd que cuenta conexiones y retrasa las respuestas."""
+
+    def __init__(self, stub: "StubSMTPServer", **kwargs):
+        super().__init__(_Handler(stub), **kwargs)
+        self._stub = stub
+
+    def connection_made(self, transport) -> None:
+        self._stub.connections += 1
+        super().connection_made(transport)
+
+    async def push(self, status) -> None:
+        if not self._stub.latency:
+            await super().push(status)
+            return
+        # Cada respuesta llega ``latency`` segundos después, sin bloquear
+        # la lectura de los siguientes comandos (como una red con RTT)
+        response = status.encode() if isinstance(status, str) else status
+        asyncio.get_running_loop().call_later(
+            self._stub.latency, self._write_later, response + b"\r\n"
+        )
+
+    def _write_later(self, response: bytes) -> None:
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.write(response)
+
+
+class StubSMTPServer:
+    """
+    Stub de servidor SMTP.
+
+    - ``pipelining``: anunciar PIPELINING en EHLO
+    - ``latency``: segundos que tarda en llegar cada respuesta
+    - ``credentials``: (usuario, contraseña) aceptados en AUTH
+    - ``idle_close``: segundos sin comandos tras los que cierra la conexión
+    - ``rejected``: destinatarios que reciben 550
+    """
+
+    def __init__(
+        self,
+        pipelining: bool = True,
+        latency: float = 0.0,
+        credentials: tuple[str, str] = ("user", "secret"),
+        idle_close: float = 300.0,
+    ):
+        self.pipelining = pipelining
+        self.latency = latency
+        self.credentials = credentials
+        self.idle_close = idle_close
+        self.rejected: set[str] = set()
+        self.connections = 0
+        self.logins = 0
+        self.messages: list[Message] = []
+        self._server: asyncio.Server | None = None
+
+    @property
+    def host(self) -> str:
+        return self._server.sockets[0].getsockname()[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self) -> "StubSMTPServer":
+        self._server = await asyncio.get_running_loop().create_server(
+            lambda: _StubSMTP(
+                self,
+                hostname="stub.local",
+                auth_require_tls=False,
+                authenticator=self._authenticate,
+                timeout=self.idle_close,
+            ),
+            "127.0.0.1",
+            0,
+        )
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> "StubSMTPServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    def _authenticate(self, server, session, envelope, mechanism, auth_data) -> AuthResult:
+        ok = isinstance(auth_data, LoginPassword) and (
+            (auth_data.login.decode(), auth_data.password.decode()) == self.credentials
+        )
+        self.logins += ok
+        return AuthResult(success=ok, handled=False)
+
+    def reset(self) -> None:
+        """Pone a cero los contadores."""
+        self.connections = self.logins = 0
+        self.messages.clear()
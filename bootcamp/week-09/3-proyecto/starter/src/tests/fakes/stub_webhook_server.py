@@ -0,0 +1,91 @@
+"""
+StubWebhookServer - Servidor HTTP/1.1 mínimo para testing.
+
+Recibe webhooks en 127.0.0.1 y cuenta conexiones TCP, peticiones y
+notificaciones (un POST en lote cuenta todas las de su cuerpo).
+Mantiene las conexiones abiertas (keep-alive) como un servidor real.
+"""
+import asyncio
+import json
+
+
+class StubWebhookServer:
+    """
+    Stub de receptor de webhooks.
+    
+    - ``latency``: segundos que tarda cada respuesta
+    - ``status_code``: código de respuesta (por defecto 200)
+    """
+    
+    def __init__(self, latency: float = 0.0, status_code: int = 200):
+        self.latency = latency
+        self.status_code = status_code
+        self.connections = 0
+        self.requests = 0
+        self.notifications = 0
+        self.bodies: list[dict] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._server: asyncio.Server | None = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+    
+    async def start(self) -> "StubWebhookServer":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+    
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+    
+    async def __aenter__(self) -> "StubWebhookServer":
+        return await self.start()
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+    
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                length = 0
+                for line in head.decode("latin-1").split("\r\n")[1:]:
+                    name, _, value = line.partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value)
+                body = json.loads(await reader.readexactly(length)) if length else {}
+                
+                self.requests += 1
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                try:
+                    if self.latency:
+                        await asyncio.sleep(self.latency)
+                finally:
+                    self.in_flight -= 1
+                self.bodies.append(body)
+                self.notifications += len(body.get("notifications", [body]))
+                
+                writer.write(
+                    f"HTTP/1.1 {self.status_code} OK\r\n"
+                    "Content-Type: application/json\r\n"
+                    "Content-Length: 2\r\n"
+                    "\r\n{}".encode()
+                )
+                await writer.drain()
+        finally:
+            writer.close()
+    
+    def reset(self) -> None:
+        """Pone a cero los contadores."""
+        self.connections = self.requests = self.notifications = 0
+        self.max_in_flight = 0
+        self.bodies.clear()
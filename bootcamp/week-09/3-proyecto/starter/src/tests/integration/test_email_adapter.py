@@ -0,0 +1,160 @@
+"""
+Tests de integración para EmailNotificationSender.
+
+Envían emails reales (SMTP sobre TCP local) a StubSMTPServer.
+"""
+import asyncio
+from email.header import decode_header, make_header
+
+import pytest
+
+from src.domain.entities.notification import Notification, NotificationChannel
+from src.infrastructure.adapters.email_adapter import EmailNotificationSender
+from src.tests.fakes.stub_smtp_server import StubSMTPServer
+
+
+@pytest.fixture
+async def server():
+    async with StubSMTPServer() as stub:
+        yield stub
+
+
+def emails(count: int) -> list[Notification]:
+    return [
+        Notification(
+            recipient=f"user{i}@example.com",
+            channel=NotificationChannel.EMAIL,
+            message=f"Mensaje {i}",
+            subject="Aviso",
+        )
+        for i in range(count)
+    ]
+
+
+def make_sender(server: StubSMTPServer, **kwargs) -> EmailNotificationSender:
+    options = {"username": "user", "password": "secret", "from_email": "noreply@example.com"}
+    options.update(kwargs)
+    return EmailNotificationSender(host=server.host, port=server.port, **options)
+
+
+class TestEmailSender:
+    """Tests para EmailNotificationSender."""
+
+    @pytest.mark.asyncio
+    async def test_send_delivers_message(self, server: StubSMTPServer):
+        """
+        Test: send autentica y entrega el email con sus cabeceras.
+        """
+        [notification] = emails(1)
+        notification.message = ".empieza por punto\n."
+
+        async with make_sender(server) as sender:
+            ok = await sender.send(notification)
+
+        assert ok
+        assert server.logins == 1
+        [message] = server.messages
+        assert message["To"] == "user0@example.com"
+        assert message["Subject"] == "Aviso"
+        assert message["X-Notification-Id"] == notification.id
+        assert message.get_payload().splitlines() == [".empieza por punto", "."]
+
+    @pytest.mark.asyncio
+    async def test_non_ascii_subject_and_body(self, server: StubSMTPServer):
+        """
+        Test: asunto y cuerpo con acentos llegan bien codificados.
+        """
+        [notification] = emails(1)
+        notification.subject = None
+        notification.message = "Pedido enviado: 3 artículos"
+
+        async with make_sender(server) as sender:
+            assert await sender.send(notification)
+
+        [message] = server.messages
+        assert str(make_header(decode_header(message["Subject"]))) == "Notificación"
+        assert message.get_payload(decode=True).decode("utf-8") == "Pedido enviado: 3 artículos"
+
+    @pytest.mark.asyncio
+    async def test_batch_reuses_authenticated_sessions(self, server: StubSMTPServer):
+        """
+        Test: varios send_batch usan las mismas sesiones (un login cada una).
+        """
+        async with make_sender(server, pool_size=2) as sender:
+            first = await sender.send_batch(emails(20))
+            second = await sender.send_batch(emails(20))
+
+        assert all(first.values()) and all(second.values())
+        assert len(server.messages) == 40
+        assert server.connections == 2
+        assert server.logins == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("pipelining", [True, False])
+    async def test_with_and_without_pipelining(self, pipelining: bool):
+        """
+        Test: el resultado es el mismo anuncie o no PIPELINING el servidor.
+        """
+        async with StubSMTPServer(pipelining=pipelining) as server:
+            server.rejected.add("user3@example.com")
+            notifications = emails(6)
+
+            async with make_sender(server, pool_size=1) as sender:
+                results = await sender.send_batch(notifications)
+
+        assert [results[n.id] for n in notifications] == [True, True, True, False, True, True]
+        assert [m["To"] for m in server.messages] == [
+            f"user{i}@example.com" for i in (0, 1, 2, 4, 5)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_recycles_after_max_messages(self, server: StubSMTPServer):
+        """
+        Test: una sesión se cierra tras max_messages_per_connection emails.
+        """
+        async with make_sender(server, pool_size=1, max_messages_per_connection=4) as sender:
+            results = await sender.send_batch(emails(10))
+
+        assert all(results.values())
+        assert server.connections == 3
+
+    @pytest.mark.asyncio
+    async def test_recycles_idle_sessions(self, server: StubSMTPServer):
+        """
+        Test: una sesión sin uso durante idle_timeout no se reutiliza.
+        """
+        async with make_sender(server, pool_size=1, idle_timeout=0.05) as sender:
+            await sender.send_batch(emails(2))
+            await asyncio.sleep(0.1)
+            await sender.send_batch(emails(2))
+
+        assert server.connections == 2
+
+    @pytest.mark.asyncio
+    async def test_reconnects_when_server_closed_idle_session(self):
+        """
+        Test: si el servidor cortó una sesión libre, se abre otra sin perder emails.
+        """
+        async with StubSMTPServer(idle_close=0.05) as server:
+            async with make_sender(server, pool_size=1) as sender:
+                await sender.send_batch(emails(2))
+                await asyncio.sleep(0.1)
+                results = await sender.send_batch(emails(3))
+
+        assert all(results.values())
+        assert len(server.messages) == 5
+        assert server.connections == 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_recipient_or_bad_credentials_fail(self, server: StubSMTPServer):
+        """
+        Test: email no válido o AUTH rechazado retornan False.
+        """
+        [notification] = emails(1)
+        bad = Notification(recipient="no-es-email", channel=NotificationChannel.EMAIL, message="x")
+
+        async with make_sender(server, password="otra") as sender:
+            results = await sender.send_batch([bad, notification])
+
+        assert results == {bad.id: False, notification.id: False}
+        assert server.messages == []
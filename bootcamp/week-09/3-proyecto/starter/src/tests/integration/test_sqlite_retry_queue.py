@@ -0,0 +1,94 @@
+"""
+Tests de integración para SQLiteRetryQueue.
+
+Usan un fichero SQLite temporal real.
+"""
+import pytest
+
+from src.domain.ports.retry_queue import RetryEntry
+from src.infrastructure.persistence.sqlite_retry_queue import SQLiteRetryQueue
+
+
+@pytest.fixture
+def queue_path(tmp_path):
+    return tmp_path / "retries.db"
+
+
+@pytest.fixture
+def retry_queue(queue_path):
+    queue = SQLiteRetryQueue(queue_path)
+    yield queue
+    queue.close()
+
+
+class TestSQLiteRetryQueue:
+    """Tests para SQLiteRetryQueue."""
+    
+    @pytest.mark.asyncio
+    async def test_claim_due_in_due_order(self, retry_queue: SQLiteRetryQueue):
+        """
+        Test: claim_due devuelve solo las vencidas, las más antiguas primero.
+        """
+        # Arrange
+        await retry_queue.schedule([
+            RetryEntry("c", attempts=1, due_at=30.0),
+            RetryEntry("a", attempts=2, due_at=10.0),
+            RetryEntry("b", attempts=1, due_at=20.0),
+            RetryEntry("d", attempts=1, due_at=99.0),
+        ])
+        
+        # Act
+        claimed = await retry_queue.claim_due(now=50.0, limit=2, lease=60.0)
+        
+        # Assert
+        assert [e.notification_id for e in claimed] == ["a", "b"]
+        assert claimed[0].attempts == 2
+        assert await retry_queue.next_due_at() == 30.0
+    
+    @pytest.mark.asyncio
+    async def test_claimed_entries_are_leased(self, retry_queue: SQLiteRetryQueue):
+        """
+        Test: una entrada tomada no vuelve a salir hasta que vence el lease.
+        """
+        # Arrange
+        await retry_queue.schedule([RetryEntry("a", attempts=1, due_at=10.0)])
+        await retry_queue.claim_due(now=10.0, limit=10, lease=60.0)
+        
+        # Act / Assert
+        assert await retry_queue.claim_due(now=20.0, limit=10, lease=60.0) == []
+        assert len(await retry_queue.claim_due(now=70.0, limit=10, lease=60.0)) == 1
+    
+    @pytest.mark.asyncio
+    async def test_dead_letter_leaves_the_queue(self, retry_queue: SQLiteRetryQueue):
+        """
+        Test: dead letter no se vuelve a tomar y se puede consultar.
+        """
+        # Arrange
+        await retry_queue.schedule([RetryEntry("a", attempts=1, due_at=10.0)])
+        
+        # Act
+        await retry_queue.dead_letter([RetryEntry("a", attempts=5, due_at=None, last_error="x")])
+        
+        # Assert
+        assert await retry_queue.claim_due(now=100.0, limit=10, lease=60.0) == []
+        assert await retry_queue.next_due_at() is None
+        [dead] = await retry_queue.dead_letters()
+        assert (dead.notification_id, dead.attempts, dead.last_error) == ("a", 5, "x")
+    
+    @pytest.mark.asyncio
+    async def test_survives_reopen(self, retry_queue: SQLiteRetryQueue, queue_path):
+        """
+        Test: los reintentos persisten al reabrir el fichero.
+        """
+        # Arrange
+        await retry_queue.schedule([RetryEntry("a", attempts=3, due_at=10.0)])
+        await retry_queue.remove(["missing"])
+        retry_queue.close()
+        
+        # Act
+        reopened = SQLiteRetryQueue(queue_path)
+        claimed = await reopened.claim_due(now=10.0, limit=10, lease=60.0)
+        reopened.close()
+        
+        # Assert
+        assert [(e.notification_id, e.attempts) for e in claimed] == [("a", 3)]
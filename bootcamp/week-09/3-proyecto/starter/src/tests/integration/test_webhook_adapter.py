@@ -0,0 +1,112 @@
+"""
+Tests de integración para WebhookNotificationSender.
+
+Envían webhooks reales (HTTP sobre TCP local) a StubWebhookServer.
+"""
+import pytest
+
+from src.domain.entities.notification import Notification, NotificationChannel
+from src.infrastructure.adapters.webhook_adapter import WebhookNotificationSender
+from src.tests.fakes.stub_webhook_server import StubWebhookServer
+
+
+@pytest.fixture
+async def server():
+    async with StubWebhookServer() as stub:
+        yield stub
+
+
+def webhooks(url: str, count: int) -> list[Notification]:
+    return [
+        Notification(recipient=url, channel=NotificationChannel.WEBHOOK, message=f"m{i}")
+        for i in range(count)
+    ]
+
+
+class TestWebhookSender:
+    """Tests para WebhookNotificationSender."""
+    
+    @pytest.mark.asyncio
+    async def test_send_posts_payload(self, server: StubWebhookServer):
+        """
+        Test: send hace POST con el JSON de la notificación.
+        """
+        [notification] = webhooks(f"{server.url}/hook", 1)
+        
+        async with WebhookNotificationSender() as sender:
+            ok = await sender.send(notification)
+        
+        assert ok
+        assert server.bodies[0]["id"] == notification.id
+        assert server.bodies[0]["message"] == "m0"
+    
+    @pytest.mark.asyncio
+    async def test_invalid_url_or_error_status_fails(self, server: StubWebhookServer):
+        """
+        Test: URL no válida o respuesta no 2xx retornan False.
+        """
+        server.status_code = 500
+        [bad_url] = webhooks("not-a-url", 1)
+        [error] = webhooks(f"{server.url}/hook", 1)
+        
+        async with WebhookNotificationSender() as sender:
+            results = await sender.send_batch([bad_url, error])
+        
+        assert results == {bad_url.id: False, error.id: False}
+        assert server.requests == 1
+    
+    @pytest.mark.asyncio
+    async def test_connections_are_reused(self, server: StubWebhookServer):
+        """
+        Test: 100 webhooks al mismo host no abren más conexiones que el límite por host.
+        """
+        server.latency = 0.005
+        
+        async with WebhookNotificationSender(max_connections_per_host=4) as sender:
+            results = await sender.send_batch(webhooks(f"{server.url}/hook", 100))
+        
+        assert all(results.values())
+        assert server.requests == 100
+        assert server.max_in_flight <= 4
+        assert server.connections <= 4
+    
+    @pytest.mark.asyncio
+    async def test_batch_urls_are_coalesced(self, server: StubWebhookServer):
+        """
+        Test: las notificaciones a una URL con lotes van en POSTs de batch_size.
+        """
+        batch_url = f"{server.url}/batch"
+        notifications = webhooks(batch_url, 25) + webhooks(f"{server.url}/single", 2)
+        
+        async with WebhookNotificationSender(batch_urls=[batch_url], batch_size=10) as sender:
+            results = await sender.send_batch(notifications)
+        
+        assert len(results) == 27 and all(results.values())
+        assert server.requests == 3 + 2
+        assert server.notifications == 27
+        sizes = sorted(len(body.get("notifications", [])) for body in server.bodies)
+        assert sizes == [0, 0, 5, 10, 10]
+    
+    @pytest.mark.asyncio
+    async def test_client_is_recreated_after_close(self, server: StubWebhookServer):
+        """
+        Test: tras aclose() el sender vuelve a funcionar con un cliente nuevo.
+        """
+        sender = WebhookNotificationSender()
+        [first, second] = webhooks(f"{server.url}/hook", 2)
+        
+        assert await sender.send(first)
+        await sender.aclose()
+        assert await sender.send(second)
+        await sender.aclose()
+        
+        assert server.connections == 2
+    
+    def test_http2_requires_h2(self, monkeypatch):
+        """
+        Test: pedir HTTP/2 sin el paquete h2 lanza RuntimeError.
+        """
+        monkeypatch.setattr("src.infrastructure.adapters.webhook_adapter.h2", None)
+        
+        with pytest.raises(RuntimeError):
+            WebhookNotificationSender(http2=True)
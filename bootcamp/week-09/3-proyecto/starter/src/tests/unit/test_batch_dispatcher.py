@@ -0,0 +1,153 @@
+"""
+Tests unitarios para BatchDispatcher.
+
+Verifican el reparto en chunks por canal, el límite de concurrencia
+de cada canal y el manejo de fallos del proveedor.
+"""
+import asyncio
+
+import pytest
+
+from src.domain.entities.notification import (
+    Notification,
+    NotificationChannel,
+    NotificationStatus,
+)
+from src.application.services.batch_dispatcher import BatchDispatcher, DispatchConfig
+from src.tests.fakes.fake_sender import FakeNotificationSender
+
+
+class SlowSender(FakeNotificationSender):
+    """Sender que tarda en cada send_batch y mide las llamadas simultáneas."""
+    
+    def __init__(self, channel: NotificationChannel, delay: float = 0.01):
+        super().__init__(channel=channel)
+        self._delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    async def send_batch(self, notifications: list[Notification]) -> dict[str, bool]:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self._delay)
+            return await super().send_batch(notifications)
+        finally:
+            self.in_flight -= 1
+
+
+class BrokenSender(FakeNotificationSender):
+    """Sender cuyo send_batch lanza una excepción."""
+    
+    async def send_batch(self, notifications: list[Notification]) -> dict[str, bool]:
+        raise ConnectionError("proveedor caído")
+
+
+def make_notifications(channel: NotificationChannel, count: int) -> list[Notification]:
+    return [
+        Notification(recipient=f"r{i}", channel=channel, message="Hola")
+        for i in range(count)
+    ]
+
+
+class TestBatchDispatcher:
+    """Tests para BatchDispatcher."""
+    
+    @pytest.mark.asyncio
+    async def test_splits_each_channel_in_chunks(self):
+        """
+        Test: cada canal se envía en chunks de chunk_size.
+        """
+        # Arrange
+        email = FakeNotificationSender(channel=NotificationChannel.EMAIL)
+        sms = FakeNotificationSender(channel=NotificationChannel.SMS)
+        dispatcher = BatchDispatcher(
+            {NotificationChannel.EMAIL: email, NotificationChannel.SMS: sms},
+            DispatchConfig(chunk_size=4),
+        )
+        notifications = (
+            make_notifications(NotificationChannel.EMAIL, 10)
+            + make_notifications(NotificationChannel.SMS, 3)
+        )
+        
+        # Act
+        await dispatcher.dispatch(notifications)
+        
+        # Assert
+        assert sorted(email.batch_sizes()) == [2, 4, 4]
+        assert sms.batch_sizes() == [3]
+        assert all(n.status == NotificationStatus.SENT for n in notifications)
+    
+    @pytest.mark.asyncio
+    async def test_respects_concurrency_per_channel(self):
+        """
+        Test: nunca hay más llamadas abiertas que el límite del canal.
+        """
+        # Arrange
+        email = SlowSender(NotificationChannel.EMAIL)
+        sms = SlowSender(NotificationChannel.SMS)
+        dispatcher = BatchDispatcher(
+            {NotificationChannel.EMAIL: email, NotificationChannel.SMS: sms},
+            DispatchConfig(
+                chunk_size=1,
+                max_concurrency=4,
+                channel_concurrency={NotificationChannel.SMS: 2},
+            ),
+        )
+        
+        # Act
+        await dispatcher.dispatch(
+            make_notifications(NotificationChannel.EMAIL, 20)
+            + make_notifications(NotificationChannel.SMS, 20)
+        )
+        
+        # Assert
+        assert email.max_in_flight == 4
+        assert sms.max_in_flight == 2
+    
+    @pytest.mark.asyncio
+    async def test_provider_error_fails_only_its_chunk(self):
+        """
+        Test: si send_batch lanza, solo su chunk queda FAILED.
+        """
+        # Arrange
+        dispatcher = BatchDispatcher({
+            NotificationChannel.EMAIL: FakeNotificationSender(channel=NotificationChannel.EMAIL),
+            NotificationChannel.SMS: BrokenSender(channel=NotificationChannel.SMS),
+        })
+        emails = make_notifications(NotificationChannel.EMAIL, 3)
+        sms = make_notifications(NotificationChannel.SMS, 3)
+        
+        # Act
+        await dispatcher.dispatch(emails + sms)
+        
+        # Assert
+        assert all(n.status == NotificationStatus.SENT for n in emails)
+        assert all(n.status == NotificationStatus.FAILED for n in sms)
+        assert sms[0].error_message == "proveedor caído"
+    
+    @pytest.mark.asyncio
+    async def test_channel_without_sender_fails(self):
+        """
+        Test: las notificaciones de un canal sin sender quedan FAILED.
+        """
+        # Arrange
+        dispatcher = BatchDispatcher({
+            NotificationChannel.EMAIL: FakeNotificationSender(channel=NotificationChannel.EMAIL),
+        })
+        push = make_notifications(NotificationChannel.PUSH, 2)
+        
+        # Act
+        await dispatcher.dispatch(push)
+        
+        # Assert
+        assert all(n.status == NotificationStatus.FAILED for n in push)
+    
+    def test_rejects_invalid_config(self):
+        """
+        Test: chunk_size y concurrencia deben ser positivos.
+        """
+        with pytest.raises(ValueError):
+            DispatchConfig(chunk_size=0)
+        with pytest.raises(ValueError):
+            DispatchConfig(channel_concurrency={NotificationChannel.SMS: 0})
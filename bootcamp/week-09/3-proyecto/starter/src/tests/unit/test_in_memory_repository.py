@@ -0,0 +1,191 @@
+"""
+Tests unitarios para InMemoryNotificationRepository.
+
+Verifican que los índices por estado, canal y destinatario siguen
+siendo correctos tras cambios de estado y borrados, y la paginación
+por fecha con cursor.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.domain.entities.notification import (
+    Notification,
+    NotificationChannel,
+    NotificationStatus,
+)
+from src.infrastructure.persistence.in_memory_repository import InMemoryNotificationRepository
+
+
+START = datetime(2026, 1, 1)
+
+
+def make(i: int, channel: NotificationChannel = NotificationChannel.EMAIL, recipient: str = "a"):
+    return Notification(
+        recipient=recipient,
+        channel=channel,
+        message=f"m{i}",
+        id=f"n{i:04d}",
+        created_at=START + timedelta(seconds=i),
+    )
+
+
+@pytest.fixture
+def repository():
+    return InMemoryNotificationRepository()
+
+
+async def collect(repository, page_size, **filters) -> list[str]:
+    ids = []
+    async for page in repository.iter_pages(page_size=page_size, **filters):
+        assert len(page) <= page_size
+        ids.extend(n.id for n in page)
+    return ids
+
+
+class TestIndexes:
+    """Tests de los índices secundarios."""
+    
+    @pytest.mark.asyncio
+    async def test_status_index_follows_transitions(self, repository):
+        """
+        Test: tras mark_as_* + save la notificación cambia de índice.
+        """
+        # Arrange
+        notifications = [make(i) for i in range(4)]
+        await repository.save_many(notifications)
+        
+        # Act
+        notifications[0].mark_as_sent()
+        notifications[1].mark_as_failed("error")
+        await repository.save_many(notifications[:2])
+        notifications[1].mark_as_sent()
+        await repository.save(notifications[1])
+        
+        # Assert
+        pending = await repository.get_by_status(NotificationStatus.PENDING)
+        sent = await repository.get_by_status(NotificationStatus.SENT)
+        assert {n.id for n in pending} == {"n0002", "n0003"}
+        assert {n.id for n in sent} == {"n0000", "n0001"}
+        assert await repository.get_by_status(NotificationStatus.FAILED) == []
+        assert await repository.count_by_status() == {
+            NotificationStatus.PENDING: 2,
+            NotificationStatus.SENT: 2,
+        }
+    
+    @pytest.mark.asyncio
+    async def test_channel_and_recipient_lookups(self, repository):
+        """
+        Test: get_by_channel y get_by_recipient usan sus índices.
+        """
+        # Arrange
+        await repository.save_many([
+            make(0, NotificationChannel.EMAIL, "x@example.com"),
+            make(1, NotificationChannel.SMS, "+34600000000"),
+            make(2, NotificationChannel.EMAIL, "x@example.com"),
+        ])
+        
+        # Act
+        sms = await repository.get_by_channel(NotificationChannel.SMS)
+        mine = await repository.get_by_recipient("x@example.com")
+        
+        # Assert
+        assert [n.id for n in sms] == ["n0001"]
+        assert [n.id for n in mine] == ["n0000", "n0002"]
+        assert await repository.get_by_recipient("nadie") == []
+    
+    @pytest.mark.asyncio
+    async def test_delete_removes_from_every_index(self, repository):
+        """
+        Test: delete quita la notificación de todos los índices.
+        """
+        # Arrange
+        notification = make(0, NotificationChannel.SMS, "r")
+        notification.mark_as_failed("error")
+        await repository.save(notification)
+        
+        # Act
+        deleted = await repository.delete(notification.id)
+        
+        # Assert
+        assert deleted
+        assert not await repository.delete(notification.id)
+        assert await repository.get_by_status(NotificationStatus.FAILED) == []
+        assert await repository.get_by_channel(NotificationChannel.SMS) == []
+        assert await repository.get_by_recipient("r") == []
+        assert (await repository.list_page()).items == []
+
+
+class TestPagination:
+    """Tests de list_page e iter_pages."""
+    
+    @pytest.mark.asyncio
+    async def test_pages_follow_creation_order(self, repository):
+        """
+        Test: las páginas salen en orden de created_at aunque se guarden desordenadas.
+        """
+        # Arrange
+        await repository.save_many([make(i) for i in reversed(range(25))])
+        
+        # Act
+        ascending = await collect(repository, 10)
+        descending = await collect(repository, 10, descending=True)
+        
+        # Assert
+        expected = [f"n{i:04d}" for i in range(25)]
+        assert ascending == expected
+        assert descending == expected[::-1]
+    
+    @pytest.mark.asyncio
+    async def test_cursor_is_stable_under_inserts(self, repository):
+        """
+        Test: insertar después de pedir una página no repite ni salta elementos.
+        """
+        # Arrange
+        await repository.save_many([make(i) for i in range(0, 20, 2)])
+        first = await repository.list_page(limit=3)
+        
+        # Act - se inserta antes y después del cursor
+        await repository.save_many([make(1), make(7)])
+        second = await repository.list_page(limit=3, cursor=first.next_cursor)
+        
+        # Assert
+        assert [n.id for n in first.items] == ["n0000", "n0002", "n0004"]
+        assert [n.id for n in second.items] == ["n0006", "n0007", "n0008"]
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("selective", [True, False])
+    async def test_filtered_pages(self, repository, selective):
+        """
+        Test: filtros combinados, tanto con índice pequeño como grande.
+        """
+        # Arrange - 1 de cada 50 (pequeño: se ordena) o 1 de cada 2 (se recorre)
+        step = 50 if selective else 2
+        notifications = [
+            make(i, NotificationChannel.SMS if i % step == 0 else NotificationChannel.EMAIL)
+            for i in range(1000)
+        ]
+        for notification in notifications[::3]:
+            notification.mark_as_failed("error")
+        await repository.save_many(notifications)
+        
+        # Act
+        ids = await collect(
+            repository, 4, channel=NotificationChannel.SMS, status=NotificationStatus.FAILED
+        )
+        
+        # Assert
+        assert ids == [
+            n.id for n in notifications
+            if n.channel == NotificationChannel.SMS and n.status == NotificationStatus.FAILED
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_invalid_arguments(self, repository):
+        """
+        Test: cursor mal formado o limit < 1 lanzan ValueError.
+        """
+        with pytest.raises(ValueError):
+            await repository.list_page(cursor="basura")
+        with pytest.raises(ValueError):
+            await repository.list_page(limit=0)
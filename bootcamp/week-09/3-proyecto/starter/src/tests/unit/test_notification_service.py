@@ -161,3 +161,91 @@ class TestNotificationService:
         
         # Assert
         assert result is None
+    
+    @pytest.mark.asyncio
+    async def test_send_batch_groups_by_channel(
+        self,
+        notification_service: NotificationService,
+        fake_email_sender: FakeNotificationSender,
+        fake_sms_sender: FakeNotificationSender,
+    ):
+        """
+        Test: send_batch usa un send_batch por canal y conserva el orden.
+        """
+        # Arrange
+        data = [
+            {"recipient": f"user{i}@example.com", "channel": "email", "message": "Hola"}
+            if i % 2 == 0
+            else {"recipient": f"+3460000000{i}", "channel": "sms", "message": "Hola"}
+            for i in range(6)
+        ]
+        
+        # Act
+        result = await notification_service.send_batch(data)
+        
+        # Assert
+        assert [n.recipient for n in result] == [d["recipient"] for d in data]
+        assert all(n.status == NotificationStatus.SENT for n in result)
+        assert fake_email_sender.batch_sizes() == [3]
+        assert fake_sms_sender.batch_sizes() == [3]
+    
+    @pytest.mark.asyncio
+    async def test_send_batch_saves_in_bulk(
+        self,
+        notification_service: NotificationService,
+        fake_repository: FakeNotificationRepository,
+    ):
+        """
+        Test: send_batch guarda con dos escrituras (PENDING y estado final).
+        """
+        # Act
+        await notification_service.send_batch([
+            {"recipient": f"user{i}@example.com", "channel": "email", "message": "Hola"}
+            for i in range(50)
+        ])
+        
+        # Assert
+        assert fake_repository.save_many_count() == 2
+        assert await fake_repository.count() == 50
+    
+    @pytest.mark.asyncio
+    async def test_send_batch_rejects_unknown_channel_before_saving(
+        self,
+        notification_service: NotificationService,
+        fake_repository: FakeNotificationRepository,
+    ):
+        """
+        Test: send_batch no guarda nada si un canal no está disponible.
+        """
+        # Act / Assert
+        with pytest.raises(ValueError):
+            await notification_service.send_batch([
+                {"recipient": "user@example.com", "channel": "email", "message": "Hola"},
+                {"recipient": "device-1", "channel": "push", "message": "Hola"},
+            ])
+        assert await fake_repository.count() == 0
+    
+    @pytest.mark.asyncio
+    async def test_retry_failed_resends_in_batch(
+        self,
+        notification_service: NotificationService,
+        fake_email_sender: FakeNotificationSender,
+    ):
+        """
+        Test: retry_failed reenvía las fallidas y actualiza su estado.
+        """
+        # Arrange
+        fake_email_sender.set_should_fail(True)
+        failed = await notification_service.send_batch([
+            {"recipient": f"user{i}@example.com", "channel": "email", "message": "Hola"}
+            for i in range(3)
+        ])
+        assert all(n.status == NotificationStatus.FAILED for n in failed)
+        fake_email_sender.set_should_fail(False)
+        
+        # Act
+        result = await notification_service.retry_failed()
+        
+        # Assert
+        assert len(result) == 3
+        assert all(n.status == NotificationStatus.SENT for n in result)
@@ -0,0 +1,222 @@
+"""
+Tests unitarios para los reintentos.
+
+Verifican el backoff de RetryPolicy, cómo NotificationService usa la
+cola de reintentos y el bucle de RetryWorker.
+"""
+import asyncio
+import random
+import time
+
+import pytest
+
+from src.domain.entities.notification import NotificationChannel, NotificationStatus
+from src.application.services.notification_service import NotificationService
+from src.application.services.retry_policy import RetryPolicy
+from src.application.services.retry_worker import RetryWorker
+from src.tests.fakes.fake_sender import FakeNotificationSender
+from src.tests.fakes.fake_repository import FakeNotificationRepository
+from src.tests.fakes.fake_retry_queue import FakeRetryQueue
+
+
+@pytest.fixture
+def retry_queue():
+    """Fixture: cola de reintentos fake."""
+    return FakeRetryQueue()
+
+
+@pytest.fixture
+def retry_service(fake_senders, fake_repository, retry_queue):
+    """Fixture: servicio con cola de reintentos y backoff fijo de 10 s."""
+    return NotificationService(
+        senders=fake_senders,
+        repository=fake_repository,
+        retry_queue=retry_queue,
+        retry_policy=RetryPolicy(max_attempts=3, base_delay=10, factor=1, max_delay=10),
+    )
+
+
+def email_batch(count: int) -> list[dict]:
+    return [
+        {"recipient": f"user{i}@example.com", "channel": "email", "message": "Hola"}
+        for i in range(count)
+    ]
+
+
+class TestRetryPolicy:
+    """Tests para RetryPolicy."""
+    
+    def test_delay_grows_exponentially_with_jitter(self):
+        """
+        Test: el retraso está entre 0 y base * factor^(n-1), con tope.
+        """
+        policy = RetryPolicy(base_delay=1, factor=2, max_delay=30, rng=random.Random(1))
+        
+        for attempts, cap in [(1, 1), (2, 2), (3, 4), (5, 16), (8, 30)]:
+            delays = [policy.delay(attempts) for _ in range(200)]
+            assert all(0 <= d <= cap for d in delays)
+            assert max(delays) > cap * 0.8
+    
+    def test_is_exhausted(self):
+        """
+        Test: tras max_attempts fallos no se reintenta.
+        """
+        policy = RetryPolicy(max_attempts=3)
+        
+        assert not policy.is_exhausted(2)
+        assert policy.is_exhausted(3)
+
+
+class TestServiceRetries:
+    """Tests de NotificationService con cola de reintentos."""
+    
+    @pytest.mark.asyncio
+    async def test_failures_are_scheduled(
+        self,
+        retry_service: NotificationService,
+        retry_queue: FakeRetryQueue,
+        fake_email_sender: FakeNotificationSender,
+    ):
+        """
+        Test: cada notificación fallida queda programada con 1 intento.
+        """
+        # Arrange
+        fake_email_sender.set_should_fail(True)
+        before = time.time()
+        
+        # Act
+        result = await retry_service.send_batch(email_batch(3))
+        
+        # Assert
+        for notification in result:
+            entry = retry_queue.get(notification.id)
+            assert entry is not None
+            assert entry.attempts == 1
+            assert before <= entry.due_at <= time.time() + 10
+    
+    @pytest.mark.asyncio
+    async def test_retry_due_only_sends_due_items(
+        self,
+        retry_service: NotificationService,
+        retry_queue: FakeRetryQueue,
+        fake_email_sender: FakeNotificationSender,
+    ):
+        """
+        Test: retry_due no toca lo que aún no ha vencido.
+        """
+        # Arrange
+        fake_email_sender.set_should_fail(True)
+        await retry_service.send_batch(email_batch(5))
+        fake_email_sender.set_should_fail(False)
+        fake_email_sender.reset()
+        
+        # Act
+        early = await retry_service.retry_due(now=time.time() - 1)
+        late = await retry_service.retry_due(now=time.time() + 11)
+        
+        # Assert
+        assert early == []
+        assert len(late) == 5
+        assert all(n.status == NotificationStatus.SENT for n in late)
+        assert fake_email_sender.call_count() == 5
+        assert await retry_queue.next_due_at() is None
+    
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_go_to_dead_letter(
+        self,
+        retry_service: NotificationService,
+        retry_queue: FakeRetryQueue,
+        fake_email_sender: FakeNotificationSender,
+        fake_repository: FakeNotificationRepository,
+    ):
+        """
+        Test: tras max_attempts fallos la notificación pasa a DEAD_LETTER.
+        """
+        # Arrange
+        fake_email_sender.set_should_fail(True)
+        [notification] = await retry_service.send_batch(email_batch(1))
+        
+        # Act - dos reintentos más (3 intentos en total)
+        now = time.time()
+        for step in (1, 2):
+            await retry_service.retry_due(now=now + 11 * step)
+        
+        # Assert
+        saved = await fake_repository.get_by_id(notification.id)
+        assert saved.status == NotificationStatus.DEAD_LETTER
+        [dead] = await retry_queue.dead_letters()
+        assert dead.notification_id == notification.id
+        assert dead.attempts == 3
+        assert await retry_queue.next_due_at() is None
+    
+    @pytest.mark.asyncio
+    async def test_deleted_notification_leaves_queue(
+        self,
+        retry_service: NotificationService,
+        retry_queue: FakeRetryQueue,
+        fake_email_sender: FakeNotificationSender,
+    ):
+        """
+        Test: borrar una notificación quita su reintento.
+        """
+        # Arrange
+        fake_email_sender.set_should_fail(True)
+        notification = await retry_service.send_notification(
+            recipient="user@example.com",
+            channel=NotificationChannel.EMAIL,
+            message="Hola",
+        )
+        assert retry_queue.get(notification.id) is not None
+        
+        # Act
+        await retry_service.delete_notification(notification.id)
+        
+        # Assert
+        assert retry_queue.get(notification.id) is None
+
+
+class TestRetryWorker:
+    """Tests para RetryWorker."""
+    
+    def test_requires_retry_queue(self, notification_service: NotificationService):
+        """
+        Test: el worker necesita un servicio con cola de reintentos.
+        """
+        with pytest.raises(ValueError):
+            RetryWorker(notification_service)
+    
+    @pytest.mark.asyncio
+    async def test_worker_wakes_when_retry_is_due(
+        self,
+        fake_senders,
+        fake_repository: FakeNotificationRepository,
+        retry_queue: FakeRetryQueue,
+        fake_email_sender: FakeNotificationSender,
+    ):
+        """
+        Test: el worker despierta al vencer el reintento y lo envía.
+        """
+        # Arrange - backoff fijo de 50 ms
+        service = NotificationService(
+            senders=fake_senders,
+            repository=fake_repository,
+            retry_queue=retry_queue,
+            retry_policy=RetryPolicy(base_delay=0.05, factor=1, max_delay=0.05,
+                                     rng=random.Random(0)),
+        )
+        worker = RetryWorker(service, max_idle=5)
+        worker.start()
+        
+        # Act
+        fake_email_sender.set_should_fail(True)
+        [notification] = await service.send_batch(email_batch(1))
+        fake_email_sender.set_should_fail(False)
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if notification.status == NotificationStatus.SENT:
+                break
+        await worker.stop()
+        
+        # Assert
+        assert notification.status == NotificationStatus.SENT
+        assert await retry_queue.next_due_at() is None
@@ -0,0 +1,99 @@
+"""
+Benchmark de latencia de entrega en broadcast_to_room.
+
+Compara el envío secuencial (un ``send_json`` tras otro) con el
+ConnectionManager basado en colas por conexión, para salas de
+10, 1k y 10k sockets simulados. El 1% de los sockets es lento.
+
+Uso (desde la carpeta starter):
+    python -m benchmarks.bench_broadcast
+"""
+
+import asyncio
+import json
+import statistics
+import time
+
+from src.manager import ConnectionManager
+
+
+NET_LATENCY = 0.0005    # Latencia de un envío normal (s)
+SLOW_LATENCY = 0.05     # Latencia de un cliente lento (s)
+SLOW_RATIO = 0.01       # Proporción de clientes lentos
+MESSAGES = 3            # Broadcasts por medición
+
+
+class SimulatedSocket:
+    """Socket simulado que registra la latencia de cada entrega."""
+
+    def __init__(self, slow: bool):
+        self.slow = slow
+        self.latencies: list[float] = []
+
+    async def accept(self):
+        pass
+
+    async def close(self, code: int = 1000):
+        pass
+
+    async def send_json(self, data):
+        await asyncio.sleep(SLOW_LATENCY if self.slow else NET_LATENCY)
+        self.latencies.append(time.perf_counter() - data["sent_at"])
+
+    async def send_text(self, text):
+        # Los outboxes envían el JSON ya codificado (EncodedMessage)
+        await self.send_json(json.loads(text))
+
+
+def make_sockets(size: int) -> list[SimulatedSocket]:
+    slow_every = max(int(1 / SLOW_RATIO), 1)
+    return [SimulatedSocket(slow=(i % slow_every == 0)) for i in range(size)]
+
+
+def p99(values: list[float]) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[98]
+
+
+async def sequential_broadcast(sockets: list[SimulatedSocket]) -> None:
+    for _ in range(MESSAGES):
+        message = {"type": "message", "sent_at": time.perf_counter()}
+        for ws in sockets:
+            await ws.send_json(message)
+
+
+async def queued_broadcast(sockets: list[SimulatedSocket]) -> None:
+    manager = ConnectionManager(send_queue_size=MESSAGES * 2)
+    for i, ws in enumerate(sockets):
+        manager.register(ws, room_id=1, user_id=i, username=f"user{i}")
+
+    for _ in range(MESSAGES):
+        message = {"type": "message", "sent_at": time.perf_counter()}
+        await manager.broadcast_to_room(1, message)
+
+    await asyncio.gather(*(outbox.drain() for outbox in manager.outboxes.values()))
+    for ws in sockets:
+        manager.disconnect(ws)
+
+
+async def measure(size: int, strategy) -> float:
+    sockets = make_sockets(size)
+    await strategy(sockets)
+    # Si un outbox aborta, la p99 saldría de una muestra vacía
+    assert all(len(ws.latencies) == MESSAGES for ws in sockets), "entregas perdidas"
+    healthy = [lat for ws in sockets if not ws.slow for lat in ws.latencies]
+    return p99(healthy) * 1000
+
+
+async def main() -> None:
+    print(f"{'sockets':>8} | {'secuencial p99 (ms)':>20} | {'colas p99 (ms)':>15}")
+    print("-" * 51)
+    for size in (10, 1_000, 10_000):
+        seq = await measure(size, sequential_broadcast)
+        queued = await measure(size, queued_broadcast)
+        print(f"{size:>8} | {seq:>20.2f} | {queued:>15.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
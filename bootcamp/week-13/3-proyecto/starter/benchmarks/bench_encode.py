@@ -0,0 +1,55 @@
+"""
+Microbenchmark del coste de codificación por broadcast.
+
+Mide cuánto tiempo se pasa codificando JSON en un broadcast según el
+tamaño de la sala: con ``send_json`` por destinatario el coste crece
+con el fan-out; con EncodedMessage se mantiene constante.
+
+Uso (desde la carpeta starter):
+    python -m benchmarks.bench_encode
+"""
+
+import json
+import time
+
+from src.encoding import encode_message, orjson
+from src.manager import create_chat_message
+
+
+ROUNDS = 20
+
+
+def per_recipient(message: dict, fan_out: int) -> None:
+    # Lo que hace WebSocket.send_json una vez por socket
+    for _ in range(fan_out):
+        json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+def encode_once(message: dict, fan_out: int) -> None:
+    encoded = encode_message(message)
+    for _ in range(fan_out):
+        encoded.text  # Cada socket reutiliza el mismo texto
+
+
+def measure(strategy, fan_out: int) -> float:
+    message = create_chat_message(1, "alice", "hola " * 40, message_id=1)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        strategy(message, fan_out)
+    return (time.perf_counter() - start) / ROUNDS * 1_000_000
+
+
+def main() -> None:
+    backend = "orjson" if orjson is not None else "json"
+    print(f"Codificador EncodedMessage: {backend}")
+    print(f"{'fan-out':>8} | {'por destinatario (µs)':>22} | {'una vez (µs)':>13}")
+    print("-" * 50)
+    for fan_out in (10, 100, 1_000, 5_000):
+        print(
+            f"{fan_out:>8} | {measure(per_recipient, fan_out):>22.1f} | "
+            f"{measure(encode_once, fan_out):>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark de handshakes por segundo con y sin token_cache.
+
+Simula una tormenta de reconexiones: 100 usuarios reconectando una y
+otra vez con su mismo token. Sin cache cada handshake decodifica el
+JWT y carga el usuario de SQLite.
+
+Uso (desde la carpeta starter):
+    python -m benchmarks.bench_handshake
+"""
+
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.auth import authenticate_token, create_access_token, decode_token, get_user_by_id
+from src.database import Base
+from src.models import User
+from src.token_cache import token_cache
+
+
+USERS = 100
+HANDSHAKES = 20_000
+
+
+def setup_db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    users = [User(username=f"user{i}", email=f"u{i}@x.com", hashed_password="x") for i in range(USERS)]
+    db.add_all(users)
+    db.commit()
+    tokens = [create_access_token({"sub": str(u.id), "username": u.username}) for u in users]
+    return db, tokens
+
+
+def without_cache(db, token: str):
+    token_data = decode_token(token)
+    return get_user_by_id(db, token_data.user_id)
+
+
+def with_cache(db, token: str):
+    return authenticate_token(db, token)
+
+
+def measure(strategy, db, tokens: list[str]) -> float:
+    token_cache.clear()
+    start = time.perf_counter()
+    for i in range(HANDSHAKES):
+        assert strategy(db, tokens[i % len(tokens)]) is not None
+        # Evitar que el identity map de la sesión haga de cache
+        db.expunge_all()
+    return HANDSHAKES / (time.perf_counter() - start)
+
+
+def main() -> None:
+    db, tokens = setup_db()
+    plain = measure(without_cache, db, tokens)
+    cached = measure(with_cache, db, tokens)
+    print(f"Handshakes/s sin cache: {plain:>10,.0f}")
+    print(f"Handshakes/s con cache: {cached:>10,.0f}  (x{cached / plain:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,19 +4,21 @@ Autenticación y autorización JWT.
 TODO: Completar las funciones marcadas con TODO
 """
 
-from datetime import datetime, timedelta
-from typing import Annotated
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, Any
 
 from fastapi import Depends, HTTPException, status, Query
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
 
 from .config import settings
 from .database import get_db
 from .models import User
 from .schemas import TokenData
+from .token_cache import AuthenticatedUser, token_cache
 
 
 # Password hashing
@@ -40,8 +42,6 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     """
     Crea un token JWT.
     
-    TODO: Implementar la creación del token
-    
     Args:
         data: Datos a incluir en el token
         expires_delta: Tiempo de expiración
@@ -49,32 +49,43 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     Returns:
         Token JWT codificado
     """
-    # TODO: Implementar
-    # 1. Copiar data para no modificar original
-    # 2. Calcular tiempo de expiración
-    # 3. Añadir "exp" al payload
-    # 4. Codificar con jwt.encode()
-    pass
+    to_encode = data.copy()
+    expire = datetime.now(timezone.utc) + (
+        expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    to_encode["exp"] = expire
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def decode_claims(token: str) -> dict[str, Any] | None:
+    """Verifica firma y expiración; retorna los claims o None."""
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
 
 
 def decode_token(token: str) -> TokenData | None:
     """
     Decodifica y valida un token JWT.
     
-    TODO: Implementar la decodificación del token
-    
     Args:
         token: Token JWT
         
     Returns:
         TokenData si es válido, None si no
     """
-    # TODO: Implementar
-    # 1. Decodificar con jwt.decode()
-    # 2. Extraer user_id y username
-    # 3. Retornar TokenData
-    # 4. Manejar JWTError retornando None
-    pass
+    claims = decode_claims(token)
+    return token_data_from_claims(claims) if claims is not None else None
+
+
+def token_data_from_claims(claims: dict[str, Any]) -> TokenData | None:
+    """Extrae user_id (claim "sub") y username de claims ya verificados."""
+    try:
+        user_id = int(claims["sub"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return TokenData(user_id=user_id, username=claims.get("username"))
 
 
 def get_user_by_username(db: Session, username: str) -> User | None:
@@ -128,22 +139,81 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    # TODO: Implementar
-    # 1. Decodificar token
-    # 2. Obtener usuario de DB
-    # 3. Retornar usuario o raise exception
-    pass
+    token_data = decode_token(token)
+    if token_data is None:
+        raise credentials_exception
+    
+    user = get_user_by_id(db, token_data.user_id)
+    if user is None:
+        raise credentials_exception
+    return user
+
+
+def authenticate_token(db: Session, token: str) -> AuthenticatedUser | None:
+    """
+    Verifica un token para un handshake WebSocket/SSE usando token_cache.
+    
+    Con cache hit no se decodifica el JWT ni se consulta la DB.
+    
+    Returns:
+        Proyección del usuario o None si el token no es válido
+    """
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+    
+    claims = decode_claims(token)
+    token_data = token_data_from_claims(claims) if claims is not None else None
+    if token_data is None:
+        return None
+    
+    user = get_user_by_id(db, token_data.user_id)
+    if user is None:
+        return None
+    
+    authenticated = AuthenticatedUser(id=user.id, username=user.username)
+    token_cache.put(token, authenticated, token_exp=claims.get("exp"))
+    return authenticated
 
 
 async def get_current_user_ws(
     token: str = Query(...),
     db: Session = Depends(get_db)
-) -> User:
+) -> AuthenticatedUser:
     """
     Obtiene usuario actual para WebSocket (token en query).
     
-    TODO: Implementar - similar a get_current_user pero para WS
+    A diferencia de get_current_user usa token_cache.
     """
-    # TODO: Implementar
-    # Similar a get_current_user pero recibe token de query param
-    pass
+    user = authenticate_token(db, token)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials"
+        )
+    return user
+
+
+# Clave de session.info con los ids de usuarios modificados en la transacción
+_CHANGED_USERS = "token_cache_changed_users"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _collect_changed_user(mapper, connection, target: User) -> None:
+    """Anota el usuario modificado; el cache se invalida al confirmar."""
+    # after_update/after_delete llegan en el flush: invalidar aquí dejaría
+    # que otra petición volviese a cachear el usuario antes del commit
+    object_session(target).info.setdefault(_CHANGED_USERS, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_cached_tokens(session: Session) -> None:
+    """Un usuario modificado o borrado no debe seguir autenticado desde el cache."""
+    for user_id in session.info.pop(_CHANGED_USERS, ()):
+        token_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session: Session) -> None:
+    session.info.pop(_CHANGED_USERS, None)
@@ -0,0 +1,310 @@
+"""
+Backplane pub/sub entre workers.
+
+Con varios workers de uvicorn cada proceso solo conoce sus propios
+sockets. El backplane reenvía los broadcasts a los demás workers para
+que cada uno los entregue a sus conexiones locales.
+
+Implementaciones:
+    - InProcessBackplane: workers simulados en el mismo proceso (tests)
+    - UnixSocketBackplane: broker local por Unix socket (varios procesos
+      en una misma máquina, sin dependencias externas)
+    - RedisBackplane: Redis pub/sub (varias máquinas)
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable
+
+from .encoding import dumps
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis es opcional
+    aioredis = None
+
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[dict[str, Any]], Awaitable[None]]
+
+# Espera entre reintentos de conexión con el broker (se duplica hasta el máximo)
+RECONNECT_MIN_DELAY = 0.5
+RECONNECT_MAX_DELAY = 30.0
+
+
+class Backplane(ABC):
+    """
+    Interfaz común de los backplanes.
+
+    Cada mensaje viaja en un sobre ``{"origin", "topic", "data"}``.
+    El worker que publica ya entregó localmente, así que ignora sus
+    propios mensajes al recibirlos.
+    """
+
+    def __init__(self):
+        self.worker_id = uuid.uuid4().hex
+        self._handlers: dict[str, Handler] = {}
+        self.reconnect_min_delay = RECONNECT_MIN_DELAY
+        self.reconnect_max_delay = RECONNECT_MAX_DELAY
+
+    def subscribe(self, topic: str, handler: Handler) -> None:
+        """Registra el handler que recibe los mensajes de otros workers."""
+        self._handlers[topic] = handler
+
+    async def publish(self, topic: str, data: dict[str, Any]) -> None:
+        """
+        Publica un mensaje para el resto de workers.
+
+        Si el broker no está disponible el mensaje se pierde (solo lo
+        reciben los sockets locales) y se registra en el log.
+        """
+        try:
+            await self._send(dumps({"origin": self.worker_id, "topic": topic, "data": data}))
+        except Exception:
+            logger.warning("Backplane: no se pudo publicar en %r", topic, exc_info=True)
+
+    async def start(self) -> None:
+        """Conecta con el broker."""
+
+    async def stop(self) -> None:
+        """Cierra la conexión con el broker."""
+
+    @abstractmethod
+    async def _send(self, text: str) -> None:
+        """Envía un sobre ya codificado al broker."""
+
+    async def _dispatch(self, text: str | bytes) -> None:
+        # Un mensaje defectuoso no debe detener la escucha
+        try:
+            envelope = json.loads(text)
+            if envelope.get("origin") == self.worker_id:
+                return
+
+            handler = self._handlers.get(envelope.get("topic"))
+            if handler is None:
+                return
+
+            await handler(envelope["data"])
+        except Exception:
+            logger.exception("Backplane: mensaje descartado: %.200r", text)
+
+    async def _connect(self) -> None:
+        """Abre la conexión con el broker (los backplanes con red la implementan)."""
+
+    async def _listen(self) -> None:
+        """Entrega los mensajes recibidos hasta que el broker cierra la conexión."""
+
+    async def _run(self) -> None:
+        """
+        Escucha al broker y reconecta si la conexión se corta.
+
+        Los reintentos esperan con backoff exponencial, de
+        ``reconnect_min_delay`` a ``reconnect_max_delay`` segundos.
+        """
+        while True:
+            try:
+                await self._listen()
+                logger.warning("Backplane: el broker cerró la conexión")
+            except Exception:
+                logger.exception("Backplane: error escuchando al broker")
+
+            delay = self.reconnect_min_delay
+            while True:
+                await asyncio.sleep(delay)
+                try:
+                    await self._connect()
+                except Exception as exc:
+                    delay = min(delay * 2, self.reconnect_max_delay)
+                    logger.warning(
+                        "Backplane: reconexión fallida (%s), reintento en %.1fs", exc, delay
+                    )
+                else:
+                    logger.info("Backplane: reconectado")
+                    break
+
+
+class InProcessBroker:
+    """Broker en memoria compartido por varios InProcessBackplane."""
+
+    def __init__(self):
+        self.members: set["InProcessBackplane"] = set()
+
+    async def relay(self, text: str) -> None:
+        for member in list(self.members):
+            await member._dispatch(text)
+
+
+class InProcessBackplane(Backplane):
+    """
+    Backplane dentro del mismo proceso.
+
+    Sin broker compartido no reenvía nada (un solo worker); con un
+    InProcessBroker común simula varios workers en tests.
+    """
+
+    def __init__(self, broker: InProcessBroker | None = None):
+        super().__init__()
+        self.broker = broker or InProcessBroker()
+
+    async def start(self) -> None:
+        self.broker.members.add(self)
+
+    async def stop(self) -> None:
+        self.broker.members.discard(self)
+
+    async def _send(self, text: str) -> None:
+        await self.broker.relay(text)
+
+
+class UnixSocketBroker:
+    """
+    Broker local que reenvía cada línea a todos los clientes conectados.
+
+    Se arranca una vez por máquina, antes de los workers:
+        python -m src.backplane /tmp/chat-backplane.sock
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._clients: set[asyncio.StreamWriter] = set()
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for writer in list(self._clients):
+            writer.close()
+        self._clients.clear()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        await self._server.serve_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._clients.add(writer)
+        try:
+            while line := await reader.readline():
+                for client in list(self._clients):
+                    if client is not writer:
+                        client.write(line)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+
+class UnixSocketBackplane(Backplane):
+    """Cliente del UnixSocketBroker (JSON delimitado por líneas)."""
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        await self._connect()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        if self._writer is not None:
+            self._writer.close()
+
+    async def _connect(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+
+    async def _send(self, text: str) -> None:
+        if self._writer.is_closing():
+            raise ConnectionError("sin conexión con el broker")
+        self._writer.write(text.encode() + b"\n")
+        await self._writer.drain()
+
+    async def _listen(self) -> None:
+        while line := await self._reader.readline():
+            await self._dispatch(line)
+        # El broker se cerró: los publish fallan hasta reconectar
+        self._writer.close()
+
+
+class RedisBackplane(Backplane):
+    """Backplane sobre Redis pub/sub."""
+
+    def __init__(self, url: str, channel: str = "chat:backplane"):
+        if aioredis is None:
+            raise RuntimeError("RedisBackplane requiere el paquete 'redis'")
+        super().__init__()
+        self.url = url
+        self.channel = channel
+        self._redis = None
+        self._pubsub = None
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._redis = aioredis.from_url(self.url)
+        await self._connect()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    async def _connect(self) -> None:
+        if self._pubsub is not None:
+            # La conexión anterior puede estar rota; basta con soltarla
+            pubsub, self._pubsub = self._pubsub, None
+            with contextlib.suppress(Exception):
+                await pubsub.aclose()
+        self._pubsub = self._redis.pubsub()
+        await self._pubsub.subscribe(self.channel)
+
+    async def _send(self, text: str) -> None:
+        await self._redis.publish(self.channel, text)
+
+    async def _listen(self) -> None:
+        async for message in self._pubsub.listen():
+            if message["type"] == "message":
+                await self._dispatch(message["data"])
+
+
+def create_backplane(url: str) -> Backplane:
+    """
+    Crea un backplane a partir de una URL.
+
+    Examples:
+        memory://
+        unix:///tmp/chat-backplane.sock
+        redis://localhost:6379/0
+    """
+    if url.startswith("memory://"):
+        return InProcessBackplane()
+    if url.startswith("unix://"):
+        return UnixSocketBackplane(url.removeprefix("unix://"))
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBackplane(url)
+    raise ValueError(f"Backplane no soportado: {url}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "/tmp/chat-backplane.sock"
+    asyncio.run(UnixSocketBroker(path).serve_forever())
@@ -16,6 +16,34 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     
+    # Cache de tokens verificados para handshakes WebSocket/SSE. Con varios
+    # workers el TTL es el retraso máximo con el que se aplica un cambio de usuario
+    TOKEN_CACHE_SIZE: int = 10_000
+    TOKEN_CACHE_TTL: float = 60  # segundos, nunca más allá del exp del token
+    
+    # WebSocket: cola de salida por conexión
+    WS_SEND_QUEUE_SIZE: int = 100
+    WS_OVERFLOW_POLICY: str = "drop_oldest"  # drop_oldest, drop_newest, coalesce, disconnect
+    
+    # SSE: cola acotada por suscriptor
+    NOTIFICATION_QUEUE_SIZE: int = 100
+    NOTIFICATION_OVERFLOW_POLICY: str = "drop_oldest"  # drop_oldest, drop_newest, coalesce, disconnect
+    NOTIFICATION_QUEUE_IDLE_SECONDS: float = 300
+    NOTIFICATION_REPLAY_SIZE: int = 200  # Eventos guardados por usuario para Last-Event-ID
+    
+    # Persistencia write-behind de mensajes
+    MESSAGE_BATCH_SIZE: int = 100
+    MESSAGE_FLUSH_INTERVAL: float = 0.05  # segundos
+    MESSAGE_DURABILITY: str = "sync"  # sync (espera el commit del lote) o async
+    MESSAGE_MAX_PENDING: int = 10_000
+    
+    # Cache de historial por sala
+    MESSAGE_CACHE_SIZE: int = 200  # Últimos mensajes por sala
+    MESSAGE_CACHE_MAX_ROOMS: int = 1000
+    
+    # Backplane entre workers: memory://, unix:///ruta.sock o redis://host:6379/0
+    BACKPLANE_URL: str = "memory://"
+    
     # App
     APP_NAME: str = "Realtime Chat"
     DEBUG: bool = True
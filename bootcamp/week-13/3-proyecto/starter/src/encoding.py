@@ -0,0 +1,49 @@
+"""
+Mensajes pre-codificados para fan-out.
+
+Un broadcast a una sala de N usuarios codificaba el mismo dict N veces
+(una por ``send_json``). ``EncodedMessage`` guarda el JSON ya generado
+para enviarlo tal cual a todos los destinatarios.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional
+    orjson = None
+
+
+def dumps(data: Any) -> str:
+    """Codifica a JSON compacto, con orjson si está instalado."""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    # Mismo formato que WebSocket.send_json de Starlette
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+@dataclass(frozen=True, slots=True)
+class EncodedMessage:
+    """
+    Mensaje codificado una sola vez.
+
+    Attributes:
+        data: Dict original (para inspección, p.ej. coalescencia)
+        text: JSON listo para enviar
+    """
+
+    data: dict[str, Any] = field(repr=False)
+    text: str
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Acceso de solo lectura al dict original."""
+        return self.data.get(key, default)
+
+
+def encode_message(message: dict[str, Any] | EncodedMessage) -> EncodedMessage:
+    """Codifica un mensaje si aún no lo está."""
+    if isinstance(message, EncodedMessage):
+        return message
+    return EncodedMessage(data=message, text=dumps(message))
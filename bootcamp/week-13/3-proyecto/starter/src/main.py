@@ -5,9 +5,11 @@ TODO: Completar los endpoints marcados con TODO
 """
 
 from contextlib import asynccontextmanager
+from datetime import datetime
+from functools import partial
 from typing import Annotated
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends, HTTPException, status, Request, Query
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Depends, HTTPException, status, Request, Query, Header, Response
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.security import OAuth2PasswordRequestForm
@@ -20,10 +22,14 @@ from .models import User, Room
 from .schemas import UserCreate, UserResponse, Token, RoomCreate, RoomResponse, RoomWithUsers
 from .auth import (
     create_access_token, authenticate_user, get_current_user,
-    get_user_by_username, get_user_by_email, get_current_user_ws, decode_token
+    get_user_by_username, get_user_by_email, get_current_user_ws,
+    decode_token, authenticate_token
 )
 from .manager import manager, create_chat_message, create_system_message, create_user_list_message
 from .notifications import notification_service
+from .backplane import InProcessBackplane, create_backplane
+from .message_sink import message_sink
+from .message_cache import message_cache
 from . import services
 
 
@@ -38,8 +44,22 @@ async def lifespan(app: FastAPI):
     services.get_or_create_default_room(db)
     db.close()
     
+    # Backplane compartido para que los broadcasts lleguen a todos los workers
+    backplane = create_backplane(settings.BACKPLANE_URL)
+    manager.attach_backplane(backplane)
+    notification_service.attach_backplane(backplane)
+    await backplane.start()
+    if not isinstance(backplane, InProcessBackplane):
+        # Otros workers escriben mensajes que el cache local no vería
+        message_cache.disable()
+    
+    # Persistencia en bloque de mensajes de chat
+    await message_sink.start()
+    
     yield
-    # Shutdown
+    # Shutdown: volcar los mensajes pendientes antes de salir
+    await message_sink.stop()
+    await backplane.stop()
 
 
 app = FastAPI(
@@ -135,16 +155,18 @@ async def create_room(
 async def list_rooms(
     db: Session = Depends(get_db)
 ):
-    """
-    Lista todas las salas con usuarios online.
-    
-    TODO: Implementar
-    """
-    # TODO: Implementar
-    # 1. Obtener salas de DB
-    # 2. Para cada sala, agregar online_users del manager
-    # 3. Retornar lista
-    pass
+    """Lista todas las salas con usuarios online."""
+    return [
+        RoomWithUsers(
+            id=room.id,
+            name=room.name,
+            description=room.description,
+            created_at=room.created_at,
+            created_by_id=room.created_by_id,
+            online_users=manager.get_room_usernames(room.id)
+        )
+        for room in services.get_rooms(db)
+    ]
 
 
 @app.get("/rooms/{room_id}", response_model=RoomWithUsers)
@@ -170,27 +192,62 @@ async def get_room(
 @app.get("/rooms/{room_id}/messages")
 async def get_room_messages(
     room_id: int,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
+    before: str | None = Query(None, description="Cursor de X-Next-Cursor"),
     db: Session = Depends(get_db)
 ):
     """
-    Obtiene historial de mensajes de una sala.
+    Obtiene historial de mensajes de una sala (más recientes primero).
     
-    TODO: Implementar
+    Paginación keyset: la cabecera X-Next-Cursor trae el cursor para
+    pedir la página anterior con ?before=. Las salas activas se sirven
+    desde message_cache sin consultar la DB. ``skip`` se mantiene por
+    compatibilidad (paginación por offset, siempre contra la DB).
     """
-    # TODO: Implementar
-    # 1. Verificar que sala existe
-    # 2. Obtener mensajes
-    # 3. Convertir a dict con username
-    # 4. Retornar
-    pass
+    if skip:
+        if not services.get_room(db, room_id):
+            raise HTTPException(status_code=404, detail="Room not found")
+        messages = services.get_room_messages(db, room_id, skip=skip, limit=limit)
+        return [services.get_message_with_username(m) for m in messages]
+    
+    cursor = None
+    if before is not None:
+        cursor = services.decode_cursor(before)
+        if cursor is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    page = message_cache.get_page(room_id, cursor, limit)
+    if page is None:
+        if message_cache.enabled and room_id not in message_cache:
+            # Primera lectura de la sala: calentar el cache
+            if not services.get_room(db, room_id):
+                raise HTTPException(status_code=404, detail="Room not found")
+            recent = services.get_room_messages_before(db, room_id, limit=message_cache.size)
+            message_cache.warm(room_id, [services.get_message_with_username(m) for m in recent])
+            page = message_cache.get_page(room_id, cursor, limit)
+        if page is None:
+            messages = services.get_room_messages_before(db, room_id, cursor, limit)
+            page = [services.get_message_with_username(m) for m in messages]
+    
+    if len(page) == limit:
+        oldest = page[-1]
+        response.headers["X-Next-Cursor"] = services.encode_cursor(
+            datetime.fromisoformat(oldest["created_at"]), oldest["id"]
+        )
+    return page
 
 
 # ============================================
 # WebSocket Chat
 # ============================================
 
+def cache_written_message(room_id: int, message: dict, message_id: int) -> None:
+    """Callback de message_sink: añade al cache el mensaje ya confirmado en la DB."""
+    message_cache.append(room_id, {"id": message_id, **message})
+
+
 @app.websocket("/ws/chat/{room_id}")
 async def websocket_chat(
     websocket: WebSocket,
@@ -201,22 +258,89 @@ async def websocket_chat(
     """
     WebSocket para chat en una sala.
     
-    TODO: Implementar el endpoint completo
+    Los mensajes se persisten a través de message_sink (insert en bloque
+    fuera del event loop) en lugar de un commit por mensaje.
     """
-    # TODO: Implementar
-    # 1. Validar token
-    # 2. Obtener usuario
-    # 3. Verificar que sala existe
-    # 4. Conectar al manager
-    # 5. Enviar mensaje de bienvenida
-    # 6. Notificar a la sala que usuario entró
-    # 7. Enviar lista de usuarios
-    # 8. Loop para recibir mensajes:
-    #    - type "message": guardar en DB, broadcast
-    #    - type "typing": broadcast typing indicator
-    #    - type "ping": responder pong
-    # 9. En desconexión: cleanup y notificar
-    pass
+    # Handshake con token_cache: sin decodificar ni consultar la DB en reconexiones
+    user = authenticate_token(db, token)
+    room = services.get_room(db, room_id) if user else None
+    if user is None or room is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    # Datos planos: la sesión no se usa dentro del loop
+    user_id, username = user.id, user.username
+    room_name = room.name
+    
+    await manager.connect(websocket, room_id, user_id, username)
+    await manager.send_personal(
+        websocket,
+        create_system_message("welcome", {"room_id": room_id, "room_name": room_name})
+    )
+    await manager.broadcast_to_room(
+        room_id,
+        create_system_message("user_joined", {"username": username}),
+        exclude=websocket
+    )
+    await manager.broadcast_to_room(
+        room_id,
+        create_user_list_message(room_id, manager.get_room_usernames(room_id))
+    )
+    await notification_service.notify_user_joined(room_id, room_name, username)
+    
+    try:
+        while True:
+            data = await websocket.receive_json()
+            msg_type = data.get("type")
+            
+            if msg_type == "message":
+                content = str(data.get("content", "")).strip()[:1000]
+                if not content:
+                    continue
+                created_at = datetime.utcnow()
+                # El cache se actualiza tras el commit, también en modo async
+                message_id = await message_sink.submit(
+                    room_id, user_id, content, created_at=created_at,
+                    on_written=partial(cache_written_message, room_id, {
+                        "content": content,
+                        "created_at": created_at.isoformat(),
+                        "user_id": user_id,
+                        "room_id": room_id,
+                        "username": username
+                    })
+                )
+                await manager.broadcast_to_room(
+                    room_id,
+                    create_chat_message(user_id, username, content, message_id)
+                )
+                await notification_service.notify_new_message(
+                    room_id, room_name, username, content
+                )
+            
+            elif msg_type == "typing":
+                await manager.broadcast_to_room(
+                    room_id,
+                    {"type": "typing", "user_id": user_id, "username": username},
+                    exclude=websocket
+                )
+            
+            elif msg_type == "ping":
+                await manager.send_personal(websocket, {"type": "pong"})
+    
+    except WebSocketDisconnect:
+        pass
+    
+    finally:
+        if manager.disconnect(websocket) is not None:
+            await manager.broadcast_to_room(
+                room_id,
+                create_system_message("user_left", {"username": username})
+            )
+            await manager.broadcast_to_room(
+                room_id,
+                create_user_list_message(room_id, manager.get_room_usernames(room_id))
+            )
+            await notification_service.notify_user_left(room_id, room_name, username)
 
 
 # ============================================
@@ -226,17 +350,27 @@ async def websocket_chat(
 @app.get("/notifications")
 async def sse_notifications(
     token: str = Query(...),
+    last_event_id: Annotated[str | None, Header(alias="Last-Event-ID")] = None,
     db: Session = Depends(get_db)
 ):
     """
     Endpoint SSE para notificaciones.
     
-    TODO: Implementar
+    Si el navegador reconecta con la cabecera Last-Event-ID solo se
+    reenvían los eventos perdidos (o un evento "resync" si ya no están).
     """
-    # TODO: Implementar
-    # 1. Validar token
-    # 2. Retornar EventSourceResponse con notification_service.subscribe()
-    pass
+    user = authenticate_token(db, token)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials"
+        )
+    
+    resume_from = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    
+    return EventSourceResponse(
+        notification_service.subscribe(user.id, last_event_id=resume_from)
+    )
 
 
 # ============================================
@@ -249,6 +383,7 @@ async def health_check():
     return {
         "status": "healthy",
         "service": settings.APP_NAME,
-        "online_users": sum(manager.get_user_count(rid) for rid in manager.rooms),
-        "notification_subscribers": notification_service.get_subscribers_count()
+        "online_users": manager.get_connection_count(),
+        "notification_subscribers": notification_service.get_subscribers_count(),
+        "notification_queues": notification_service.get_queue_stats()
     }
@@ -1,7 +1,5 @@
 """
 Connection Manager para WebSocket.
-
-TODO: Completar la clase ConnectionManager
 """
 
 from fastapi import WebSocket
@@ -9,20 +7,59 @@ from typing import Any
 from datetime import datetime
 from collections import defaultdict
 
+from .backplane import Backplane
+from .config import settings
+from .encoding import EncodedMessage, encode_message
+from .outbox import OverflowPolicy, SocketOutbox
+
 
 class ConnectionManager:
     """
     Gestor de conexiones WebSocket con soporte para salas.
     
-    TODO: Implementar todos los métodos marcados
+    Usa estructuras indexadas para que connect, disconnect y las
+    consultas de presencia sean O(1) aunque una sala tenga miles
+    de conexiones. Cada conexión tiene su propio SocketOutbox, así
+    que un broadcast solo encola y nunca espera a la red.
     """
     
-    def __init__(self):
-        # Conexiones por sala: {room_id: [(websocket, user_id, username), ...]}
-        self.rooms: dict[int, list[tuple[WebSocket, int, str]]] = defaultdict(list)
+    def __init__(
+        self,
+        send_queue_size: int = settings.WS_SEND_QUEUE_SIZE,
+        overflow_policy: OverflowPolicy | str = settings.WS_OVERFLOW_POLICY
+    ):
+        self.send_queue_size = send_queue_size
+        self.overflow_policy = OverflowPolicy(overflow_policy)
+        
+        # Conexiones por sala: {room_id: {websocket, ...}}
+        self.rooms: dict[int, set[WebSocket]] = defaultdict(set)
         
         # Mapeo inverso para cleanup: {websocket: (room_id, user_id, username)}
         self.connections: dict[WebSocket, tuple[int, int, str]] = {}
+        
+        # Índice de usuario: {user_id: {websocket, ...}} (todas las salas)
+        self.user_connections: dict[int, set[WebSocket]] = defaultdict(set)
+        
+        # Miembros por sala: {room_id: {user_id: {websocket, ...}}}
+        # Un usuario puede tener varias pestañas abiertas en la misma sala
+        self.room_members: dict[int, dict[int, set[WebSocket]]] = defaultdict(dict)
+        
+        # Snapshot de usernames por sala, invalidado en cada cambio
+        self._usernames_cache: dict[int, list[str]] = {}
+        
+        # Cola de salida por conexión
+        self.outboxes: dict[WebSocket, SocketOutbox] = {}
+        
+        # Mensajes descartados por conexiones ya cerradas
+        self._closed_dropped = 0
+        
+        # Backplane para llegar a las salas de otros workers (opcional)
+        self.backplane: Backplane | None = None
+    
+    def attach_backplane(self, backplane: Backplane) -> None:
+        """Conecta el manager al backplane compartido entre workers."""
+        self.backplane = backplane
+        backplane.subscribe("room", self._on_remote_broadcast)
     
     async def connect(
         self,
@@ -34,103 +71,207 @@ class ConnectionManager:
         """
         Conecta un usuario a una sala.
         
-        TODO: Implementar
-        
         Args:
             websocket: Conexión WebSocket
             room_id: ID de la sala
             user_id: ID del usuario
             username: Nombre del usuario
         """
-        # TODO: Implementar
-        # 1. Aceptar conexión
-        # 2. Registrar en self.rooms
-        # 3. Registrar en self.connections
-        pass
+        await websocket.accept()
+        self.register(websocket, room_id, user_id, username)
+    
+    def register(
+        self,
+        websocket: WebSocket,
+        room_id: int,
+        user_id: int,
+        username: str
+    ) -> None:
+        """Registra una conexión ya aceptada en todos los índices."""
+        self.rooms[room_id].add(websocket)
+        self.connections[websocket] = (room_id, user_id, username)
+        self.user_connections[user_id].add(websocket)
+        self.outboxes[websocket] = SocketOutbox(
+            websocket,
+            max_size=self.send_queue_size,
+            policy=self.overflow_policy
+        )
+        
+        members = self.room_members[room_id]
+        if user_id not in members:
+            members[user_id] = set()
+            self._usernames_cache.pop(room_id, None)
+        members[user_id].add(websocket)
     
     def disconnect(self, websocket: WebSocket) -> tuple[int, int, str] | None:
         """
         Desconecta un usuario.
         
-        TODO: Implementar
-        
         Returns:
             Tupla (room_id, user_id, username) o None
         """
-        # TODO: Implementar
-        # 1. Obtener info de self.connections
-        # 2. Remover de self.rooms
-        # 3. Remover de self.connections
-        # 4. Limpiar sala si está vacía
-        # 5. Retornar info
-        pass
+        info = self.connections.pop(websocket, None)
+        if info is None:
+            return None
+        
+        room_id, user_id, _ = info
+        
+        outbox = self.outboxes.pop(websocket, None)
+        if outbox is not None:
+            outbox.close()
+            self._closed_dropped += outbox.dropped
+        
+        room = self.rooms.get(room_id)
+        if room is not None:
+            room.discard(websocket)
+            if not room:
+                del self.rooms[room_id]
+        
+        sockets = self.user_connections.get(user_id)
+        if sockets is not None:
+            sockets.discard(websocket)
+            if not sockets:
+                del self.user_connections[user_id]
+        
+        members = self.room_members.get(room_id)
+        if members is not None and user_id in members:
+            members[user_id].discard(websocket)
+            if not members[user_id]:
+                # Última pestaña del usuario en la sala
+                del members[user_id]
+                self._usernames_cache.pop(room_id, None)
+            if not members:
+                del self.room_members[room_id]
+        
+        return info
     
     async def send_personal(
         self,
         websocket: WebSocket,
-        message: dict[str, Any]
+        message: dict[str, Any] | EncodedMessage
     ) -> None:
         """
         Envía mensaje a un usuario específico.
         
-        TODO: Implementar
+        Si la conexión está registrada pasa por su cola de salida para
+        conservar el orden respecto a los broadcasts.
         """
-        # TODO: Implementar
-        pass
+        outbox = self.outboxes.get(websocket)
+        if outbox is None:
+            if isinstance(message, EncodedMessage):
+                await websocket.send_text(message.text)
+            else:
+                await websocket.send_json(message)
+        else:
+            outbox.put(message)
     
     async def broadcast_to_room(
         self,
         room_id: int,
-        message: dict[str, Any],
+        message: dict[str, Any] | EncodedMessage,
         exclude: WebSocket | None = None
     ) -> None:
         """
         Envía mensaje a todos los usuarios de una sala.
         
-        TODO: Implementar
+        Solo encola en el outbox de cada conexión; las tareas escritoras
+        hacen el envío en paralelo, así un cliente lento no frena al resto.
+        El mensaje se codifica a JSON una sola vez para toda la sala y,
+        si hay backplane, se publica para los demás workers.
         
         Args:
             room_id: ID de la sala
             message: Mensaje a enviar
             exclude: WebSocket a excluir (opcional)
         """
-        # TODO: Implementar
-        # 1. Iterar sobre conexiones de la sala
-        # 2. Excluir websocket si se especifica
-        # 3. Enviar mensaje JSON a cada uno
-        pass
+        message = encode_message(message)
+        self._deliver_to_room(room_id, message, exclude)
+        
+        if self.backplane is not None:
+            await self.backplane.publish(
+                "room", {"room_id": room_id, "message": message.data}
+            )
+    
+    async def _on_remote_broadcast(self, data: dict[str, Any]) -> None:
+        """Entrega localmente un broadcast publicado por otro worker."""
+        self._deliver_to_room(data["room_id"], encode_message(data["message"]))
+    
+    def _deliver_to_room(
+        self,
+        room_id: int,
+        message: EncodedMessage,
+        exclude: WebSocket | None = None
+    ) -> None:
+        """Encola el mensaje en las conexiones locales de la sala."""
+        if not self.rooms.get(room_id):
+            return
+        
+        for websocket in self.rooms[room_id]:
+            if websocket is exclude:
+                continue
+            outbox = self.outboxes.get(websocket)
+            if outbox is not None:
+                outbox.put(message)
     
     def get_room_users(self, room_id: int) -> list[dict[str, Any]]:
         """
         Retorna lista de usuarios conectados a una sala.
         
-        TODO: Implementar
-        
         Returns:
             Lista de dicts con user_id y username
         """
-        # TODO: Implementar
-        pass
+        members = self.room_members.get(room_id, {})
+        return [
+            {"user_id": user_id, "username": self._username_of(sockets)}
+            for user_id, sockets in members.items()
+        ]
     
     def get_room_usernames(self, room_id: int) -> list[str]:
         """
         Retorna lista de usernames en una sala.
         
-        TODO: Implementar
+        El resultado es un snapshot cacheado: no debe modificarse.
         """
-        # TODO: Implementar
-        pass
+        cached = self._usernames_cache.get(room_id)
+        if cached is None:
+            members = self.room_members.get(room_id, {})
+            cached = [self._username_of(sockets) for sockets in members.values()]
+            self._usernames_cache[room_id] = cached
+        return cached
     
     def get_user_count(self, room_id: int) -> int:
-        """Retorna cantidad de usuarios en una sala."""
-        return len(self.rooms.get(room_id, []))
+        """Retorna cantidad de conexiones en una sala."""
+        return len(self.rooms.get(room_id, ()))
+    
+    def get_connection_count(self) -> int:
+        """Retorna cantidad total de conexiones abiertas."""
+        return len(self.connections)
+    
+    def get_online_user_count(self) -> int:
+        """Retorna cantidad de usuarios distintos conectados."""
+        return len(self.user_connections)
+    
+    def get_send_stats(self) -> dict[str, int]:
+        """Retorna métricas agregadas de las colas de salida."""
+        outboxes = self.outboxes.values()
+        return {
+            "queued": sum(len(outbox) for outbox in outboxes),
+            "sent": sum(outbox.sent for outbox in outboxes),
+            "dropped": self._closed_dropped + sum(outbox.dropped for outbox in outboxes),
+            "coalesced": sum(outbox.coalesced for outbox in outboxes),
+        }
     
     def is_user_in_room(self, room_id: int, user_id: int) -> bool:
         """Verifica si un usuario está en una sala."""
-        for _, uid, _ in self.rooms.get(room_id, []):
-            if uid == user_id:
-                return True
-        return False
+        return user_id in self.room_members.get(room_id, ())
+    
+    def is_user_online(self, user_id: int) -> bool:
+        """Verifica si un usuario tiene alguna conexión abierta."""
+        return user_id in self.user_connections
+    
+    def _username_of(self, sockets: set[WebSocket]) -> str:
+        """Obtiene el username asociado a cualquiera de los sockets."""
+        return self.connections[next(iter(sockets))][2]
 
 
 # Instancia global
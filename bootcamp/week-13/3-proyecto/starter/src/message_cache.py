@@ -0,0 +1,143 @@
+"""
+Cache en memoria de los últimos mensajes por sala.
+
+Guarda los ``size`` mensajes más recientes de cada sala. El WebSocket
+añade cada mensaje nuevo cuando message_sink confirma su escritura,
+así que cargar el historial de una sala activa no consulta la DB.
+
+El cache es local al proceso: con un backplane entre varios workers no
+vería los mensajes escritos por los demás, y se desactiva.
+"""
+
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from .config import settings
+
+
+@dataclass
+class RoomMessages:
+    """Mensajes cacheados de una sala, del más antiguo al más reciente."""
+
+    entries: deque[dict[str, Any]]
+    # True si la sala tiene menos mensajes que el cache: nada más antiguo en DB
+    complete: bool = False
+    keys: deque[tuple[datetime, int]] = field(default_factory=deque)
+
+
+class RoomMessageCache:
+    """
+    Cache LRU de salas con los últimos mensajes de cada una.
+
+    Los mensajes se guardan como el dict de get_message_with_username.
+    """
+
+    def __init__(
+        self,
+        size: int = settings.MESSAGE_CACHE_SIZE,
+        max_rooms: int = settings.MESSAGE_CACHE_MAX_ROOMS
+    ):
+        self.size = size
+        self.max_rooms = max_rooms
+        self.enabled = True
+        self._rooms: OrderedDict[int, RoomMessages] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, room_id: int) -> bool:
+        return room_id in self._rooms
+
+    def warm(self, room_id: int, newest_first: list[dict[str, Any]]) -> None:
+        """
+        Carga el cache de una sala desde la DB.
+
+        Args:
+            room_id: ID de la sala
+            newest_first: Hasta ``size`` mensajes, más recientes primero
+        """
+        if not self.enabled:
+            return
+        room = RoomMessages(
+            entries=deque(maxlen=self.size),
+            complete=len(newest_first) < self.size,
+            keys=deque(maxlen=self.size)
+        )
+        for message in reversed(newest_first):
+            room.entries.append(message)
+            room.keys.append(_key(message))
+
+        self._rooms[room_id] = room
+        self._rooms.move_to_end(room_id)
+        while len(self._rooms) > self.max_rooms:
+            self._rooms.popitem(last=False)
+
+    def append(self, room_id: int, message: dict[str, Any]) -> None:
+        """Añade un mensaje recién persistido (no-op si la sala no está cacheada)."""
+        room = self._rooms.get(room_id)
+        if room is None:
+            return
+
+        key = _key(message)
+        if room.keys and key <= room.keys[-1]:
+            # Ya incluido al calentar el cache desde la DB
+            return
+        if len(room.entries) == self.size:
+            room.complete = False
+        room.entries.append(message)
+        room.keys.append(key)
+
+    def invalidate(self, room_id: int) -> None:
+        """Descarta el cache de una sala."""
+        self._rooms.pop(room_id, None)
+
+    def disable(self) -> None:
+        """Vacía el cache y deja de usarlo (todas las lecturas van a la DB)."""
+        self.enabled = False
+        self._rooms.clear()
+
+    def get_page(
+        self,
+        room_id: int,
+        before: tuple[datetime, int] | None,
+        limit: int
+    ) -> list[dict[str, Any]] | None:
+        """
+        Página de mensajes anteriores a ``before``, más recientes primero.
+
+        Returns:
+            La página, o None si el cache no puede responderla entera
+        """
+        room = self._rooms.get(room_id)
+        if room is None:
+            self.misses += 1
+            return None
+        self._rooms.move_to_end(room_id)
+
+        # Índice del primer mensaje posterior o igual al cursor
+        end = len(room.keys)
+        if before is not None:
+            while end > 0 and room.keys[end - 1] >= before:
+                end -= 1
+
+        start = max(end - limit, 0)
+        if start == 0 and end - start < limit and not room.complete:
+            # Faltan mensajes más antiguos que solo están en la DB
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return [room.entries[i] for i in range(end - 1, start - 1, -1)]
+
+
+def _key(message: dict[str, Any]) -> tuple[datetime, int]:
+    created_at = message["created_at"]
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at)
+    return created_at, message["id"]
+
+
+# Instancia global
+message_cache = RoomMessageCache()
@@ -0,0 +1,192 @@
+"""
+Persistencia write-behind de mensajes de chat.
+
+En lugar de un commit por mensaje dentro del loop del WebSocket, los
+mensajes se acumulan y se insertan en bloque desde un hilo, cuando el
+lote llega a ``batch_size`` o pasan ``flush_interval`` segundos.
+
+Modos de durabilidad:
+    - "sync": ``submit`` espera a que su lote esté confirmado en la DB
+      y retorna el id (group commit: un commit para todo el lote).
+    - "async": ``submit`` retorna de inmediato (id None); un fallo de la
+      DB solo se refleja en ``stats``.
+
+En ambos modos ``on_written`` recibe el id cuando el lote está
+confirmado, para actualizar lo que dependa de la DB (p. ej. el cache).
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Callable
+
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .database import SessionLocal
+from . import services
+
+
+DURABILITY_MODES = ("sync", "async")
+
+Pending = tuple[dict[str, Any], asyncio.Future | None, Callable[[int], None] | None]
+
+
+class MessageSink:
+    """Buffer de mensajes con volcado en bloque fuera del event loop."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = settings.MESSAGE_BATCH_SIZE,
+        flush_interval: float = settings.MESSAGE_FLUSH_INTERVAL,
+        durability: str = settings.MESSAGE_DURABILITY,
+        max_pending: int = settings.MESSAGE_MAX_PENDING
+    ):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Modo de durabilidad no válido: {durability}")
+
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.durability = durability
+        self.max_pending = max_pending
+
+        # Pendientes: (fila, future del llamador o None en modo async, on_written)
+        self._pending: list[Pending] = []
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+        self.stats = {"written": 0, "batches": 0, "failed": 0}
+
+    async def start(self) -> None:
+        """Arranca la tarea de volcado periódico."""
+        if self._task is None:
+            # Primitivas ligadas al event loop actual
+            self._wakeup = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Detiene la tarea y vuelca todo lo pendiente (shutdown).
+
+        La tarea no se cancela: se le avisa y termina tras su último
+        volcado, así ningún lote queda a medio escribir.
+        """
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def submit(
+        self,
+        room_id: int,
+        user_id: int,
+        content: str,
+        created_at: datetime | None = None,
+        on_written: Callable[[int], None] | None = None
+    ) -> int | None:
+        """
+        Encola un mensaje para persistirlo.
+
+        Args:
+            on_written: Se llama con el id del mensaje tras el commit
+                de su lote (no se llama si la escritura falla)
+
+        Returns:
+            ID del mensaje en modo "sync", None en modo "async"
+        """
+        row = {
+            "room_id": room_id,
+            "user_id": user_id,
+            "content": content,
+            "created_at": created_at or datetime.utcnow()
+        }
+
+        future = None
+        if self.durability == "sync":
+            future = asyncio.get_running_loop().create_future()
+        self._pending.append((row, future, on_written))
+
+        if self._task is None or len(self._pending) >= self.max_pending:
+            # Sin tarea de fondo, o con backpressure, se vuelca en línea
+            await self.flush()
+        elif len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+        if future is not None:
+            return await future
+        return None
+
+    async def flush(self) -> int:
+        """
+        Vuelca en bloque todo lo pendiente.
+
+        Returns:
+            Número de mensajes escritos
+        """
+        async with self._flush_lock:
+            written = 0
+            while self._pending:
+                batch = self._pending[:self.batch_size]
+                del self._pending[:self.batch_size]
+                written += await self._write_batch(batch)
+            return written
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def _write_batch(self, batch: list[Pending]) -> int:
+        rows = [row for row, _, _ in batch]
+        insert = asyncio.ensure_future(asyncio.to_thread(self._insert, rows))
+        try:
+            # wait no cancela el insert si cancelan a quien espera
+            await asyncio.wait({insert})
+        except asyncio.CancelledError:
+            # El hilo termina el lote igualmente: sus llamadores reciben el
+            # resultado real en lugar de quedarse esperando para siempre
+            insert.add_done_callback(lambda _: self._settle(batch, insert))
+            raise
+        return self._settle(batch, insert)
+
+    def _settle(self, batch: list[Pending], insert: asyncio.Future) -> int:
+        """Resuelve los futures del lote con el resultado del insert."""
+        exc = asyncio.CancelledError() if insert.cancelled() else insert.exception()
+        if exc is not None:
+            self.stats["failed"] += len(batch)
+            for _, future, _ in batch:
+                if future is not None and not future.done():
+                    future.set_exception(exc)
+            return 0
+
+        self.stats["written"] += len(batch)
+        self.stats["batches"] += 1
+        for (_, future, on_written), message_id in zip(batch, insert.result()):
+            if on_written is not None:
+                on_written(message_id)
+            if future is not None and not future.done():
+                future.set_result(message_id)
+        return len(batch)
+
+    def _insert(self, rows: list[dict[str, Any]]) -> list[int]:
+        # Corre en un hilo: sesión propia, un solo commit por lote
+        db = self.session_factory()
+        try:
+            return services.create_messages_bulk(db, rows)
+        finally:
+            db.close()
+
+
+# Instancia global
+message_sink = MessageSink()
@@ -3,7 +3,7 @@ Modelos de base de datos.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 
 from .database import Base
@@ -56,3 +56,8 @@ class Message(Base):
     # Relaciones
     user = relationship("User", back_populates="messages")
     room = relationship("Room", back_populates="messages")
+    
+    # Índice para la paginación keyset del historial
+    __table_args__ = (
+        Index("ix_messages_room_created_id", "room_id", "created_at", "id"),
+    )
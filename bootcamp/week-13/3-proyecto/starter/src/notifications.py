@@ -1,52 +1,280 @@
 """
 Servicio de notificaciones con SSE.
-
-TODO: Completar el servicio de notificaciones
 """
 
 import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
 from typing import Any, AsyncGenerator
 from datetime import datetime
-from collections import defaultdict
+
+from .backplane import Backplane
+from .config import settings
+from .encoding import EncodedMessage, encode_message
+from .outbox import OverflowPolicy
+
+
+@dataclass
+class QueueStats:
+    """Métricas agregadas de las colas de notificaciones."""
+    
+    queued: int = 0         # Notificaciones pendientes en todas las colas
+    dropped: int = 0        # Descartadas por cola llena
+    coalesced: int = 0      # Reemplazadas por otra del mismo tipo
+    disconnected: int = 0   # Conexiones cortadas por ir lentas
+    evicted: int = 0        # Historiales inactivos eliminados
+
+
+class ReplayBuffer:
+    """
+    Últimas notificaciones de un usuario (un ring buffer con su id),
+    para reenviarlas si el cliente reconecta con ``Last-Event-ID``.
+    
+    Lo comparten todas las conexiones del usuario y se conserva tras
+    desconectarse hasta que ``evict_idle`` lo elimina.
+    """
+    
+    def __init__(self, size: int, first_event_id: int = 0):
+        # Los ids anteriores a replay_from no se conocen
+        self.history: deque[EncodedMessage] = deque(maxlen=size)
+        self.replay_from = first_event_id
+        self.last_activity = time.monotonic()
+    
+    def record(self, notification: EncodedMessage) -> None:
+        """Guarda la notificación en el historial de replay."""
+        if self.history.maxlen == 0:
+            return
+        if len(self.history) == self.history.maxlen:
+            # La más antigua sale del buffer: ya no se puede reenviar. Las
+            # de otros workers pueden llegar algo desordenadas
+            self.replay_from = max(self.replay_from, self.history[0].get("id") + 1)
+        self.history.append(notification)
+    
+    def replay_since(self, last_event_id: int) -> tuple[list[EncodedMessage], bool]:
+        """
+        Notificaciones posteriores a ``last_event_id``.
+        
+        Returns:
+            Tupla (notificaciones, completo). completo es False si parte
+            de lo perdido ya no está en el buffer y hace falta resync.
+        """
+        missed = [n for n in self.history if n.get("id") > last_event_id]
+        return missed, last_event_id + 1 >= self.replay_from
+
+
+class NotificationQueue:
+    """
+    Cola acotada de una conexión SSE.
+    
+    Con la política COALESCE una notificación pendiente se reemplaza por
+    la siguiente del mismo tipo de evento; DISCONNECT cierra la cola y
+    termina el stream de la conexión lenta.
+    """
+    
+    def __init__(self, max_size: int, policy: OverflowPolicy, stats: QueueStats):
+        self.max_size = max_size
+        self.policy = policy
+        self.stats = stats
+        
+        # Cada entrada es una lista [notificación] para reemplazarla in situ
+        self._pending: deque[list[EncodedMessage]] = deque()
+        self._by_type: dict[str, list[EncodedMessage]] = {}
+        self._ready = asyncio.Event()
+        self.closed = False
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    def empty(self) -> bool:
+        return not self._pending
+    
+    def clear_pending(self) -> None:
+        """Descarta lo pendiente."""
+        self.stats.queued -= len(self._pending)
+        self._pending.clear()
+        self._by_type.clear()
+    
+    def put(self, notification: EncodedMessage) -> bool:
+        """Encola sin bloquear aplicando la política de desborde."""
+        if self.closed:
+            return False
+        
+        event_type = notification.get("type")
+        if self.policy is OverflowPolicy.COALESCE and event_type in self._by_type:
+            self._by_type[event_type][0] = notification
+            self.stats.coalesced += 1
+            return True
+        
+        if len(self._pending) >= self.max_size:
+            if self.policy is OverflowPolicy.DROP_NEWEST:
+                self.stats.dropped += 1
+                return False
+            if self.policy is OverflowPolicy.DISCONNECT:
+                self.stats.dropped += 1 + len(self._pending)
+                self.stats.disconnected += 1
+                self.close()
+                return False
+            self._pop()
+            self.stats.dropped += 1
+        
+        entry = [notification]
+        self._pending.append(entry)
+        if self.policy is OverflowPolicy.COALESCE:
+            self._by_type[event_type] = entry
+        self.stats.queued += 1
+        self._ready.set()
+        return True
+    
+    def get_nowait(self) -> EncodedMessage:
+        """Saca la siguiente notificación o lanza asyncio.QueueEmpty."""
+        if not self._pending:
+            raise asyncio.QueueEmpty
+        return self._pop()
+    
+    async def get(self, timeout: float) -> EncodedMessage | None:
+        """Espera la siguiente notificación; None si vence el timeout o se cierra."""
+        if not self._pending and not self.closed:
+            # Evento nuevo por espera: la cola puede sobrevivir a un event loop
+            self._ready = asyncio.Event()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        
+        if self.closed or not self._pending:
+            return None
+        return self._pop()
+    
+    def close(self) -> None:
+        """Descarta lo pendiente y despierta al consumidor."""
+        self.closed = True
+        self.clear_pending()
+        self._ready.set()
+    
+    def _pop(self) -> EncodedMessage:
+        entry = self._pending.popleft()
+        event_type = entry[0].get("type")
+        if self._by_type.get(event_type) is entry:
+            del self._by_type[event_type]
+        self.stats.queued -= 1
+        return entry[0]
 
 
 class NotificationService:
     """
     Servicio de notificaciones SSE.
     
-    TODO: Implementar los métodos marcados
+    Las colas guardan EncodedMessage: el JSON de cada notificación se
+    genera una sola vez aunque se entregue a miles de suscriptores.
+    Cada conexión SSE tiene su propia cola acotada (un usuario puede
+    tener varias pestañas abiertas) que se elimina al cerrarse el stream.
+    
+    Cada notificación lleva un id creciente y comparable entre workers:
+    la de otro worker conserva el id con el que se publicó. El historial
+    de replay es
+    por usuario: mientras no se elimina (``idle_seconds`` sin conexiones)
+    sus notificaciones se siguen guardando para reenviarlas al reconectar.
     """
     
-    def __init__(self):
-        # Cola de notificaciones por usuario
-        self.queues: dict[int, asyncio.Queue] = defaultdict(asyncio.Queue)
+    def __init__(
+        self,
+        queue_size: int = settings.NOTIFICATION_QUEUE_SIZE,
+        overflow_policy: OverflowPolicy | str = settings.NOTIFICATION_OVERFLOW_POLICY,
+        idle_seconds: float = settings.NOTIFICATION_QUEUE_IDLE_SECONDS,
+        replay_size: int = settings.NOTIFICATION_REPLAY_SIZE
+    ):
+        self.queue_size = queue_size
+        self.overflow_policy = OverflowPolicy(overflow_policy)
+        self.idle_seconds = idle_seconds
+        self.replay_size = replay_size
+        
+        # Ids basados en el reloj: siguen creciendo tras reiniciar el proceso
+        self._last_event_id = time.time_ns() // 1000
+        
+        # Colas de las conexiones SSE abiertas, por usuario
+        self.subscribers: dict[int, set[NotificationQueue]] = {}
+        
+        # Historial de replay por usuario (sobrevive a la desconexión)
+        self.replay_buffers: dict[int, ReplayBuffer] = {}
+        
+        self.stats = QueueStats()
+        self._last_sweep = time.monotonic()
         
-        # Set de usuarios suscritos
-        self.subscribers: set[int] = set()
+        # Backplane para llegar a suscriptores de otros workers (opcional)
+        self.backplane: Backplane | None = None
+    
+    def attach_backplane(self, backplane: Backplane) -> None:
+        """Conecta el servicio al backplane compartido entre workers."""
+        self.backplane = backplane
+        backplane.subscribe("notifications", self._on_remote_broadcast)
     
     async def subscribe(
         self,
         user_id: int,
-        keepalive_seconds: int = 30
+        keepalive_seconds: int = 30,
+        last_event_id: int | None = None
     ) -> AsyncGenerator[dict[str, Any], None]:
         """
-        Suscribe a un usuario y genera eventos SSE.
+        Suscribe una conexión de un usuario y genera eventos SSE.
         
-        TODO: Implementar
+        Cada llamada tiene su propia cola: las conexiones simultáneas del
+        mismo usuario reciben todas las notificaciones. El stream termina
+        si la cola se cierra por la política DISCONNECT; el cliente puede
+        reconectar.
         
         Args:
             user_id: ID del usuario
             keepalive_seconds: Intervalo de keepalive
+            last_event_id: Valor de la cabecera Last-Event-ID al reconectar
             
         Yields:
             Eventos SSE
         """
-        # TODO: Implementar
-        # 1. Registrar suscriptor
-        # 2. Loop infinito con wait_for y timeout
-        # 3. Yield eventos o keepalive
-        # 4. Cleanup en finally
-        pass
+        queue = self._open_stream(user_id)
+        
+        try:
+            if last_event_id is not None:
+                # Lo posterior a este punto ya llega por la cola
+                missed, complete = self.replay_buffers[user_id].replay_since(last_event_id)
+                # Un id posterior al último visto aquí es de otro worker cuya
+                # notificación aún no ha llegado: no se sabe qué falta
+                if not complete or last_event_id > self._last_event_id:
+                    # Parte de lo perdido ya salió del buffer: el cliente debe recargar
+                    yield {"event": "resync", "data": "{}", "id": str(self._last_event_id)}
+                for notification in missed:
+                    yield to_sse_event(notification)
+            
+            while not queue.closed:
+                notification = await queue.get(timeout=keepalive_seconds)
+                if notification is None:
+                    if not queue.closed:
+                        yield {"comment": "keepalive"}
+                    continue
+                
+                yield to_sse_event(notification)
+        finally:
+            self._close_stream(user_id, queue)
+    
+    def _open_stream(self, user_id: int) -> NotificationQueue:
+        """Crea la cola de una conexión SSE nueva del usuario."""
+        self._get_replay_buffer(user_id)
+        queue = NotificationQueue(self.queue_size, self.overflow_policy, self.stats)
+        self.subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+    
+    def _close_stream(self, user_id: int, queue: NotificationQueue) -> None:
+        """Retira la cola de una conexión terminada; el historial se conserva."""
+        queue.close()
+        streams = self.subscribers.get(user_id)
+        if streams is not None:
+            streams.discard(queue)
+            if not streams:
+                del self.subscribers[user_id]
+        
+        replay_buffer = self.replay_buffers.get(user_id)
+        if replay_buffer is not None:
+            replay_buffer.last_activity = time.monotonic()
     
     async def notify_user(
         self,
@@ -55,12 +283,20 @@ class NotificationService:
         data: dict[str, Any]
     ) -> bool:
         """
-        Envía notificación a un usuario.
+        Envía notificación a todas las conexiones de un usuario.
         
-        TODO: Implementar
+        Returns:
+            True si se encoló en alguna conexión del usuario
         """
-        # TODO: Implementar
-        pass
+        notification = self._new_notification(event_type, data)
+        
+        # También recién desconectado: se guarda para el replay
+        replay_buffer = self.replay_buffers.get(user_id)
+        if replay_buffer is not None:
+            replay_buffer.record(notification)
+        
+        delivered = [queue.put(notification) for queue in self.subscribers.get(user_id, ())]
+        return any(delivered)
     
     async def broadcast(
         self,
@@ -70,13 +306,84 @@ class NotificationService:
         """
         Envía notificación a todos los suscriptores.
         
-        TODO: Implementar
+        La notificación se codifica una vez y se comparte entre colas.
+        Si hay backplane también se publica para los demás workers.
         
         Returns:
-            Número de usuarios notificados
+            Número de usuarios notificados en este worker
         """
-        # TODO: Implementar
-        pass
+        notification = self._new_notification(event_type, data)
+        count = self._deliver(notification)
+        
+        if self.backplane is not None:
+            await self.backplane.publish("notifications", notification.data)
+        
+        return count
+    
+    async def _on_remote_broadcast(self, data: dict[str, Any]) -> None:
+        """Entrega localmente una notificación publicada por otro worker."""
+        # Conserva el id del publicador: el Last-Event-ID que vio un
+        # cliente en otro worker también vale al reconectar aquí
+        self._last_event_id = max(self._last_event_id, data["id"])
+        self._deliver(encode_message(data))
+    
+    def _deliver(self, notification: EncodedMessage) -> int:
+        """Encola la notificación para los suscriptores locales."""
+        self.evict_idle()
+        
+        count = 0
+        for streams in self.subscribers.values():
+            delivered = [queue.put(notification) for queue in streams]
+            count += any(delivered)
+        
+        # Conectados o recién desconectados: historial para el replay
+        for replay_buffer in self.replay_buffers.values():
+            replay_buffer.record(notification)
+        
+        return count
+    
+    def evict_idle(self, force: bool = False) -> int:
+        """
+        Elimina historiales de usuarios sin conexiones desde hace más
+        de ``idle_seconds``.
+        
+        Se ejecuta como mucho una vez por ``idle_seconds`` salvo con force.
+        
+        Returns:
+            Número de historiales eliminados
+        """
+        now = time.monotonic()
+        if not force and now - self._last_sweep < self.idle_seconds:
+            return 0
+        self._last_sweep = now
+        
+        idle = [
+            user_id for user_id, replay_buffer in self.replay_buffers.items()
+            if user_id not in self.subscribers
+            and now - replay_buffer.last_activity >= self.idle_seconds
+        ]
+        for user_id in idle:
+            del self.replay_buffers[user_id]
+        
+        self.stats.evicted += len(idle)
+        return len(idle)
+    
+    def _get_replay_buffer(self, user_id: int) -> ReplayBuffer:
+        """Obtiene (o crea) el historial de replay de un usuario."""
+        replay_buffer = self.replay_buffers.get(user_id)
+        if replay_buffer is None:
+            replay_buffer = ReplayBuffer(self.replay_size, first_event_id=self._last_event_id + 1)
+            self.replay_buffers[user_id] = replay_buffer
+        return replay_buffer
+    
+    def _next_event_id(self) -> int:
+        # Reloj híbrido: microsegundos actuales, pero siempre por encima
+        # del último id visto, propio o recibido de otro worker
+        self._last_event_id = max(time.time_ns() // 1000, self._last_event_id + 1)
+        return self._last_event_id
+    
+    def _new_notification(self, event_type: str, data: dict[str, Any]) -> EncodedMessage:
+        return create_notification(event_type, data, event_id=self._next_event_id())
     
     async def notify_new_message(
         self,
@@ -129,8 +436,41 @@ class NotificationService:
         )
     
     def get_subscribers_count(self) -> int:
-        """Retorna número de suscriptores."""
+        """Retorna número de usuarios suscritos."""
         return len(self.subscribers)
+    
+    def get_queue_stats(self) -> dict[str, int]:
+        """Retorna métricas de profundidad y descartes de las colas."""
+        return {
+            "queues": sum(len(streams) for streams in self.subscribers.values()),
+            "replay_buffers": len(self.replay_buffers),
+            **vars(self.stats)
+        }
+
+
+def create_notification(
+    event_type: str,
+    data: dict[str, Any],
+    event_id: int | None = None
+) -> EncodedMessage:
+    """Crea una notificación ya codificada a JSON."""
+    return encode_message({
+        "id": event_id,
+        "type": event_type,
+        "data": data,
+        "timestamp": datetime.utcnow().isoformat()
+    })
+
+
+def to_sse_event(notification: EncodedMessage) -> dict[str, Any]:
+    """Convierte una notificación en evento SSE (data ya es JSON)."""
+    event = {
+        "event": notification.get("type", "notification"),
+        "data": notification.text
+    }
+    if notification.get("id") is not None:
+        event["id"] = str(notification.get("id"))
+    return event
 
 
 # Instancia global
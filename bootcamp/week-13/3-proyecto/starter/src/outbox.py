@@ -0,0 +1,204 @@
+"""
+Cola de salida por WebSocket.
+
+Cada conexión tiene su propia cola acotada y una tarea escritora,
+así un broadcast solo encola y un cliente lento no frena al resto
+de la sala.
+"""
+
+import asyncio
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Hashable
+
+from fastapi import WebSocket
+
+from .encoding import EncodedMessage
+
+
+class OverflowPolicy(str, Enum):
+    """Qué hacer cuando la cola de un cliente está llena."""
+
+    DROP_OLDEST = "drop_oldest"    # Descarta el mensaje más antiguo
+    DROP_NEWEST = "drop_newest"    # Descarta el mensaje entrante
+    COALESCE = "coalesce"          # Reemplaza mensajes del mismo tipo, si no drop_oldest
+    DISCONNECT = "disconnect"      # Cierra la conexión del cliente lento
+
+
+# Código de cierre WebSocket "Try Again Later"
+SLOW_CONSUMER_CLOSE_CODE = 1013
+
+# Código de cierre WebSocket "Internal Error" (falló un envío)
+SEND_ERROR_CLOSE_CODE = 1011
+
+
+def coalesce_key(message: Any) -> Hashable | None:
+    """
+    Clave de coalescencia de un mensaje.
+
+    Solo los mensajes de estado (lista de usuarios, typing) pueden
+    reemplazarse por uno más nuevo; los mensajes de chat nunca.
+    """
+    if not isinstance(message, (dict, EncodedMessage)):
+        return None
+
+    msg_type = message.get("type")
+    if msg_type == "user_list":
+        return ("user_list", message.get("room_id"))
+    if msg_type == "typing":
+        return ("typing", message.get("user_id"))
+    return None
+
+
+class SocketOutbox:
+    """
+    Cola de salida acotada con una tarea escritora dedicada.
+
+    La tarea se crea de forma perezosa en el primer ``put`` para
+    poder construir el outbox fuera de un event loop.
+
+    Al abortar (envío fallido o política DISCONNECT) el outbox solo
+    cierra el socket: el endpoint sale de ``receive`` y es quien lo
+    quita del manager y avisa a la sala. ``on_close`` es un aviso
+    opcional y no debe desregistrar la conexión.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_size: int = 100,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        on_close: Callable[[WebSocket], Any] | None = None
+    ):
+        self.websocket = websocket
+        self.max_size = max_size
+        self.policy = OverflowPolicy(policy)
+        self.on_close = on_close
+
+        # Cada entrada es una lista [mensaje] para poder reemplazarla in situ
+        self._pending: deque[list[Any]] = deque()
+        self._by_key: dict[Hashable, list[Any]] = {}
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task: asyncio.Task | None = None
+        self._close_task: asyncio.Task | None = None
+        self.closed = False
+
+        # Métricas
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def put(self, message: Any) -> bool:
+        """
+        Encola un mensaje sin esperar a la red.
+
+        Returns:
+            True si el mensaje quedó encolado (o fusionado)
+        """
+        if self.closed:
+            return False
+
+        key = coalesce_key(message) if self.policy is OverflowPolicy.COALESCE else None
+        if key is not None and key in self._by_key:
+            self._by_key[key][0] = message
+            self.coalesced += 1
+            return True
+
+        if len(self._pending) >= self.max_size:
+            if self.policy is OverflowPolicy.DROP_NEWEST:
+                self.dropped += 1
+                return False
+            if self.policy is OverflowPolicy.DISCONNECT:
+                self.dropped += 1 + len(self._pending)
+                self._abort(close_code=SLOW_CONSUMER_CLOSE_CODE)
+                return False
+            self._drop_oldest()
+
+        entry = [message]
+        self._pending.append(entry)
+        if key is not None:
+            self._by_key[key] = entry
+
+        self._ensure_writer()
+        self._idle.clear()
+        self._wakeup.set()
+        return True
+
+    def close(self) -> None:
+        """Detiene la tarea escritora y descarta lo pendiente."""
+        self.closed = True
+        self._pending.clear()
+        self._by_key.clear()
+        self._idle.set()
+        if self._task is not None and not self._task.done():
+            try:
+                current = asyncio.current_task()
+            except RuntimeError:
+                current = None
+            # Si cierra la propia tarea escritora, basta con salir del loop
+            if self._task is not current:
+                self._task.cancel()
+
+    async def drain(self) -> None:
+        """Espera a que se envíe todo lo pendiente (útil en tests)."""
+        await self._idle.wait()
+
+    async def _send(self, message: Any) -> None:
+        if isinstance(message, EncodedMessage):
+            # Ya codificado por el broadcast: se envía tal cual
+            await self.websocket.send_text(message.text)
+        else:
+            await self.websocket.send_json(message)
+
+    async def _run(self) -> None:
+        while not self.closed:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            while self._pending:
+                entry = self._pending.popleft()
+                message = entry[0]
+                key = coalesce_key(message)
+                if key is not None and self._by_key.get(key) is entry:
+                    del self._by_key[key]
+
+                try:
+                    await self._send(message)
+                except Exception:
+                    # Cerrar el socket despierta al endpoint, que hace la limpieza
+                    self._abort(close_code=SEND_ERROR_CLOSE_CODE)
+                    return
+                self.sent += 1
+
+            self._idle.set()
+
+    def _ensure_writer(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def _drop_oldest(self) -> None:
+        entry = self._pending.popleft()
+        key = coalesce_key(entry[0])
+        if key is not None and self._by_key.get(key) is entry:
+            del self._by_key[key]
+        self.dropped += 1
+
+    def _abort(self, close_code: int | None = None) -> None:
+        self.close()
+        if close_code is not None:
+            self._close_task = asyncio.get_running_loop().create_task(
+                self._close_socket(close_code)
+            )
+        if self.on_close is not None:
+            self.on_close(self.websocket)
+
+    async def _close_socket(self, code: int) -> None:
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass
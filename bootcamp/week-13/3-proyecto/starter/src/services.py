@@ -4,8 +4,11 @@ Servicios de lógica de negocio.
 TODO: Completar las funciones de servicio
 """
 
-from sqlalchemy.orm import Session
+import base64
+from sqlalchemy import and_, insert, or_
+from sqlalchemy.orm import Session, contains_eager
 from datetime import datetime
+from typing import Any
 
 from .models import User, Room, Message
 from .schemas import UserCreate, RoomCreate, MessageCreate
@@ -62,13 +65,8 @@ def get_room_by_name(db: Session, name: str) -> Room | None:
 
 
 def get_rooms(db: Session, skip: int = 0, limit: int = 100) -> list[Room]:
-    """
-    Lista todas las salas.
-    
-    TODO: Implementar
-    """
-    # TODO: Implementar
-    pass
+    """Lista todas las salas."""
+    return db.query(Room).order_by(Room.id).offset(skip).limit(limit).all()
 
 
 def get_or_create_default_room(db: Session) -> Room:
@@ -94,13 +92,39 @@ def create_message(
     user_id: int,
     content: str
 ) -> Message:
+    """Crea un nuevo mensaje."""
+    message = Message(room_id=room_id, user_id=user_id, content=content)
+    db.add(message)
+    db.commit()
+    db.refresh(message)
+    return message
+
+
+def create_messages_bulk(db: Session, rows: list[dict[str, Any]]) -> list[int]:
     """
-    Crea un nuevo mensaje.
+    Inserta varios mensajes en una transacción con un solo commit.
     
-    TODO: Implementar
+    Con RETURNING ordenado, SQLAlchemy solo agrupa filas en un INSERT
+    multi-fila si la tabla tiene columna centinela; en SQLite, sin ella,
+    envía un INSERT por mensaje. Es barato (sin red ni fsync por fila):
+    lo caro, el commit, se paga una vez por lote.
+    
+    Args:
+        db: Sesión de DB
+        rows: Dicts con room_id, user_id, content y created_at
+        
+    Returns:
+        IDs de los mensajes, en el mismo orden que rows
     """
-    # TODO: Implementar
-    pass
+    if not rows:
+        return []
+    
+    ids = db.scalars(
+        insert(Message).returning(Message.id, sort_by_parameter_order=True),
+        rows
+    ).all()
+    db.commit()
+    return list(ids)
 
 
 def get_room_messages(
@@ -110,16 +134,77 @@ def get_room_messages(
     limit: int = 50
 ) -> list[Message]:
     """
-    Obtiene mensajes de una sala.
+    Obtiene mensajes de una sala con paginación por offset.
     
-    TODO: Implementar
+    Para historial largo usar get_room_messages_before (keyset).
     
     Returns:
         Lista de mensajes ordenados por fecha (más recientes primero)
     """
-    # TODO: Implementar
-    # Ordenar por created_at descendente
-    pass
+    return (
+        _room_messages_query(db, room_id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+def get_room_messages_before(
+    db: Session,
+    room_id: int,
+    before: tuple[datetime, int] | None = None,
+    limit: int = 50
+) -> list[Message]:
+    """
+    Obtiene mensajes de una sala con paginación keyset.
+    
+    Usa el índice (room_id, created_at, id): el coste no depende de lo
+    profunda que sea la página, a diferencia de OFFSET.
+    
+    Args:
+        db: Sesión de DB
+        room_id: ID de la sala
+        before: Clave (created_at, id) del último mensaje ya recibido
+        limit: Máximo de mensajes
+        
+    Returns:
+        Lista de mensajes ordenados por fecha (más recientes primero)
+    """
+    query = _room_messages_query(db, room_id)
+    if before is not None:
+        created_at, message_id = before
+        query = query.filter(or_(
+            Message.created_at < created_at,
+            and_(Message.created_at == created_at, Message.id < message_id)
+        ))
+    return query.limit(limit).all()
+
+
+def _room_messages_query(db: Session, room_id: int):
+    # JOIN con users en la misma consulta: evita el N+1 de message.user
+    return (
+        db.query(Message)
+        .join(Message.user)
+        .options(contains_eager(Message.user))
+        .filter(Message.room_id == room_id)
+        .order_by(Message.created_at.desc(), Message.id.desc())
+    )
+
+
+def encode_cursor(created_at: datetime, message_id: int) -> str:
+    """Codifica la clave keyset de un mensaje como cursor opaco."""
+    raw = f"{created_at.isoformat()}|{message_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int] | None:
+    """Decodifica un cursor; None si no es válido."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, message_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(message_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
 
 
 def get_message_with_username(message: Message) -> dict:
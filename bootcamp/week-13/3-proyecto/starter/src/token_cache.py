@@ -0,0 +1,126 @@
+"""
+Cache de verificación de JWT para handshakes WebSocket y SSE.
+
+En una tormenta de reconexiones el mismo token se decodifica y su
+usuario se busca en la DB miles de veces por segundo. El cache guarda,
+por token, los claims ya verificados y una proyección del usuario
+hasta lo que ocurra antes: el TTL configurado o el ``exp`` del token.
+
+Al confirmar un cambio o borrado de un usuario se invalidan sus tokens,
+pero solo en el proceso que hizo el commit. Con varios workers los
+demás siguen sirviendo la entrada hasta que vence: TOKEN_CACHE_TTL es
+el retraso máximo con el que se aplica un cambio (bajarlo si importa).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .config import settings
+
+
+@dataclass(frozen=True, slots=True)
+class AuthenticatedUser:
+    """Proyección mínima del usuario para los handshakes."""
+
+    id: int
+    username: str
+
+
+@dataclass(slots=True)
+class _Entry:
+    user: AuthenticatedUser
+    expires_at: float  # time.monotonic()
+
+
+class TokenCache:
+    """Cache LRU acotado con TTL, indexado también por user_id."""
+
+    def __init__(
+        self,
+        max_size: int = settings.TOKEN_CACHE_SIZE,
+        ttl_seconds: float = settings.TOKEN_CACHE_TTL
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._by_user: dict[int, set[str]] = {}
+        # Las invalidaciones pueden llegar desde eventos de SQLAlchemy en otro hilo
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> AuthenticatedUser | None:
+        """Retorna el usuario cacheado si el token sigue vigente."""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry.user
+
+    def put(self, token: str, user: AuthenticatedUser, token_exp: float | None = None) -> None:
+        """
+        Guarda un token verificado.
+
+        Args:
+            token: JWT
+            user: Proyección del usuario
+            token_exp: Claim ``exp`` (epoch); el cache nunca lo sobrepasa
+        """
+        ttl = self.ttl_seconds
+        if token_exp is not None:
+            ttl = min(ttl, token_exp - time.time())
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = _Entry(user, time.monotonic() + ttl)
+            self._by_user.setdefault(user.id, set()).add(token)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int) -> int:
+        """
+        Descarta todos los tokens cacheados de un usuario.
+
+        Returns:
+            Número de entradas eliminadas
+        """
+        with self._lock:
+            tokens = list(self._by_user.get(user_id, ()))
+            for token in tokens:
+                self._remove(token)
+            return len(tokens)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def _remove(self, token: str) -> None:
+        entry = self._entries.pop(token, None)
+        if entry is None:
+            return
+        tokens = self._by_user.get(entry.user.id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._by_user[entry.user.id]
+
+
+# Instancia global
+token_cache = TokenCache()
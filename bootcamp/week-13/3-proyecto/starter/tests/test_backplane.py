@@ -0,0 +1,210 @@
+"""
+Tests del backplane entre workers.
+"""
+
+import asyncio
+
+import pytest
+
+from src.backplane import (
+    InProcessBackplane, InProcessBroker, UnixSocketBackplane, UnixSocketBroker,
+    create_backplane,
+)
+from src.manager import ConnectionManager
+from src.notifications import NotificationService
+from tests.test_manager import FakeWebSocket
+
+
+async def make_worker(backplane) -> tuple[ConnectionManager, NotificationService]:
+    """Crea el par manager/servicio de un worker conectado al backplane."""
+    manager = ConnectionManager()
+    service = NotificationService()
+    manager.attach_backplane(backplane)
+    service.attach_backplane(backplane)
+    await backplane.start()
+    return manager, service
+
+
+class TestInProcessBackplane:
+    """Tests con workers simulados en el mismo proceso."""
+
+    @pytest.mark.asyncio
+    async def test_room_broadcast_reaches_other_worker(self):
+        broker = InProcessBroker()
+        manager_a, _ = await make_worker(InProcessBackplane(broker))
+        manager_b, _ = await make_worker(InProcessBackplane(broker))
+
+        ws_a, ws_b = FakeWebSocket(), FakeWebSocket()
+        manager_a.register(ws_a, 1, 10, "alice")
+        manager_b.register(ws_b, 1, 20, "bob")
+
+        await manager_a.broadcast_to_room(1, {"type": "message", "content": "hola"})
+        await manager_a.outboxes[ws_a].drain()
+        await manager_b.outboxes[ws_b].drain()
+
+        # Cada socket lo recibe una sola vez
+        assert ws_a.sent == [{"type": "message", "content": "hola"}]
+        assert ws_b.sent == [{"type": "message", "content": "hola"}]
+
+    @pytest.mark.asyncio
+    async def test_notification_broadcast_reaches_other_worker(self):
+        broker = InProcessBroker()
+        _, service_a = await make_worker(InProcessBackplane(broker))
+        _, service_b = await make_worker(InProcessBackplane(broker))
+        queue = service_b._open_stream(2)
+
+        assert await service_a.broadcast("room_created", {"room_id": 1}) == 0
+
+        notification = queue.get_nowait()
+        assert notification.get("type") == "room_created"
+
+    @pytest.mark.asyncio
+    async def test_replay_on_other_worker_keeps_publisher_ids(self):
+        broker = InProcessBroker()
+        _, service_a = await make_worker(InProcessBackplane(broker))
+        _, service_b = await make_worker(InProcessBackplane(broker))
+        queue_a = service_a._open_stream(1)
+        service_b._close_stream(1, service_b._open_stream(1))
+
+        await service_a.broadcast("a", {})
+        seen = queue_a.get_nowait()
+        service_a._close_stream(1, queue_a)
+        await service_a.broadcast("b", {})
+
+        # El cliente reconecta en el otro worker con el id que vio en A
+        resumed = service_b.subscribe(user_id=1, last_event_id=seen.get("id"))
+        replayed = await resumed.__anext__()
+        await resumed.aclose()
+
+        assert replayed["event"] == "b"
+        assert int(replayed["id"]) > seen.get("id")
+
+    @pytest.mark.asyncio
+    async def test_resync_when_last_event_id_not_seen_yet(self):
+        _, service = await make_worker(InProcessBackplane())
+
+        # Id de otro worker cuya notificación aún no ha llegado
+        resumed = service.subscribe(user_id=1, last_event_id=service._last_event_id + 1)
+        first = await resumed.__anext__()
+        await resumed.aclose()
+
+        assert first["event"] == "resync"
+
+    @pytest.mark.asyncio
+    async def test_single_worker_does_not_relay(self):
+        manager, _ = await make_worker(InProcessBackplane())
+        ws = FakeWebSocket()
+        manager.register(ws, 1, 10, "alice")
+
+        await manager.broadcast_to_room(1, {"type": "message"})
+        await manager.outboxes[ws].drain()
+
+        assert ws.sent == [{"type": "message"}]
+
+
+class TestUnixSocketBackplane:
+    """Tests con el broker local por Unix socket."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_through_broker(self, tmp_path):
+        path = str(tmp_path / "backplane.sock")
+        broker = UnixSocketBroker(path)
+        await broker.start()
+
+        backplane_a, backplane_b = UnixSocketBackplane(path), UnixSocketBackplane(path)
+        manager_a, _ = await make_worker(backplane_a)
+        manager_b, _ = await make_worker(backplane_b)
+        ws_b = FakeWebSocket()
+        manager_b.register(ws_b, 1, 20, "bob")
+
+        await manager_a.broadcast_to_room(1, {"type": "message", "content": "hola"})
+        for _ in range(50):
+            if ws_b.sent:
+                break
+            await asyncio.sleep(0.01)
+
+        assert ws_b.sent == [{"type": "message", "content": "hola"}]
+
+        await backplane_a.stop()
+        await backplane_b.stop()
+        await broker.stop()
+
+    @pytest.mark.asyncio
+    async def test_malformed_frame_does_not_stop_listener(self, tmp_path):
+        path = str(tmp_path / "backplane.sock")
+        broker = UnixSocketBroker(path)
+        await broker.start()
+
+        backplane = UnixSocketBackplane(path)
+        manager, _ = await make_worker(backplane)
+        ws = FakeWebSocket()
+        manager.register(ws, 1, 20, "bob")
+
+        _, writer = await asyncio.open_unix_connection(path)
+        writer.write(b"{no es json\n")
+        writer.write(b'{"origin": "otro", "topic": "room", "data": {"room_id": 1, '
+                     b'"message": {"type": "message"}}}\n')
+        await writer.drain()
+        for _ in range(50):
+            if ws.sent:
+                break
+            await asyncio.sleep(0.01)
+
+        assert ws.sent == [{"type": "message"}]
+
+        writer.close()
+        await backplane.stop()
+        await broker.stop()
+
+    @pytest.mark.asyncio
+    async def test_reconnects_after_broker_restart(self, tmp_path):
+        path = str(tmp_path / "backplane.sock")
+        broker = UnixSocketBroker(path)
+        await broker.start()
+
+        backplane_a, backplane_b = UnixSocketBackplane(path), UnixSocketBackplane(path)
+        backplane_a.reconnect_min_delay = backplane_b.reconnect_min_delay = 0.01
+        manager_a, _ = await make_worker(backplane_a)
+        manager_b, _ = await make_worker(backplane_b)
+        ws_b = FakeWebSocket()
+        manager_b.register(ws_b, 1, 20, "bob")
+
+        async def wait_for_clients(broker: UnixSocketBroker) -> None:
+            for _ in range(100):
+                if len(broker._clients) == 2:
+                    return
+                await asyncio.sleep(0.01)
+
+        await wait_for_clients(broker)
+        await broker.stop()
+        broker = UnixSocketBroker(path)
+        await broker.start()
+        await wait_for_clients(broker)
+
+        await manager_a.broadcast_to_room(1, {"type": "message", "content": "hola"})
+        for _ in range(50):
+            if ws_b.sent:
+                break
+            await asyncio.sleep(0.01)
+
+        assert ws_b.sent == [{"type": "message", "content": "hola"}]
+
+        await backplane_a.stop()
+        await backplane_b.stop()
+        await broker.stop()
+
+
+class TestCreateBackplane:
+    """Tests de la factoría por URL."""
+
+    def test_memory_url(self):
+        assert isinstance(create_backplane("memory://"), InProcessBackplane)
+
+    def test_unix_url(self):
+        backplane = create_backplane("unix:///tmp/chat.sock")
+        assert isinstance(backplane, UnixSocketBackplane)
+        assert backplane.path == "/tmp/chat.sock"
+
+    def test_unknown_url(self):
+        with pytest.raises(ValueError):
+            create_backplane("kafka://localhost")
@@ -0,0 +1,82 @@
+"""
+Tests de mensajes pre-codificados.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src import encoding
+from src.encoding import EncodedMessage, encode_message
+from src.manager import ConnectionManager
+from src.notifications import NotificationService
+from tests.test_manager import FakeWebSocket
+
+
+class TestEncodedMessage:
+    """Tests de EncodedMessage."""
+
+    def test_encode_once(self):
+        message = encode_message({"type": "message", "content": "hola ñ"})
+
+        assert json.loads(message.text) == {"type": "message", "content": "hola ñ"}
+        assert message.get("type") == "message"
+        assert encode_message(message) is message
+
+    def test_fallback_without_orjson(self, monkeypatch):
+        monkeypatch.setattr(encoding, "orjson", None)
+
+        assert encoding.dumps({"a": "ñ"}) == '{"a":"ñ"}'
+
+    @pytest.mark.asyncio
+    async def test_broadcast_encodes_once_per_room(self, monkeypatch):
+        calls = []
+        original = encoding.dumps
+        monkeypatch.setattr(
+            "src.encoding.dumps", lambda data: calls.append(data) or original(data)
+        )
+
+        manager = ConnectionManager()
+        sockets = [FakeWebSocket() for _ in range(50)]
+        for i, ws in enumerate(sockets):
+            manager.register(ws, 1, i, f"user{i}")
+
+        await manager.broadcast_to_room(1, {"type": "message", "content": "hola"})
+        for outbox in manager.outboxes.values():
+            await outbox.drain()
+
+        assert len(calls) == 1
+        assert all(ws.sent == [{"type": "message", "content": "hola"}] for ws in sockets)
+
+
+class TestNotificationBroadcast:
+    """Tests de broadcast SSE con payload compartido."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_shares_payload(self):
+        service = NotificationService()
+        queues = [service._open_stream(user_id) for user_id in (1, 2, 3)]
+
+        assert await service.broadcast("room_created", {"room_id": 7}) == 3
+
+        payloads = [queue.get_nowait() for queue in queues]
+        assert all(isinstance(p, EncodedMessage) for p in payloads)
+        assert payloads[0] is payloads[1] is payloads[2]
+        assert json.loads(payloads[0].text)["data"] == {"room_id": 7}
+
+    @pytest.mark.asyncio
+    async def test_subscribe_yields_encoded_data(self):
+        service = NotificationService()
+        events = service.subscribe(user_id=1)
+
+        pending = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0)
+
+        assert await service.notify_user(1, "user_joined", {"username": "alice"}) is True
+        event = await pending
+
+        assert event["event"] == "user_joined"
+        assert json.loads(event["data"])["data"] == {"username": "alice"}
+        await events.aclose()
+        assert service.get_subscribers_count() == 0
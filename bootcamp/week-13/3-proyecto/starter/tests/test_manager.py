@@ -0,0 +1,115 @@
+"""
+Tests del Connection Manager.
+"""
+
+import json
+
+import pytest
+
+from src.manager import ConnectionManager
+
+
+class FakeWebSocket:
+    """WebSocket falso que guarda los mensajes enviados."""
+
+    def __init__(self):
+        self.accepted = False
+        self.sent: list = []
+        self.closed_code: int | None = None
+
+    async def accept(self):
+        self.accepted = True
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+    async def send_text(self, data):
+        self.sent.append(json.loads(data))
+
+    async def close(self, code: int = 1000):
+        self.closed_code = code
+
+
+@pytest.fixture
+def manager() -> ConnectionManager:
+    """Manager vacío para cada test."""
+    return ConnectionManager()
+
+
+class TestConnectionIndexes:
+    """Tests de los índices del manager."""
+
+    @pytest.mark.asyncio
+    async def test_connect_registers_in_all_indexes(self, manager):
+        ws = FakeWebSocket()
+        await manager.connect(ws, room_id=1, user_id=10, username="alice")
+
+        assert ws.accepted is True
+        assert ws in manager.rooms[1]
+        assert manager.connections[ws] == (1, 10, "alice")
+        assert manager.is_user_in_room(1, 10) is True
+        assert manager.is_user_online(10) is True
+        assert manager.get_room_usernames(1) == ["alice"]
+        assert manager.get_room_users(1) == [{"user_id": 10, "username": "alice"}]
+
+    def test_disconnect_cleans_empty_structures(self, manager):
+        ws = FakeWebSocket()
+        manager.register(ws, 1, 10, "alice")
+
+        assert manager.disconnect(ws) == (1, 10, "alice")
+        assert manager.disconnect(ws) is None
+        assert 1 not in manager.rooms
+        assert 1 not in manager.room_members
+        assert manager.is_user_online(10) is False
+        assert manager.get_room_usernames(1) == []
+        assert manager.get_connection_count() == 0
+
+    def test_user_with_several_tabs(self, manager):
+        ws1, ws2 = FakeWebSocket(), FakeWebSocket()
+        manager.register(ws1, 1, 10, "alice")
+        manager.register(ws2, 1, 10, "alice")
+
+        assert manager.get_user_count(1) == 2
+        assert manager.get_room_usernames(1) == ["alice"]
+
+        manager.disconnect(ws1)
+        assert manager.is_user_in_room(1, 10) is True
+
+        manager.disconnect(ws2)
+        assert manager.is_user_in_room(1, 10) is False
+
+    def test_usernames_cache_invalidated_on_change(self, manager):
+        ws1, ws2 = FakeWebSocket(), FakeWebSocket()
+        manager.register(ws1, 1, 10, "alice")
+        first = manager.get_room_usernames(1)
+
+        # Sin cambios se reutiliza el mismo snapshot
+        assert manager.get_room_usernames(1) is first
+
+        manager.register(ws2, 1, 20, "bob")
+        assert manager.get_room_usernames(1) == ["alice", "bob"]
+
+        manager.disconnect(ws1)
+        assert manager.get_room_usernames(1) == ["bob"]
+
+    @pytest.mark.asyncio
+    async def test_broadcast_excludes_sender(self, manager):
+        ws1, ws2 = FakeWebSocket(), FakeWebSocket()
+        manager.register(ws1, 1, 10, "alice")
+        manager.register(ws2, 1, 20, "bob")
+
+        await manager.broadcast_to_room(1, {"type": "message"}, exclude=ws1)
+        await manager.outboxes[ws2].drain()
+
+        assert ws1.sent == []
+        assert ws2.sent == [{"type": "message"}]
+
+    def test_disconnect_closes_outbox(self, manager):
+        ws = FakeWebSocket()
+        manager.register(ws, 1, 10, "alice")
+        outbox = manager.outboxes[ws]
+
+        manager.disconnect(ws)
+
+        assert ws not in manager.outboxes
+        assert outbox.closed is True
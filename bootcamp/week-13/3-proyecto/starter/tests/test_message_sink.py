@@ -0,0 +1,129 @@
+"""
+Tests de la persistencia write-behind de mensajes.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from sqlalchemy.orm import sessionmaker
+
+from src.message_sink import MessageSink
+from src.models import Message
+
+
+@pytest.fixture
+def session_factory(db):
+    """Sesiones sobre la misma DB en memoria del fixture db."""
+    return sessionmaker(bind=db.get_bind())
+
+
+class TestMessageSink:
+    """Tests de MessageSink."""
+
+    @pytest.mark.asyncio
+    async def test_sync_mode_returns_ids_in_one_batch(self, db, session_factory, test_user, test_room):
+        sink = MessageSink(session_factory, batch_size=10, flush_interval=0.01)
+        await sink.start()
+
+        ids = await asyncio.gather(*(
+            sink.submit(test_room.id, test_user.id, f"msg {i}") for i in range(5)
+        ))
+        await sink.stop()
+
+        assert len(set(ids)) == 5
+        assert sink.stats == {"written": 5, "batches": 1, "failed": 0}
+        contents = [db.get(Message, message_id).content for message_id in ids]
+        assert contents == [f"msg {i}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_batch_size_triggers_flush(self, db, session_factory, test_user, test_room):
+        sink = MessageSink(session_factory, batch_size=3, flush_interval=60)
+        await sink.start()
+
+        ids = await asyncio.gather(*(
+            sink.submit(test_room.id, test_user.id, "hola") for _ in range(3)
+        ))
+        await sink.stop()
+
+        assert all(message_id is not None for message_id in ids)
+
+    @pytest.mark.asyncio
+    async def test_async_mode_flushes_on_stop(self, db, session_factory, test_user, test_room):
+        sink = MessageSink(
+            session_factory, batch_size=100, flush_interval=60, durability="async"
+        )
+        await sink.start()
+
+        assert await sink.submit(test_room.id, test_user.id, "hola") is None
+        assert db.query(Message).count() == 0
+
+        await sink.stop()
+        assert db.query(Message).count() == 1
+
+    @pytest.mark.asyncio
+    async def test_on_written_runs_after_commit(self, db, session_factory, test_user, test_room):
+        sink = MessageSink(
+            session_factory, batch_size=100, flush_interval=60, durability="async"
+        )
+        await sink.start()
+        written = []
+
+        def on_written(message_id: int) -> None:
+            # El mensaje ya es visible para otra sesión
+            assert db.get(Message, message_id) is not None
+            written.append(message_id)
+
+        await sink.submit(test_room.id, test_user.id, "hola", on_written=on_written)
+        assert written == []
+
+        await sink.stop()
+        assert len(written) == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_batch_in_progress(self, db, session_factory, test_user, test_room):
+        def slow_session():
+            time.sleep(0.1)
+            return session_factory()
+
+        sink = MessageSink(slow_session, batch_size=1, flush_interval=60)
+        await sink.start()
+        submitted = asyncio.ensure_future(sink.submit(test_room.id, test_user.id, "hola"))
+        await asyncio.sleep(0.02)
+
+        # El lote ya se está escribiendo en el hilo
+        await sink.stop()
+
+        assert await submitted is not None
+        assert db.query(Message).count() == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_task_still_resolves_callers(self, session_factory, test_user, test_room):
+        def slow_session():
+            time.sleep(0.1)
+            return session_factory()
+
+        sink = MessageSink(slow_session, batch_size=1, flush_interval=60)
+        await sink.start()
+        submitted = asyncio.ensure_future(sink.submit(test_room.id, test_user.id, "hola"))
+        await asyncio.sleep(0.02)
+
+        sink._task.cancel()
+
+        assert await asyncio.wait_for(submitted, timeout=1) is not None
+
+    @pytest.mark.asyncio
+    async def test_failure_propagates_in_sync_mode(self):
+        def broken_session():
+            raise RuntimeError("db down")
+
+        sink = MessageSink(broken_session)
+
+        with pytest.raises(RuntimeError):
+            await sink.submit(1, 1, "hola")
+        assert sink.stats["failed"] == 1
+
+    def test_invalid_durability(self):
+        with pytest.raises(ValueError):
+            MessageSink(durability="eventually")
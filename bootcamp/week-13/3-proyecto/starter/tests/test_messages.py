@@ -0,0 +1,141 @@
+"""
+Tests del historial de mensajes: keyset y cache por sala.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src import services
+from src.message_cache import RoomMessageCache, message_cache
+from src.models import Message
+
+
+@pytest.fixture(autouse=True)
+def clear_message_cache():
+    """El cache global no debe filtrarse entre tests."""
+    message_cache._rooms.clear()
+    yield
+    message_cache._rooms.clear()
+
+
+@pytest.fixture
+def messages(db, test_user, test_room) -> list[Message]:
+    """Crea 7 mensajes; dos comparten created_at para probar el desempate por id."""
+    base = datetime(2026, 1, 1, 12, 0, 0)
+    times = [base + timedelta(seconds=i) for i in range(6)] + [base + timedelta(seconds=5)]
+    rows = [
+        Message(content=f"msg {i}", created_at=t, user_id=test_user.id, room_id=test_room.id)
+        for i, t in enumerate(times)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+class TestKeysetPagination:
+    """Tests de get_room_messages_before."""
+
+    def test_pages_cover_all_messages_without_overlap(self, db, test_room, messages):
+        seen, cursor = [], None
+        while True:
+            page = services.get_room_messages_before(db, test_room.id, cursor, limit=3)
+            if not page:
+                break
+            seen.extend(m.content for m in page)
+            cursor = (page[-1].created_at, page[-1].id)
+
+        assert seen == ["msg 6", "msg 5", "msg 4", "msg 3", "msg 2", "msg 1", "msg 0"]
+
+    def test_username_loaded_in_same_query(self, db, test_room, messages):
+        db.expire_all()
+        page = services.get_room_messages_before(db, test_room.id, limit=5)
+
+        # contains_eager: la relación ya está cargada, sin lazy load
+        assert all("user" in m.__dict__ for m in page)
+        assert services.get_message_with_username(page[0])["username"] == "testuser"
+
+    def test_cursor_round_trip(self):
+        created_at = datetime(2026, 1, 1, 12, 0, 0, 123)
+        cursor = services.encode_cursor(created_at, 42)
+
+        assert services.decode_cursor(cursor) == (created_at, 42)
+        assert services.decode_cursor("not-a-cursor") is None
+
+
+class TestRoomMessageCache:
+    """Tests de RoomMessageCache."""
+
+    def _message(self, message_id: int, second: int) -> dict:
+        created_at = datetime(2026, 1, 1, 12, 0, second)
+        return {"id": message_id, "created_at": created_at.isoformat(), "content": ""}
+
+    def test_complete_room_served_from_cache(self):
+        cache = RoomMessageCache(size=10)
+        cache.warm(1, [self._message(2, 2), self._message(1, 1)])
+
+        assert [m["id"] for m in cache.get_page(1, None, 50)] == [2, 1]
+
+    def test_partial_room_falls_back_to_db(self):
+        cache = RoomMessageCache(size=2)
+        cache.warm(1, [self._message(3, 3), self._message(2, 2)])
+
+        assert [m["id"] for m in cache.get_page(1, None, 2)] == [3, 2]
+        # Más antiguos que el cache: solo están en la DB
+        assert cache.get_page(1, None, 3) is None
+
+    def test_append_keeps_cache_current_and_skips_duplicates(self):
+        cache = RoomMessageCache(size=10)
+        cache.warm(1, [self._message(1, 1)])
+
+        cache.append(1, self._message(2, 2))
+        cache.append(1, self._message(2, 2))
+
+        assert [m["id"] for m in cache.get_page(1, None, 10)] == [2, 1]
+
+    def test_max_rooms_evicts_least_recent(self):
+        cache = RoomMessageCache(size=10, max_rooms=2)
+        for room_id in (1, 2, 3):
+            cache.warm(room_id, [])
+
+        assert 1 not in cache
+        assert 2 in cache and 3 in cache
+
+
+class TestMessagesEndpoint:
+    """Tests de GET /rooms/{room_id}/messages."""
+
+    def test_paginates_with_cursor_header(self, client, test_room, messages):
+        first = client.get(f"/rooms/{test_room.id}/messages?limit=4")
+        cursor = first.headers["X-Next-Cursor"]
+        second = client.get(f"/rooms/{test_room.id}/messages", params={"limit": 4, "before": cursor})
+
+        contents = [m["content"] for m in first.json() + second.json()]
+        assert contents == ["msg 6", "msg 5", "msg 4", "msg 3", "msg 2", "msg 1", "msg 0"]
+        assert "X-Next-Cursor" not in second.headers
+
+    def test_hot_room_does_not_query_db(self, client, db, test_room, messages):
+        client.get(f"/rooms/{test_room.id}/messages")
+        db.query(Message).delete()
+        db.commit()
+
+        # Servido desde el cache aunque la tabla esté vacía
+        response = client.get(f"/rooms/{test_room.id}/messages")
+        assert len(response.json()) == 7
+
+    def test_disabled_cache_always_reads_db(self, client, db, test_room, messages, monkeypatch):
+        monkeypatch.setattr(message_cache, "enabled", False)
+        client.get(f"/rooms/{test_room.id}/messages")
+        db.query(Message).delete()
+        db.commit()
+
+        # Sin cache (varios workers) cada lectura ve la DB actual
+        assert client.get(f"/rooms/{test_room.id}/messages").json() == []
+        assert test_room.id not in message_cache
+
+    def test_unknown_room(self, client):
+        assert client.get("/rooms/999/messages").status_code == 404
+
+    def test_invalid_cursor(self, client, test_room):
+        response = client.get(f"/rooms/{test_room.id}/messages", params={"before": "???"})
+        assert response.status_code == 400
@@ -0,0 +1,191 @@
+"""
+Tests de las colas acotadas del servicio de notificaciones.
+"""
+
+import asyncio
+
+import pytest
+
+from src.notifications import NotificationQueue, NotificationService, create_notification
+from src.outbox import OverflowPolicy
+
+
+def drain(queue: NotificationQueue) -> list[str]:
+    """Saca todas las notificaciones pendientes y retorna sus tipos."""
+    return [queue.get_nowait().get("type") for _ in range(len(queue))]
+
+
+class TestOverflowPolicies:
+    """Tests de las políticas de desborde."""
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest(self):
+        service = NotificationService(queue_size=2, overflow_policy="drop_oldest")
+        queue = service._open_stream(1)
+
+        for event in ("a", "b", "c"):
+            await service.broadcast(event, {})
+
+        assert drain(queue) == ["b", "c"]
+        assert service.stats.dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_coalesce_by_event_type(self):
+        service = NotificationService(queue_size=10, overflow_policy=OverflowPolicy.COALESCE)
+        queue = service._open_stream(1)
+
+        await service.broadcast("user_joined", {"username": "a"})
+        await service.broadcast("new_message", {})
+        await service.broadcast("user_joined", {"username": "b"})
+
+        first = queue.get_nowait()
+        assert first.get("data") == {"username": "b"}
+        assert queue.get_nowait().get("type") == "new_message"
+        assert service.stats.coalesced == 1
+
+    @pytest.mark.asyncio
+    async def test_disconnect_ends_stream(self):
+        service = NotificationService(queue_size=1, overflow_policy="disconnect")
+        events = service.subscribe(user_id=1, keepalive_seconds=1)
+        pending = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0)
+
+        # El consumidor no lee a tiempo: la segunda desborda
+        [queue] = service.subscribers[1]
+        queue.put(create_notification("a", {}))
+        queue.put(create_notification("b", {}))
+
+        with pytest.raises(StopAsyncIteration):
+            await pending
+
+        assert service.stats.disconnected == 1
+        assert queue.closed is True
+        assert service.get_subscribers_count() == 0
+
+
+class TestMultipleConnections:
+    """Tests de varias conexiones SSE del mismo usuario."""
+
+    @pytest.mark.asyncio
+    async def test_each_connection_receives_every_notification(self):
+        service = NotificationService()
+        first, second = service.subscribe(user_id=1), service.subscribe(user_id=1)
+        pending = [asyncio.ensure_future(events.__anext__()) for events in (first, second)]
+        await asyncio.sleep(0)
+
+        assert await service.notify_user(1, "ping", {}) is True
+        assert [(await p)["event"] for p in pending] == ["ping", "ping"]
+
+        # Cerrar una pestaña no corta la otra
+        await first.aclose()
+        assert service.get_subscribers_count() == 1
+        pending = asyncio.ensure_future(second.__anext__())
+        await asyncio.sleep(0)
+        await service.broadcast("pong", {})
+        assert (await pending)["event"] == "pong"
+
+        await second.aclose()
+        assert service.get_subscribers_count() == 0
+        assert service.get_queue_stats()["queues"] == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_connection_does_not_disconnect_others(self):
+        service = NotificationService(queue_size=1, overflow_policy="disconnect")
+        slow, fast = service._open_stream(1), service._open_stream(1)
+
+        await service.broadcast("a", {})
+        fast.get_nowait()
+        await service.broadcast("b", {})
+
+        assert slow.closed is True
+        assert fast.closed is False
+        assert drain(fast) == ["b"]
+
+
+class TestQueueLifecycle:
+    """Tests de creación y limpieza de colas."""
+
+    @pytest.mark.asyncio
+    async def test_offline_user_gets_no_queue(self):
+        service = NotificationService()
+
+        assert await service.notify_user(99, "ping", {}) is False
+        assert service.replay_buffers == {}
+
+    def test_evict_idle_replay_buffers(self):
+        service = NotificationService(idle_seconds=0)
+        service._open_stream(1).put(create_notification("a", {}))
+        service._close_stream(2, service._open_stream(2))
+
+        # El usuario 2 no tiene conexiones: se elimina; el 1 se conserva
+        assert service.evict_idle(force=True) == 1
+        assert list(service.replay_buffers) == [1]
+        assert service.get_queue_stats()["queued"] == 1
+        assert service.get_queue_stats()["evicted"] == 1
+
+
+class TestReplay:
+    """Tests del replay con Last-Event-ID."""
+
+    async def _read(self, events, count: int) -> list[dict]:
+        return [await events.__anext__() for _ in range(count)]
+
+    @pytest.mark.asyncio
+    async def test_events_have_increasing_ids(self):
+        service = NotificationService()
+        queue = service._open_stream(1)
+
+        await service.broadcast("a", {})
+        await service.broadcast("b", {})
+
+        first, second = (queue.get_nowait() for _ in range(2))
+        assert second.get("id") > first.get("id")
+
+    @pytest.mark.asyncio
+    async def test_reconnect_replays_only_missed(self):
+        service = NotificationService()
+        events = service.subscribe(user_id=1)
+        pending = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0)
+
+        await service.broadcast("a", {})
+        seen = await pending
+        await events.aclose()
+
+        # Desconectado: se guardan para el replay
+        await service.broadcast("b", {})
+        await service.notify_user(1, "c", {})
+
+        resumed = service.subscribe(user_id=1, last_event_id=int(seen["id"]))
+        replayed = await self._read(resumed, 2)
+        await resumed.aclose()
+
+        assert [e["event"] for e in replayed] == ["b", "c"]
+        assert int(replayed[0]["id"]) > int(seen["id"])
+
+    @pytest.mark.asyncio
+    async def test_resync_when_buffer_overflowed(self):
+        service = NotificationService(replay_size=2)
+        queue = service._open_stream(1)
+        await service.broadcast("a", {})
+        first_id = queue.get_nowait().get("id")
+        service._close_stream(1, queue)
+
+        for event in ("b", "c", "d"):
+            await service.broadcast(event, {})
+
+        resumed = service.subscribe(user_id=1, last_event_id=first_id)
+        replayed = await self._read(resumed, 3)
+        await resumed.aclose()
+
+        assert [e["event"] for e in replayed] == ["resync", "c", "d"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_user_needs_resync(self):
+        service = NotificationService()
+
+        resumed = service.subscribe(user_id=1, last_event_id=1)
+        event = await resumed.__anext__()
+        await resumed.aclose()
+
+        assert event["event"] == "resync"
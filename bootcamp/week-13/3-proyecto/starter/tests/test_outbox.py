@@ -0,0 +1,124 @@
+"""
+Tests de la cola de salida por WebSocket.
+"""
+
+import asyncio
+
+import pytest
+
+from src.outbox import OverflowPolicy, SocketOutbox, SLOW_CONSUMER_CLOSE_CODE
+from tests.test_manager import FakeWebSocket
+
+
+class BlockedWebSocket(FakeWebSocket):
+    """WebSocket cuyo envío queda bloqueado hasta liberar el evento."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+
+    async def send_json(self, data):
+        await self.release.wait()
+        await super().send_json(data)
+
+
+class TestSocketOutbox:
+    """Tests de SocketOutbox."""
+
+    @pytest.mark.asyncio
+    async def test_sends_in_order(self):
+        ws = FakeWebSocket()
+        outbox = SocketOutbox(ws, max_size=10)
+
+        for i in range(3):
+            outbox.put({"n": i})
+        await outbox.drain()
+
+        assert ws.sent == [{"n": 0}, {"n": 1}, {"n": 2}]
+        assert outbox.sent == 3
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest(self):
+        ws = BlockedWebSocket()
+        outbox = SocketOutbox(ws, max_size=2, policy=OverflowPolicy.DROP_OLDEST)
+
+        # El primero lo toma la tarea escritora y queda bloqueado
+        outbox.put({"n": 0})
+        await asyncio.sleep(0)
+        for i in range(1, 4):
+            outbox.put({"n": i})
+
+        ws.release.set()
+        await outbox.drain()
+
+        assert ws.sent == [{"n": 0}, {"n": 2}, {"n": 3}]
+        assert outbox.dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_drop_newest(self):
+        ws = BlockedWebSocket()
+        outbox = SocketOutbox(ws, max_size=1, policy=OverflowPolicy.DROP_NEWEST)
+
+        outbox.put({"n": 0})
+        await asyncio.sleep(0)
+        assert outbox.put({"n": 1}) is True
+        assert outbox.put({"n": 2}) is False
+
+        ws.release.set()
+        await outbox.drain()
+
+        assert ws.sent == [{"n": 0}, {"n": 1}]
+
+    @pytest.mark.asyncio
+    async def test_coalesce_state_messages(self):
+        ws = BlockedWebSocket()
+        outbox = SocketOutbox(ws, max_size=10, policy=OverflowPolicy.COALESCE)
+
+        outbox.put({"type": "message", "n": 0})
+        await asyncio.sleep(0)
+        outbox.put({"type": "user_list", "room_id": 1, "users": ["a"]})
+        outbox.put({"type": "message", "n": 1})
+        outbox.put({"type": "user_list", "room_id": 1, "users": ["a", "b"]})
+
+        ws.release.set()
+        await outbox.drain()
+
+        assert ws.sent == [
+            {"type": "message", "n": 0},
+            {"type": "user_list", "room_id": 1, "users": ["a", "b"]},
+            {"type": "message", "n": 1},
+        ]
+        assert outbox.coalesced == 1
+
+    @pytest.mark.asyncio
+    async def test_disconnect_slow_consumer(self):
+        ws = BlockedWebSocket()
+        closed = []
+        outbox = SocketOutbox(
+            ws, max_size=1, policy=OverflowPolicy.DISCONNECT, on_close=closed.append
+        )
+
+        outbox.put({"n": 0})
+        await asyncio.sleep(0)
+        outbox.put({"n": 1})
+        assert outbox.put({"n": 2}) is False
+        await asyncio.sleep(0)
+
+        assert outbox.closed is True
+        assert closed == [ws]
+        assert ws.closed_code == SLOW_CONSUMER_CLOSE_CODE
+
+    @pytest.mark.asyncio
+    async def test_send_error_closes_outbox(self):
+        class BrokenWebSocket(FakeWebSocket):
+            async def send_json(self, data):
+                raise RuntimeError("closed")
+
+        closed = []
+        outbox = SocketOutbox(BrokenWebSocket(), on_close=closed.append)
+
+        outbox.put({"n": 0})
+        await asyncio.sleep(0)
+
+        assert outbox.closed is True
+        assert len(closed) == 1
@@ -0,0 +1,113 @@
+"""
+Tests del cache de verificación de tokens.
+"""
+
+import time
+from datetime import timedelta
+
+import pytest
+
+from src.auth import authenticate_token, create_access_token
+from src.token_cache import AuthenticatedUser, TokenCache, token_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """El cache global no debe filtrarse entre tests."""
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+class TestTokenCache:
+    """Tests de TokenCache."""
+
+    def test_put_and_get(self):
+        cache = TokenCache(max_size=10, ttl_seconds=60)
+        user = AuthenticatedUser(id=1, username="alice")
+        cache.put("t1", user)
+
+        assert cache.get("t1") == user
+        assert cache.get("other") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_respects_token_expiry(self):
+        cache = TokenCache(ttl_seconds=60)
+        cache.put("expired", AuthenticatedUser(1, "alice"), token_exp=time.time() - 1)
+
+        assert cache.get("expired") is None
+        assert len(cache) == 0
+
+    def test_bounded_lru(self):
+        cache = TokenCache(max_size=2)
+        for i in range(3):
+            cache.put(f"t{i}", AuthenticatedUser(i, f"user{i}"))
+
+        assert cache.get("t0") is None
+        assert len(cache) == 2
+
+    def test_invalidate_user(self):
+        cache = TokenCache()
+        cache.put("a", AuthenticatedUser(1, "alice"))
+        cache.put("b", AuthenticatedUser(1, "alice"))
+        cache.put("c", AuthenticatedUser(2, "bob"))
+
+        assert cache.invalidate_user(1) == 2
+        assert cache.get("a") is None
+        assert cache.get("c") is not None
+
+
+class TestAuthenticateToken:
+    """Tests de authenticate_token con la DB."""
+
+    def test_second_handshake_served_from_cache(self, db, test_user, test_user_token):
+        first = authenticate_token(db, test_user_token)
+        second = authenticate_token(db, test_user_token)
+
+        assert first == second == AuthenticatedUser(test_user.id, "testuser")
+        assert token_cache.hits == 1
+
+    def test_invalid_token_not_cached(self, db):
+        assert authenticate_token(db, "not-a-jwt") is None
+        assert len(token_cache) == 0
+
+    def test_expired_token_rejected(self, db, test_user):
+        token = create_access_token(
+            {"sub": str(test_user.id)}, expires_delta=timedelta(seconds=-1)
+        )
+        assert authenticate_token(db, token) is None
+
+    def test_user_update_invalidates(self, db, test_user, test_user_token):
+        authenticate_token(db, test_user_token)
+
+        test_user.username = "renamed"
+        db.commit()
+
+        assert authenticate_token(db, test_user_token).username == "renamed"
+
+    def test_invalidates_on_commit_not_flush(self, db, test_user, test_user_token):
+        authenticate_token(db, test_user_token)
+
+        test_user.username = "renamed"
+        db.flush()
+        # Cambio aún sin confirmar: otras sesiones siguen viendo el usuario
+        assert len(token_cache) == 1
+
+        db.rollback()
+        assert len(token_cache) == 1
+
+        test_user.username = "renamed"
+        db.commit()
+        assert len(token_cache) == 0
+
+
+class TestHandshake:
+    """El WebSocket usa el cache en reconexiones."""
+
+    def test_reconnect_hits_cache(self, client, test_user_token, test_room):
+        url = f"/ws/chat/{test_room.id}?token={test_user_token}"
+        for _ in range(2):
+            with client.websocket_connect(url) as websocket:
+                assert websocket.receive_json()["event"] == "welcome"
+
+        assert token_cache.hits >= 1
@@ -4,9 +4,16 @@ Tests de WebSocket.
 TODO: Completar los tests marcados con TODO
 """
 
+import asyncio
+
 import pytest
 from fastapi.testclient import TestClient
 
+from src.auth import create_access_token, get_password_hash
+from src.manager import manager
+from src.models import User
+from src.outbox import OverflowPolicy, SLOW_CONSUMER_CLOSE_CODE
+
 
 class TestWebSocketConnection:
     """Tests de conexión WebSocket."""
@@ -113,3 +120,60 @@ class TestConnectionManager:
         """
         # TODO: Implementar
         pass
+
+
+class TestSlowConsumer:
+    """Tests de la política DISCONNECT con el endpoint real."""
+    
+    def test_overflow_announces_user_left(self, client, db, test_user_token, test_room, monkeypatch):
+        """
+        Test: si el outbox de un cliente lento desborda, la sala recibe
+        user_left y la lista de usuarios actualizada.
+        """
+        bob = User(username="bob", email="bob@example.com", hashed_password=get_password_hash("x"))
+        db.add(bob)
+        db.commit()
+        bob_token = create_access_token(data={"sub": str(bob.id), "username": "bob"})
+        
+        monkeypatch.setattr(manager, "send_queue_size", 2)
+        monkeypatch.setattr(manager, "overflow_policy", OverflowPolicy.DISCONNECT)
+        url = f"/ws/chat/{test_room.id}?token="
+        
+        with client.websocket_connect(url + bob_token) as bob_ws:
+            assert bob_ws.receive_json()["event"] == "welcome"
+            assert bob_ws.receive_json()["type"] == "user_list"
+            
+            with client.websocket_connect(url + test_user_token) as slow_ws:
+                assert slow_ws.receive_json()["event"] == "welcome"
+                assert slow_ws.receive_json()["type"] == "user_list"
+                
+                # El cliente deja de leer: su tarea escritora queda bloqueada
+                [slow_server_ws] = [
+                    ws for ws, info in manager.connections.items() if info[2] == "testuser"
+                ]
+                
+                async def stuck(text):
+                    await asyncio.sleep(3600)
+                
+                slow_server_ws.send_text = stuck
+                for _ in range(5):
+                    bob_ws.send_json({"type": "typing"})
+                
+                # Cierre 1013 y respuesta del cliente
+                message = slow_ws.receive()
+                assert message["type"] == "websocket.close"
+                assert message["code"] == SLOW_CONSUMER_CLOSE_CODE
+                slow_ws.close()
+                
+                received = []
+                for _ in range(20):
+                    bob_ws.send_json({"type": "ping"})
+                    while (data := bob_ws.receive_json())["type"] != "pong":
+                        received.append(data)
+                    if any(m.get("users") == ["bob"] for m in received):
+                        break
+        
+        left = [m for m in received if m.get("event") == "user_left"]
+        assert [m["data"] for m in left] == [{"username": "testuser"}]
+        assert received[-1]["type"] == "user_list"
+        assert received[-1]["users"] == ["bob"]
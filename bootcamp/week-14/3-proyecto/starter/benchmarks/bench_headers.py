@@ -0,0 +1,121 @@
+"""
+Benchmark de requests/segundo según la pila de middlewares.
+
+Compara la pila anterior (SecurityHeaders y RequestLogging como
+``BaseHTTPMiddleware``, más CORS) con la actual (middlewares ASGI puros
+con los headers ya codificados), para una respuesta JSON y una de
+streaming.
+
+Uso (desde la carpeta starter):
+    python -m benchmarks.bench_headers
+"""
+
+import asyncio
+import io
+import time
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.observability.log_writer import LogWriter
+from src.observability.logging import RequestLoggingMiddleware
+from src.security.headers import SECURITY_HEADERS, SecurityHeadersMiddleware
+
+
+REQUESTS = 3_000
+
+
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    """La implementación anterior: un header a la vez sobre el Response."""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        for header, value in SECURITY_HEADERS.items():
+            response.headers[header] = value
+        return response
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    """Logging anterior: BaseHTTPMiddleware sin escritura (solo el salto)."""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = "bench"
+        return response
+
+
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/json")
+    async def json_endpoint():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream_endpoint():
+        async def chunks():
+            for _ in range(5):
+                yield "data: tick\n\n"
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    if stack == "legacy":
+        app.add_middleware(CORSMiddleware, allow_origins=["http://localhost:3000"])
+        app.add_middleware(LegacySecurityHeadersMiddleware)
+        app.add_middleware(LegacyLoggingMiddleware)
+    elif stack == "asgi":
+        # El writer escribe en memoria: se mide la pila, no stdout
+        writer = LogWriter(stream=io.StringIO())
+        app.add_middleware(CORSMiddleware, allow_origins=["http://localhost:3000"])
+        app.add_middleware(SecurityHeadersMiddleware)
+        app.add_middleware(RequestLoggingMiddleware, writer=writer, sample_rate=0.0)
+    return app
+
+
+async def call(app: FastAPI, path: str) -> None:
+    # spec_version 2.4: StreamingResponse no espera http.disconnect
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"origin", b"http://localhost:3000")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("test", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def requests_per_second(stack: str, path: str) -> float:
+    app = build_app(stack)
+    await call(app, path)  # Construye la pila de middlewares
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await call(app, path)
+    return REQUESTS / (time.perf_counter() - start)
+
+
+def main() -> None:
+    print(f"{'pila':>8} | {'JSON (req/s)':>13} | {'stream (req/s)':>15}")
+    print("-" * 42)
+    for stack in ("none", "legacy", "asgi"):
+        json_rps = asyncio.run(requests_per_second(stack, "/json"))
+        stream_rps = asyncio.run(requests_per_second(stack, "/stream"))
+        print(f"{stack:>8} | {json_rps:>13,.0f} | {stream_rps:>15,.0f}")
+
+
+if __name__ == "__main__":
+    main()
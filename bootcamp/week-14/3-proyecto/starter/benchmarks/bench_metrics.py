@@ -0,0 +1,125 @@
+"""
+Microbenchmark del coste de instrumentación por request.
+
+Compara lo que cuesta registrar una request (counter + histograma de
+latencia con labels) con prometheus_client y con MetricsRegistry, y el
+coste de una request ASGI completa con cada middleware.
+
+Uso (desde la carpeta starter):
+    python -m benchmarks.bench_metrics
+"""
+
+import asyncio
+import time
+
+from fastapi import FastAPI
+from prometheus_client import CollectorRegistry, Counter, Histogram
+from prometheus_fastapi_instrumentator import Instrumentator
+
+from src.observability.metrics import MetricsMiddleware
+from src.observability.registry import MetricsRegistry
+
+
+OBSERVATIONS = 200_000
+REQUESTS = 5_000
+
+
+def bench_prometheus_client() -> float:
+    registry = CollectorRegistry()
+    requests = Counter("requests_total", "Requests", ["method", "handler", "status"], registry=registry)
+    latency = Histogram("latency_seconds", "Latency", ["method", "handler"], registry=registry)
+    start = time.perf_counter()
+    for i in range(OBSERVATIONS):
+        requests.labels("GET", "/tasks", "2xx").inc()
+        latency.labels("GET", "/tasks").observe((i % 1000) / 10_000)
+    return (time.perf_counter() - start) / OBSERVATIONS * 1_000_000_000
+
+
+def bench_registry() -> float:
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ("method", "handler", "status"))
+    latency = registry.histogram("latency_seconds", "Latency", ("method", "handler"), scale=1_000_000)
+    start = time.perf_counter()
+    for i in range(OBSERVATIONS):
+        requests.labels("GET", "/tasks", "2xx").inc()
+        latency.labels("GET", "/tasks").observe((i % 1000) / 10_000)
+    return (time.perf_counter() - start) / OBSERVATIONS * 1_000_000_000
+
+
+def bench_quantiles() -> float:
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", scale=1_000_000)
+    for i in range(OBSERVATIONS):
+        latency.observe((i % 1000) / 10_000)
+    histogram = registry.collect_local().histograms[("latency_seconds", ())]
+    start = time.perf_counter()
+    for _ in range(1_000):
+        histogram.quantile(0.99)
+    return (time.perf_counter() - start) / 1_000 * 1_000_000
+
+
+def build_app(mode: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/tasks")
+    async def tasks():
+        return {"ok": True}
+
+    if mode == "instrumentator":
+        Instrumentator(registry=CollectorRegistry()).instrument(app)
+    elif mode == "registry":
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def call(app: FastAPI) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/tasks",
+        "raw_path": b"/tasks",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "client": ("127.0.0.1", 1234),
+        "server": ("test", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def bench_request(mode: str) -> float:
+    app = build_app(mode)
+    await call(app)  # Construye la pila de middlewares
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await call(app)
+    return (time.perf_counter() - start) / REQUESTS * 1_000_000
+
+
+def main() -> None:
+    print("Registro de una request (counter + histograma):")
+    print(f"  prometheus_client: {bench_prometheus_client():8.0f} ns")
+    print(f"  MetricsRegistry:   {bench_registry():8.0f} ns")
+    print(f"  p99 HDR sobre {OBSERVATIONS} obs.: {bench_quantiles():.1f} µs")
+    print()
+
+    baseline = asyncio.run(bench_request("none"))
+    print("Request ASGI completa:")
+    print(f"  sin métricas:      {baseline:8.1f} µs")
+    for mode in ("instrumentator", "registry"):
+        elapsed = asyncio.run(bench_request(mode))
+        print(f"  {mode + ':':<18} {elapsed:8.1f} µs  (+{elapsed - baseline:.1f} µs)")
+
+
+if __name__ == "__main__":
+    main()
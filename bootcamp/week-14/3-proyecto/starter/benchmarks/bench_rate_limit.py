@@ -0,0 +1,112 @@
+"""
+Microbenchmark del coste del rate limiting por request.
+
+Mide el tiempo de ``storage.hit`` para cada backend y estrategia, y el
+de una request completa contra un endpoint con y sin ``@limiter.limit``.
+
+Uso (desde la carpeta starter):
+    python -m benchmarks.bench_rate_limit
+"""
+
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import FastAPI, Request
+
+from src.security.rate_limit import (
+    RateLimitExceeded,
+    RateLimitHeadersMiddleware,
+    RateLimiter,
+    rate_limit_exceeded_handler,
+)
+from src.security.rate_limit_storage import RateLimit, create_storage
+
+
+HITS = 50_000
+REQUESTS = 5_000
+CLIENTS = 1_000
+
+
+def bench_storage(uri: str, strategy: str, hits: int) -> float:
+    storage = create_storage(uri, strategy)
+    # Límite alto: se mide el camino normal, no el rechazo
+    limit = RateLimit(amount=1_000_000, period=60)
+    keys = [f"client:{i}" for i in range(CLIENTS)]
+    start = time.perf_counter()
+    for i in range(hits):
+        storage.hit(keys[i % CLIENTS], limit)
+    elapsed = time.perf_counter() - start
+    storage.close()
+    return elapsed / hits * 1_000_000
+
+
+def build_app(limited: bool) -> FastAPI:
+    limiter = RateLimiter(key_func=lambda request: "bench")
+    app = FastAPI()
+    app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+    app.add_middleware(RateLimitHeadersMiddleware)
+
+    async def endpoint(request: Request):
+        return {"ok": True}
+
+    if limited:
+        endpoint = limiter.limit("1000000/minute")(endpoint)
+    app.get("/")(endpoint)
+    return app
+
+
+async def call(app: FastAPI) -> None:
+    # Request ASGI mínima, sin la sobrecarga de un cliente HTTP
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/",
+        "raw_path": b"/",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "client": ("127.0.0.1", 1234),
+        "server": ("test", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def bench_request(limited: bool) -> float:
+    app = build_app(limited)
+    await call(app)  # Calentar el router
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await call(app)
+    return (time.perf_counter() - start) / REQUESTS * 1_000_000
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_uri = f"sqlite:///{Path(tmp) / 'limits.db'}"
+        print(f"{'backend':>10} | {'estrategia':>15} | {'µs por hit':>11}")
+        print("-" * 43)
+        for uri, name, hits in (("memory://", "memory", HITS), (sqlite_uri, "sqlite", HITS // 10)):
+            for strategy in ("sliding-window", "token-bucket"):
+                print(f"{name:>10} | {strategy:>15} | {bench_storage(uri, strategy, hits):>11.2f}")
+
+    baseline = asyncio.run(bench_request(limited=False))
+    limited = asyncio.run(bench_request(limited=True))
+    print()
+    print(f"Request sin límite:  {baseline:8.1f} µs")
+    print(f"Request con límite:  {limited:8.1f} µs  (+{limited - baseline:.1f} µs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -36,13 +36,30 @@ class Settings(BaseSettings):
     # Rate Limiting
     rate_limit_enabled: bool = True
     rate_limit_default: str = "100/minute"
+    rate_limit_strategy: str = "sliding-window"  # o "token-bucket"
+    # memory:// (por proceso) o sqlite:///./rate_limits.db (entre workers)
+    rate_limit_storage_uri: str = "memory://"
     
     # Logging
     log_level: str = "INFO"
     log_format: str = "json"
+    log_queue_size: int = 10_000
+    log_batch_size: int = 256
+    log_flush_interval: float = 0.5
+    # Fracción de requests exitosas que se loggean (errores siempre)
+    log_sample_rate: float = 1.0
+    
+    # Health checks
+    health_cache_ttl: float = 2.0
+    health_check_timeout: float = 1.0
+    health_breaker_threshold: int = 3
+    health_breaker_reset: float = 30.0
     
     # Métricas
     metrics_enabled: bool = True
+    # Directorio compartido por los workers (None: solo el proceso actual)
+    metrics_multiproc_dir: str | None = None
+    metrics_flush_interval: float = 1.0
     
     @property
     def allowed_origins_list(self) -> list[str]:
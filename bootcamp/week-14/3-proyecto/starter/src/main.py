@@ -16,16 +16,26 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from slowapi.errors import RateLimitExceeded
 
 from src.config import get_settings
 from src.database import init_db
 from src.routers import tasks_router, auth_router
-from src.security.rate_limit import limiter, rate_limit_exceeded_handler
+from src.security.rate_limit import (
+    RateLimitExceeded,
+    RateLimitHeadersMiddleware,
+    limiter,
+    rate_limit_exceeded_handler,
+)
 from src.security.headers import SecurityHeadersMiddleware
 from src.observability.logging import setup_logging, get_logger, RequestLoggingMiddleware
-from src.observability.metrics import instrumentator
-from src.observability.health import get_liveness, get_readiness, HealthStatus
+from src.observability.log_writer import log_writer
+from src.observability.metrics import registry, setup_metrics
+from src.observability.health import (
+    HealthStatus,
+    close_health_clients,
+    get_liveness,
+    get_readiness,
+)
 
 
 settings = get_settings()
@@ -44,6 +54,7 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     setup_logging()
+    await log_writer.start()
     logger = get_logger("startup")
     logger.info("starting_application", environment=settings.environment)
     
@@ -51,10 +62,15 @@ async def lifespan(app: FastAPI):
     init_db()
     logger.info("database_initialized")
     
+    await registry.start(settings.metrics_flush_interval)
+    
     yield
     
     # Shutdown
+    await registry.stop()
+    await close_health_clients()
     logger.info("shutting_down_application")
+    await log_writer.stop()
 
 
 # ============================================
@@ -72,13 +88,12 @@ app = FastAPI(
 
 
 # ============================================
-# TODO 1: Configurar Rate Limiting
+# Rate Limiting
 # ============================================
-# Añadir estado del limiter y handler de excepciones
 
-# TODO: Descomentar
-# app.state.limiter = limiter
-# app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+app.state.limiter = limiter
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+app.add_middleware(RateLimitHeadersMiddleware)
 
 
 # ============================================
@@ -98,35 +113,25 @@ app = FastAPI(
 
 
 # ============================================
-# TODO 3: Añadir Security Headers Middleware
+# Security Headers Middleware
 # ============================================
 
-# TODO: Descomentar
-# app.add_middleware(SecurityHeadersMiddleware)
+app.add_middleware(SecurityHeadersMiddleware)
 
 
 # ============================================
-# TODO 4: Añadir Request Logging Middleware
+# Request Logging Middleware
 # ============================================
 
-# TODO: Descomentar
-# app.add_middleware(RequestLoggingMiddleware)
+app.add_middleware(RequestLoggingMiddleware)
 
 
 # ============================================
-# TODO 5: Configurar Prometheus Metrics
+# Prometheus Metrics
 # ============================================
 
-# TODO: Descomentar para configuración avanzada
-# instrumentator.instrument(app).expose(
-#     app,
-#     endpoint="/metrics",
-#     include_in_schema=True,
-#     tags=["monitoring"],
-# )
-
-# Versión básica
-instrumentator.instrument(app).expose(app)
+if settings.metrics_enabled:
+    setup_metrics(app)
 
 
 # ============================================
@@ -1,14 +1,25 @@
 """Observability package."""
 
 from src.observability.logging import setup_logging, get_logger, RequestLoggingMiddleware
-from src.observability.metrics import instrumentator, record_task_created, record_task_completed
+from src.observability.log_writer import LogWriter, log_writer
+from src.observability.metrics import (
+    MetricsMiddleware,
+    record_task_completed,
+    record_task_created,
+    registry,
+    setup_metrics,
+)
 from src.observability.health import get_liveness, get_readiness
 
 __all__ = [
     "setup_logging",
     "get_logger",
     "RequestLoggingMiddleware",
-    "instrumentator",
+    "LogWriter",
+    "log_writer",
+    "MetricsMiddleware",
+    "registry",
+    "setup_metrics",
     "record_task_created",
     "record_task_completed",
     "get_liveness",
@@ -3,15 +3,34 @@ Health Checks Configuration.
 
 Este módulo implementa endpoints de health check para monitoreo.
 
-TODO: Implementar health checks completos.
+Con probes de varios kubelets y balanceadores, ejecutar los checks en
+cada request genera carga real sobre las dependencias. Por eso el
+readiness:
+
+- Ejecuta los checks en paralelo, cada uno con su propio timeout
+- Cachea el resultado ``health_cache_ttl`` segundos; las probes
+  concurrentes comparten un único check en curso (single-flight)
+- Protege cada dependencia con un circuit breaker: tras varios fallos
+  seguidos deja de consultarla durante ``health_breaker_reset`` segundos
 """
 
+import asyncio
 import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from enum import Enum
+from enum import Enum, StrEnum
 from typing import Any
 
+from sqlalchemy import text
+
 from src.config import get_settings
+from src.database import engine
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis es opcional
+    aioredis = None
 
 
 settings = get_settings()
@@ -19,122 +38,287 @@ settings = get_settings()
 
 class HealthStatus(str, Enum):
     """Estados de salud."""
-    
+
     HEALTHY = "healthy"
     UNHEALTHY = "unhealthy"
     DEGRADED = "degraded"
 
 
+CheckFunc = Callable[[], Awaitable[dict[str, Any]]]
+
+
 # ============================================
-# TODO 1: Funciones de Verificación
+# Funciones de Verificación
 # ============================================
 
 async def check_database() -> dict[str, Any]:
     """
     Verifica conexión a la base de datos.
-    
-    TODO: Implementar verificación real de DB.
-    
+
+    Usa una conexión del pool del engine (no una sesión nueva) y corre
+    en un hilo para no bloquear el event loop.
+
     Returns:
         dict: Estado de la base de datos
     """
-    # TODO: Implementar verificación real
-    # try:
-    #     start = time.perf_counter()
-    #     
-    #     # Ejecutar query simple
-    #     from src.database import SessionLocal
-    #     db = SessionLocal()
-    #     try:
-    #         db.execute(text("SELECT 1"))
-    #         latency_ms = (time.perf_counter() - start) * 1000
-    #         return {
-    #             "healthy": True,
-    #             "message": "Database connection OK",
-    #             "latency_ms": round(latency_ms, 2),
-    #         }
-    #     finally:
-    #         db.close()
-    #         
-    # except Exception as e:
-    #     return {
-    #         "healthy": False,
-    #         "message": f"Database error: {str(e)}",
-    #         "latency_ms": None,
-    #     }
-    
-    # Versión básica (simula DB ok)
+    def ping() -> None:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    start = time.perf_counter()
+    try:
+        await asyncio.to_thread(ping)
+    except Exception as e:
+        return {
+            "healthy": False,
+            "message": f"Database error: {str(e)}",
+            "latency_ms": None,
+        }
     return {
         "healthy": True,
         "message": "Database connection OK",
-        "latency_ms": 5.0,
+        "latency_ms": round((time.perf_counter() - start) * 1000, 2),
     }
 
 
+# Cliente reutilizado entre probes (uno por event loop)
+_redis_clients: dict[asyncio.AbstractEventLoop, Any] = {}
+
+
+def _get_redis_client():
+    loop = asyncio.get_running_loop()
+    client = _redis_clients.get(loop)
+    if client is None:
+        # Sin reintentos: el timeout y el circuit breaker son del checker
+        client = aioredis.from_url(settings.redis_url, retry=None)
+        _redis_clients[loop] = client
+    return client
+
+
 async def check_redis() -> dict[str, Any]:
     """
     Verifica conexión a Redis.
-    
-    TODO: Implementar verificación real de Redis.
-    
+
     Returns:
         dict: Estado de Redis
     """
-    # TODO: Implementar verificación real
-    # try:
-    #     import redis.asyncio as redis
-    #     
-    #     start = time.perf_counter()
-    #     client = redis.from_url(settings.redis_url)
-    #     await client.ping()
-    #     latency_ms = (time.perf_counter() - start) * 1000
-    #     await client.close()
-    #     
-    #     return {
-    #         "healthy": True,
-    #         "message": "Redis connection OK",
-    #         "latency_ms": round(latency_ms, 2),
-    #     }
-    #     
-    # except Exception as e:
-    #     return {
-    #         "healthy": False,
-    #         "message": f"Redis error: {str(e)}",
-    #         "latency_ms": None,
-    #     }
-    
-    # Versión básica (simula Redis ok)
+    if aioredis is None:
+        return {
+            "healthy": False,
+            "message": "Redis client not installed",
+            "latency_ms": None,
+        }
+
+    start = time.perf_counter()
+    try:
+        await _get_redis_client().ping()
+    except Exception as e:
+        return {
+            "healthy": False,
+            "message": f"Redis error: {str(e)}",
+            "latency_ms": None,
+        }
     return {
         "healthy": True,
         "message": "Redis connection OK",
-        "latency_ms": 2.0,
+        "latency_ms": round((time.perf_counter() - start) * 1000, 2),
     }
 
 
+async def close_health_clients() -> None:
+    """Cierra los clientes reutilizados (shutdown)."""
+    loop = asyncio.get_running_loop()
+    client = _redis_clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+# ============================================
+# Circuit Breaker
+# ============================================
+
+class CircuitState(StrEnum):
+    """Estados del circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker por dependencia.
+
+    - closed: se ejecuta el check; ``failure_threshold`` fallos seguidos
+      abren el circuito
+    - open: no se consulta la dependencia durante ``reset_timeout``
+    - half_open: se deja pasar un check de prueba; si va bien se cierra,
+      si falla se vuelve a abrir
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = settings.health_breaker_threshold,
+        reset_timeout: float = settings.health_breaker_reset,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+
+    @property
+    def state(self) -> CircuitState:
+        if self.opened_at is None:
+            return CircuitState.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return CircuitState.HALF_OPEN
+        return CircuitState.OPEN
+
+    def allow(self) -> bool:
+        """True si se puede consultar la dependencia."""
+        return self.state != CircuitState.OPEN
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        tripped = self.failures >= self.failure_threshold
+        if self.state == CircuitState.HALF_OPEN or tripped:
+            self.opened_at = time.monotonic()
+
+
+# ============================================
+# Readiness Checker
+# ============================================
+
+@dataclass
+class DependencyCheck:
+    """Check de una dependencia."""
+
+    name: str
+    func: CheckFunc
+    # Si una dependencia no crítica falla, el estado es DEGRADED
+    critical: bool = True
+    breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+
+
+class ReadinessChecker:
+    """Ejecuta los checks en paralelo, con caché y single-flight."""
+
+    def __init__(
+        self,
+        checks: list[DependencyCheck],
+        cache_ttl: float = settings.health_cache_ttl,
+        timeout: float = settings.health_check_timeout,
+    ):
+        self.checks = checks
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
+        self._result: dict[str, Any] | None = None
+        self._expires_at = 0.0
+        self._in_flight: asyncio.Future | None = None
+
+    async def get(self) -> dict[str, Any]:
+        """Resultado cacheado o, si caducó, el de un check nuevo compartido."""
+        if self._result is not None and time.monotonic() < self._expires_at:
+            return self._result
+
+        if self._in_flight is None:
+            self._in_flight = asyncio.ensure_future(self._refresh())
+            self._in_flight.add_done_callback(self._clear_in_flight)
+        # shield: si una probe se cancela, las demás siguen esperando el mismo check
+        return await asyncio.shield(self._in_flight)
+
+    def invalidate(self) -> None:
+        """Descarta el resultado cacheado."""
+        self._result = None
+        self._expires_at = 0.0
+
+    def _clear_in_flight(self, future: asyncio.Future) -> None:
+        if self._in_flight is future:
+            self._in_flight = None
+
+    async def _refresh(self) -> dict[str, Any]:
+        results = await asyncio.gather(*(self._run(check) for check in self.checks))
+
+        checks = {}
+        overall_status = HealthStatus.HEALTHY
+        for check, result in zip(self.checks, results):
+            checks[check.name] = result
+            if result["healthy"]:
+                continue
+            if check.critical:
+                overall_status = HealthStatus.UNHEALTHY
+            elif overall_status == HealthStatus.HEALTHY:
+                overall_status = HealthStatus.DEGRADED
+
+        self._result = {
+            "status": overall_status,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "service": "task-api",
+            "version": "1.0.0",
+            "checks": checks,
+        }
+        self._expires_at = time.monotonic() + self.cache_ttl
+        return self._result
+
+    async def _run(self, check: DependencyCheck) -> dict[str, Any]:
+        breaker = check.breaker
+        if not breaker.allow():
+            return {
+                "healthy": False,
+                "message": "Circuit open: check skipped",
+                "latency_ms": None,
+                "circuit": breaker.state.value,
+            }
+
+        try:
+            result = await asyncio.wait_for(check.func(), timeout=self.timeout)
+        except TimeoutError:
+            result = {
+                "healthy": False,
+                "message": f"Check timed out after {self.timeout}s",
+                "latency_ms": None,
+            }
+        except Exception as e:
+            result = {
+                "healthy": False,
+                "message": f"Check error: {str(e)}",
+                "latency_ms": None,
+            }
+
+        if result["healthy"]:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        return {**result, "circuit": breaker.state.value}
+
+
+readiness_checker = ReadinessChecker(
+    [
+        DependencyCheck("database", check_database, critical=True),
+        # Redis es opcional, solo degradado
+        DependencyCheck("redis", check_redis, critical=False),
+    ]
+)
+
+
 # ============================================
-# TODO 2: Liveness Check
+# Liveness Check
 # ============================================
 
 async def get_liveness() -> dict[str, Any]:
     """
     Liveness check - verifica si la aplicación está corriendo.
-    
+
     Este check debe ser SIMPLE y RÁPIDO.
     Si falla, Kubernetes reiniciará el container.
-    
-    TODO: Implementar liveness check.
-    
+
     Returns:
         dict: Estado de liveness
     """
-    # TODO: Implementar
-    # return {
-    #     "status": HealthStatus.HEALTHY,
-    #     "timestamp": datetime.now(timezone.utc).isoformat(),
-    #     "service": "task-api",
-    #     "version": "1.0.0",
-    # }
-    
     return {
         "status": HealthStatus.HEALTHY,
         "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -144,55 +328,17 @@ async def get_liveness() -> dict[str, Any]:
 
 
 # ============================================
-# TODO 3: Readiness Check
+# Readiness Check
 # ============================================
 
 async def get_readiness() -> dict[str, Any]:
     """
     Readiness check - verifica si puede recibir tráfico.
-    
+
     Este check verifica TODAS las dependencias críticas.
     Si falla, Kubernetes deja de enviar tráfico pero NO reinicia.
-    
-    TODO: Implementar readiness check completo.
-    
+
     Returns:
         dict: Estado de readiness con checks
     """
-    # TODO: Implementar verificación completa
-    # checks = {}
-    # overall_status = HealthStatus.HEALTHY
-    # 
-    # # Check database
-    # db_check = await check_database()
-    # checks["database"] = db_check
-    # if not db_check["healthy"]:
-    #     overall_status = HealthStatus.UNHEALTHY
-    # 
-    # # Check Redis
-    # redis_check = await check_redis()
-    # checks["redis"] = redis_check
-    # if not redis_check["healthy"]:
-    #     # Redis es opcional, solo degradado
-    #     if overall_status == HealthStatus.HEALTHY:
-    #         overall_status = HealthStatus.DEGRADED
-    # 
-    # return {
-    #     "status": overall_status,
-    #     "timestamp": datetime.now(timezone.utc).isoformat(),
-    #     "service": "task-api",
-    #     "version": "1.0.0",
-    #     "checks": checks,
-    # }
-    
-    # Versión básica
-    return {
-        "status": HealthStatus.HEALTHY,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "service": "task-api",
-        "version": "1.0.0",
-        "checks": {
-            "database": {"healthy": True, "message": "OK", "latency_ms": 5.0},
-            "redis": {"healthy": True, "message": "OK", "latency_ms": 2.0},
-        },
-    }
+    return await readiness_checker.get()
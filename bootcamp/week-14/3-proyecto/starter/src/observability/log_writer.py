@@ -0,0 +1,148 @@
+"""
+Escritura de logs en segundo plano y por lotes.
+
+Los eventos se encolan como dicts (sin renderizar) en una cola acotada.
+Una tarea de fondo los agrupa y, en un hilo, los renderiza a JSON y los
+escribe con una sola llamada ``write`` + ``flush`` por lote, así que el
+event loop nunca espera por stdout.
+
+Si la cola está llena se descartan eventos informativos (y se cuentan
+en ``stats``); los errores se aceptan siempre.
+"""
+
+import asyncio
+import json
+import sys
+from collections import deque
+from typing import Any, TextIO
+
+from src.config import get_settings
+
+settings = get_settings()
+
+ERROR_LEVELS = frozenset({"error", "critical", "exception"})
+
+
+class LogWriter:
+    """Cola acotada de eventos con volcado por lotes."""
+
+    def __init__(
+        self,
+        stream: TextIO | None = None,
+        max_size: int = settings.log_queue_size,
+        batch_size: int = settings.log_batch_size,
+        flush_interval: float = settings.log_flush_interval,
+    ):
+        # None: sys.stdout en el momento de escribir (respeta redirecciones)
+        self.stream = stream
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: deque[dict[str, Any]] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+        self.stats = {"written": 0, "dropped": 0, "batches": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def put(self, event: dict[str, Any]) -> bool:
+        """
+        Encola un evento.
+
+        Returns:
+            False si se descartó por tener la cola llena
+        """
+        if len(self._queue) >= self.max_size and event.get("level") not in ERROR_LEVELS:
+            self.stats["dropped"] += 1
+            return False
+
+        self._queue.append(event)
+        if self._task is None:
+            # Sin tarea de fondo (scripts, tests sin lifespan): escritura en línea
+            self._write(self._take(len(self._queue)))
+        elif len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    async def start(self) -> None:
+        """Arranca la tarea de volcado."""
+        if self._task is None:
+            # Primitiva ligada al event loop actual
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Detiene la tarea y escribe todo lo pendiente."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Escribe todo lo pendiente en lotes de ``batch_size``."""
+        while self._queue:
+            await asyncio.to_thread(self._write, self._take(self.batch_size))
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def _take(self, count: int) -> list[dict[str, Any]]:
+        queue = self._queue
+        return [queue.popleft() for _ in range(min(count, len(queue)))]
+
+    def _write(self, batch: list[dict[str, Any]]) -> None:
+        if not batch:
+            return
+        text = "".join(
+            json.dumps(event, default=str, ensure_ascii=False) + "\n"
+            for event in batch
+        )
+        stream = self.stream or sys.stdout
+        stream.write(text)
+        stream.flush()
+        self.stats["written"] += len(batch)
+        self.stats["batches"] += 1
+
+
+class QueueLogger:
+    """
+    Logger de structlog que encola el event dict en un LogWriter.
+
+    El renderizado a JSON se hace en el hilo del writer, no aquí.
+    """
+
+    def __init__(self, writer: LogWriter):
+        self._writer = writer
+
+    def msg(self, **event: Any) -> None:
+        self._writer.put(event)
+
+    log = debug = info = warn = warning = error = critical = exception = fatal = msg
+
+
+class QueueLoggerFactory:
+    """logger_factory para structlog.configure."""
+
+    def __init__(self, writer: LogWriter):
+        self._logger = QueueLogger(writer)
+
+    def __call__(self, *args: Any) -> QueueLogger:
+        return self._logger
+
+
+# Instancia global
+log_writer = LogWriter()
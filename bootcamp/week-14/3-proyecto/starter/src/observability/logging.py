@@ -3,28 +3,38 @@ Structured Logging Configuration.
 
 Este módulo configura structlog para logging estructurado en JSON.
 
-TODO: Implementar logging estructurado completo.
+En formato JSON los eventos no se renderizan ni se escriben en el
+event loop: se encolan en ``log_writer`` (ver log_writer), que los
+vuelca por lotes desde un hilo.
 """
 
 import logging
-import sys
+import random
 import time
 import uuid
+from datetime import datetime, timezone
 from typing import Any
 
 import structlog
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.config import get_settings
+from src.observability.log_writer import LogWriter, QueueLoggerFactory, log_writer
 
 
 settings = get_settings()
 
+SENSITIVE_KEYS = frozenset({"password", "token", "secret", "authorization", "api_key"})
+
+APP_CONTEXT = {
+    "service": "task-api",
+    "environment": settings.environment,
+    "version": "1.0.0",
+}
+
 
 # ============================================
-# TODO 1: Procesadores de Structlog
+# Procesadores de Structlog
 # ============================================
 
 def mask_sensitive_data(
@@ -34,34 +44,26 @@ def mask_sensitive_data(
 ) -> dict[str, Any]:
     """
     Enmascara datos sensibles en los logs.
-    
-    TODO: Implementar enmascaramiento de:
-    - password
-    - token
-    - secret
-    - authorization
-    
+
+    Enmascara password, token, secret, authorization y api_key, también
+    un nivel dentro de dicts anidados.
+
     Args:
         logger: Logger instance
         method_name: Nombre del método de logging
         event_dict: Diccionario del evento
-        
+
     Returns:
         dict: Evento con datos sensibles enmascarados
     """
-    # TODO: Implementar
-    # sensitive_keys = {"password", "token", "secret", "authorization", "api_key"}
-    # 
-    # for key in event_dict:
-    #     if key.lower() in sensitive_keys:
-    #         event_dict[key] = "***MASKED***"
-    #     elif isinstance(event_dict[key], dict):
-    #         for subkey in event_dict[key]:
-    #             if subkey.lower() in sensitive_keys:
-    #                 event_dict[key][subkey] = "***MASKED***"
-    # 
-    # return event_dict
-    
+    for key, value in event_dict.items():
+        if key.lower() in SENSITIVE_KEYS:
+            event_dict[key] = "***MASKED***"
+        elif isinstance(value, dict):
+            for subkey in value:
+                if subkey.lower() in SENSITIVE_KEYS:
+                    value[subkey] = "***MASKED***"
+
     return event_dict
 
 
@@ -72,80 +74,59 @@ def add_app_context(
 ) -> dict[str, Any]:
     """
     Añade contexto de la aplicación a cada log.
-    
-    TODO: Añadir:
-    - service name
-    - environment
-    - version
+
+    Añade service, environment y version.
     """
-    # TODO: Implementar
-    # event_dict["service"] = "task-api"
-    # event_dict["environment"] = settings.environment
-    # event_dict["version"] = "1.0.0"
-    # return event_dict
-    
+    event_dict.update(APP_CONTEXT)
     return event_dict
 
 
 # ============================================
-# TODO 2: Configurar Structlog
+# Configurar Structlog
 # ============================================
 
-def setup_logging() -> None:
+def setup_logging(writer: LogWriter = log_writer) -> None:
     """
     Configura structlog para la aplicación.
-    
-    TODO: Implementar configuración completa con:
-    - Procesadores para timestamps, niveles, etc.
-    - Formato JSON para producción
-    - Formato colored para desarrollo
+
+    - Formato JSON: procesadores sin renderer; el event dict se encola
+      en ``writer`` y se renderiza en su hilo
+    - Formato console: salida coloreada síncrona para desarrollo
     """
-    # TODO: Implementar configuración avanzada
-    # processors = [
-    #     structlog.contextvars.merge_contextvars,
-    #     structlog.processors.add_log_level,
-    #     structlog.processors.TimeStamper(fmt="iso"),
-    #     add_app_context,
-    #     mask_sensitive_data,
-    #     structlog.processors.StackInfoRenderer(),
-    #     structlog.processors.format_exc_info,
-    # ]
-    # 
-    # if settings.log_format == "json":
-    #     processors.append(structlog.processors.JSONRenderer())
-    # else:
-    #     processors.append(structlog.dev.ConsoleRenderer(colors=True))
-    # 
-    # structlog.configure(
-    #     processors=processors,
-    #     wrapper_class=structlog.make_filtering_bound_logger(
-    #         getattr(logging, settings.log_level.upper())
-    #     ),
-    #     context_class=dict,
-    #     logger_factory=structlog.PrintLoggerFactory(),
-    #     cache_logger_on_first_use=True,
-    # )
-    
-    # Configuración básica
+    processors = [
+        structlog.contextvars.merge_contextvars,
+        structlog.processors.add_log_level,
+        structlog.processors.TimeStamper(fmt="iso"),
+        add_app_context,
+        mask_sensitive_data,
+        structlog.processors.StackInfoRenderer(),
+        structlog.processors.format_exc_info,
+    ]
+
+    if settings.log_format == "json":
+        logger_factory = QueueLoggerFactory(writer)
+    else:
+        processors.append(structlog.dev.ConsoleRenderer(colors=True))
+        logger_factory = structlog.PrintLoggerFactory()
+
     structlog.configure(
-        processors=[
-            structlog.processors.add_log_level,
-            structlog.processors.TimeStamper(fmt="iso"),
-            structlog.dev.ConsoleRenderer(),
-        ],
-        wrapper_class=structlog.make_filtering_bound_logger(logging.INFO),
+        processors=processors,
+        wrapper_class=structlog.make_filtering_bound_logger(
+            getattr(logging, settings.log_level.upper())
+        ),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        logger_factory=logger_factory,
+        cache_logger_on_first_use=True,
     )
 
 
 def get_logger(name: str | None = None) -> structlog.BoundLogger:
     """
     Obtiene un logger con contexto.
-    
+
     Args:
         name: Nombre opcional del logger
-        
+
     Returns:
         BoundLogger: Logger estructurado
     """
@@ -156,79 +137,109 @@ def get_logger(name: str | None = None) -> structlog.BoundLogger:
 
 
 # ============================================
-# TODO 3: Request Logging Middleware
+# Request Logging Middleware
 # ============================================
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """
-    Middleware que loggea información de cada request.
-    
-    TODO: Implementar logging de:
-    - request_id (generado o del header)
-    - method, path
-    - status_code
-    - duration_ms
-    - client_ip
+    Middleware ASGI que loggea un evento por request.
+
+    Registra request_id (del header X-Request-ID o generado), method,
+    path, status_code, duration_ms y client_ip, y devuelve el
+    request_id en la respuesta.
+
+    Las requests con status < 400 se muestrean con ``sample_rate``;
+    4xx siempre se registran y 5xx/excepciones se registran como error
+    (el LogWriter nunca descarta errores).
     """
-    
-    async def dispatch(self, request: Request, call_next) -> Response:
-        """
-        Procesa request y loggea información.
-        
-        TODO: Implementar logging completo del request.
-        """
-        # TODO: Implementar
-        # # Obtener o generar request_id
-        # request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
-        # 
-        # # Bind request_id al contexto
-        # structlog.contextvars.clear_contextvars()
-        # structlog.contextvars.bind_contextvars(request_id=request_id)
-        # 
-        # logger = get_logger("http")
-        # 
-        # # Registrar inicio
-        # start_time = time.perf_counter()
-        # 
-        # # Log de request entrante
-        # logger.info(
-        #     "request_started",
-        #     method=request.method,
-        #     path=request.url.path,
-        #     client_ip=request.client.host if request.client else "unknown",
-        # )
-        # 
-        # try:
-        #     response = await call_next(request)
-        #     
-        #     # Calcular duración
-        #     duration_ms = (time.perf_counter() - start_time) * 1000
-        #     
-        #     # Log de response
-        #     logger.info(
-        #         "request_completed",
-        #         method=request.method,
-        #         path=request.url.path,
-        #         status_code=response.status_code,
-        #         duration_ms=round(duration_ms, 2),
-        #     )
-        #     
-        #     # Añadir request_id al response
-        #     response.headers["X-Request-ID"] = request_id
-        #     
-        #     return response
-        #     
-        # except Exception as exc:
-        #     duration_ms = (time.perf_counter() - start_time) * 1000
-        #     logger.error(
-        #         "request_failed",
-        #         method=request.method,
-        #         path=request.url.path,
-        #         error=str(exc),
-        #         duration_ms=round(duration_ms, 2),
-        #     )
-        #     raise
-        
-        # Versión básica
-        response = await call_next(request)
-        return response
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        writer: LogWriter = log_writer,
+        sample_rate: float = settings.log_sample_rate,
+    ):
+        self.app = app
+        self.writer = writer
+        self.sample_rate = sample_rate
+        self.min_level = getattr(logging, settings.log_level.upper())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if request_id is None:
+            request_id = uuid.uuid4().hex
+
+        # Los logs de la aplicación durante la request llevan el request_id
+        structlog.contextvars.clear_contextvars()
+        structlog.contextvars.bind_contextvars(request_id=request_id)
+
+        status_code = 500
+        start_time = time.perf_counter()
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        except Exception as exc:
+            self._log(scope, request_id, 500, start_time, error=repr(exc))
+            raise
+        else:
+            self._log(scope, request_id, status_code, start_time)
+
+    def _log(
+        self,
+        scope: Scope,
+        request_id: str,
+        status_code: int,
+        start_time: float,
+        error: str | None = None,
+    ) -> None:
+        if error is None and status_code < 400 and self.sample_rate < 1.0:
+            if random.random() >= self.sample_rate:
+                return
+
+        if error is not None or status_code >= 500:
+            level = "error"
+            event = "request_failed"
+        elif status_code >= 400:
+            level = "warning"
+            event = "request_completed"
+        else:
+            level = "info"
+            event = "request_completed"
+        if getattr(logging, level.upper()) < self.min_level:
+            return
+
+        client = scope.get("client")
+        record = {
+            "event": event,
+            "level": level,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "request_id": request_id,
+            "method": scope["method"],
+            "path": scope["path"],
+            "status_code": status_code,
+            "duration_ms": round((time.perf_counter() - start_time) * 1000, 2),
+            "client_ip": client[0] if client else "unknown",
+            **APP_CONTEXT,
+        }
+        if error is not None:
+            record["error"] = error
+        if self.sample_rate < 1.0 and level == "info":
+            record["sample_rate"] = self.sample_rate
+        self.writer.put(record)
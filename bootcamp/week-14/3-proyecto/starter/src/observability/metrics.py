@@ -1,102 +1,159 @@
 """
 Prometheus Metrics Configuration.
 
-Este módulo configura métricas para monitoreo con Prometheus.
-
-TODO: Implementar métricas automáticas y de negocio.
+Este módulo configura métricas para monitoreo con Prometheus sobre
+MetricsRegistry (ver registry): acumulación por hilo sin locks,
+histogramas HDR con cuantiles baratos y agregación entre workers a
+través de un directorio compartido (``metrics_multiproc_dir``).
 """
 
-from prometheus_fastapi_instrumentator import Instrumentator
-from prometheus_client import Counter, Gauge, Histogram
+import time
 
-from src.config import get_settings
+import anyio.to_thread
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from src.config import get_settings
+from src.observability.registry import MetricsRegistry
 
 settings = get_settings()
 
+registry = MetricsRegistry(settings.metrics_multiproc_dir)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
 
 # ============================================
-# TODO 1: Configurar Instrumentator
+# Métricas HTTP
 # ============================================
 
-# TODO: Configurar instrumentator avanzado
-# instrumentator = Instrumentator(
-#     should_group_status_codes=True,
-#     should_ignore_untemplated=True,
-#     should_respect_env_var=True,
-#     should_instrument_requests_inprogress=True,
-#     excluded_handlers=["/health/live", "/health/ready", "/metrics"],
-#     inprogress_name="http_requests_inprogress",
-#     inprogress_labels=True,
-# )
+HTTP_REQUESTS_TOTAL = registry.counter(
+    name="http_requests_total",
+    documentation="Total number of HTTP requests",
+    labelnames=("method", "handler", "status"),
+)
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    name="http_request_duration_seconds",
+    documentation="HTTP request latency in seconds",
+    labelnames=("method", "handler"),
+    scale=1_000_000,  # Se guarda en µs
+)
+
+EXCLUDED_HANDLERS = frozenset({"/health/live", "/health/ready", "/metrics"})
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mide cada request.
+
+    Usa la plantilla de la ruta (``/tasks/{task_id}``) como handler para
+    no crear una serie por ID, y agrupa los status codes (``2xx``).
+    """
 
-# Versión básica
-instrumentator = Instrumentator()
+    def __init__(
+        self, app: ASGIApp, excluded_handlers: frozenset[str] = EXCLUDED_HANDLERS
+    ):
+        self.app = app
+        self.excluded_handlers = excluded_handlers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            # Sin ruta (404): una sola serie para no inflar la cardinalidad
+            handler = getattr(route, "path", None) or "none"
+            if handler not in self.excluded_handlers:
+                method = scope["method"]
+                status = f"{status_code // 100}xx"
+                HTTP_REQUESTS_TOTAL.labels(method, handler, status).inc()
+                duration = time.perf_counter() - start
+                HTTP_REQUEST_DURATION.labels(method, handler).observe(duration)
+
+
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    """Expone las métricas de todos los workers."""
+    # En modo multiproceso render() lee los archivos de cada worker
+    body = await anyio.to_thread.run_sync(registry.render)
+    return PlainTextResponse(body, media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def setup_metrics(app: FastAPI) -> None:
+    """Instrumenta la app y expone ``/metrics``."""
+    app.add_middleware(MetricsMiddleware)
+    app.add_api_route(
+        "/metrics", metrics_endpoint, methods=["GET"], tags=["monitoring"]
+    )
 
 
 # ============================================
-# TODO 2: Métricas de Negocio
+# Métricas de Negocio
 # ============================================
 
-# TODO: Implementar métricas de negocio para tareas
-# 
-# # Counter: Total de tareas creadas
-# TASKS_CREATED = Counter(
-#     name="tasks_created_total",
-#     documentation="Total number of tasks created",
-#     labelnames=["priority"],
-# )
-# 
-# # Counter: Total de tareas completadas
-# TASKS_COMPLETED = Counter(
-#     name="tasks_completed_total",
-#     documentation="Total number of tasks completed",
-# )
-# 
-# # Gauge: Tareas activas (pendientes + en progreso)
-# ACTIVE_TASKS = Gauge(
-#     name="active_tasks_total",
-#     documentation="Number of active tasks (pending + in_progress)",
-# )
-# 
-# # Histogram: Tiempo hasta completar tarea (en horas)
-# TASK_COMPLETION_TIME = Histogram(
-#     name="task_completion_hours",
-#     documentation="Time to complete tasks in hours",
-#     buckets=[0.5, 1, 2, 4, 8, 24, 48, 72, 168],  # horas
-# )
+# Counter: Total de tareas creadas
+TASKS_CREATED = registry.counter(
+    name="tasks_created_total",
+    documentation="Total number of tasks created",
+    labelnames=("priority",),
+)
+
+# Counter: Total de tareas completadas
+TASKS_COMPLETED = registry.counter(
+    name="tasks_completed_total",
+    documentation="Total number of tasks completed",
+)
+
+# Gauge: Tareas activas (pendientes + en progreso)
+ACTIVE_TASKS = registry.gauge(
+    name="active_tasks_total",
+    documentation="Number of active tasks (pending + in_progress)",
+)
+
+# Histograma: Tiempo hasta completar tarea (en horas, guardado en segundos)
+TASK_COMPLETION_TIME = registry.histogram(
+    name="task_completion_hours",
+    documentation="Time to complete tasks in hours",
+    scale=3600,
+)
 
 
 def record_task_created(priority: str = "medium") -> None:
     """
     Registra la creación de una tarea.
     
-    TODO: Implementar
-    
     Args:
         priority: Prioridad de la tarea
     """
-    # TODO: Implementar
-    # TASKS_CREATED.labels(priority=priority).inc()
-    # ACTIVE_TASKS.inc()
-    pass
+    TASKS_CREATED.labels(priority=priority).inc()
+    ACTIVE_TASKS.inc()
 
 
 def record_task_completed(completion_hours: float | None = None) -> None:
     """
     Registra la completación de una tarea.
     
-    TODO: Implementar
-    
     Args:
         completion_hours: Horas que tomó completar (opcional)
     """
-    # TODO: Implementar
-    # TASKS_COMPLETED.inc()
-    # ACTIVE_TASKS.dec()
-    # if completion_hours is not None:
-    #     TASK_COMPLETION_TIME.observe(completion_hours)
-    pass
+    TASKS_COMPLETED.inc()
+    ACTIVE_TASKS.dec()
+    if completion_hours is not None:
+        TASK_COMPLETION_TIME.observe(completion_hours)
 
 
 def set_active_tasks(count: int) -> None:
@@ -108,27 +165,4 @@ def set_active_tasks(count: int) -> None:
     Args:
         count: Número de tareas activas
     """
-    # TODO: Implementar
-    # ACTIVE_TASKS.set(count)
-    pass
-
-
-# ============================================
-# TODO 3: Métricas Personalizadas Adicionales
-# ============================================
-# Puedes añadir más métricas según necesites:
-# 
-# # Rate de errores por tipo
-# ERROR_COUNTER = Counter(
-#     name="api_errors_total",
-#     documentation="Total API errors by type",
-#     labelnames=["error_type", "endpoint"],
-# )
-# 
-# # Latencia de base de datos
-# DB_QUERY_DURATION = Histogram(
-#     name="db_query_duration_seconds",
-#     documentation="Database query duration in seconds",
-#     labelnames=["operation"],
-#     buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1],
-# )
+    ACTIVE_TASKS.set(count)
@@ -0,0 +1,381 @@
+"""
+Registro de métricas sin locks por request y agregable entre workers.
+
+prometheus_client toma un lock en cada ``inc``/``observe`` y, con
+varios workers de uvicorn, cada proceso expone solo su propio registro.
+Aquí cada hilo escribe en su propio shard (sin locks: ningún otro hilo
+escribe en él) y la agregación ocurre solo al leer:
+
+    hilo -> shard -> snapshot del proceso -> directorio compartido
+                                          -> suma de todos los workers
+
+Con ``multiproc_dir`` cada worker vuelca periódicamente su snapshot a
+``<dir>/worker-<pid>.json`` (escritura atómica con ``os.replace``) y el
+worker que atiende ``/metrics`` combina todos los archivos. Como con
+PROMETHEUS_MULTIPROC_DIR, el directorio debe vaciarse en cada despliegue.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.observability.histogram import HdrHistogram
+
+LabelKey = tuple[str, tuple[str, ...]]
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+
+# ============================================
+# Shards y snapshots
+# ============================================
+
+class _Shard:
+    """Acumuladores de un hilo."""
+
+    __slots__ = ("values", "histograms")
+
+    def __init__(self):
+        self.values: dict[LabelKey, float] = {}
+        self.histograms: dict[LabelKey, HdrHistogram] = {}
+
+
+@dataclass
+class Snapshot:
+    """Valores agregados (de un proceso o de todos los workers)."""
+
+    values: dict[LabelKey, float] = field(default_factory=dict)
+    histograms: dict[LabelKey, HdrHistogram] = field(default_factory=dict)
+
+    def merge(self, other: Snapshot) -> None:
+        for key, value in other.values.items():
+            self.values[key] = self.values.get(key, 0.0) + value
+        for key, histogram in other.histograms.items():
+            mine = self.histograms.get(key)
+            if mine is None:
+                mine = HdrHistogram(histogram.precision, histogram.max_bits)
+                self.histograms[key] = mine
+            mine.merge(histogram)
+
+    def to_dict(self) -> dict:
+        return {
+            "values": [
+                [name, list(labels), value]
+                for (name, labels), value in self.values.items()
+            ],
+            "histograms": [
+                [name, list(labels), histogram.to_dict()]
+                for (name, labels), histogram in self.histograms.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Snapshot:
+        snapshot = cls()
+        for name, labels, value in data["values"]:
+            snapshot.values[(name, tuple(labels))] = value
+        for name, labels, histogram in data["histograms"]:
+            key = (name, tuple(labels))
+            snapshot.histograms[key] = HdrHistogram.from_dict(histogram)
+        return snapshot
+
+
+# ============================================
+# Métricas
+# ============================================
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+    ):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], object] = {}
+
+    def labels(self, *values: str, **kwargs: str):
+        """Hijo con los valores de labels fijados (se cachea)."""
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} espera labels {self.labelnames}")
+            key = (self.name, tuple(str(v) for v in values))
+            child = self._children[values] = self._child(key)
+        return child
+
+    def _child(self, key: LabelKey):
+        raise NotImplementedError
+
+
+class _CounterChild:
+    __slots__ = ("_registry", "_key")
+
+    def __init__(self, registry: MetricsRegistry, key: LabelKey):
+        self._registry = registry
+        self._key = key
+
+    def inc(self, amount: float = 1.0) -> None:
+        values = self._registry._shard().values
+        values[self._key] = values.get(self._key, 0.0) + amount
+
+
+class Counter(_Metric):
+    """Contador monótono (se suma entre hilos y workers)."""
+
+    kind = "counter"
+
+    def _child(self, key: LabelKey) -> _CounterChild:
+        return _CounterChild(self.registry, key)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def set(self, value: float) -> None:
+        # Se guarda como delta: no es atómico frente a inc() concurrentes
+        current = self._registry.collect_local().values.get(self._key, 0.0)
+        self.inc(value - current)
+
+
+class Gauge(_Metric):
+    """Gauge acumulado por deltas; entre workers se expone la suma."""
+
+    kind = "gauge"
+
+    def _child(self, key: LabelKey) -> _GaugeChild:
+        return _GaugeChild(self.registry, key)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class _HistogramChild:
+    __slots__ = ("_registry", "_key", "_scale")
+
+    def __init__(self, registry: MetricsRegistry, key: LabelKey, scale: float):
+        self._registry = registry
+        self._key = key
+        self._scale = scale
+
+    def observe(self, value: float) -> None:
+        histograms = self._registry._shard().histograms
+        histogram = histograms.get(self._key)
+        if histogram is None:
+            histogram = histograms[self._key] = HdrHistogram()
+        histogram.record(value * self._scale)
+
+
+class Histogram(_Metric):
+    """
+    Histograma HDR expuesto como summary (cuantiles, _sum y _count).
+
+    ``scale`` convierte la unidad observada en enteros: con 1e6 las
+    observaciones en segundos se guardan en µs.
+    """
+
+    kind = "summary"
+
+    def __init__(
+        self,
+        *args,
+        scale: float = 1.0,
+        quantiles: tuple[float, ...] = DEFAULT_QUANTILES,
+    ):
+        super().__init__(*args)
+        self.scale = scale
+        self.quantiles = quantiles
+
+    def _child(self, key: LabelKey) -> _HistogramChild:
+        return _HistogramChild(self.registry, key, self.scale)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+
+# ============================================
+# Registro
+# ============================================
+
+class MetricsRegistry:
+    """Registro de métricas del proceso."""
+
+    def __init__(self, multiproc_dir: str | None = None):
+        self.multiproc_dir = Path(multiproc_dir) if multiproc_dir else None
+        self._metrics: dict[str, _Metric] = {}
+        self._local = threading.local()
+        self._shards: list[_Shard] = []
+        # Solo se toma al crear un shard (una vez por hilo)
+        self._shards_lock = threading.Lock()
+        self._flush_task: asyncio.Task | None = None
+
+        if self.multiproc_dir is not None:
+            self.multiproc_dir.mkdir(parents=True, exist_ok=True)
+
+    def counter(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> Counter:
+        return self._register(Counter(self, name, documentation, tuple(labelnames)))
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> Gauge:
+        return self._register(Gauge(self, name, documentation, tuple(labelnames)))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        scale: float = 1.0,
+        quantiles: tuple[float, ...] = DEFAULT_QUANTILES,
+    ) -> Histogram:
+        metric = Histogram(
+            self,
+            name,
+            documentation,
+            tuple(labelnames),
+            scale=scale,
+            quantiles=quantiles,
+        )
+        return self._register(metric)
+
+    def _register(self, metric: _Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Métrica duplicada: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def _shard(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard()
+            with self._shards_lock:
+                self._shards.append(shard)
+            return shard
+
+    def collect_local(self) -> Snapshot:
+        """Suma los shards de todos los hilos del proceso."""
+        with self._shards_lock:
+            shards = list(self._shards)
+        snapshot = Snapshot()
+        for shard in shards:
+            # Copias: el hilo dueño puede seguir escribiendo
+            snapshot.merge(Snapshot(dict(shard.values), dict(shard.histograms)))
+        return snapshot
+
+    def collect(self) -> Snapshot:
+        """Snapshot de todos los workers (o solo del proceso)."""
+        if self.multiproc_dir is None:
+            return self.collect_local()
+
+        self.flush()
+        snapshot = Snapshot()
+        for path in self.multiproc_dir.glob("worker-*.json"):
+            try:
+                data = json.loads(path.read_text())
+            except (OSError, ValueError):
+                # Archivo a medio borrar o de otra versión
+                continue
+            snapshot.merge(Snapshot.from_dict(data))
+        return snapshot
+
+    def flush(self) -> None:
+        """Vuelca el snapshot del proceso al directorio compartido."""
+        if self.multiproc_dir is None:
+            return
+        path = self.multiproc_dir / f"worker-{os.getpid()}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.collect_local().to_dict()))
+        os.replace(tmp, path)
+
+    async def start(self, interval: float = 1.0) -> None:
+        """Arranca el volcado periódico (solo en modo multiproceso)."""
+        if self.multiproc_dir is not None and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop(interval))
+
+    async def stop(self) -> None:
+        """Detiene el volcado y escribe el último snapshot."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await asyncio.to_thread(self.flush)
+
+    async def _flush_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(self.flush)
+
+    def reset(self) -> None:
+        """Vacía los acumuladores del proceso (tests)."""
+        with self._shards_lock:
+            for shard in self._shards:
+                shard.values.clear()
+                shard.histograms.clear()
+
+    def render(self) -> str:
+        """Métricas en formato de texto de Prometheus."""
+        snapshot = self.collect()
+        by_name: dict[str, list[LabelKey]] = {}
+        for key in list(snapshot.values) + list(snapshot.histograms):
+            by_name.setdefault(key[0], []).append(key)
+
+        lines: list[str] = []
+        for name, metric in self._metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for _, labels in sorted(by_name.get(name, [])):
+                pairs = list(zip(metric.labelnames, labels))
+                if isinstance(metric, Histogram):
+                    histogram = snapshot.histograms[(name, labels)]
+                    for q in metric.quantiles:
+                        value = histogram.quantile(q) / metric.scale
+                        quantile = _labels(pairs + [("quantile", str(q))])
+                        lines.append(f"{name}{quantile} {value}")
+                    total = histogram.total / metric.scale
+                    lines.append(f"{name}_sum{_labels(pairs)} {total}")
+                    lines.append(f"{name}_count{_labels(pairs)} {histogram.count}")
+                else:
+                    value = snapshot.values[(name, labels)]
+                    lines.append(f"{name}{_labels(pairs)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(pairs: list[tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -56,8 +56,7 @@ def authenticate_user(username: str, password: str) -> dict | None:
 # ============================================
 
 @router.post("/login", response_model=Token)
-# TODO: Añadir rate limiting estricto para prevenir brute force
-# @limiter.limit("5/minute")
+@limiter.limit("5/minute")
 async def login(request: Request, login_data: LoginRequest):
     """
     Autentica usuario y retorna token JWT.
@@ -53,8 +53,7 @@ next_id = 3
 # ============================================
 
 @router.get("", response_model=TaskList)
-# TODO: Añadir rate limiting
-# @limiter.limit("60/minute")
+@limiter.limit("60/minute")
 async def list_tasks(
     request: Request,
     status_filter: TaskStatus | None = None,
@@ -109,8 +108,7 @@ async def get_task(task_id: int):
 # ============================================
 
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-# TODO: Añadir rate limiting
-# @limiter.limit("20/minute")
+@limiter.limit("20/minute")
 async def create_task(
     request: Request,
     task: TaskCreate,
@@ -138,8 +136,7 @@ async def create_task(
     fake_tasks_db[next_id] = new_task
     next_id += 1
     
-    # TODO: Registrar métrica de tarea creada
-    # record_task_created(priority=task.priority.value)
+    record_task_created(priority=task.priority.value)
     
     return new_task
 
@@ -149,8 +146,7 @@ async def create_task(
 # ============================================
 
 @router.put("/{task_id}", response_model=TaskResponse)
-# TODO: Añadir rate limiting
-# @limiter.limit("30/minute")
+@limiter.limit("30/minute")
 async def update_task(
     request: Request,
     task_id: int,
@@ -185,9 +181,8 @@ async def update_task(
     is_completed = task["status"] == TaskStatus.COMPLETED.value
     if is_completed and not was_completed:
         task["completed_at"] = datetime.now(timezone.utc)
-        # TODO: Registrar métrica de tarea completada
-        # completion_hours = (task["completed_at"] - task["created_at"]).total_seconds() / 3600
-        # record_task_completed(completion_hours=completion_hours)
+        completion_hours = (task["completed_at"] - task["created_at"]).total_seconds() / 3600
+        record_task_completed(completion_hours=completion_hours)
     
     return task
 
@@ -197,8 +192,7 @@ async def update_task(
 # ============================================
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-# TODO: Añadir rate limiting
-# @limiter.limit("30/minute")
+@limiter.limit("30/minute")
 async def delete_task(request: Request, task_id: int):
     """
     Elimina una tarea.
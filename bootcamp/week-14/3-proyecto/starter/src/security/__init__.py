@@ -1,10 +1,17 @@
 """Security package."""
 
-from src.security.rate_limit import limiter, rate_limit_exceeded_handler
+from src.security.rate_limit import (
+    RateLimitExceeded,
+    RateLimitHeadersMiddleware,
+    limiter,
+    rate_limit_exceeded_handler,
+)
 from src.security.headers import SecurityHeadersMiddleware
 
 __all__ = [
     "limiter",
+    "RateLimitExceeded",
+    "RateLimitHeadersMiddleware",
     "rate_limit_exceeded_handler",
     "SecurityHeadersMiddleware",
 ]
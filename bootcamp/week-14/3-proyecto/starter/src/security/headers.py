@@ -3,12 +3,13 @@ Security Headers Middleware.
 
 Este módulo implementa headers de seguridad HTTP.
 
-TODO: Implementar middleware de headers de seguridad.
+El middleware es ASGI puro: en lugar de envolver cada respuesta como
+``BaseHTTPMiddleware`` (una tarea y una copia extra por request), añade
+una lista de headers ya codificada al mensaje ``http.response.start``.
+Funciona igual para respuestas normales, streaming y SSE.
 """
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.config import get_settings
 
@@ -17,73 +18,90 @@ settings = get_settings()
 
 
 # ============================================
-# TODO 1: Definir Security Headers
+# Security Headers
 # ============================================
-# Define los headers de seguridad recomendados por OWASP
+# Headers de seguridad recomendados por OWASP
 
-# TODO: Completar los headers de seguridad
 SECURITY_HEADERS = {
     # Previene MIME sniffing
-    # "X-Content-Type-Options": "nosniff",
+    "X-Content-Type-Options": "nosniff",
     
     # Previene clickjacking
-    # "X-Frame-Options": "DENY",
+    "X-Frame-Options": "DENY",
     
     # Filtro XSS del navegador
-    # "X-XSS-Protection": "1; mode=block",
-    
-    # HSTS - fuerza HTTPS (solo en producción)
-    # "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+    "X-XSS-Protection": "1; mode=block",
     
     # Referrer Policy
-    # "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
     
     # Content Security Policy básico
-    # "Content-Security-Policy": "default-src 'self'; script-src 'self' 'unsafe-inline'",
+    "Content-Security-Policy": "default-src 'self'; script-src 'self' 'unsafe-inline'",
     
     # Permissions Policy
-    # "Permissions-Policy": "geolocation=(), microphone=(), camera=()",
+    "Permissions-Policy": "geolocation=(), microphone=(), camera=()",
 }
 
+# HSTS - fuerza HTTPS (solo en producción)
+HSTS_HEADER = ("Strict-Transport-Security", "max-age=31536000; includeSubDomains; preload")
+
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+def build_header_block(
+    headers: dict[str, str] = SECURITY_HEADERS,
+    include_hsts: bool = False,
+) -> list[tuple[bytes, bytes]]:
     """
-    Middleware que añade headers de seguridad a todas las respuestas.
-    
-    TODO: Implementar el middleware completo.
+    Codifica los headers una sola vez, en el formato de ASGI.
+
+    Args:
+        headers: Nombre -> valor
+        include_hsts: Añadir Strict-Transport-Security
+
+    Returns:
+        Lista de (nombre en minúsculas, valor) en bytes latin-1
     """
-    
-    async def dispatch(self, request: Request, call_next) -> Response:
-        """
-        Procesa el request y añade headers de seguridad.
-        
-        TODO: Implementar:
-        1. Llamar al siguiente middleware/endpoint
-        2. Añadir todos los headers de seguridad
-        3. Condicionalmente añadir HSTS solo en producción
-        
-        Args:
-            request: Request entrante
-            call_next: Siguiente handler en la cadena
-            
-        Returns:
-            Response: Respuesta con headers de seguridad
-        """
-        # TODO: Implementar
-        # response = await call_next(request)
-        # 
-        # # Añadir headers de seguridad
-        # for header, value in SECURITY_HEADERS.items():
-        #     response.headers[header] = value
-        # 
-        # # HSTS solo en producción (requiere HTTPS)
-        # if settings.is_production:
-        #     response.headers["Strict-Transport-Security"] = (
-        #         "max-age=31536000; includeSubDomains; preload"
-        #     )
-        # 
-        # return response
-        
-        # Versión básica (reemplazar con la de arriba)
-        response = await call_next(request)
-        return response
+    items = list(headers.items())
+    if include_hsts:
+        items.append(HSTS_HEADER)
+    return [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in items]
+
+
+class SecurityHeadersMiddleware:
+    """
+    Middleware ASGI que añade headers de seguridad a todas las respuestas.
+
+    Si el endpoint ya fijó alguno de los headers (p.ej. una CSP propia),
+    se respeta el suyo.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        headers: dict[str, str] = SECURITY_HEADERS,
+        include_hsts: bool | None = None,
+    ):
+        self.app = app
+        if include_hsts is None:
+            # HSTS solo en producción (requiere HTTPS)
+            include_hsts = settings.is_production
+        self.header_block = build_header_block(headers, include_hsts)
+        self.header_names = frozenset(name for name, _ in self.header_block)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                header_names = self.header_names
+                if any(name in header_names for name, _ in headers):
+                    existing = {name for name, _ in headers}
+                    headers.extend(h for h in self.header_block if h[0] not in existing)
+                else:
+                    headers.extend(self.header_block)
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -1,19 +1,34 @@
 """
 Rate Limiting Configuration.
 
-Este módulo configura slowapi para limitar requests por usuario/IP.
+Este módulo limita requests por usuario/IP con un API compatible con
+los decoradores de slowapi (``@limiter.limit("5/minute")``), pero con
+almacenamiento intercambiable (ver rate_limit_storage):
 
-TODO: Implementar la configuración de rate limiting.
+- Estrategias sliding-window y token-bucket en lugar de ventana fija
+- Backend SQLite compartido entre workers de uvicorn
+- Headers X-RateLimit-Limit / Remaining / Reset en cada respuesta
 """
 
+import functools
+import inspect
+import math
+from collections.abc import Callable
+
+import anyio.to_thread
 from fastapi import Request
 from fastapi.responses import JSONResponse
-from slowapi import Limiter
-from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.config import get_settings
-
+from src.security.rate_limit_storage import (
+    RateLimit,
+    RateLimitResult,
+    RateLimitStorage,
+    create_storage,
+    parse_rate,
+)
 
 settings = get_settings()
 
@@ -55,60 +70,198 @@ def get_identifier(request: Request) -> str:
 
 
 # ============================================
-# TODO 2: Crear instancia del Limiter
+# Limiter
+# ============================================
+
+class RateLimitExceeded(Exception):
+    """Se lanza cuando una clave agota su límite."""
+
+    def __init__(self, limit: RateLimit, result: RateLimitResult):
+        self.limit = limit
+        self.result = result
+        self.detail = str(limit)
+        super().__init__(self.detail)
+
+
+class RateLimiter:
+    """
+    Limiter con backend intercambiable.
+
+    El resultado del último límite evaluado se guarda en
+    ``request.state.rate_limit`` y RateLimitHeadersMiddleware lo
+    convierte en headers de la respuesta.
+    """
+
+    def __init__(
+        self,
+        key_func: Callable[[Request], str],
+        storage: RateLimitStorage | None = None,
+        enabled: bool = True,
+    ):
+        self.key_func = key_func
+        self.storage = storage or create_storage()
+        self.enabled = enabled
+
+    def hit(self, request: Request, limit: RateLimit, scope: str) -> RateLimitResult:
+        """
+        Consume una request del límite ``scope`` para el cliente.
+
+        Raises:
+            RateLimitExceeded: Si el cliente agotó el límite
+        """
+        key = f"{scope}:{self.key_func(request)}"
+        return self._check(request, limit, self.storage.hit(key, limit))
+
+    async def ahit(
+        self, request: Request, limit: RateLimit, scope: str
+    ) -> RateLimitResult:
+        """
+        Como ``hit`` pero sin bloquear el event loop.
+
+        Un backend con I/O (SQLite puede esperar ``timeout`` segundos al
+        lock de otro worker) se consulta en el threadpool.
+
+        Raises:
+            RateLimitExceeded: Si el cliente agotó el límite
+        """
+        key = f"{scope}:{self.key_func(request)}"
+        if self.storage.blocking:
+            result = await anyio.to_thread.run_sync(self.storage.hit, key, limit)
+        else:
+            result = self.storage.hit(key, limit)
+        return self._check(request, limit, result)
+
+    def _check(
+        self, request: Request, limit: RateLimit, result: RateLimitResult
+    ) -> RateLimitResult:
+        request.state.rate_limit = result
+        if not result.allowed:
+            raise RateLimitExceeded(limit, result)
+        return result
+
+    def limit(self, rate: str) -> Callable:
+        """
+        Decorador de endpoint, p.ej. ``@limiter.limit("5/minute")``.
+
+        El endpoint debe recibir un parámetro ``request: Request``.
+        """
+        rate_limit = parse_rate(rate)
+
+        def decorator(func: Callable) -> Callable:
+            scope = f"{func.__module__}.{func.__qualname__}"
+
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    if self.enabled:
+                        await self.ahit(_find_request(args, kwargs), rate_limit, scope)
+                    return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def sync_wrapper(*args, **kwargs):
+                if self.enabled:
+                    self.hit(_find_request(args, kwargs), rate_limit, scope)
+                return func(*args, **kwargs)
+            return sync_wrapper
+
+        return decorator
+
+    def reset(self) -> None:
+        """Olvida todos los contadores (tests)."""
+        self.storage.reset()
+
+
+def _find_request(args: tuple, kwargs: dict) -> Request:
+    request = kwargs.get("request")
+    if isinstance(request, Request):
+        return request
+    for arg in args:
+        if isinstance(arg, Request):
+            return arg
+    raise RuntimeError("El endpoint limitado debe recibir 'request: Request'")
+
+
+limiter = RateLimiter(
+    key_func=get_identifier,
+    storage=create_storage(
+        settings.rate_limit_storage_uri, settings.rate_limit_strategy
+    ),
+    enabled=settings.rate_limit_enabled,
+)
+
+
+# ============================================
+# Headers
 # ============================================
-# Configura slowapi con la función de identificación
-# y opcionalmente con Redis como backend.
 
-# TODO: Descomentar y completar configuración avanzada
-# limiter = Limiter(
-#     key_func=get_identifier,
-#     default_limits=[settings.rate_limit_default],
-#     storage_uri=settings.redis_url if settings.is_production else None,
-#     strategy="fixed-window",  # o "moving-window"
-#     headers_enabled=True,
-# )
+def rate_limit_headers(result: RateLimitResult) -> dict[str, str]:
+    """Headers X-RateLimit-* para un resultado."""
+    return {
+        "X-RateLimit-Limit": str(result.limit),
+        "X-RateLimit-Remaining": str(result.remaining),
+        "X-RateLimit-Reset": str(math.ceil(result.reset_after)),
+    }
+
+
+class RateLimitHeadersMiddleware:
+    """
+    Middleware ASGI que añade los headers X-RateLimit-*.
+
+    Solo actúa en requests que pasaron por un endpoint limitado.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-# Versión básica (reemplazar con la de arriba)
-limiter = Limiter(key_func=get_identifier)
+        # request.state escribe en este mismo dict
+        state = scope.setdefault("state", {})
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                result = state.get("rate_limit")
+                if result is not None:
+                    headers = list(message.get("headers", []))
+                    headers.extend(
+                        (name.lower().encode("latin-1"), value.encode("latin-1"))
+                        for name, value in rate_limit_headers(result).items()
+                    )
+                    message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
 
 # ============================================
-# TODO 3: Handler para rate limit exceeded
+# Handler para rate limit exceeded
 # ============================================
 
-def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> JSONResponse:
+def rate_limit_exceeded_handler(
+    request: Request, exc: RateLimitExceeded
+) -> JSONResponse:
     """
     Handler para cuando se excede el rate limit.
-    
-    TODO: Personalizar la respuesta con:
-    - Mensaje claro
-    - Headers de retry-after
-    - Logging del evento
-    
+
     Args:
         request: Request que excedió el límite
-        exc: Excepción con detalles del límite
-        
+        exc: Excepción con el límite y el resultado del backend
+
     Returns:
-        JSONResponse: Respuesta 429
+        JSONResponse: Respuesta 429 con Retry-After
     """
-    # TODO: Implementar respuesta personalizada
-    # response = JSONResponse(
-    #     status_code=429,
-    #     content={
-    #         "error": "rate_limit_exceeded",
-    #         "message": f"Too many requests. Limit: {exc.detail}",
-    #         "retry_after": 60,
-    #     },
-    # )
-    # response.headers["Retry-After"] = "60"
-    # response.headers["X-RateLimit-Limit"] = str(exc.detail)
-    # return response
-    
+    retry_after = max(1, math.ceil(exc.result.retry_after))
     return JSONResponse(
         status_code=429,
-        content={"detail": f"Rate limit exceeded: {exc.detail}"},
+        content={
+            "detail": f"Rate limit exceeded: {exc.detail}",
+            "retry_after": retry_after,
+        },
+        headers={"Retry-After": str(retry_after)},
     )
 
 
@@ -117,12 +270,12 @@ def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> JSO
 # ============================================
 # Usa estos decoradores en los endpoints:
 #
-# @limiter.limit("5/minute")  # 5 requests por minuto
 # @app.post("/auth/login")
+# @limiter.limit("5/minute")  # 5 requests por minuto
 # async def login(request: Request):
 #     ...
 #
-# @limiter.limit("60/minute")
 # @app.get("/tasks")
+# @limiter.limit("60/minute")
 # async def list_tasks(request: Request):
 #     ...
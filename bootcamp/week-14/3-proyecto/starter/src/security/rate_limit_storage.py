@@ -0,0 +1,436 @@
+"""
+Backends de almacenamiento para rate limiting.
+
+El ``Limiter`` básico de slowapi guarda contadores de ventana fija en
+memoria del proceso: cada worker de uvicorn lleva su propia cuenta y
+en el borde de la ventana se admite hasta el doble del límite.
+
+Estrategias disponibles:
+    - sliding-window: log de timestamps por clave (en memoria) o
+      contador de ventana deslizante ponderado (en SQLite)
+    - token-bucket: cubo de ``limit`` fichas que se rellena de forma
+      continua a ``limit / period`` fichas por segundo
+
+Backends:
+    - memory://: por proceso, sin I/O
+    - sqlite:///ruta/al/archivo.db: compartido entre workers de una
+      misma máquina (transacciones ``BEGIN IMMEDIATE``)
+"""
+
+import math
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+
+STRATEGIES = ("sliding-window", "token-bucket")
+
+_PERIODS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+}
+
+_RATE_RE = re.compile(
+    r"^\s*(\d+)\s*(?:/|per)\s*(\d+)?\s*(second|minute|hour|day)s?\s*$"
+)
+
+
+# ============================================
+# Límites y resultados
+# ============================================
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    """Límite de ``amount`` requests cada ``period`` segundos."""
+
+    amount: int
+    period: float
+
+    def __str__(self) -> str:
+        return f"{self.amount} per {self.period:g} second(s)"
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitResult:
+    """Resultado de consumir una request para una clave."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    # Segundos hasta que la clave recupera el límite completo
+    reset_after: float
+    # Segundos hasta que se admitirá la siguiente request (0 si allowed)
+    retry_after: float = 0.0
+
+
+def parse_rate(rate: str) -> RateLimit:
+    """
+    Convierte la notación de slowapi en un RateLimit.
+
+    Examples:
+        "5/minute", "100 per hour", "10/30 seconds"
+    """
+    match = _RATE_RE.match(rate.lower())
+    if match is None:
+        raise ValueError(f"Rate limit no válido: {rate!r}")
+    amount, multiplier, unit = match.groups()
+    period = _PERIODS[unit] * int(multiplier or 1)
+    return RateLimit(amount=int(amount), period=period)
+
+
+# ============================================
+# Interfaz común
+# ============================================
+
+class RateLimitStorage(ABC):
+    """Interfaz de los backends de rate limiting."""
+
+    strategy: str
+    # True si hit hace I/O bloqueante: los endpoints async lo llaman en un hilo
+    blocking: bool = False
+
+    @abstractmethod
+    def hit(self, key: str, limit: RateLimit) -> RateLimitResult:
+        """Consume una request de ``key`` si el límite lo permite."""
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Olvida todos los contadores."""
+
+    def close(self) -> None:
+        """Libera recursos del backend."""
+
+
+# ============================================
+# Backends en memoria
+# ============================================
+
+class MemorySlidingWindowStorage(RateLimitStorage):
+    """
+    Ventana deslizante exacta con un log de timestamps por clave.
+
+    Memoria O(limit) por clave activa; las claves inactivas se
+    purgan cada ``sweep_every`` hits.
+    """
+
+    strategy = "sliding-window"
+
+    def __init__(self, sweep_every: int = 1024):
+        self.sweep_every = sweep_every
+        self._logs: dict[str, tuple[float, deque[float]]] = {}
+        # Los endpoints síncronos corren en el threadpool
+        self._lock = threading.Lock()
+        self._hits = 0
+
+    def hit(self, key: str, limit: RateLimit) -> RateLimitResult:
+        now = time.monotonic()
+        with self._lock:
+            self._hits += 1
+            if self._hits % self.sweep_every == 0:
+                self._sweep(now)
+
+            entry = self._logs.get(key)
+            if entry is None:
+                entry = self._logs[key] = (limit.period, deque())
+            log = entry[1]
+
+            cutoff = now - limit.period
+            while log and log[0] <= cutoff:
+                log.popleft()
+
+            if len(log) >= limit.amount:
+                retry_after = log[0] + limit.period - now
+                return RateLimitResult(
+                    allowed=False,
+                    limit=limit.amount,
+                    remaining=0,
+                    reset_after=log[-1] + limit.period - now,
+                    retry_after=retry_after,
+                )
+
+            log.append(now)
+            return RateLimitResult(
+                allowed=True,
+                limit=limit.amount,
+                remaining=limit.amount - len(log),
+                reset_after=limit.period,
+            )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._logs.clear()
+
+    def _sweep(self, now: float) -> None:
+        expired = [
+            key for key, (period, log) in self._logs.items()
+            if not log or log[-1] <= now - period
+        ]
+        for key in expired:
+            del self._logs[key]
+
+
+class MemoryTokenBucketStorage(RateLimitStorage):
+    """
+    Token bucket en memoria: memoria constante por clave.
+
+    Admite ráfagas de hasta ``limit`` requests y después un ritmo
+    sostenido de ``limit / period`` por segundo.
+    """
+
+    strategy = "token-bucket"
+
+    def __init__(self, sweep_every: int = 1024):
+        self.sweep_every = sweep_every
+        # key -> [fichas, último relleno, periodo]
+        self._buckets: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+
+    def hit(self, key: str, limit: RateLimit) -> RateLimitResult:
+        now = time.monotonic()
+        with self._lock:
+            self._hits += 1
+            if self._hits % self.sweep_every == 0:
+                self._sweep(now)
+
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(limit.amount), now, limit.period]
+            tokens = _refill(bucket[0], bucket[1], now, limit)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            bucket[0], bucket[1] = tokens, now
+
+        return _bucket_result(allowed, tokens, limit)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def _sweep(self, now: float) -> None:
+        # Un cubo inactivo durante un periodo completo ya está lleno
+        full = [
+            key
+            for key, (_, updated, period) in self._buckets.items()
+            if now - updated >= period
+        ]
+        for key in full:
+            del self._buckets[key]
+
+
+def _refill(tokens: float, updated: float, now: float, limit: RateLimit) -> float:
+    rate = limit.amount / limit.period
+    return min(float(limit.amount), tokens + (now - updated) * rate)
+
+
+def _bucket_result(allowed: bool, tokens: float, limit: RateLimit) -> RateLimitResult:
+    rate = limit.amount / limit.period
+    return RateLimitResult(
+        allowed=allowed,
+        limit=limit.amount,
+        remaining=int(tokens),
+        reset_after=(limit.amount - tokens) / rate,
+        retry_after=0.0 if allowed else (1 - tokens) / rate,
+    )
+
+
+# ============================================
+# Backend SQLite (compartido entre workers)
+# ============================================
+
+class SQLiteStorage(RateLimitStorage):
+    """
+    Contadores en un archivo SQLite compartido por todos los workers.
+
+    Cada hit es una transacción ``BEGIN IMMEDIATE`` sobre una sola fila
+    por clave, así que la lectura y la escritura son atómicas entre
+    procesos. La ventana deslizante usa el contador ponderado de dos
+    ventanas fijas (memoria constante por clave) en lugar de un log.
+
+    Cada fila guarda en ``expires`` cuándo deja de influir (ventana
+    vencida o cubo lleno); esas filas se borran cada ``sweep_every`` hits.
+
+    Usa ``time.time()``: el reloj tiene que ser común a los procesos.
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        path: str,
+        strategy: str = "sliding-window",
+        timeout: float = 5.0,
+        sweep_every: int = 1024,
+    ):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Estrategia de rate limiting no soportada: {strategy}")
+        self.path = path
+        self.strategy = strategy
+        self.sweep_every = sweep_every
+        self._hits = 0
+        # Una conexión por proceso; el lock la serializa entre hilos
+        self._conn = sqlite3.connect(
+            path,
+            timeout=timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            " key TEXT PRIMARY KEY,"
+            " a REAL NOT NULL,"
+            " b REAL NOT NULL,"
+            " c REAL NOT NULL,"
+            " expires REAL NOT NULL"
+            ")"
+        )
+
+    def hit(self, key: str, limit: RateLimit) -> RateLimitResult:
+        now = time.time()
+        with self._lock:
+            self._hits += 1
+            if self._hits % self.sweep_every == 0:
+                self._sweep(now)
+
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                row = cursor.execute(
+                    "SELECT a, b, c FROM rate_limits WHERE key = ?", (key,)
+                ).fetchone()
+                if self.strategy == "token-bucket":
+                    result, values = self._token_bucket(row, now, limit)
+                else:
+                    result, values = self._sliding_window(row, now, limit)
+                cursor.execute(
+                    "INSERT INTO rate_limits (key, a, b, c, expires)"
+                    " VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET a = excluded.a, b = excluded.b,"
+                    " c = excluded.c, expires = excluded.expires",
+                    (key, *values),
+                )
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM rate_limits")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _sweep(self, now: float) -> None:
+        # Una fila vencida equivale a no tener fila: se puede borrar
+        self._conn.execute("DELETE FROM rate_limits WHERE expires <= ?", (now,))
+
+    @staticmethod
+    def _token_bucket(row, now: float, limit: RateLimit):
+        # a = fichas, b = último relleno
+        if row is None:
+            tokens = float(limit.amount)
+        else:
+            tokens = _refill(row[0], row[1], now, limit)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        result = _bucket_result(allowed, tokens, limit)
+        return result, (tokens, now, 0.0, now + result.reset_after)
+
+    @staticmethod
+    def _sliding_window(row, now: float, limit: RateLimit):
+        # a = inicio de la ventana actual, b = cuenta actual, c = cuenta anterior
+        period = limit.period
+        window = math.floor(now / period) * period
+        current = previous = 0.0
+        if row is not None:
+            start, count, prev = row
+            if start == window:
+                current, previous = count, prev
+            elif start == window - period:
+                previous = count
+
+        # Peso de la ventana anterior que aún solapa con la deslizante
+        weight = 1 - (now - window) / period
+        estimated = previous * weight + current
+        # Las requests de la ventana actual cuentan hasta el final de la siguiente
+        reset_after = window + 2 * period - now
+
+        if estimated + 1 > limit.amount:
+            retry_after = _sliding_retry_after(
+                now, window, period, current, previous, limit.amount
+            )
+            result = RateLimitResult(
+                allowed=False,
+                limit=limit.amount,
+                remaining=0,
+                reset_after=reset_after,
+                retry_after=retry_after,
+            )
+            return result, (window, current, previous, now + reset_after)
+
+        current += 1
+        result = RateLimitResult(
+            allowed=True,
+            limit=limit.amount,
+            remaining=max(0, math.floor(limit.amount - estimated - 1)),
+            reset_after=reset_after,
+        )
+        return result, (window, current, previous, now + reset_after)
+
+
+def _sliding_retry_after(
+    now: float,
+    window: float,
+    period: float,
+    current: float,
+    previous: float,
+    amount: int,
+) -> float:
+    """Segundos hasta que el contador ponderado deje sitio a una request."""
+    room = amount - 1 - current
+    if room >= 0 and previous > 0:
+        # Dentro de esta ventana, cuando el peso de la anterior baje lo suficiente
+        return max(0.0, window + period * (1 - room / previous) - now)
+    # En la ventana siguiente la actual pasa a ser la anterior
+    next_window = window + period
+    if current <= amount - 1:
+        return max(0.0, next_window - now)
+    return next_window + period * (1 - (amount - 1) / current) - now
+
+
+# ============================================
+# Factory
+# ============================================
+
+def create_storage(
+    uri: str = "memory://", strategy: str = "sliding-window"
+) -> RateLimitStorage:
+    """
+    Crea un backend a partir de una URI.
+
+    Examples:
+        memory://
+        sqlite:///./rate_limits.db
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Estrategia de rate limiting no soportada: {strategy}")
+    if uri.startswith("memory://"):
+        if strategy == "token-bucket":
+            return MemoryTokenBucketStorage()
+        return MemorySlidingWindowStorage()
+    if uri.startswith("sqlite://"):
+        return SQLiteStorage(uri.removeprefix("sqlite:///"), strategy=strategy)
+    raise ValueError(f"Storage de rate limiting no soportado: {uri}")
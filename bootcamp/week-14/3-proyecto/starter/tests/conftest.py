@@ -0,0 +1,15 @@
+"""
+Fixtures compartidas.
+"""
+
+import pytest
+
+from src.security.rate_limit import limiter
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """Cada test empieza con los contadores de rate limiting vacíos."""
+    limiter.reset()
+    yield
+    limiter.reset()
@@ -133,8 +133,8 @@ class TestMetricsEndpoint:
             response = await client.get("/metrics")
             assert response.status_code == 200
             
-            # TODO: Verificar que health no está en métricas
-            # cuando la configuración avanzada esté activa
+            assert 'handler="/health/live"' not in response.text
+            assert 'handler="/health/ready"' not in response.text
 
 
 class TestMetricsIntegration:
@@ -157,6 +157,5 @@ class TestMetricsIntegration:
             # Verificar métricas
             response = await client.get("/metrics")
             
-            # TODO: Descomentar cuando métricas de negocio estén activas
-            # assert "tasks_created_total" in response.text
+            assert 'tasks_created_total{priority="high"}' in response.text
             assert response.status_code == 200
@@ -0,0 +1,129 @@
+"""
+Tests para el readiness checker (concurrencia, caché y circuit breaker).
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.observability import health
+from src.observability.health import (
+    CircuitBreaker,
+    CircuitState,
+    DependencyCheck,
+    HealthStatus,
+    ReadinessChecker,
+)
+
+
+def make_check(delay: float = 0.0, healthy: bool = True):
+    calls = []
+
+    async def check():
+        calls.append(time.perf_counter())
+        await asyncio.sleep(delay)
+        return {"healthy": healthy, "message": "ok" if healthy else "down", "latency_ms": delay * 1000}
+
+    return check, calls
+
+
+class TestReadinessChecker:
+    """Tests para la ejecución de los checks."""
+
+    @pytest.mark.asyncio
+    async def test_checks_run_concurrently(self):
+        db, _ = make_check(delay=0.2)
+        cache, _ = make_check(delay=0.2)
+        checker = ReadinessChecker(
+            [DependencyCheck("database", db), DependencyCheck("redis", cache, critical=False)],
+            cache_ttl=0,
+        )
+
+        start = time.perf_counter()
+        result = await checker.get()
+        assert time.perf_counter() - start < 0.35
+        assert result["status"] == HealthStatus.HEALTHY
+        assert set(result["checks"]) == {"database", "redis"}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_probes_share_one_check(self):
+        db, calls = make_check(delay=0.05)
+        checker = ReadinessChecker([DependencyCheck("database", db)], cache_ttl=10)
+
+        results = await asyncio.gather(*(checker.get() for _ in range(50)))
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+
+        # Dentro del TTL se responde desde caché
+        await checker.get()
+        assert len(calls) == 1
+
+        checker.invalidate()
+        await checker.get()
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_timeout_marks_check_unhealthy(self):
+        hung, _ = make_check(delay=5)
+        checker = ReadinessChecker([DependencyCheck("database", hung)], cache_ttl=0, timeout=0.05)
+
+        start = time.perf_counter()
+        result = await checker.get()
+        assert time.perf_counter() - start < 1
+        assert result["status"] == HealthStatus.UNHEALTHY
+        assert "timed out" in result["checks"]["database"]["message"]
+
+    @pytest.mark.asyncio
+    async def test_optional_dependency_degrades(self):
+        db, _ = make_check()
+        cache, _ = make_check(healthy=False)
+        checker = ReadinessChecker(
+            [DependencyCheck("database", db), DependencyCheck("redis", cache, critical=False)],
+            cache_ttl=0,
+        )
+        result = await checker.get()
+        assert result["status"] == HealthStatus.DEGRADED
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_hung_dependency(self):
+        hung, calls = make_check(delay=5)
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        checker = ReadinessChecker(
+            [DependencyCheck("database", hung, breaker=breaker)], cache_ttl=0, timeout=0.02
+        )
+
+        await checker.get()
+        await checker.get()
+        assert breaker.state == CircuitState.OPEN
+
+        start = time.perf_counter()
+        result = await checker.get()
+        assert time.perf_counter() - start < 0.01
+        assert len(calls) == 2
+        assert result["checks"]["database"]["circuit"] == "open"
+
+
+class TestCircuitBreaker:
+    """Tests para las transiciones del circuit breaker."""
+
+    def test_half_open_after_reset_timeout(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(health.time, "monotonic", lambda: now[0])
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+
+        breaker.record_failure()
+        assert not breaker.allow()
+
+        now[0] += 30
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow()
+
+        # Un fallo en half-open vuelve a abrir
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+
+        now[0] += 30
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.failures == 0
@@ -0,0 +1,128 @@
+"""
+Tests para el pipeline de logs por lotes.
+"""
+
+import io
+import json
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.observability.log_writer import LogWriter
+from src.observability.logging import (
+    RequestLoggingMiddleware,
+    get_logger,
+    setup_logging,
+)
+
+
+def read_events(stream: io.StringIO) -> list[dict]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def build_app(writer: LogWriter, sample_rate: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok():
+        return {"ok": True}
+
+    @app.get("/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    app.add_middleware(RequestLoggingMiddleware, writer=writer, sample_rate=sample_rate)
+    return app
+
+
+class TestLogWriter:
+    """Tests para la cola acotada y el volcado por lotes."""
+
+    def test_writes_inline_without_background_task(self):
+        stream = io.StringIO()
+        writer = LogWriter(stream=stream)
+        writer.put({"event": "hello", "level": "info"})
+        assert read_events(stream) == [{"event": "hello", "level": "info"}]
+
+    @pytest.mark.asyncio
+    async def test_batches_in_background(self):
+        stream = io.StringIO()
+        writer = LogWriter(stream=stream, batch_size=10, flush_interval=60)
+        await writer.start()
+
+        for i in range(25):
+            writer.put({"event": "tick", "level": "info", "i": i})
+        # Nada se escribe en el event loop
+        assert stream.getvalue() == ""
+
+        await writer.stop()
+        assert [e["i"] for e in read_events(stream)] == list(range(25))
+        assert writer.stats["batches"] == 3
+
+    @pytest.mark.asyncio
+    async def test_full_queue_keeps_errors(self):
+        stream = io.StringIO()
+        writer = LogWriter(stream=stream, max_size=3, batch_size=100, flush_interval=60)
+        await writer.start()
+
+        for i in range(5):
+            writer.put({"event": "info", "level": "info", "i": i})
+        assert writer.put({"event": "failure", "level": "error"})
+
+        await writer.stop()
+        events = read_events(stream)
+        assert [e["event"] for e in events] == ["info"] * 3 + ["failure"]
+        assert writer.stats["dropped"] == 2
+
+    def test_structlog_events_are_masked(self):
+        stream = io.StringIO()
+        setup_logging(LogWriter(stream=stream))
+        try:
+            get_logger("test").info("login", password="admin123")
+        finally:
+            setup_logging()
+
+        [event] = read_events(stream)
+        assert event["event"] == "login"
+        assert event["password"] == "***MASKED***"
+        assert event["service"] == "task-api"
+
+
+class TestRequestLoggingMiddleware:
+    """Tests para el middleware ASGI de logging."""
+
+    @pytest.mark.asyncio
+    async def test_sampling_never_drops_errors(self):
+        stream = io.StringIO()
+        app = build_app(LogWriter(stream=stream), sample_rate=0.0)
+        transport = ASGITransport(app=app, raise_app_exceptions=False)
+
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            for _ in range(10):
+                assert (await client.get("/ok")).status_code == 200
+            assert (await client.get("/missing")).status_code == 404
+            assert (await client.get("/boom")).status_code == 500
+
+        events = read_events(stream)
+        assert [(e["event"], e["status_code"]) for e in events] == [
+            ("request_completed", 404),
+            ("request_failed", 500),
+        ]
+        assert events[1]["level"] == "error"
+        assert "boom" in events[1]["error"]
+
+    @pytest.mark.asyncio
+    async def test_request_id_in_event_and_header(self):
+        stream = io.StringIO()
+        app = build_app(LogWriter(stream=stream), sample_rate=1.0)
+        transport = ASGITransport(app=app)
+
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/ok", headers={"X-Request-ID": "abc-123"})
+
+        assert response.headers["X-Request-ID"] == "abc-123"
+        [event] = read_events(stream)
+        assert event["request_id"] == "abc-123"
+        assert event["path"] == "/ok"
+        assert event["duration_ms"] >= 0
@@ -25,8 +25,7 @@ class TestRequestLogging:
             response = await client.get("/tasks")
             
             assert response.status_code == 200
-            # TODO: Descomentar cuando RequestLoggingMiddleware esté activo
-            # assert "X-Request-ID" in response.headers
+            assert "X-Request-ID" in response.headers
     
     @pytest.mark.asyncio
     async def test_custom_request_id_preserved(self, client):
@@ -40,8 +39,7 @@ class TestRequestLogging:
             )
             
             assert response.status_code == 200
-            # TODO: Descomentar cuando RequestLoggingMiddleware esté activo
-            # assert response.headers.get("X-Request-ID") == custom_id
+            assert response.headers.get("X-Request-ID") == custom_id
     
     @pytest.mark.asyncio
     async def test_error_logging(self, client):
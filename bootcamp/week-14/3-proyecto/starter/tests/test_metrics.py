@@ -0,0 +1,116 @@
+"""
+Tests para el registro de métricas y los histogramas HDR.
+"""
+
+import os
+import random
+import threading
+
+import pytest
+
+from src.observability.histogram import HdrHistogram
+from src.observability.registry import MetricsRegistry
+
+
+class TestHdrHistogram:
+    """Tests para el histograma log-lineal."""
+
+    def test_small_values_are_exact(self):
+        histogram = HdrHistogram()
+        for value in range(1, 101):
+            histogram.record(value)
+        assert histogram.quantile(0.5) == 50
+        assert histogram.quantile(0.99) == 99
+        assert histogram.quantile(1.0) == 100
+
+    def test_relative_error_is_bounded(self):
+        rng = random.Random(42)
+        values = sorted(int(rng.lognormvariate(9, 1.5)) for _ in range(20_000))
+        histogram = HdrHistogram()
+        for value in values:
+            histogram.record(value)
+
+        for q in (0.5, 0.9, 0.99, 0.999):
+            exact = values[round(q * len(values)) - 1]
+            assert histogram.quantile(q) == pytest.approx(exact, rel=1 / 64)
+
+    def test_merge_and_serialization(self):
+        a, b = HdrHistogram(), HdrHistogram()
+        for value in range(1_000):
+            (a if value % 2 else b).record(value * 1_000)
+
+        merged = HdrHistogram.from_dict(a.to_dict())
+        merged.merge(b)
+        assert merged.count == 1_000
+        assert merged.min == 0
+        assert merged.max == 999_000
+        assert merged.quantile(0.5) == pytest.approx(499_000, rel=1 / 64)
+
+    def test_empty_histogram(self):
+        assert HdrHistogram().quantile(0.99) == 0
+
+
+class TestMetricsRegistry:
+    """Tests para la acumulación por hilo y la exposición."""
+
+    def test_threads_write_to_own_shards(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs", ("kind",))
+
+        def work():
+            child = counter.labels("batch")
+            for _ in range(10_000):
+                child.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(registry._shards) == 4
+        assert registry.collect_local().values[("jobs_total", ("batch",))] == 40_000
+
+    def test_render_prometheus_format(self):
+        registry = MetricsRegistry()
+        registry.counter("hits_total", "Hits", ("path",)).labels(path='/a"b').inc(2)
+        latency = registry.histogram("latency_seconds", "Latency", scale=1_000_000)
+        for ms in range(1, 101):
+            latency.observe(ms / 1000)
+
+        text = registry.render()
+        assert "# TYPE hits_total counter" in text
+        assert 'hits_total{path="/a\\"b"} 2.0' in text
+        assert 'latency_seconds{quantile="0.5"} 0.05' in text
+        assert "latency_seconds_count 100" in text
+
+    def test_gauge_set(self):
+        registry = MetricsRegistry()
+        gauge = registry.gauge("active", "Active")
+        gauge.inc(5)
+        gauge.set(2)
+        gauge.dec()
+        assert registry.collect_local().values[("active", ())] == 1
+
+    def test_duplicate_metric(self):
+        registry = MetricsRegistry()
+        registry.counter("dup_total", "Dup")
+        with pytest.raises(ValueError):
+            registry.counter("dup_total", "Dup")
+
+    def test_workers_aggregate_through_directory(self, tmp_path, monkeypatch):
+        # Dos "workers": registros distintos sobre el mismo directorio
+        worker_a = MetricsRegistry(str(tmp_path))
+        worker_b = MetricsRegistry(str(tmp_path))
+        for registry in (worker_a, worker_b):
+            registry.counter("requests_total", "Requests").inc(3)
+            registry.histogram("latency", "Latency").observe(100)
+
+        monkeypatch.setattr(os, "getpid", lambda: 1001)
+        worker_a.flush()
+        monkeypatch.setattr(os, "getpid", lambda: 1002)
+        snapshot = worker_b.collect()
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["worker-1001.json", "worker-1002.json"]
+        assert snapshot.values[("requests_total", ())] == 6
+        assert snapshot.histograms[("latency", ())].count == 2
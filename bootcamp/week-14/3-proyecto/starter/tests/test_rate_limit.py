@@ -2,10 +2,15 @@
 Tests para Rate Limiting.
 """
 
+import threading
+
 import pytest
+from fastapi import Request
 from httpx import AsyncClient, ASGITransport
 
 from src.main import app
+from src.security.rate_limit import RateLimiter
+from src.security.rate_limit_storage import MemorySlidingWindowStorage
 
 
 @pytest.fixture
@@ -34,9 +39,9 @@ class TestRateLimiting:
             # Verificar que la respuesta es exitosa
             assert response.status_code == 200
             
-            # TODO: Verificar headers cuando se implemente rate limiting
-            # assert "X-RateLimit-Limit" in response.headers
-            # assert "X-RateLimit-Remaining" in response.headers
+            assert response.headers["X-RateLimit-Limit"] == "60"
+            assert response.headers["X-RateLimit-Remaining"] == "59"
+            assert "X-RateLimit-Reset" in response.headers
     
     @pytest.mark.asyncio
     async def test_login_rate_limit(self, client):
@@ -56,14 +61,13 @@ class TestRateLimiting:
                 responses.append(response)
             
             # Los primeros 5 deberían ser 401 (credenciales inválidas)
-            # El 6to debería ser 429 cuando rate limiting esté activo
-            
-            # Por ahora, todos deberían ser 401
             for resp in responses[:5]:
                 assert resp.status_code == 401
             
-            # TODO: Descomentar cuando rate limiting esté activo
-            # assert responses[5].status_code == 429
+            # El 6to excede el límite
+            assert responses[5].status_code == 429
+            assert int(responses[5].headers["Retry-After"]) >= 1
+            assert responses[5].headers["X-RateLimit-Remaining"] == "0"
     
     @pytest.mark.asyncio
     async def test_tasks_list_allows_many_requests(self, client):
@@ -97,3 +101,34 @@ class TestRateLimiting:
                     },
                 )
                 assert response.status_code == 201
+
+
+class BlockingStorage(MemorySlidingWindowStorage):
+    """Backend en memoria que se declara bloqueante y anota su hilo."""
+
+    blocking = True
+
+    def hit(self, key, limit):
+        self.thread = threading.current_thread()
+        return super().hit(key, limit)
+
+
+class TestAsyncEndpoints:
+    """Tests del decorador sobre endpoints async."""
+
+    @pytest.mark.asyncio
+    async def test_blocking_storage_runs_off_event_loop(self):
+        """
+        Test que un backend bloqueante (SQLite) no corre en el event loop.
+        """
+        storage = BlockingStorage()
+        limiter = RateLimiter(key_func=lambda request: "client", storage=storage)
+
+        @limiter.limit("5/minute")
+        async def endpoint(request: Request):
+            return "ok"
+
+        request = Request({"type": "http", "headers": []})
+        assert await endpoint(request=request) == "ok"
+        assert storage.thread is not threading.current_thread()
+        assert request.state.rate_limit.remaining == 4
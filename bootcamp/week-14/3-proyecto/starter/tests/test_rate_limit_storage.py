@@ -0,0 +1,178 @@
+"""
+Tests para los backends de rate limiting.
+"""
+
+import pytest
+
+from src.security import rate_limit_storage
+from src.security.rate_limit_storage import (
+    MemorySlidingWindowStorage,
+    MemoryTokenBucketStorage,
+    RateLimit,
+    SQLiteStorage,
+    create_storage,
+    parse_rate,
+)
+
+
+class FakeClock:
+    """Reemplaza time.monotonic y time.time por un reloj manual."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit_storage.time, "monotonic", fake)
+    monkeypatch.setattr(rate_limit_storage.time, "time", fake)
+    return fake
+
+
+class TestParseRate:
+    """Tests para la notación de límites."""
+
+    def test_slowapi_notation(self):
+        assert parse_rate("5/minute") == RateLimit(5, 60)
+        assert parse_rate("100 per hour") == RateLimit(100, 3600)
+        assert parse_rate("10/30 seconds") == RateLimit(10, 30)
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            parse_rate("cinco por minuto")
+
+
+class TestSlidingWindowLog:
+    """Tests para la ventana deslizante en memoria."""
+
+    def test_no_burst_at_window_edge(self, clock):
+        storage = MemorySlidingWindowStorage()
+        limit = RateLimit(5, 60)
+
+        clock.advance(59)
+        for _ in range(5):
+            assert storage.hit("k", limit).allowed
+
+        # Con ventana fija aquí empezaría una ventana nueva
+        clock.advance(2)
+        result = storage.hit("k", limit)
+        assert not result.allowed
+        assert result.retry_after == pytest.approx(58)
+
+        clock.advance(58)
+        assert storage.hit("k", limit).allowed
+
+    def test_remaining_decreases(self, clock):
+        storage = MemorySlidingWindowStorage()
+        limit = RateLimit(3, 10)
+        assert [storage.hit("k", limit).remaining for _ in range(3)] == [2, 1, 0]
+
+    def test_keys_are_independent(self, clock):
+        storage = MemorySlidingWindowStorage()
+        limit = RateLimit(1, 10)
+        assert storage.hit("a", limit).allowed
+        assert storage.hit("b", limit).allowed
+        assert not storage.hit("a", limit).allowed
+
+    def test_sweep_drops_idle_keys(self, clock):
+        storage = MemorySlidingWindowStorage(sweep_every=2)
+        limit = RateLimit(1, 10)
+        storage.hit("idle", limit)
+        clock.advance(11)
+        storage.hit("other", limit)
+        assert "idle" not in storage._logs
+
+
+class TestTokenBucket:
+    """Tests para el token bucket en memoria."""
+
+    def test_burst_then_refill(self, clock):
+        storage = MemoryTokenBucketStorage()
+        limit = RateLimit(10, 10)  # 1 ficha por segundo
+
+        for _ in range(10):
+            assert storage.hit("k", limit).allowed
+        result = storage.hit("k", limit)
+        assert not result.allowed
+        assert result.retry_after == pytest.approx(1)
+
+        clock.advance(1)
+        assert storage.hit("k", limit).allowed
+        assert not storage.hit("k", limit).allowed
+
+    def test_reset_after_is_time_to_full(self, clock):
+        storage = MemoryTokenBucketStorage()
+        limit = RateLimit(10, 10)
+        storage.hit("k", limit)
+        storage.hit("k", limit)
+        assert storage.hit("k", limit).reset_after == pytest.approx(3)
+
+
+class TestSQLiteStorage:
+    """Tests para el backend compartido entre workers."""
+
+    @pytest.mark.parametrize("strategy", ["sliding-window", "token-bucket"])
+    def test_limit_shared_between_connections(self, tmp_path, clock, strategy):
+        path = str(tmp_path / "limits.db")
+        worker_a = SQLiteStorage(path, strategy=strategy)
+        worker_b = SQLiteStorage(path, strategy=strategy)
+        limit = RateLimit(4, 60)
+
+        results = [storage.hit("k", limit) for storage in (worker_a, worker_b) * 2]
+        assert all(r.allowed for r in results)
+        assert [r.remaining for r in results] == [3, 2, 1, 0]
+        assert not worker_a.hit("k", limit).allowed
+        assert not worker_b.hit("k", limit).allowed
+
+        worker_a.close()
+        worker_b.close()
+
+    def test_sliding_window_weights_previous_window(self, tmp_path, clock):
+        clock.now = 600.0  # Inicio exacto de una ventana de 60 s
+        storage = SQLiteStorage(str(tmp_path / "limits.db"))
+        limit = RateLimit(10, 60)
+
+        for _ in range(10):
+            assert storage.hit("k", limit).allowed
+
+        # A mitad de la siguiente ventana la anterior pesa 0.5: 5 libres
+        clock.advance(90)
+        allowed = sum(storage.hit("k", limit).allowed for _ in range(10))
+        assert allowed == 5
+
+        result = storage.hit("k", limit)
+        assert not result.allowed
+        assert 0 < result.retry_after <= 60
+        storage.close()
+
+    @pytest.mark.parametrize("strategy", ["sliding-window", "token-bucket"])
+    def test_sweep_drops_expired_rows(self, tmp_path, clock, strategy):
+        storage = SQLiteStorage(str(tmp_path / "limits.db"), strategy=strategy, sweep_every=2)
+        limit = RateLimit(1, 10)
+        storage.hit("idle", limit)
+        # Ventana deslizante: la cuenta pesa hasta el final de la ventana siguiente
+        clock.advance(21)
+        storage.hit("other", limit)
+
+        keys = [row[0] for row in storage._conn.execute("SELECT key FROM rate_limits")]
+        assert keys == ["other"]
+        storage.close()
+
+    def test_create_storage(self, tmp_path):
+        assert isinstance(create_storage("memory://"), MemorySlidingWindowStorage)
+        assert isinstance(create_storage("memory://", "token-bucket"), MemoryTokenBucketStorage)
+        storage = create_storage(f"sqlite:///{tmp_path / 'limits.db'}", "token-bucket")
+        assert isinstance(storage, SQLiteStorage)
+        storage.close()
+
+        with pytest.raises(ValueError):
+            create_storage("memcached://localhost")
+        with pytest.raises(ValueError):
+            create_storage("memory://", "fixed-window")
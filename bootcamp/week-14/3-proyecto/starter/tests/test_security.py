@@ -3,9 +3,12 @@ Tests para Security Headers y CORS.
 """
 
 import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
 from httpx import AsyncClient, ASGITransport
 
 from src.main import app
+from src.security.headers import SecurityHeadersMiddleware
 
 
 @pytest.fixture
@@ -24,8 +27,7 @@ class TestSecurityHeaders:
         async with client:
             response = await client.get("/")
             
-            # TODO: Descomentar cuando SecurityHeadersMiddleware esté activo
-            # assert response.headers.get("X-Content-Type-Options") == "nosniff"
+            assert response.headers.get("X-Content-Type-Options") == "nosniff"
             assert response.status_code == 200
     
     @pytest.mark.asyncio
@@ -34,8 +36,7 @@ class TestSecurityHeaders:
         async with client:
             response = await client.get("/")
             
-            # TODO: Descomentar cuando SecurityHeadersMiddleware esté activo
-            # assert response.headers.get("X-Frame-Options") == "DENY"
+            assert response.headers.get("X-Frame-Options") == "DENY"
             assert response.status_code == 200
     
     @pytest.mark.asyncio
@@ -44,8 +45,7 @@ class TestSecurityHeaders:
         async with client:
             response = await client.get("/")
             
-            # TODO: Descomentar cuando SecurityHeadersMiddleware esté activo
-            # assert "1; mode=block" in response.headers.get("X-XSS-Protection", "")
+            assert "1; mode=block" in response.headers.get("X-XSS-Protection", "")
             assert response.status_code == 200
     
     @pytest.mark.asyncio
@@ -54,11 +54,59 @@ class TestSecurityHeaders:
         async with client:
             response = await client.get("/")
             
-            # TODO: Descomentar cuando SecurityHeadersMiddleware esté activo
-            # assert response.headers.get("Referrer-Policy") is not None
+            assert response.headers.get("Referrer-Policy") is not None
             assert response.status_code == 200
 
 
+class TestSecurityHeadersMiddleware:
+    """Tests para el middleware ASGI con respuestas de todo tipo."""
+    
+    @pytest.fixture
+    def headers_client(self):
+        demo = FastAPI()
+        
+        @demo.get("/stream")
+        async def stream():
+            async def chunks():
+                for i in range(3):
+                    yield f"chunk {i}\n"
+            return StreamingResponse(chunks(), media_type="text/plain")
+        
+        @demo.get("/events")
+        async def events():
+            async def generator():
+                yield "event: tick\ndata: 1\n\n"
+            return StreamingResponse(generator(), media_type="text/event-stream")
+        
+        @demo.get("/custom-csp")
+        async def custom_csp():
+            return JSONResponse({}, headers={"Content-Security-Policy": "default-src 'none'"})
+        
+        demo.add_middleware(SecurityHeadersMiddleware, include_hsts=True)
+        transport = ASGITransport(app=demo)
+        return AsyncClient(transport=transport, base_url="http://test")
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("path", ["/stream", "/events"])
+    async def test_streaming_responses(self, headers_client, path):
+        """Test que streaming y SSE también reciben los headers."""
+        async with headers_client:
+            response = await headers_client.get(path)
+            
+            assert response.status_code == 200
+            assert response.headers["X-Frame-Options"] == "DENY"
+            assert "max-age=31536000" in response.headers["Strict-Transport-Security"]
+    
+    @pytest.mark.asyncio
+    async def test_endpoint_header_is_respected(self, headers_client):
+        """Test que un header fijado por el endpoint no se duplica."""
+        async with headers_client:
+            response = await headers_client.get("/custom-csp")
+            
+            assert response.headers.get_list("Content-Security-Policy") == ["default-src 'none'"]
+            assert response.headers["X-Content-Type-Options"] == "nosniff"
+
+
 class TestCORS:
     """Tests para verificar configuración CORS."""
     
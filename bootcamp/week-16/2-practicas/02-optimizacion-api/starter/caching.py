@@ -6,302 +6,663 @@ Archivo: caching.py
 
 Implementa caching para reducir carga en la base de datos
 y mejorar tiempos de respuesta.
+
+Este módulo es importable (``from caching import MemoryCache, cached``)
+y al ejecutarlo muestra una demo:
+
+    python caching.py
+
+Qué resuelve frente a un dict con ``datetime.now()``:
+
+- Tamaño acotado con expulsión LRU o LFU (el dict crecía sin límite)
+- Expiración con reloj monotónico (no salta con cambios de hora/NTP)
+- Single-flight: N misses concurrentes de la misma key ejecutan el
+  loader una sola vez (evita la estampida sobre la DB)
+- Keys estables entre procesos (``hash()`` cambia con PYTHONHASHSEED)
+- Invalidación por tags sin ``KEYS`` (que bloquea Redis)
+- Estadísticas de hits, misses y expulsiones
 """
 
+import asyncio
+import hashlib
+import inspect
 import json
 import time
-from datetime import datetime, timedelta
-from functools import wraps
-from typing import Any, Callable, TypeVar
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from functools import partial, wraps
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
+from uuid import UUID
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis es opcional: solo para RedisCache
+    aioredis = None
+
+
+T = TypeVar("T")
+Loader = Callable[[], Awaitable[Any]]
+Tags = Iterable[str] | Callable[..., Iterable[str]]
+
+# Distingue "no está en cache" de un valor None cacheado
+_MISSING = object()
+
 
 # ============================================
-# PASO 1: Cache en memoria simple
+# PASO 1: Estadísticas y single-flight
 # ============================================
-print("--- Paso 1: Cache en memoria simple ---")
 
-MEMORY_CACHE = """
-# Cache simple usando diccionario
-# Útil para desarrollo y apps pequeñas
+@dataclass
+class CacheStats:
+    """Contadores del cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    # Llamadas reales al loader (con single-flight, <= misses)
+    loads: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "loads": self.loads,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class SingleFlight:
+    """
+    Agrupa llamadas concurrentes por key.
+
+    La primera llamada ejecuta ``loader``; las que llegan mientras está
+    en curso esperan el mismo resultado (o la misma excepción).
+    """
+
+    def __init__(self):
+        self._calls: dict[str, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, loader: Loader) -> Any:
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(loader())
+            self._calls[key] = future
+            future.add_done_callback(partial(self._done, key))
+        # shield: si un llamador se cancela, los demás siguen esperando
+        return await asyncio.shield(future)
+
+    def _done(self, key: str, future: asyncio.Future) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
 
-from datetime import datetime, timedelta
-from typing import Any
 
-class SimpleCache:
-    '''Cache en memoria con TTL.'''
-    
+class _Generations:
+    """
+    Invalidaciones de las keys y tags que tienen un load en curso.
+
+    Un loader puede leer la DB antes de una escritura y terminar después
+    de su ``delete``/``invalidate_tags``: si se guardara su resultado, la
+    invalidación quedaría deshecha. Solo se cuentan los nombres con un
+    load en curso, así que no crece con el número de keys.
+    """
+
     def __init__(self):
-        self._cache: dict[str, tuple[Any, datetime]] = {}
-    
-    def get(self, key: str) -> Any | None:
-        '''Obtiene valor del cache si no ha expirado.'''
-        if key not in self._cache:
-            return None
-        
-        value, expires_at = self._cache[key]
-        
-        if datetime.now() > expires_at:
-            del self._cache[key]
-            return None
-        
-        return value
-    
-    def set(self, key: str, value: Any, ttl_seconds: int = 300) -> None:
-        '''Guarda valor en cache con TTL (default 5 min).'''
-        expires_at = datetime.now() + timedelta(seconds=ttl_seconds)
-        self._cache[key] = (value, expires_at)
-    
-    def delete(self, key: str) -> None:
-        '''Elimina key del cache.'''
-        self._cache.pop(key, None)
-    
-    def clear(self) -> None:
-        '''Limpia todo el cache.'''
-        self._cache.clear()
-    
-    def get_or_set(
-        self, 
-        key: str, 
-        func: Callable[[], Any], 
-        ttl_seconds: int = 300
-    ) -> Any:
-        '''Obtiene del cache o ejecuta función y guarda resultado.'''
-        value = self.get(key)
-        if value is not None:
-            return value
-        
-        value = func()
-        self.set(key, value, ttl_seconds)
-        return value
+        # nombre -> [loads en curso, generación]
+        self._counters: dict[tuple[str, str], list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def start(self, names: list[tuple[str, str]]) -> list[int]:
+        """Registra un load y devuelve la generación actual de ``names``."""
+        snapshot = []
+        for name in names:
+            counter = self._counters.setdefault(name, [0, 0])
+            counter[0] += 1
+            snapshot.append(counter[1])
+        return snapshot
+
+    def finish(self, names: list[tuple[str, str]], snapshot: list[int]) -> bool:
+        """Cierra el load. True si nada de ``names`` se invalidó mientras tanto."""
+        fresh = True
+        for name, generation in zip(names, snapshot):
+            counter = self._counters[name]
+            fresh = fresh and counter[1] == generation
+            counter[0] -= 1
+            if not counter[0]:
+                del self._counters[name]
+        return fresh
+
+    def bump(self, name: tuple[str, str]) -> None:
+        counter = self._counters.get(name)
+        if counter is not None:
+            counter[1] += 1
+
+    def bump_all(self) -> None:
+        for counter in self._counters.values():
+            counter[1] += 1
+
+
+def _load_names(key: str, tags: frozenset[str]) -> list[tuple[str, str]]:
+    return [("key", key), *(("tag", tag) for tag in tags)]
+
 
-# Instancia global
-cache = SimpleCache()
-
-# Uso en endpoint:
-@router.get("/stats")
-async def get_stats(db: AsyncSession = Depends(get_db)):
-    # Cache por 1 hora (stats no cambian frecuentemente)
-    return cache.get_or_set(
-        "global_stats",
-        lambda: calculate_stats(db),
-        ttl_seconds=3600
+# ============================================
+# PASO 2: Keys estables
+# ============================================
+
+def _key_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if hasattr(value, "model_dump"):  # modelos Pydantic
+        return value.model_dump(mode="json")
+    # repr() de objetos arbitrarios incluye la dirección de memoria:
+    # la key cambiaría en cada request
+    raise TypeError(
+        f"{type(value).__name__} no sirve para construir una key de cache; "
+        "exclúyelo con ignore=(...)"
     )
-"""
-print(MEMORY_CACHE)
+
+
+def make_key(*parts: Any, prefix: str = "") -> str:
+    """
+    Key determinista para ``parts``.
+
+    Serializa a JSON canónico (claves ordenadas) y aplica blake2b: el
+    mismo input da la misma key en cualquier proceso y reinicio.
+    """
+    payload = json.dumps(
+        parts, sort_keys=True, separators=(",", ":"), default=_key_default
+    )
+    digest = hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    return f"{prefix}{digest}"
 
 
 # ============================================
-# PASO 2: Decorador de cache
+# PASO 3: Cache en memoria (LRU / LFU + TTL)
 # ============================================
-print("\n--- Paso 2: Decorador de cache ---")
 
-T = TypeVar("T")
+class _Entry:
+    __slots__ = ("value", "expires_at", "tags", "freq")
 
-CACHE_DECORATOR = """
-from functools import wraps
-from typing import Callable, TypeVar
+    def __init__(self, value: Any, expires_at: float | None, tags: frozenset[str]):
+        self.value = value
+        self.expires_at = expires_at
+        self.tags = tags
+        self.freq = 1
 
-T = TypeVar("T")
 
-def cached(ttl_seconds: int = 300, key_prefix: str = ""):
-    '''
-    Decorador para cachear resultados de funciones.
-    
-    Args:
-        ttl_seconds: Tiempo de vida del cache
-        key_prefix: Prefijo para la key de cache
-    '''
-    def decorator(func: Callable[..., T]) -> Callable[..., T]:
-        @wraps(func)
-        async def wrapper(*args, **kwargs) -> T:
-            # Generar key única basada en función y argumentos
-            cache_key = f"{key_prefix}{func.__name__}:{hash(str(args) + str(kwargs))}"
-            
-            # Intentar obtener del cache
-            cached_value = cache.get(cache_key)
-            if cached_value is not None:
-                return cached_value
-            
-            # Ejecutar función y cachear resultado
-            result = await func(*args, **kwargs)
-            cache.set(cache_key, result, ttl_seconds)
-            
-            return result
-        
-        return wrapper
-    return decorator
+class MemoryCache:
+    """
+    Cache en memoria del proceso con tamaño máximo y TTL.
 
-# Uso:
-@cached(ttl_seconds=600, key_prefix="users:")
-async def get_user_by_id(db: AsyncSession, user_id: int) -> User | None:
-    return await db.get(User, user_id)
+    - ``policy="lru"``: expulsa la entrada usada hace más tiempo
+    - ``policy="lfu"``: expulsa la menos usada (a igual frecuencia, la
+      más antigua); resiste mejor barridos puntuales de keys frías
 
-@cached(ttl_seconds=300)
-async def get_popular_products(db: AsyncSession, limit: int = 10) -> list[Product]:
-    query = select(Product).order_by(Product.views.desc()).limit(limit)
-    result = await db.execute(query)
-    return result.scalars().all()
-"""
-print(CACHE_DECORATOR)
+    Todas las operaciones son O(1) salvo ``invalidate_tags`` (O(keys
+    del tag)) y ``purge_expired``. No es thread-safe: pensado para un
+    event loop por proceso.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        default_ttl: float | None = 300,
+        policy: str = "lru",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if policy not in ("lru", "lfu"):
+            raise ValueError(f"policy debe ser 'lru' o 'lfu', no {policy!r}")
+        if max_size < 1:
+            raise ValueError("max_size debe ser >= 1")
+
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.policy = policy
+        self._clock = clock
+
+        # En LRU el orden del OrderedDict es el orden de uso
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        # En LFU: frecuencia -> keys en orden de llegada a esa frecuencia
+        self._buckets: dict[int, OrderedDict[str, None]] = {}
+        self._min_freq = 0
+        self._tags: dict[str, set[str]] = {}
+
+        self.stats = CacheStats()
+        self._flight = SingleFlight()
+        self._generations = _Generations()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self._lookup(key, count=False) is not _MISSING
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Obtiene el valor si existe y no ha expirado."""
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float | None = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        """
+        Guarda ``value``. ``ttl=None`` usa ``default_ttl``; ``tags``
+        permite invalidar grupos de keys con ``invalidate_tags``.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = None if ttl is None else self._clock() + ttl
+        tags = frozenset(tags)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._untag(key, entry.tags)
+            entry.value = value
+            entry.expires_at = expires_at
+            entry.tags = tags
+            self._touch(key, entry)
+        else:
+            if len(self._entries) >= self.max_size:
+                self._evict()
+            self._entries[key] = _Entry(value, expires_at, tags)
+            if self.policy == "lfu":
+                self._buckets.setdefault(1, OrderedDict())[key] = None
+                self._min_freq = 1
+
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+    def delete(self, key: str) -> bool:
+        """Elimina ``key``. Devuelve True si existía."""
+        self._generations.bump(("key", key))
+        if key not in self._entries:
+            return False
+        self._remove(key)
+        return True
+
+    def clear(self) -> None:
+        self._generations.bump_all()
+        self._entries.clear()
+        self._buckets.clear()
+        self._tags.clear()
+        self._min_freq = 0
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """Elimina todas las keys con alguno de ``tags``. Devuelve cuántas."""
+        keys: set[str] = set()
+        for tag in tags:
+            self._generations.bump(("tag", tag))
+            keys |= self._tags.get(tag, set())
+        for key in keys:
+            self._remove(key)
+        self.stats.invalidations += len(keys)
+        return len(keys)
+
+    def purge_expired(self) -> int:
+        """Elimina las entradas expiradas (si no, se limpian al leerlas)."""
+        now = self._clock()
+        expired = [
+            key
+            for key, entry in self._entries.items()
+            if entry.expires_at is not None and now >= entry.expires_at
+        ]
+        for key in expired:
+            self._remove(key)
+        self.stats.expirations += len(expired)
+        return len(expired)
+
+    def get_or_set(
+        self,
+        key: str,
+        func: Callable[[], T],
+        ttl: float | None = None,
+        tags: Iterable[str] = (),
+    ) -> T:
+        """Versión síncrona de cache-aside (sin single-flight)."""
+        value = self._lookup(key)
+        if value is _MISSING:
+            self.stats.loads += 1
+            value = func()
+            self.set(key, value, ttl, tags)
+        return value
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Loader,
+        ttl: float | None = None,
+        tags: Iterable[str] = (),
+    ) -> Any:
+        """
+        Cache-aside con single-flight.
+
+        En un miss, las corrutinas que piden la misma key a la vez
+        comparten una única ejecución de ``loader``. Si la key o uno de
+        sus tags se invalida durante la carga, el resultado se devuelve
+        pero no se guarda.
+        """
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+        tags = frozenset(tags)
+
+        async def load() -> Any:
+            self.stats.loads += 1
+            names = _load_names(key, tags)
+            snapshot = self._generations.start(names)
+            try:
+                result = await loader()
+            finally:
+                fresh = self._generations.finish(names, snapshot)
+            if fresh:
+                self.set(key, result, ttl, tags)
+            return result
+
+        return await self._flight.do(key, load)
+
+    # --- internos ---
+
+    def _lookup(self, key: str, count: bool = True) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at is not None:
+            if self._clock() >= entry.expires_at:
+                self._remove(key)
+                if count:
+                    self.stats.expirations += 1
+                entry = None
+
+        if entry is None:
+            if count:
+                self.stats.misses += 1
+            return _MISSING
+
+        if count:
+            self.stats.hits += 1
+            self._touch(key, entry)
+        return entry.value
+
+    def _touch(self, key: str, entry: _Entry) -> None:
+        if self.policy == "lru":
+            self._entries.move_to_end(key)
+            return
+
+        bucket = self._buckets[entry.freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[entry.freq]
+            if self._min_freq == entry.freq:
+                self._min_freq += 1
+        entry.freq += 1
+        self._buckets.setdefault(entry.freq, OrderedDict())[key] = None
+
+    def _evict(self) -> None:
+        if self.policy == "lru":
+            key = next(iter(self._entries))
+        else:
+            if self._min_freq not in self._buckets:
+                # Tras deletes/invalidaciones el mínimo puede haber cambiado
+                self._min_freq = min(self._buckets)
+            key = next(iter(self._buckets[self._min_freq]))
+        self._remove(key)
+        self.stats.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._untag(key, entry.tags)
+        if self.policy == "lfu":
+            bucket = self._buckets[entry.freq]
+            del bucket[key]
+            if not bucket:
+                del self._buckets[entry.freq]
+
+    def _untag(self, key: str, tags: frozenset[str]) -> None:
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
 
 
 # ============================================
-# PASO 3: Cache con Redis (producción)
+# PASO 4: Cache con Redis (producción)
 # ============================================
-print("\n--- Paso 3: Cache con Redis ---")
 
-REDIS_CACHE = """
-# Para producción, usa Redis
-# Instalar: uv add redis
+# Borra las keys de los tags y los propios sets de forma atómica.
+# DEL por bloques: unpack() tiene un límite de argumentos en Lua.
+_INVALIDATE_TAGS_LUA = """
+local keys = redis.call('SUNION', unpack(KEYS))
+local deleted = 0
+for i = 1, #keys, 500 do
+    deleted = deleted + redis.call('DEL', unpack(keys, i, math.min(i + 499, #keys)))
+end
+redis.call('DEL', unpack(KEYS))
+return deleted
+"""
 
-import redis.asyncio as redis
-import json
-from typing import Any
 
 class RedisCache:
-    '''Cache usando Redis para producción.'''
-    
-    def __init__(self, url: str = "redis://localhost:6379"):
-        self.redis = redis.from_url(url, decode_responses=True)
-    
-    async def get(self, key: str) -> Any | None:
-        '''Obtiene valor deserializado del cache.'''
-        value = await self.redis.get(key)
-        if value is None:
-            return None
-        return json.loads(value)
-    
+    """
+    Cache compartido entre procesos usando Redis.
+
+    Cada tag es un SET con las keys que lo llevan, así que invalidar
+    es O(keys del tag) en lugar de recorrer todo el keyspace con
+    ``KEYS`` (que bloquea Redis mientras dura). Requiere Redis >= 7
+    (``EXPIRE ... NX/GT``).
+
+    Instalar: uv add redis
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379",
+        default_ttl: int = 300,
+        prefix: str = "cache:",
+    ):
+        if aioredis is None:
+            raise RuntimeError("RedisCache necesita el paquete redis (uv add redis)")
+        self.redis = aioredis.from_url(url, decode_responses=True)
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+        self.stats = CacheStats()
+        self._flight = SingleFlight()
+        self._generations = _Generations()
+        self._invalidate_script = self.redis.register_script(_INVALIDATE_TAGS_LUA)
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        value = await self._lookup(key)
+        return default if value is _MISSING else value
+
     async def set(
-        self, 
-        key: str, 
-        value: Any, 
-        ttl_seconds: int = 300
+        self,
+        key: str,
+        value: Any,
+        ttl: int | None = None,
+        tags: Iterable[str] = (),
     ) -> None:
-        '''Guarda valor serializado en cache.'''
-        await self.redis.setex(
-            key,
-            ttl_seconds,
-            json.dumps(value, default=str)
-        )
-    
-    async def delete(self, key: str) -> None:
-        '''Elimina key del cache.'''
-        await self.redis.delete(key)
-    
-    async def delete_pattern(self, pattern: str) -> int:
-        '''Elimina todas las keys que coinciden con patrón.'''
-        keys = await self.redis.keys(pattern)
-        if keys:
-            return await self.redis.delete(*keys)
-        return 0
-    
-    async def get_or_set(
+        """Guarda el valor serializado y lo añade a los sets de sus tags."""
+        ttl = ttl or self.default_ttl
+        full_key = self.prefix + key
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(full_key, json.dumps(value, default=str), ex=ttl)
+            for tag in tags:
+                tag_key = self._tag_key(tag)
+                pipe.sadd(tag_key, full_key)
+                # El set vive al menos tanto como su key más duradera
+                pipe.expire(tag_key, ttl, nx=True)
+                pipe.expire(tag_key, ttl, gt=True)
+            await pipe.execute()
+
+    async def delete(self, key: str) -> bool:
+        self._generations.bump(("key", key))
+        return bool(await self.redis.delete(self.prefix + key))
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        """Elimina todas las keys con alguno de ``tags``. Devuelve cuántas."""
+        if not tags:
+            return 0
+        for tag in tags:
+            self._generations.bump(("tag", tag))
+        deleted = await self._invalidate_script(keys=[self._tag_key(tag) for tag in tags])
+        self.stats.invalidations += deleted
+        return deleted
+
+    async def get_or_load(
         self,
         key: str,
-        func: Callable,
-        ttl_seconds: int = 300
+        loader: Loader,
+        ttl: int | None = None,
+        tags: Iterable[str] = (),
     ) -> Any:
-        '''Obtiene del cache o ejecuta función async.'''
-        value = await self.get(key)
-        if value is not None:
+        """
+        Cache-aside con single-flight dentro del proceso.
+
+        Como en MemoryCache, no guarda un resultado cuya key o tags se
+        invalidaron durante la carga (solo detecta las invalidaciones
+        hechas desde este proceso).
+        """
+        value = await self._lookup(key)
+        if value is not _MISSING:
             return value
-        
-        value = await func()
-        await self.set(key, value, ttl_seconds)
-        return value
+        tags = frozenset(tags)
+
+        async def load() -> Any:
+            self.stats.loads += 1
+            names = _load_names(key, tags)
+            snapshot = self._generations.start(names)
+            try:
+                result = await loader()
+            finally:
+                fresh = self._generations.finish(names, snapshot)
+            if fresh:
+                await self.set(key, result, ttl, tags)
+            return result
+
+        return await self._flight.do(key, load)
 
-# Dependency para FastAPI:
-async def get_cache() -> RedisCache:
-    return RedisCache(settings.redis_url)
+    async def close(self) -> None:
+        await self.redis.aclose()
 
-# Uso:
-@router.get("/products/{product_id}")
-async def get_product(
-    product_id: int,
-    cache: RedisCache = Depends(get_cache),
-    db: AsyncSession = Depends(get_db)
+    async def _lookup(self, key: str) -> Any:
+        raw = await self.redis.get(self.prefix + key)
+        if raw is None:
+            self.stats.misses += 1
+            return _MISSING
+        self.stats.hits += 1
+        return json.loads(raw)
+
+
+# ============================================
+# PASO 5: Decorador de cache
+# ============================================
+
+def cached(
+    cache: MemoryCache | RedisCache,
+    ttl: float | None = None,
+    key_prefix: str = "",
+    tags: Tags = (),
+    ignore: Iterable[str] = ("self", "db", "session"),
 ):
-    cache_key = f"product:{product_id}"
-    
-    product = await cache.get(cache_key)
-    if product:
-        return product
-    
-    product = await db.get(Product, product_id)
-    if product:
-        await cache.set(cache_key, product.to_dict(), ttl_seconds=600)
-    
-    return product
-"""
-print(REDIS_CACHE)
+    """
+    Decorador para cachear funciones async.
+
+    La key se construye con los argumentos ya enlazados a la firma
+    (``f(1)`` y ``f(user_id=1)`` comparten key) excepto los de
+    ``ignore``, como la sesión de DB.
+
+    Args:
+        cache: MemoryCache o RedisCache
+        ttl: Tiempo de vida (None: el default del cache)
+        key_prefix: Prefijo de la key (default: módulo.función)
+        tags: Tags fijos o función que recibe los argumentos y los devuelve
+        ignore: Nombres de argumentos que no forman parte de la key
+    """
+    ignore = frozenset(ignore)
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        signature = inspect.signature(func)
+        prefix = key_prefix or f"{func.__module__}.{func.__qualname__}:"
+
+        def key_params(args: tuple, kwargs: dict) -> dict[str, Any]:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return {name: value for name, value in bound.arguments.items() if name not in ignore}
+
+        def cache_key(*args: Any, **kwargs: Any) -> str:
+            return make_key(key_params(args, kwargs), prefix=prefix)
+
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            params = key_params(args, kwargs)
+            key = make_key(params, prefix=prefix)
+            entry_tags = tags(**params) if callable(tags) else tags
+            return await cache.get_or_load(
+                key, lambda: func(*args, **kwargs), ttl=ttl, tags=entry_tags
+            )
+
+        wrapper.cache_key = cache_key
+        return wrapper
+
+    return decorator
 
 
 # ============================================
-# PASO 4: Invalidación de cache
+# PASO 6: Uso e invalidación
 # ============================================
-print("\n--- Paso 4: Invalidación de cache ---")
 
-CACHE_INVALIDATION = """
-# El cache debe invalidarse cuando los datos cambian
+CACHE_USAGE = """
+cache = MemoryCache(max_size=10_000, default_ttl=300, policy="lfu")
+
+@cached(cache, ttl=600, tags=lambda user_id: [f"user:{user_id}"])
+async def get_user_by_id(db: AsyncSession, user_id: int) -> dict | None:
+    user = await db.get(User, user_id)
+    return user.to_dict() if user else None
+
+@cached(cache, ttl=60, tags=["users:list"])
+async def list_users(db: AsyncSession, page: int = 1) -> list[dict]:
+    ...
 
 class UserService:
-    def __init__(self, db: AsyncSession, cache: RedisCache):
-        self.db = db
-        self.cache = cache
-    
-    async def get_user(self, user_id: int) -> User | None:
-        cache_key = f"user:{user_id}"
-        
-        # Try cache first
-        cached = await self.cache.get(cache_key)
-        if cached:
-            return User(**cached)
-        
-        # Fetch from DB
-        user = await self.db.get(User, user_id)
-        if user:
-            await self.cache.set(cache_key, user.to_dict())
-        
-        return user
-    
     async def update_user(self, user_id: int, data: UserUpdate) -> User:
-        user = await self.db.get(User, user_id)
-        
-        # Update in DB
-        for key, value in data.model_dump(exclude_unset=True).items():
-            setattr(user, key, value)
-        await self.db.commit()
-        
-        # Invalidate cache
-        await self.cache.delete(f"user:{user_id}")
-        
-        # También invalidar listas que incluyan este usuario
-        await self.cache.delete_pattern("users:list:*")
-        
-        return user
-    
-    async def delete_user(self, user_id: int) -> None:
-        await self.db.execute(
-            delete(User).where(User.id == user_id)
-        )
+        ...
         await self.db.commit()
-        
-        # Invalidar todo el cache relacionado
-        await self.cache.delete(f"user:{user_id}")
-        await self.cache.delete_pattern("users:*")
-
-# Patrones de invalidación:
-# 1. Invalidar key específica: cache.delete("user:123")
-# 2. Invalidar por patrón: cache.delete_pattern("user:*")
-# 3. TTL corto para datos que cambian frecuentemente
-# 4. Eventos/hooks para invalidar al modificar
-"""
-print(CACHE_INVALIDATION)
+        # Invalida el detalle y todas las páginas del listado, sin KEYS
+        cache.invalidate_tags(f"user:{user_id}", "users:list")
 
-
-# ============================================
-# PASO 5: Estrategias de caching
-# ============================================
-print("\n--- Paso 5: Estrategias de caching ---")
+@router.get("/cache/stats")
+async def cache_stats():
+    return cache.stats.as_dict()
+"""
 
 CACHING_STRATEGIES = """
 ┌──────────────────┬────────────────────────────────────────────────┐
@@ -338,28 +699,78 @@ TTLs recomendados:
 • Listas/catálogos: 1-5 minutos
 • Stats/reportes: 1-24 horas
 """
-print(CACHING_STRATEGIES)
 
 
 # ============================================
-# EJERCICIO PRÁCTICO
+# DEMO
 # ============================================
-print("\n" + "="*50)
-print("📝 EJERCICIO: Implementa cache en tu proyecto")
-print("="*50)
-print("""
-1. Implementa SimpleCache para desarrollo
+
+async def demo() -> None:
+    print("--- Expulsión LRU vs LFU ---")
+    for policy in ("lru", "lfu"):
+        cache = MemoryCache(max_size=3, policy=policy)
+        for key in ("a", "b", "c"):
+            cache.set(key, key.upper())
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+        cache.get("c")
+        cache.get("c")
+        cache.set("d", "D")  # lleno: expulsa una entrada
+        print(f"{policy}: quedan {[key for key in 'abcd' if key in cache]}")
+
+    print("\n--- Single-flight: 100 misses concurrentes ---")
+    cache = MemoryCache()
+    calls = 0
+
+    async def slow_query() -> dict:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"total_users": 42}
+
+    await asyncio.gather(*(cache.get_or_load("stats", slow_query) for _ in range(100)))
+    print(f"loader ejecutado {calls} vez; stats: {cache.stats.as_dict()}")
+
+    print("\n--- Decorador e invalidación por tags ---")
+
+    @cached(cache, tags=lambda user_id: [f"user:{user_id}"])
+    async def get_user(user_id: int) -> dict:
+        return {"id": user_id, "loaded_at": time.monotonic()}
+
+    first = await get_user(1)
+    same = await get_user(user_id=1)
+    print(f"misma key con args posicionales y por nombre: {first is same}")
+    print(f"invalidadas: {cache.invalidate_tags('user:1')}")
+    reloaded = await get_user(1)
+    print(f"recargado tras invalidar: {reloaded is not first}")
+
+
+if __name__ == "__main__":
+    asyncio.run(demo())
+
+    print("\n--- Uso en endpoints ---")
+    print(CACHE_USAGE)
+
+    print("\n--- Estrategias de caching ---")
+    print(CACHING_STRATEGIES)
+
+    print("\n" + "="*50)
+    print("📝 EJERCICIO: Implementa cache en tu proyecto")
+    print("="*50)
+    print("""
+1. Usa MemoryCache (o RedisCache con varios workers)
 
 2. Identifica 3 endpoints que se beneficiarían de cache:
    - Endpoint de listado (GET /items)
    - Endpoint de detalle frecuente (GET /items/{id})
    - Endpoint de stats/dashboard
 
-3. Agrega el decorador @cached a estos endpoints
+3. Agrega el decorador @cached con tags a estos endpoints
 
-4. Implementa invalidación en endpoints de escritura
+4. Invalida por tags en endpoints de escritura
 
-5. Mide mejora en tiempo de respuesta
+5. Mide mejora en tiempo de respuesta y el hit_rate de cache.stats
 
 Resultado esperado:
 - Endpoints cacheados responden < 50ms en cache hit
@@ -6,21 +6,313 @@ Archivo: query_logging.py
 
 Aprende a monitorear las queries de SQLAlchemy
 para identificar problemas de rendimiento.
+
+Este módulo es importable y al ejecutarlo muestra una demo:
+
+    python query_logging.py
+
+Profiler de queries por request:
+
+- Se engancha a ``before/after_cursor_execute`` del engine (sync o async)
+- Atribuye cada query a la request en curso con un ContextVar
+- Normaliza cada statement a una "huella" (literales y parámetros
+  -> ``?``): la misma huella repetida N veces en una request es un N+1
+- Añade ``X-Query-Count`` y ``X-Query-Time-Ms`` a cada respuesta y
+  agrega por endpoint en ``/debug/queries``
+
+Uso:
+
+    profiler = setup_query_profiler(app, engine)
 """
 
 import logging
+import re
 import time
-from contextlib import asynccontextmanager
-from functools import wraps
-from typing import Any, Callable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Iterator
 
+from fastapi import FastAPI
 from sqlalchemy import event
-from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+logger = logging.getLogger("query_profiler")
+
+
+# ============================================
+# PASO 1: Huella de un statement
+# ============================================
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+# ?, %s, %(name)s, :name (sin confundir con casts ::), $1
+_BIND_PARAM = re.compile(r"%\(\w+\)s|%s|(?<!:):\w+|\$\d+")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_ROWS = re.compile(r"(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> str:
+    """
+    Forma de un statement sin valores concretos.
+
+    ``SELECT * FROM users WHERE id = 7`` y ``... WHERE id = ?`` dan la
+    misma huella; ``IN (?, ?, ?)`` se colapsa a ``IN (?)``. Cacheado:
+    el ORM repite el mismo texto SQL.
+    """
+    result = _STRING_LITERAL.sub("?", statement)
+    result = _BIND_PARAM.sub("?", result)
+    result = _NUMBER_LITERAL.sub("?", result)
+    result = _IN_LIST.sub("IN (?)", result)
+    result = _VALUES_ROWS.sub(r"\1", result)
+    return _WHITESPACE.sub(" ", result).strip()
+
 
 # ============================================
-# PASO 1: Logging básico de SQLAlchemy
+# PASO 2: Perfil de la request en curso
+# ============================================
+
+@dataclass
+class RequestProfile:
+    """Queries ejecutadas durante una request."""
+
+    count: int = 0
+    total_time: float = 0.0
+    slow_count: int = 0
+    # huella -> número de ejecuciones
+    shapes: dict[str, int] = field(default_factory=dict)
+
+    def record(self, statement: str, duration: float, slow_threshold: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        if duration >= slow_threshold:
+            self.slow_count += 1
+        shape = fingerprint(statement)
+        self.shapes[shape] = self.shapes.get(shape, 0) + 1
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """Huellas ejecutadas ``threshold`` veces o más (sospechosas de N+1)."""
+        return {shape: n for shape, n in self.shapes.items() if n >= threshold}
+
+
+# Se muta el objeto, no la variable: los endpoints ``def`` corren en un
+# threadpool con una copia del contexto y siguen viendo el mismo perfil
+_current_profile: ContextVar[RequestProfile | None] = ContextVar(
+    "query_profile", default=None
+)
+
+
+def current_profile() -> RequestProfile | None:
+    """Perfil de la request en curso (None fuera de una request)."""
+    return _current_profile.get()
+
+
+# ============================================
+# PASO 3: Agregado por endpoint
+# ============================================
+
+@dataclass
+class EndpointStats:
+    """Acumulado de queries de un endpoint."""
+
+    requests: int = 0
+    queries: int = 0
+    max_queries: int = 0
+    total_time: float = 0.0
+    slow_queries: int = 0
+    # huella -> [requests en que se repitió, máximo de repeticiones]
+    n_plus_one: dict[str, list[int]] = field(default_factory=dict)
+
+    def add(self, profile: RequestProfile, repeated: dict[str, int]) -> None:
+        self.requests += 1
+        self.queries += profile.count
+        self.max_queries = max(self.max_queries, profile.count)
+        self.total_time += profile.total_time
+        self.slow_queries += profile.slow_count
+        for shape, repeats in repeated.items():
+            seen = self.n_plus_one.setdefault(shape, [0, 0])
+            seen[0] += 1
+            seen[1] = max(seen[1], repeats)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "queries": self.queries,
+            "avg_queries": round(self.queries / self.requests, 2),
+            "max_queries": self.max_queries,
+            "total_time_ms": round(self.total_time * 1000, 3),
+            "avg_time_ms": round(self.total_time * 1000 / self.requests, 3),
+            "slow_queries": self.slow_queries,
+            "n_plus_one": [
+                {"fingerprint": shape, "requests": seen[0], "max_repeats": seen[1]}
+                for shape, seen in sorted(
+                    self.n_plus_one.items(), key=lambda item: item[1][1], reverse=True
+                )
+            ],
+        }
+
+
+# ============================================
+# PASO 4: Profiler (eventos de SQLAlchemy)
+# ============================================
+
+class QueryProfiler:
+    """
+    Mide las queries de uno o varios engines por request.
+
+    Las queries fuera de una request (arranque, tareas de fondo) no se
+    atribuyen a ningún endpoint.
+    """
+
+    def __init__(self, n_plus_one_threshold: int = 5, slow_query_ms: float = 100):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.slow_threshold = slow_query_ms / 1000
+        self.endpoints: dict[str, EndpointStats] = {}
+
+    def install(self, engine: Any) -> None:
+        """Registra los listeners en un Engine o AsyncEngine."""
+        # AsyncEngine: los eventos de cursor van en el engine síncrono interno
+        sync_engine = getattr(engine, "sync_engine", engine)
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def uninstall(self, engine: Any) -> None:
+        sync_engine = getattr(engine, "sync_engine", engine)
+        event.remove(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    @contextmanager
+    def profile(self) -> Iterator[RequestProfile]:
+        """Atribuye al perfil devuelto las queries del bloque."""
+        request_profile = RequestProfile()
+        token = _current_profile.set(request_profile)
+        try:
+            yield request_profile
+        finally:
+            _current_profile.reset(token)
+
+    def finish(self, endpoint: str, request_profile: RequestProfile) -> None:
+        """Agrega el perfil de una request y avisa de N+1."""
+        repeated = request_profile.repeated(self.n_plus_one_threshold)
+        for shape, repeats in repeated.items():
+            logger.warning("Posible N+1 en %s: %d x %s", endpoint, repeats, shape[:200])
+
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = EndpointStats()
+        stats.add(request_profile, repeated)
+
+    def report(self) -> dict[str, Any]:
+        """Endpoints ordenados por número total de queries."""
+        ranking = sorted(self.endpoints.items(), key=lambda item: item[1].queries, reverse=True)
+        return {endpoint: stats.as_dict() for endpoint, stats in ranking}
+
+    def reset(self) -> None:
+        self.endpoints.clear()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if _current_profile.get() is not None:
+            conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        request_profile = _current_profile.get()
+        if request_profile is None:
+            return
+        starts = conn.info.get("query_start_time")
+        if not starts:
+            return
+        duration = time.perf_counter() - starts.pop()
+        request_profile.record(statement, duration, self.slow_threshold)
+        if duration >= self.slow_threshold:
+            logger.warning("Query lenta (%.3fs): %s", duration, statement[:200])
+
+
+# ============================================
+# PASO 5: Middleware y /debug/queries
+# ============================================
+
+class QueryProfilerMiddleware:
+    """
+    Middleware ASGI que abre un perfil por request.
+
+    Añade ``X-Query-Count`` y ``X-Query-Time-Ms`` (queries hasta el
+    inicio de la respuesta) y agrega el perfil bajo ``MÉTODO /ruta``,
+    con la plantilla de la ruta para no crear una entrada por ID.
+    """
+
+    def __init__(self, app: ASGIApp, profiler: QueryProfiler, excluded_paths: frozenset[str]):
+        self.app = app
+        self.profiler = profiler
+        self.excluded_paths = excluded_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        with self.profiler.profile() as request_profile:
+
+            async def send_with_headers(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-query-count", str(request_profile.count).encode()))
+                    headers.append(
+                        (b"x-query-time-ms", f"{request_profile.total_time * 1000:.2f}".encode())
+                    )
+                    message["headers"] = headers
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_headers)
+            finally:
+                route = scope.get("route")
+                path = getattr(route, "path", None) or "none"
+                self.profiler.finish(f"{scope['method']} {path}", request_profile)
+
+
+def setup_query_profiler(
+    app: FastAPI,
+    engine: Any,
+    debug_path: str | None = "/debug/queries",
+    n_plus_one_threshold: int = 5,
+    slow_query_ms: float = 100,
+) -> QueryProfiler:
+    """
+    Instrumenta ``engine`` y la app.
+
+    ``debug_path=None`` no expone el reporte (recomendado en producción
+    salvo detrás de autenticación).
+    """
+    profiler = QueryProfiler(n_plus_one_threshold, slow_query_ms)
+    profiler.install(engine)
+
+    excluded = frozenset({debug_path}) if debug_path else frozenset()
+    app.add_middleware(QueryProfilerMiddleware, profiler=profiler, excluded_paths=excluded)
+
+    if debug_path:
+
+        async def query_report() -> dict[str, Any]:
+            """Queries por endpoint y sospechas de N+1."""
+            return profiler.report()
+
+        async def reset_query_report() -> dict[str, str]:
+            """Resetea el reporte."""
+            profiler.reset()
+            return {"status": "reset"}
+
+        app.add_api_route(debug_path, query_report, methods=["GET"], tags=["monitoring"])
+        app.add_api_route(debug_path, reset_query_report, methods=["DELETE"], tags=["monitoring"])
+
+    return profiler
+
+
+# ============================================
+# REFERENCIA: Logging de SQLAlchemy
 # ============================================
-print("--- Paso 1: Logging básico ---")
 
 BASIC_LOGGING = """
 # En tu database.py, habilita echo para ver todas las queries:
@@ -34,275 +326,135 @@ engine = create_async_engine(
     echo_pool=True  # También pool de conexiones
 )
 
-# Producción - solo queries lentas
+# Producción - solo queries lentas (ver QueryProfiler)
 engine = create_async_engine(
     DATABASE_URL,
     echo=False,
-    # Configurar logging separado para producción
 )
 """
-print(BASIC_LOGGING)
-
-
-# ============================================
-# PASO 2: Logging estructurado
-# ============================================
-print("\n--- Paso 2: Logging estructurado ---")
-
-# Descomenta para usar:
-# logging.basicConfig()
-# logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
 
 STRUCTURED_LOGGING = """
 # Configura logging más detallado en tu config.py:
 
 import logging
 
-# Configurar logger de SQLAlchemy
 def setup_db_logging(level: str = "INFO"):
     # Logger principal de engine
     engine_logger = logging.getLogger("sqlalchemy.engine")
     engine_logger.setLevel(getattr(logging, level))
-    
-    # Handler personalizado
-    handler = logging.StreamHandler()
-    handler.setFormatter(logging.Formatter(
-        "%(asctime)s [SQL] %(message)s",
-        datefmt="%H:%M:%S"
-    ))
-    engine_logger.addHandler(handler)
-    
-    # Para ver el pool de conexiones
-    pool_logger = logging.getLogger("sqlalchemy.pool")
-    pool_logger.setLevel(logging.DEBUG)
-
-# Llamar al inicio de la app
+
+    # Avisos de N+1 y queries lentas de este módulo
+    logging.getLogger("query_profiler").setLevel(logging.WARNING)
+
 # setup_db_logging("DEBUG")  # Desarrollo
 # setup_db_logging("WARNING")  # Producción
 """
-print(STRUCTURED_LOGGING)
 
 
 # ============================================
-# PASO 3: Medir tiempo de queries
+# DEMO
 # ============================================
-print("\n--- Paso 3: Medir tiempo de queries ---")
 
-QUERY_TIMING = """
-# Middleware para medir tiempo de queries
-
-from sqlalchemy import event
-from sqlalchemy.engine import Engine
-import time
-import logging
-
-logger = logging.getLogger("query_timer")
-
-@event.listens_for(Engine, "before_cursor_execute")
-def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
-
-@event.listens_for(Engine, "after_cursor_execute")
-def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
-    total = time.perf_counter() - conn.info["query_start_time"].pop()
-    
-    # Log solo queries lentas (> 100ms)
-    if total > 0.1:
-        logger.warning(
-            f"Query lenta ({total:.3f}s): {statement[:100]}..."
+def demo() -> None:
+    from fastapi import Depends
+    from fastapi.testclient import TestClient
+    from sqlalchemy import ForeignKey, String, create_engine, select
+    from sqlalchemy.orm import (
+        DeclarativeBase,
+        Mapped,
+        Session,
+        mapped_column,
+        relationship,
+        selectinload,
+    )
+    from sqlalchemy.pool import StaticPool
+
+    class Base(DeclarativeBase):
+        pass
+
+    class User(Base):
+        __tablename__ = "users"
+        id: Mapped[int] = mapped_column(primary_key=True)
+        username: Mapped[str] = mapped_column(String(50))
+
+    class Message(Base):
+        __tablename__ = "messages"
+        id: Mapped[int] = mapped_column(primary_key=True)
+        content: Mapped[str] = mapped_column(String(200))
+        user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+        user: Mapped[User] = relationship()
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        users = [User(username=f"user{i}") for i in range(10)]
+        db.add_all(users)
+        db.add_all(Message(content=f"hola {i}", user=users[i % 10]) for i in range(50))
+        db.commit()
+
+    def get_db():
+        with Session(engine) as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/rooms/{room_id}/messages")
+    def list_messages(room_id: int, db: Session = Depends(get_db)):
+        messages = db.scalars(select(Message).limit(20)).all()
+        # N+1: un SELECT de users por cada autor distinto
+        return [{"content": m.content, "user": m.user.username} for m in messages]
+
+    @app.get("/rooms/{room_id}/messages-fixed")
+    def list_messages_fixed(room_id: int, db: Session = Depends(get_db)):
+        query = select(Message).options(selectinload(Message.user)).limit(20)
+        messages = db.scalars(query).all()
+        return [{"content": m.content, "user": m.user.username} for m in messages]
+
+    setup_query_profiler(app, engine)
+    client = TestClient(app)
+
+    for path in ("/rooms/1/messages", "/rooms/2/messages", "/rooms/1/messages-fixed"):
+        response = client.get(path)
+        print(
+            f"GET {path}: X-Query-Count={response.headers['x-query-count']} "
+            f"X-Query-Time-Ms={response.headers['x-query-time-ms']}"
         )
 
-# Para async engine, usa este approach:
-class QueryTimer:
-    def __init__(self):
-        self.queries = []
-        self.start_time = None
-    
-    def start(self):
-        self.start_time = time.perf_counter()
-        self.queries = []
-    
-    def log_query(self, query: str, duration: float):
-        self.queries.append({
-            "query": query[:200],
-            "duration": duration
-        })
-    
-    def get_summary(self) -> dict:
-        total_time = time.perf_counter() - self.start_time
-        return {
-            "total_queries": len(self.queries),
-            "total_time": total_time,
-            "slow_queries": [q for q in self.queries if q["duration"] > 0.1]
-        }
-"""
-print(QUERY_TIMING)
-
-
-# ============================================
-# PASO 4: Contador de queries por request
-# ============================================
-print("\n--- Paso 4: Contador de queries por request ---")
+    print("\nGET /debug/queries")
+    for endpoint, stats in client.get("/debug/queries").json().items():
+        print(f"  {endpoint}: {stats['queries']} queries en {stats['requests']} requests")
+        for suspect in stats["n_plus_one"]:
+            print(f"    N+1 ({suspect['max_repeats']}x): {suspect['fingerprint']}")
 
-QUERY_COUNTER = """
-# Middleware para contar queries por request
 
-from contextvars import ContextVar
-from starlette.middleware.base import BaseHTTPMiddleware
-from fastapi import Request
-
-# Context variable para tracking
-query_count: ContextVar[int] = ContextVar("query_count", default=0)
-
-class QueryCounterMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # Reset counter
-        query_count.set(0)
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Add header with query count
-        count = query_count.get()
-        response.headers["X-Query-Count"] = str(count)
-        
-        # Log si hay muchas queries
-        if count > 10:
-            logger.warning(
-                f"Alto número de queries ({count}) en {request.url.path}"
-            )
-        
-        return response
-
-# Hook para incrementar contador
-def increment_query_count():
-    current = query_count.get()
-    query_count.set(current + 1)
-
-# Usar en eventos de SQLAlchemy
-@event.listens_for(Engine, "after_cursor_execute")
-def after_execute(conn, cursor, statement, parameters, context, executemany):
-    try:
-        increment_query_count()
-    except LookupError:
-        pass  # Fuera de contexto de request
-
-# Agregar middleware
-# app.add_middleware(QueryCounterMiddleware)
-"""
-print(QUERY_COUNTER)
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(message)s")
 
+    print("--- Demo: profiler de queries ---")
+    demo()
 
-# ============================================
-# PASO 5: Logging por endpoint
-# ============================================
-print("\n--- Paso 5: Decorador para endpoints ---")
+    print("\n--- Referencia: logging de SQLAlchemy ---")
+    print(BASIC_LOGGING)
+    print(STRUCTURED_LOGGING)
 
-ENDPOINT_DECORATOR = """
-# Decorador para medir performance de endpoints
-
-import time
-from functools import wraps
-from typing import Callable
-
-def measure_endpoint(func: Callable):
-    @wraps(func)
-    async def wrapper(*args, **kwargs):
-        start = time.perf_counter()
-        query_count.set(0)
-        
-        try:
-            result = await func(*args, **kwargs)
-            return result
-        finally:
-            duration = time.perf_counter() - start
-            queries = query_count.get()
-            
-            logger.info(
-                f"Endpoint: {func.__name__} | "
-                f"Duration: {duration:.3f}s | "
-                f"Queries: {queries}"
-            )
-    
-    return wrapper
-
-# Uso en router:
-@router.get("/users")
-@measure_endpoint
-async def list_users(db: AsyncSession = Depends(get_db)):
-    # ... tu código
-    pass
-"""
-print(ENDPOINT_DECORATOR)
-
-
-# ============================================
-# PASO 6: Dashboard simple de métricas
-# ============================================
-print("\n--- Paso 6: Endpoint de métricas ---")
-
-METRICS_ENDPOINT = """
-# Endpoint para ver métricas de queries
-
-from collections import defaultdict
-from datetime import datetime, timedelta
-
-# Storage simple en memoria (usar Redis en producción)
-query_metrics = defaultdict(lambda: {
-    "count": 0,
-    "total_time": 0,
-    "slow_count": 0
-})
-
-def record_query_metric(endpoint: str, duration: float):
-    query_metrics[endpoint]["count"] += 1
-    query_metrics[endpoint]["total_time"] += duration
-    if duration > 0.1:
-        query_metrics[endpoint]["slow_count"] += 1
-
-@router.get("/metrics/queries", tags=["monitoring"])
-async def get_query_metrics():
-    '''Retorna métricas de queries por endpoint.'''
-    return {
-        endpoint: {
-            "total_queries": data["count"],
-            "total_time_seconds": round(data["total_time"], 3),
-            "avg_time_ms": round((data["total_time"] / data["count"]) * 1000, 2)
-                if data["count"] > 0 else 0,
-            "slow_queries": data["slow_count"]
-        }
-        for endpoint, data in query_metrics.items()
-    }
-
-# Reset diario (en producción usar scheduler)
-@router.post("/metrics/queries/reset", tags=["monitoring"])
-async def reset_query_metrics():
-    '''Resetea métricas de queries.'''
-    query_metrics.clear()
-    return {"status": "reset"}
-"""
-print(METRICS_ENDPOINT)
-
-
-# ============================================
-# EJERCICIO PRÁCTICO
-# ============================================
-print("\n" + "="*50)
-print("📝 EJERCICIO: Implementa logging en tu proyecto")
-print("="*50)
-print("""
+    print("\n" + "="*50)
+    print("📝 EJERCICIO: Implementa logging en tu proyecto")
+    print("="*50)
+    print("""
 1. Habilita echo=True en desarrollo
 
-2. Implementa el middleware QueryCounterMiddleware
+2. Llama a setup_query_profiler(app, engine) al crear la app
 
-3. Agrega el header X-Query-Count a responses
+3. Revisa los headers X-Query-Count y X-Query-Time-Ms
 
-4. Identifica endpoints con más de 5 queries
+4. Consulta /debug/queries: endpoints con más de 5 queries o con N+1
 
-5. Optimiza los endpoints problemáticos
+5. Optimiza los endpoints problemáticos (selectinload/joinedload)
 
 Resultado esperado:
 - Cada response incluye X-Query-Count header
-- Logs muestran queries lentas (>100ms)
+- Logs muestran queries lentas (>100ms) y posibles N+1
 - Endpoints principales usan < 5 queries
 """)
@@ -0,0 +1,63 @@
+"""
+Tests para la invalidación durante un load con single-flight.
+"""
+
+import asyncio
+
+import pytest
+
+from caching import MemoryCache
+
+
+async def start_load(cache: MemoryCache, tags=()) -> tuple[asyncio.Task, asyncio.Event]:
+    """Lanza un get_or_load y espera a que su loader haya empezado."""
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def loader() -> str:
+        started.set()
+        await release.wait()
+        return "leído antes de la escritura"
+
+    task = asyncio.create_task(cache.get_or_load("user:1", loader, tags=tags))
+    await started.wait()
+    return task, release
+
+
+class TestInvalidationDuringLoad:
+    """Una invalidación no la deshace un load que ya estaba en curso."""
+
+    @pytest.mark.asyncio
+    async def test_delete_during_load(self):
+        cache = MemoryCache()
+        task, release = await start_load(cache)
+
+        cache.delete("user:1")
+        release.set()
+
+        assert await task == "leído antes de la escritura"
+        assert "user:1" not in cache
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_during_load(self):
+        cache = MemoryCache()
+        task, release = await start_load(cache, tags=["users"])
+
+        cache.invalidate_tags("users")
+        release.set()
+
+        await task
+        assert "user:1" not in cache
+
+    @pytest.mark.asyncio
+    async def test_load_without_invalidation_is_cached(self):
+        cache = MemoryCache()
+        task, release = await start_load(cache, tags=["users"])
+
+        # Otra key y otro tag no afectan a este load
+        cache.delete("user:2")
+        cache.invalidate_tags("orders")
+        release.set()
+
+        await task
+        assert cache.get("user:1") == "leído antes de la escritura"
+        assert len(cache._generations) == 0
@@ -0,0 +1,220 @@
+"""
+============================================
+PROYECTO FINAL - Template de database.py (async)
+============================================
+
+Capa de base de datos asíncrona: AsyncEngine, async_sessionmaker y
+un get_db asíncrono para FastAPI.
+
+Los proyectos de semanas anteriores usan ``create_engine`` y
+``SessionLocal`` síncronos dentro de endpoints ``async def``: cada
+query bloquea el event loop y todas las requests esperan. Con el
+engine asíncrono la espera de I/O libera el loop.
+
+El pool respeta ``db_pool_size``, ``db_max_overflow`` y
+``db_pool_timeout`` de config_template y mide cuánto espera cada
+request para obtener una conexión (ver ``get_pool_stats``).
+
+Copia y adapta a tu proyecto.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+
+from config_template import Settings, get_settings
+
+
+# ============================================
+# MÉTRICAS DEL POOL
+# ============================================
+
+@dataclass
+class PoolStats:
+    """Tiempos de espera al pedir una conexión al pool."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    def record(self, wait: float) -> None:
+        self.checkouts += 1
+        self.total_wait += wait
+        if wait > self.max_wait:
+            self.max_wait = wait
+
+    @property
+    def avg_wait_ms(self) -> float:
+        if not self.checkouts:
+            return 0.0
+        return self.total_wait / self.checkouts * 1000
+
+    def reset(self) -> None:
+        self.checkouts = self.timeouts = 0
+        self.total_wait = self.max_wait = 0.0
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool que mide la espera de cada checkout.
+
+    ``_do_get`` es el punto donde el pool espera una conexión libre (o
+    abre una de overflow); SQLAlchemy no expone un evento para el
+    inicio de esa espera.
+    """
+
+    def __init__(self, *args: Any, stats: PoolStats | None = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.stats = stats or PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            self.stats.record(time.perf_counter() - start)
+
+    def recreate(self):
+        # dispose() recrea el pool: se conservan las métricas
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+# ============================================
+# ENGINE Y SESIONES
+# ============================================
+
+def create_engine_from_settings(settings: Settings | None = None) -> AsyncEngine:
+    """
+    Crea el AsyncEngine con la configuración del pool.
+
+    SQLite en memoria usa StaticPool (una sola conexión compartida);
+    el resto de URLs usan un pool con tamaño, overflow y timeout.
+    """
+    settings = settings or get_settings()
+    url = settings.database_url
+
+    if url.startswith("sqlite") and ":memory:" in url:
+        return create_async_engine(
+            url,
+            poolclass=StaticPool,
+            connect_args={"check_same_thread": False},
+            echo=settings.debug,
+        )
+
+    return create_async_engine(
+        url,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        # Descarta conexiones cortadas por el servidor sin fallar la request
+        pool_pre_ping=not url.startswith("sqlite"),
+        echo=settings.debug,
+    )
+
+
+engine = create_engine_from_settings()
+
+# expire_on_commit=False: los objetos siguen usables tras el commit
+# sin lanzar lazy loads (que en async fallan)
+AsyncSessionLocal = async_sessionmaker(
+    engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+
+class Base(DeclarativeBase):
+    """Base para modelos SQLAlchemy."""
+    pass
+
+
+# ============================================
+# DEPENDENCY
+# ============================================
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency para obtener sesión de DB.
+
+    Hace rollback si el endpoint lanza una excepción; el commit es
+    responsabilidad del servicio.
+
+    Yields:
+        AsyncSession: Sesión de base de datos
+    """
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
+
+# ============================================
+# CICLO DE VIDA
+# ============================================
+
+async def init_db() -> None:
+    """Crea todas las tablas (en producción usar Alembic)."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def close_db() -> None:
+    """Cierra las conexiones del pool (shutdown)."""
+    await engine.dispose()
+
+
+def get_pool_stats(async_engine: AsyncEngine = engine) -> dict[str, Any]:
+    """
+    Estado del pool y tiempos de checkout.
+
+    Útil para exponer en /health o en métricas: si ``avg_wait_ms``
+    crece, el pool es demasiado pequeño para la concurrencia.
+    """
+    pool = async_engine.pool
+    stats = getattr(pool, "stats", None)
+    result: dict[str, Any] = {"pool": pool.status()}
+    if stats is not None:
+        result.update(
+            checkouts=stats.checkouts,
+            timeouts=stats.timeouts,
+            avg_wait_ms=round(stats.avg_wait_ms, 3),
+            max_wait_ms=round(stats.max_wait * 1000, 3),
+        )
+    return result
+
+
+# ============================================
+# EJEMPLO DE USO
+# ============================================
+# from fastapi import Depends, FastAPI
+# from sqlalchemy import select
+#
+# @asynccontextmanager
+# async def lifespan(app: FastAPI):
+#     await init_db()
+#     yield
+#     await close_db()
+#
+# @app.get("/tasks")
+# async def list_tasks(db: AsyncSession = Depends(get_db)):
+#     result = await db.execute(select(Task).limit(20))
+#     return result.scalars().all()
@@ -0,0 +1,216 @@
+"""
+============================================
+PROYECTO FINAL - Load test: engine sync vs async
+============================================
+
+Compara el throughput de un endpoint ``async def`` que consulta la DB:
+
+- sync: ``create_engine`` + ``SessionLocal`` (como en semanas 7 y 14),
+  cada query bloquea el event loop
+- async: AsyncEngine de database_template
+
+Para simular la latencia de red de una DB real (PostgreSQL) sobre
+SQLite, la query llama a ``sleep_ms(n)``, una función SQL que duerme
+en el hilo de la conexión.
+
+Además del throughput mide el retraso del event loop (un latido cada
+10 ms) y, para el engine async, la espera de checkout del pool.
+
+Uso (desde esta carpeta):
+    python load_test_database.py
+    python load_test_database.py --requests 2000 --concurrency 100 --pool-size 5
+    python load_test_database.py --db-latency-ms 0   # solo CPU de SQLite
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from config_template import Settings
+from database_template import create_engine_from_settings, get_pool_stats
+
+
+# La subquery no correlacionada se evalúa una sola vez por query
+QUERY = text(
+    "SELECT count(*), sum(value) FROM items "
+    "WHERE value % :m = 0 AND (SELECT sleep_ms(:latency)) = 0"
+)
+
+
+def register_sleep(engine) -> None:
+    """Registra sleep_ms en cada conexión nueva del pool."""
+
+    def sleep_ms(ms: int) -> int:
+        time.sleep(ms / 1000)
+        return 0
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.create_function("sleep_ms", 1, sleep_ms)
+
+
+# ============================================
+# DATOS DE PRUEBA
+# ============================================
+
+def create_database(path: Path, rows: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, value INTEGER)"))
+        conn.execute(
+            text("INSERT INTO items (value) VALUES (:value)"),
+            [{"value": i} for i in range(rows)],
+        )
+    engine.dispose()
+
+
+# ============================================
+# APPS
+# ============================================
+
+def build_sync_app(path: Path, settings: Settings, latency: int):
+    engine = create_engine(
+        f"sqlite:///{path}",
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        connect_args={"check_same_thread": False},
+    )
+    register_sleep(engine)
+    SessionLocal = sessionmaker(bind=engine)
+    app = FastAPI()
+
+    @app.get("/stats/{m}")
+    async def stats(m: int):
+        # Patrón a evitar: I/O síncrono dentro de async def
+        db = SessionLocal()
+        try:
+            count, total = db.execute(QUERY, {"m": m, "latency": latency}).one()
+        finally:
+            db.close()
+        return {"count": count, "total": total}
+
+    return app, engine
+
+
+def build_async_app(path: Path, settings: Settings, latency: int):
+    settings = settings.model_copy(update={"database_url": f"sqlite+aiosqlite:///{path}"})
+    engine = create_engine_from_settings(settings)
+    register_sleep(engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    app = FastAPI()
+
+    async def get_db():
+        async with AsyncSessionLocal() as session:
+            yield session
+
+    @app.get("/stats/{m}")
+    async def stats(m: int, db: AsyncSession = Depends(get_db)):
+        count, total = (await db.execute(QUERY, {"m": m, "latency": latency})).one()
+        return {"count": count, "total": total}
+
+    return app, engine
+
+
+# ============================================
+# CARGA
+# ============================================
+
+async def heartbeat(lags: list[float], stop: asyncio.Event) -> None:
+    """Mide cuánto se retrasa un sleep de 10 ms: bloqueo del event loop."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lags.append(time.perf_counter() - start - 0.01)
+
+
+async def run_load(app, requests: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    lags: list[float] = []
+    stop = asyncio.Event()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        async def one(i: int) -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(f"/stats/{i % 7 + 2}")
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        monitor = asyncio.create_task(heartbeat(lags, stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await monitor
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "max_loop_lag_ms": max(lags, default=0.0) * 1000,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    settings = Settings(
+        db_pool_size=args.pool_size,
+        db_max_overflow=args.max_overflow,
+        db_pool_timeout=args.pool_timeout,
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "load.db"
+        create_database(path, args.rows)
+
+        sync_app, sync_engine = build_sync_app(path, settings, args.db_latency_ms)
+        sync_result = await run_load(sync_app, args.requests, args.concurrency)
+        sync_engine.dispose()
+
+        async_app, async_engine = build_async_app(path, settings, args.db_latency_ms)
+        async_result = await run_load(async_app, args.requests, args.concurrency)
+        pool = get_pool_stats(async_engine)
+        await async_engine.dispose()
+
+    print(
+        f"{args.requests} requests, concurrencia {args.concurrency}, "
+        f"pool_size={args.pool_size} max_overflow={args.max_overflow}, "
+        f"latencia DB {args.db_latency_ms} ms"
+    )
+    print(f"{'engine':>7} | {'req/s':>8} | {'p50 ms':>8} | {'p99 ms':>8} | {'lag loop ms':>11}")
+    print("-" * 55)
+    for name, result in (("sync", sync_result), ("async", async_result)):
+        print(
+            f"{name:>7} | {result['rps']:>8.0f} | {result['p50_ms']:>8.2f} | "
+            f"{result['p99_ms']:>8.2f} | {result['max_loop_lag_ms']:>11.2f}"
+        )
+    print()
+    print(
+        f"Pool async: {pool['checkouts']} checkouts, espera media {pool['avg_wait_ms']} ms, "
+        f"máxima {pool['max_wait_ms']} ms, timeouts {pool['timeouts']}"
+    )
+    print(f"Estado: {pool['pool']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test engine sync vs async")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--db-latency-ms", type=int, default=5)
+    parser.add_argument("--pool-size", type=int, default=5)
+    parser.add_argument("--max-overflow", type=int, default=10)
+    parser.add_argument("--pool-timeout", type=int, default=30)
+    asyncio.run(main(parser.parse_args()))